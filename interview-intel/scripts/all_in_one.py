@@ -5,28 +5,50 @@ All-in-One Interview Intel Workflow
 One-command execution to generate complete interview preparation package.
 Input: JD + Resume Version
 Output: Company background, JD analysis, resume matching, interview strategy, icebreaker messages
+
+Every Markdown/text output gets a structured JSON copy next to it
+(<file>.json, see artifact_sidecar.py); later steps read those instead of
+scraping the text.
 """
 
 import os
 import sys
-import json
-import subprocess
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Optional
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+# tracing, run_manifest (hashlib), profiling (shutil), artifact_sidecar and
+# json are imported where they are used: `all-in-one --help` and the
+# startup-check budget (interview_intel.py) pay for none of them.
+
+# Steps that --profile-target can select
+PROFILE_TARGETS = [
+    "setup_folder", "save_jd", "extract_keywords",
+    "generate_analysis", "generate_strategy", "generate_icebreaker"
+]
+
 class AllInOneWorkflow:
     """Orchestrates the complete interview preparation workflow."""
 
-    def __init__(self, base_path: str):
+    def __init__(self, base_path: str, trace: bool = True):
         """
         Initialize workflow.
 
         Args:
             base_path: Base path where companies/ folder lives
+            trace: Record spans and write trace_<role>.json (Chrome trace-event
+                format) into the company folder
         """
-        self.base_path = Path(base_path)
+        # Absolute: step results stored in the run manifest (folder paths, output
+        # files) must stay valid when --resume-run is invoked from another cwd
+        self.base_path = Path(base_path).expanduser().resolve()
         self.scripts_dir = Path(__file__).parent
+        self.trace = trace
+        self.tracer: Optional["Tracer"] = None
+        self.manifest: Optional["RunManifest"] = None
+        self._resuming = False
 
     def execute(
         self,
@@ -37,11 +59,17 @@ class AllInOneWorkflow:
         resume_content: Optional[str] = None,
         top_achievement: Optional[str] = None,
         years_experience: Optional[int] = None,
-        industry_insight: Optional[str] = None
+        industry_insight: Optional[str] = None,
+        resume_run: bool = False
     ) -> Dict[str, Any]:
         """
         Execute complete workflow.
 
+        Completed steps are checkpointed in run_manifest_<role>.json in the
+        company folder. With resume_run=True, steps recorded for the same inputs
+        whose outputs are unchanged are skipped and the run continues from the
+        first incomplete step.
+
         Args:
             company_name: Target company name
             role_name: Target role/position
@@ -51,10 +79,57 @@ class AllInOneWorkflow:
             top_achievement: Top achievement for icebreaker
             years_experience: Years of relevant experience
             industry_insight: Industry insight for icebreaker strategy B
+            resume_run: Continue an interrupted run from its manifest
 
         Returns:
             Dictionary with paths to all generated files
         """
+        from run_manifest import RunManifest
+        from setup_company_folder import sanitize_name
+        from tracing import Tracer, activate, inputs_hash, span
+
+        self.tracer = Tracer() if self.trace else None
+        results = {}
+
+        manifest_file = (self.base_path / "companies" / sanitize_name(company_name)
+                         / f"run_manifest_{role_name}.json")
+        # The base path is part of the inputs: recorded step results hold absolute paths under it
+        self.manifest = RunManifest.open(manifest_file, inputs_hash(
+            str(self.base_path), company_name, role_name, jd_text, resume_version, resume_content,
+            top_achievement, years_experience, industry_insight), resume_run)
+        self._resuming = resume_run
+
+        try:
+            with activate(self.tracer):
+                with span("workflow", "workflow", inputs=(company_name, role_name, jd_text, resume_version)):
+                    results = self._execute(
+                        company_name, role_name, jd_text, resume_version, resume_content,
+                        top_achievement, years_experience, industry_insight, results
+                    )
+        finally:
+            # Export even when a step failed so the failing span is visible
+            if self.tracer is not None and results.get("company_path"):
+                trace_file = Path(results["company_path"]) / f"trace_{role_name}.json"
+                self.tracer.export(trace_file, {"company": company_name, "role": role_name})
+                print(f"🧭 Trace: {trace_file}")
+
+        return results
+
+    def _execute(
+        self,
+        company_name: str,
+        role_name: str,
+        jd_text: str,
+        resume_version: str,
+        resume_content: Optional[str],
+        top_achievement: Optional[str],
+        years_experience: Optional[int],
+        industry_insight: Optional[str],
+        results: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Run the six steps, filling in results as they complete."""
+        from state_io import write_json
+
         print(f"\n{'='*70}")
         print(f"🚀 Interview Intel 一键执行工作流")
         print(f"{'='*70}\n")
@@ -63,57 +138,70 @@ class AllInOneWorkflow:
         print(f"📋 简历版本: {resume_version}")
         print(f"\n{'='*70}\n")
 
-        results = {
+        results.update({
             "company": company_name,
             "role": role_name,
             "resume_version": resume_version,
             "generated_at": datetime.now().isoformat(),
             "files": {}
-        }
+        })
 
         try:
             # Step 1: Setup company folder
             print("📁 Step 1/6: 创建公司文件夹结构...")
-            folder_info = self._setup_company_folder(company_name, role_name)
+            folder_info = self._step(
+                1, "setup_folder", lambda: self._setup_company_folder(company_name, role_name),
+                lambda info: [info["company_folder"], info["raw_data_folder"], info["resumes_folder"]])
             results["company_path"] = folder_info["company_folder"]
             print(f"✅ 文件夹创建完成: {folder_info['company_folder']}")
 
             # Step 2: Save original JD
             print("\n📄 Step 2/6: 保存原始 JD...")
-            jd_file = self._save_jd(folder_info, jd_text, role_name)
+            jd_file = Path(self._step(
+                2, "save_jd", lambda: self._save_jd(folder_info, jd_text, role_name),
+                lambda path: [path]))
             results["files"]["jd_original"] = str(jd_file)
             print(f"✅ JD 已保存: {jd_file}")
+            results["similar_jds"] = self._find_similar_jds(jd_text, jd_file)
 
             # Step 3: Extract JD keywords
             print("\n🔍 Step 3/6: 提取 JD 关键词...")
-            keywords_file = self._extract_keywords(jd_file, folder_info, role_name)
+            keywords_file = Path(self._step(
+                3, "extract_keywords", lambda: self._extract_keywords(jd_file, folder_info, role_name),
+                lambda path: [path]))
             results["files"]["jd_keywords"] = str(keywords_file)
             print(f"✅ 关键词已提取: {keywords_file}")
 
             # Step 4: Generate JD deep analysis + Resume matching
             print("\n🧠 Step 4/6: 生成 JD 深度分析和简历匹配报告...")
-            analysis_files = self._generate_analysis(
-                company_name, role_name, jd_file, resume_version,
-                resume_content, folder_info
-            )
+            analysis_files = self._step(
+                4, "generate_analysis", lambda: self._generate_analysis(
+                    company_name, role_name, jd_file, resume_version,
+                    resume_content, folder_info
+                ),
+                lambda files: list(files.values()))
             results["files"].update(analysis_files)
             print(f"✅ JD 分析完成: {analysis_files.get('jd_analysis')}")
             print(f"✅ 简历匹配完成: {analysis_files.get('resume_mapping')}")
 
             # Step 5: Generate interview strategy
             print("\n⚔️ Step 5/6: 生成面试攻防策略...")
-            strategy_file = self._generate_strategy(
-                company_name, role_name, resume_version, folder_info
-            )
+            strategy_file = Path(self._step(
+                5, "generate_strategy", lambda: self._generate_strategy(
+                    company_name, role_name, resume_version, folder_info
+                ),
+                lambda path: [path]))
             results["files"]["interview_strategy"] = str(strategy_file)
             print(f"✅ 面试策略完成: {strategy_file}")
 
             # Step 6: Generate icebreaker messages
             print("\n💬 Step 6/6: 生成破冰文案...")
-            icebreaker_file = self._generate_icebreaker(
-                company_name, role_name, keywords_file,
-                top_achievement, years_experience, industry_insight, folder_info
-            )
+            icebreaker_file = Path(self._step(
+                6, "generate_icebreaker", lambda: self._generate_icebreaker(
+                    company_name, role_name, keywords_file,
+                    top_achievement, years_experience, industry_insight, folder_info
+                ),
+                lambda path: [path]))
             results["files"]["icebreaker"] = str(icebreaker_file)
             print(f"✅ 破冰文案完成: {icebreaker_file}")
 
@@ -128,8 +216,7 @@ class AllInOneWorkflow:
 
             # Save workflow metadata
             metadata_file = Path(results['company_path']) / f"workflow_metadata_{role_name}.json"
-            with open(metadata_file, 'w', encoding='utf-8') as f:
-                json.dump(results, f, ensure_ascii=False, indent=2)
+            write_json(metadata_file, results)
 
             return results
 
@@ -139,8 +226,83 @@ class AllInOneWorkflow:
             traceback.print_exc()
             raise
 
+    def _step(self, number: int, name: str, func, outputs) -> Any:
+        """
+        Run one step and checkpoint it, or reuse its recorded result on resume.
+
+        Once any step runs, every later step runs too: its inputs may have
+        changed.
+
+        Args:
+            number: Step number (span name step_<number>_<name>)
+            name: Step name (manifest node and profile target)
+            func: Runs the step and returns its result
+            outputs: Maps the result to the files/folders it produced
+        """
+        from profiling import profiled
+        from tracing import span
+
+        if self._resuming and self.manifest.is_complete(name):
+            print("⏭️  已完成，沿用上次结果 (--resume-run)")
+            return self.manifest.result(name)
+        self._resuming = False
+
+        with span(f"step_{number}_{name}", "step"), profiled(name):
+            result = func()
+            paths = outputs(result)
+            sidecars = self._write_sidecars(name, paths)
+
+        stored = str(result) if isinstance(result, Path) else result
+        self.manifest.record(name, paths + sidecars, stored)
+        return stored
+
+    @staticmethod
+    def _write_sidecars(name: str, paths) -> list:
+        """
+        Structured copies of a step's Markdown/text outputs.
+
+        Steps with typed data write their own sidecar (the keywords report);
+        Markdown reports without one get a sidecar parsed from the written
+        file. Outputs the step did not produce are skipped.
+        """
+        import artifact_sidecar
+
+        sidecars = []
+        for path in map(Path, paths):
+            if path.suffix == ".md" and path.is_file():
+                sidecars.append(str(artifact_sidecar.ensure(path, name)))
+            elif artifact_sidecar.load(path) is not None:
+                sidecars.append(str(artifact_sidecar.sidecar_path(path)))
+        return sidecars
+
+    def _find_similar_jds(self, jd_text: str, jd_file: Path) -> list:
+        """
+        Previously saved JDs that are near-duplicates of this one (jd_index.py).
+
+        Prints each match with the folder holding its outputs, so an existing
+        package can be reused instead of regenerated; pipeline packets can be
+        reused directly with ``pipeline_team.py --reuse-similar``. The JD this
+        run just saved is not compared with itself.
+        """
+        from jd_index import find_similar
+        from tracing import span
+
+        with span("jd_index", "analysis") as current:
+            matches = find_similar(jd_text, str(self.base_path), exclude=[jd_file])
+            current.set("matches", len(matches))
+        for match in matches[:3]:
+            label = f"{match['company']} / {match['role']}" if match["role"] else match["company"]
+            print(f"🔁 近似重复 JD ({match['similarity']:.0%}): {label} → {match['packet']}")
+        if any(match["kind"] == "packet" for match in matches):
+            print("   流水线包可直接沿用: pipeline_team.py --reuse-similar")
+        return matches
+
     def _setup_company_folder(self, company_name: str, role_name: str) -> Dict[str, Any]:
         """Step 1: Setup company folder structure."""
+        import json
+        from profiling import child_command
+        from tracing import run
+
         script = self.scripts_dir / "setup_company_folder.py"
         cmd = [
             "python3", str(script),
@@ -149,7 +311,7 @@ class AllInOneWorkflow:
             role_name
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = run(child_command(cmd), capture_output=True, text=True)
 
         if result.returncode != 0:
             raise RuntimeError(f"Failed to setup folder: {result.stderr}")
@@ -167,29 +329,40 @@ class AllInOneWorkflow:
 
     def _save_jd(self, folder_info: Dict[str, Any], jd_text: str, role_name: str) -> Path:
         """Step 2: Save original JD text."""
+        from tracing import write_text
+
         jd_file = Path(folder_info['raw_data_folder']) / f"jd_original_{role_name}.txt"
-        with open(jd_file, 'w', encoding='utf-8') as f:
-            f.write(jd_text)
+        write_text(jd_file, jd_text)
         return jd_file
 
     def _extract_keywords(self, jd_file: Path, folder_info: Dict[str, Any], role_name: str) -> Path:
-        """Step 3: Extract JD keywords."""
-        script = self.scripts_dir / "extract_jd_keywords.py"
-        keywords_file = Path(folder_info['raw_data_folder']) / f"jd_keywords_{role_name}.txt"
+        """
+        Step 3: Extract JD keywords.
 
-        cmd = [
-            "python3", str(script),
-            str(jd_file)
-        ]
+        Runs the extractor in-process (extract_jd_keywords.analyze_jd, memoized
+        under <base-path>/.cache/jd_analysis/ so a reposted JD is not analyzed
+        again) and writes the readable report (jd_keywords_<role>.txt) plus,
+        next to it, the analysis itself as the sidecar's data
+        (jd_keywords_<role>.txt.json).
+        """
+        import artifact_sidecar
+        from extract_jd_keywords import format_output
+        from jd_analysis_cache import get_cache
+        from tracing import read_text, span, write_text
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        keywords_file = Path(folder_info['raw_data_folder']) / f"jd_keywords_{role_name}.txt"
 
-        if result.returncode != 0:
-            raise RuntimeError(f"Failed to extract keywords: {result.stderr}")
+        cache = get_cache(str(self.base_path))
+        with span("analyze_jd", "analysis") as current:
+            misses = cache.stats["misses"]
+            analysis = cache.analyze(read_text(jd_file))
+            current.set("cached", cache.stats["misses"] == misses)
 
         # Save keywords output
-        with open(keywords_file, 'w', encoding='utf-8') as f:
-            f.write(result.stdout)
+        content = format_output(analysis) + "\n"
+        write_text(keywords_file, content)
+        artifact_sidecar.write(keywords_file, artifact_sidecar.build(
+            keywords_file.name, content, "extract_keywords", analysis))
 
         return keywords_file
 
@@ -203,6 +376,9 @@ class AllInOneWorkflow:
         folder_info: Dict[str, Any]
     ) -> Dict[str, str]:
         """Step 4: Generate JD analysis and resume matching using resume_optimizer.py."""
+        from profiling import child_command
+        from tracing import run, write_text
+
         script = self.scripts_dir / "resume_optimizer.py"
         company_path = folder_info['company_folder']
 
@@ -221,11 +397,10 @@ class AllInOneWorkflow:
         if resume_content:
             # Save resume content to temp file
             temp_resume = Path(folder_info['resumes_folder']) / f"temp_resume_{resume_version}.txt"
-            with open(temp_resume, 'w', encoding='utf-8') as f:
-                f.write(resume_content)
+            write_text(temp_resume, resume_content)
             cmd.extend(["--resume-file", str(temp_resume)])
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = run(child_command(cmd), capture_output=True, text=True)
 
         if result.returncode != 0:
             raise RuntimeError(f"Failed to generate analysis: {result.stderr}")
@@ -244,6 +419,9 @@ class AllInOneWorkflow:
         folder_info: Dict[str, Any]
     ) -> Path:
         """Step 5: Generate interview strategy using interview_strategy.py."""
+        from profiling import child_command
+        from tracing import run
+
         script = self.scripts_dir / "interview_strategy.py"
         company_path = folder_info['company_folder']
 
@@ -256,7 +434,7 @@ class AllInOneWorkflow:
             "--resume-version", resume_version
         ]
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = run(child_command(cmd), capture_output=True, text=True)
 
         if result.returncode != 0:
             raise RuntimeError(f"Failed to generate strategy: {result.stderr}")
@@ -274,6 +452,9 @@ class AllInOneWorkflow:
         folder_info: Dict[str, Any]
     ) -> Path:
         """Step 6: Generate icebreaker messages using icebreaker_generator.py."""
+        from profiling import child_command
+        from tracing import run
+
         script = self.scripts_dir / "icebreaker_generator.py"
         company_path = folder_info['company_folder']
 
@@ -300,7 +481,7 @@ class AllInOneWorkflow:
         if industry_insight:
             cmd.extend(["--insight", industry_insight])
 
-        result = subprocess.run(cmd, capture_output=True, text=True)
+        result = run(child_command(cmd), capture_output=True, text=True)
 
         if result.returncode != 0:
             raise RuntimeError(f"Failed to generate icebreaker: {result.stderr}")
@@ -308,34 +489,39 @@ class AllInOneWorkflow:
         return Path(company_path) / f"icebreaker_{company_name}_{role_name}.md"
 
     def _extract_top_keywords(self, keywords_file: Path) -> list:
-        """Extract top keywords from keywords extraction output."""
+        """
+        Top technical keywords from step 3, highest ranked first.
+
+        Reads the typed analysis from the sidecar; a keywords file without a
+        valid sidecar (older runs, edited by hand) is parsed for the
+        "## TECHNICAL SKILLS" section instead.
+        """
+        import artifact_sidecar
+
+        defaults = ["产品设计", "需求分析", "项目管理"]
         keywords = []
 
         try:
-            with open(keywords_file, 'r', encoding='utf-8') as f:
-                content = f.read()
-
-            # Simple extraction: look for lines that start with "- " in technical skills section
-            in_tech_section = False
-            for line in content.split('\n'):
-                if 'Technical Skills' in line or '技术技能' in line:
-                    in_tech_section = True
+            document = artifact_sidecar.read(keywords_file, "extract_keywords")
+        except (OSError, ValueError):
+            return defaults
+
+        # Ranked keywords: [keyword, category, mentions, score], highest score first
+        ranked = document["data"].get("ranked_keywords")
+        if isinstance(ranked, list):
+            keywords = [entry[0] for entry in ranked]
+        else:
+            for section in document["sections"]:
+                top = section["path"].split(" > ")[0].strip().lower()
+                if top not in ("technical skills", "技术技能"):
                     continue
-                if in_tech_section and line.strip().startswith('-'):
-                    # Extract keyword (remove "- " and any trailing notes)
-                    keyword = line.strip()[2:].split('(')[0].split('：')[0].strip()
-                    if keyword:
-                        keywords.append(keyword)
-                    if len(keywords) >= 5:
-                        break
-                elif in_tech_section and not line.strip():
-                    break
-        except Exception:
-            # Fallback keywords
-            keywords = ["产品设计", "需求分析", "项目管理"]
-
-        return keywords if keywords else ["产品设计", "需求分析", "项目管理"]
+                for line in section["text"].splitlines():
+                    if line.strip().startswith("- "):
+                        keyword = line.strip()[2:].split('(')[0].split('：')[0].strip()
+                        if keyword:
+                            keywords.append(keyword)
 
+        return keywords[:5] if keywords else defaults
 
 def main():
     """Main CLI entry point."""
@@ -360,6 +546,13 @@ Optional Arguments:
   --achievement <text>        Top achievement for icebreaker
   --years <number>            Years of relevant experience
   --insight <text>            Industry insight for icebreaker strategy B
+  --resume-run                Continue an interrupted run: skip steps recorded in
+                              run_manifest_<role>.json whose outputs are unchanged
+  --no-trace                  Do not write trace_<role>.json
+  --profile                   cProfile the run (writes all_in_one*.prof into the company folder)
+  --profile-memory            tracemalloc the run (writes all_in_one*.memory.txt)
+  --profile-target <step>     Only profile one step: setup_folder, save_jd, extract_keywords,
+                              generate_analysis, generate_strategy, generate_icebreaker
 
 Examples:
   # Basic usage
@@ -394,7 +587,7 @@ Output:
         print(f"Unknown command: {command}")
         sys.exit(1)
 
-    # Parse arguments
+    # Parse arguments (flags: --resume-run, --no-trace, --profile, --profile-memory)
     args = {}
     i = 2
     while i < len(sys.argv):
@@ -416,6 +609,14 @@ Output:
         print(f"❌ Missing required arguments: {', '.join(missing)}")
         sys.exit(1)
 
+    profile_target = args.get("profile-target")
+    if profile_target is not None and profile_target not in PROFILE_TARGETS:
+        print(f"❌ Unknown profile target: {profile_target} (choose from {', '.join(PROFILE_TARGETS)})")
+        sys.exit(1)
+    import profiling
+
+    profiler = profiling.from_flags("profile" in args, "profile-memory" in args, profile_target, "all_in_one")
+
     try:
         # Read JD file
         with open(args["jd-file"], 'r', encoding='utf-8') as f:
@@ -428,19 +629,23 @@ Output:
                 resume_content = f.read()
 
         # Initialize workflow
-        workflow = AllInOneWorkflow(args["base-path"])
+        workflow = AllInOneWorkflow(args["base-path"], trace="no-trace" not in args)
 
         # Execute workflow
-        results = workflow.execute(
-            company_name=args["company"],
-            role_name=args["role"],
-            jd_text=jd_text,
-            resume_version=args["resume-version"],
-            resume_content=resume_content,
-            top_achievement=args.get("achievement"),
-            years_experience=int(args["years"]) if "years" in args else None,
-            industry_insight=args.get("insight")
-        )
+        with profiling.activate(profiler):
+            results = workflow.execute(
+                company_name=args["company"],
+                role_name=args["role"],
+                jd_text=jd_text,
+                resume_version=args["resume-version"],
+                resume_content=resume_content,
+                top_achievement=args.get("achievement"),
+                years_experience=int(args["years"]) if "years" in args else None,
+                industry_insight=args.get("insight"),
+                resume_run="resume-run" in args
+            )
+        if profiler:
+            profiler.write(results["company_path"])
 
         # Print success summary
         print(f"\n🎉 完成！所有文件已生成。")
@@ -450,6 +655,10 @@ Output:
         print(f"  3. 查看面试策略: {Path(results['files']['interview_strategy']).name}")
         print(f"  4. 查看破冰文案: {Path(results['files']['icebreaker']).name}")
 
+    except KeyboardInterrupt:
+        print("\n⚠️  Interrupted (completed steps are in run_manifest_<role>.json; rerun with --resume-run to continue)",
+              file=sys.stderr)
+        sys.exit(1)
     except KeyError as e:
         print(f"❌ Missing required argument: {e}", file=sys.stderr)
         sys.exit(1)
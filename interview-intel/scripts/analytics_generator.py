@@ -13,6 +13,11 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from state_io import read_json, write_json
+from template_engine import render as render_template
+
 
 class AnalyticsGenerator:
     """Generates analytics from interview tracking data."""
@@ -36,30 +41,52 @@ class AnalyticsGenerator:
         self.resume_registry_path = self.base_path / "resumes" / "resume_registry.json"
         self.resume_registry = self._load_resume_registry()
 
+        # Caches for long-lived instances (daemon mode); tracking entries are
+        # validated by mtime, the folder list is reset via invalidate_cache()
+        self._company_folders_cache: Optional[List[Path]] = None
+        self._tracking_cache: Dict[str, Any] = {}
+
+    def invalidate_cache(self):
+        """Forget the cached company folder scan and resume registry."""
+        self._company_folders_cache = None
+        self.resume_registry = self._load_resume_registry()
+
     def _load_resume_registry(self) -> Dict[str, Any]:
         """Load resume registry."""
-        if self.resume_registry_path.exists():
-            with open(self.resume_registry_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return {"versions": [], "tailored_versions": []}
+        return read_json(self.resume_registry_path, default={"versions": [], "tailored_versions": []})
 
     def _get_all_company_folders(self) -> List[Path]:
         """Get all company folders in the base path."""
+        if self._company_folders_cache is not None:
+            return list(self._company_folders_cache)
+
         companies = []
         for item in self.base_path.iterdir():
             if item.is_dir() and not item.name.startswith('.') and item.name not in ['resumes', 'interview-intel']:
                 # Check if it has an interviews folder
                 if (item / "interviews").exists():
                     companies.append(item)
-        return companies
+
+        self._company_folders_cache = companies
+        return list(companies)
 
     def _load_company_tracking(self, company_path: Path) -> Optional[Dict[str, Any]]:
         """Load tracking data for a company."""
         tracking_path = company_path / "interviews" / "tracking.json"
-        if tracking_path.exists():
-            with open(tracking_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        return None
+        try:
+            stat = tracking_path.stat()
+        except FileNotFoundError:
+            self._tracking_cache.pop(str(tracking_path), None)
+            return None
+
+        signature = (stat.st_mtime_ns, stat.st_size)
+        cached = self._tracking_cache.get(str(tracking_path))
+        if cached and cached[0] == signature:
+            return cached[1]
+
+        tracking = read_json(tracking_path)
+        self._tracking_cache[str(tracking_path)] = (signature, tracking)
+        return tracking
 
     def generate_global_stats(self) -> Dict[str, Any]:
         """Generate global statistics across all companies."""
@@ -222,8 +249,7 @@ class AnalyticsGenerator:
 
         # Save to file
         output_path = self.analytics_path / "global_stats.json"
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(stats, f, indent=2, ensure_ascii=False)
+        write_json(output_path, stats)
 
         return stats
 
@@ -323,259 +349,20 @@ class AnalyticsGenerator:
         """Generate HTML dashboard with visualizations."""
         stats = self.generate_global_stats()
 
-        html = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>Interview Intel Dashboard</title>
-    <script src="https://cdn.jsdelivr.net/npm/chart.js@4.4.0/dist/chart.umd.min.js"></script>
-    <style>
-        * {{
-            margin: 0;
-            padding: 0;
-            box-sizing: border-box;
-        }}
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
-            background: #f5f7fa;
-            padding: 20px;
-            color: #333;
-        }}
-        .container {{
-            max-width: 1400px;
-            margin: 0 auto;
-        }}
-        header {{
-            background: white;
-            padding: 30px;
-            border-radius: 10px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-            margin-bottom: 30px;
-        }}
-        h1 {{
-            font-size: 32px;
-            color: #2c3e50;
-            margin-bottom: 10px;
-        }}
-        .subtitle {{
-            color: #7f8c8d;
-            font-size: 14px;
-        }}
-        .stats-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(250px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }}
-        .stat-card {{
-            background: white;
-            padding: 25px;
-            border-radius: 10px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        }}
-        .stat-label {{
-            font-size: 14px;
-            color: #7f8c8d;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-            margin-bottom: 10px;
-        }}
-        .stat-value {{
-            font-size: 36px;
-            font-weight: bold;
-            color: #2c3e50;
-        }}
-        .stat-value.success {{
-            color: #27ae60;
-        }}
-        .stat-value.warning {{
-            color: #f39c12;
-        }}
-        .stat-value.info {{
-            color: #3498db;
-        }}
-        .charts-grid {{
-            display: grid;
-            grid-template-columns: repeat(auto-fit, minmax(400px, 1fr));
-            gap: 20px;
-            margin-bottom: 30px;
-        }}
-        .chart-card {{
-            background: white;
-            padding: 25px;
-            border-radius: 10px;
-            box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-        }}
-        .chart-title {{
-            font-size: 18px;
-            font-weight: 600;
-            color: #2c3e50;
-            margin-bottom: 20px;
-        }}
-        canvas {{
-            max-height: 300px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <header>
-            <h1>📊 Interview Intel Dashboard</h1>
-            <p class="subtitle">Generated: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}</p>
-        </header>
-
-        <div class="stats-grid">
-            <div class="stat-card">
-                <div class="stat-label">Total Applications</div>
-                <div class="stat-value info">{stats["summary"]["total_applications"]}</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label">Response Rate</div>
-                <div class="stat-value">{stats["summary"]["response_rate"]:.1%}</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label">Total Interviews</div>
-                <div class="stat-value">{stats["summary"]["total_interviews_completed"]}</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label">Interview Pass Rate</div>
-                <div class="stat-value success">{stats["interview_performance"]["pass_rate"]:.1%}</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label">Offers Received</div>
-                <div class="stat-value success">{stats["summary"]["total_offers"]}</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label">Offer Rate</div>
-                <div class="stat-value success">{stats["summary"]["offer_rate"]:.1%}</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label">Active Processes</div>
-                <div class="stat-value warning">{stats["summary"]["active_processes"]}</div>
-            </div>
-            <div class="stat-card">
-                <div class="stat-label">Avg Difficulty</div>
-                <div class="stat-value">{stats["interview_performance"]["average_difficulty"]:.1f}/5</div>
-            </div>
-        </div>
-
-        <div class="charts-grid">
-            <div class="chart-card">
-                <h3 class="chart-title">Applications by Status</h3>
-                <canvas id="statusChart"></canvas>
-            </div>
-            <div class="chart-card">
-                <h3 class="chart-title">Resume Version Performance</h3>
-                <canvas id="resumeChart"></canvas>
-            </div>
-            <div class="chart-card">
-                <h3 class="chart-title">Interview Pass Rate</h3>
-                <canvas id="passRateChart"></canvas>
-            </div>
-            <div class="chart-card">
-                <h3 class="chart-title">Applications by Position Type</h3>
-                <canvas id="positionChart"></canvas>
-            </div>
-        </div>
-    </div>
-
-    <script>
-        // Status Chart
-        new Chart(document.getElementById('statusChart'), {{
-            type: 'doughnut',
-            data: {{
-                labels: ['Active', 'Offers', 'Rejected', 'Withdrawn'],
-                datasets: [{{
-                    data: [
-                        {stats["summary"]["active_processes"]},
-                        {stats["summary"]["total_offers"]},
-                        {stats["summary"]["rejected"]},
-                        {stats["summary"]["withdrawn"]}
-                    ],
-                    backgroundColor: ['#f39c12', '#27ae60', '#e74c3c', '#95a5a6']
-                }}]
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: true
-            }}
-        }});
-
-        // Resume Version Chart
-        new Chart(document.getElementById('resumeChart'), {{
-            type: 'bar',
-            data: {{
-                labels: {json.dumps(list(stats["by_resume_version"].keys()))},
-                datasets: [{{
-                    label: 'Applications',
-                    data: {json.dumps([v["applications"] for v in stats["by_resume_version"].values()])},
-                    backgroundColor: '#3498db'
-                }}, {{
-                    label: 'Interviews',
-                    data: {json.dumps([v["interviews"] for v in stats["by_resume_version"].values()])},
-                    backgroundColor: '#9b59b6'
-                }}, {{
-                    label: 'Offers',
-                    data: {json.dumps([v["offers"] for v in stats["by_resume_version"].values()])},
-                    backgroundColor: '#27ae60'
-                }}]
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: true,
-                scales: {{
-                    y: {{
-                        beginAtZero: true
-                    }}
-                }}
-            }}
-        }});
-
-        // Pass Rate Chart
-        new Chart(document.getElementById('passRateChart'), {{
-            type: 'pie',
-            data: {{
-                labels: ['Passed', 'Failed'],
-                datasets: [{{
-                    data: [
-                        {stats["interview_performance"]["passed"]},
-                        {stats["interview_performance"]["failed"]}
-                    ],
-                    backgroundColor: ['#27ae60', '#e74c3c']
-                }}]
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: true
-            }}
-        }});
-
-        // Position Type Chart
-        new Chart(document.getElementById('positionChart'), {{
-            type: 'bar',
-            data: {{
-                labels: {json.dumps(list(stats["by_position_type"].keys()))},
-                datasets: [{{
-                    label: 'Applications',
-                    data: {json.dumps([v["applications"] for v in stats["by_position_type"].values()])},
-                    backgroundColor: '#3498db'
-                }}]
-            }},
-            options: {{
-                responsive: true,
-                maintainAspectRatio: true,
-                indexAxis: 'y',
-                scales: {{
-                    x: {{
-                        beginAtZero: true
-                    }}
-                }}
-            }}
-        }});
-    </script>
-</body>
-</html>"""
+        by_resume = stats["by_resume_version"]
+        by_position = stats["by_position_type"]
+        html = render_template("analytics_dashboard.html", {
+            "stats": stats,
+            "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "charts": {
+                "resume_versions": list(by_resume.keys()),
+                "resume_applications": [v["applications"] for v in by_resume.values()],
+                "resume_interviews": [v["interviews"] for v in by_resume.values()],
+                "resume_offers": [v["offers"] for v in by_resume.values()],
+                "position_types": list(by_position.keys()),
+                "position_applications": [v["applications"] for v in by_position.values()]
+            }
+        })
 
         output_path = self.exports_path / output_file
         with open(output_path, 'w', encoding='utf-8') as f:
@@ -595,6 +382,9 @@ def main():
         print("  python analytics_generator.py generate [--scope global|company] [--company <name>]")
         print("  python analytics_generator.py export --format csv --output <filename>")
         print("  python analytics_generator.py dashboard --output <filename.html>")
+        print("\nOptions:")
+        print("  --profile          cProfile the command (writes analytics.prof)")
+        print("  --profile-memory   tracemalloc the command (writes analytics.memory.txt)")
         print("\nExamples:")
         print('  python analytics_generator.py generate --scope global')
         print('  python analytics_generator.py generate --scope company --company SIF')
@@ -605,9 +395,6 @@ def main():
     # Determine base path
     base_path = os.getcwd()
 
-    # Initialize generator
-    generator = AnalyticsGenerator(base_path)
-
     command = sys.argv[1]
 
     # Parse arguments
@@ -625,50 +412,72 @@ def main():
         else:
             i += 1
 
+    import profiling
+    from daemon_client import try_call
+
+    # --profile / --profile-memory always run locally
+    profiler = profiling.from_flags("profile" in args, "profile-memory" in args, label="analytics")
+
+    def call_daemon(method, params):
+        return (False, None) if profiler else try_call(method, params)
+
     try:
-        if command == "generate":
-            scope = args.get("scope", "global")
-
-            if scope == "global":
-                stats = generator.generate_global_stats()
-                print("\n📊 Global Statistics Generated\n")
-                print(f"Total Applications: {stats['summary']['total_applications']}")
-                print(f"Response Rate: {stats['summary']['response_rate']:.1%}")
-                print(f"Interview Pass Rate: {stats['interview_performance']['pass_rate']:.1%}")
-                print(f"Offers: {stats['summary']['total_offers']}")
-                print(f"\n✅ Saved to .analytics/global_stats.json")
-
-            elif scope == "company":
-                company = args.get("company")
-                if not company:
-                    print("Error: --company required for company scope")
-                    sys.exit(1)
-
-                stats = generator.generate_company_stats(company)
-                if "error" in stats:
-                    print(f"❌ {stats['error']}")
-                else:
-                    print(f"\n📊 Statistics for {stats['company']}\n")
-                    print(f"Role: {stats['role']}")
-                    print(f"Status: {stats['overall_status']}")
-                    print(f"Total Rounds: {stats['total_rounds']}")
-                    print(f"Pass Rate: {stats['pass_rate']:.1%}")
-                    print(json.dumps(stats, indent=2))
-
-        elif command == "export":
-            format_type = args.get("format", "csv")
-            output = args.get("output", "interview_data.csv")
-
-            if format_type == "csv":
-                generator.export_to_csv(output)
-
-        elif command == "dashboard":
-            output = args.get("output", "dashboard.html")
-            generator.generate_html_dashboard(output)
+        with profiling.activate(profiler):
+            if command == "generate":
+                scope = args.get("scope", "global")
+
+                if scope == "global":
+                    handled, stats = call_daemon("analytics.global", {"base_path": base_path})
+                    if not handled:
+                        stats = AnalyticsGenerator(base_path).generate_global_stats()
+                    print("\n📊 Global Statistics Generated\n")
+                    print(f"Total Applications: {stats['summary']['total_applications']}")
+                    print(f"Response Rate: {stats['summary']['response_rate']:.1%}")
+                    print(f"Interview Pass Rate: {stats['interview_performance']['pass_rate']:.1%}")
+                    print(f"Offers: {stats['summary']['total_offers']}")
+                    print(f"\n✅ Saved to .analytics/global_stats.json")
+
+                elif scope == "company":
+                    company = args.get("company")
+                    if not company:
+                        print("Error: --company required for company scope")
+                        sys.exit(1)
+
+                    handled, stats = call_daemon("analytics.company", {"base_path": base_path, "company": company})
+                    if not handled:
+                        stats = AnalyticsGenerator(base_path).generate_company_stats(company)
+                    if "error" in stats:
+                        print(f"❌ {stats['error']}")
+                    else:
+                        print(f"\n📊 Statistics for {stats['company']}\n")
+                        print(f"Role: {stats['role']}")
+                        print(f"Status: {stats['overall_status']}")
+                        print(f"Total Rounds: {stats['total_rounds']}")
+                        print(f"Pass Rate: {stats['pass_rate']:.1%}")
+                        print(json.dumps(stats, indent=2))
+
+            elif command == "export":
+                format_type = args.get("format", "csv")
+                output = args.get("output", "interview_data.csv")
+
+                if format_type == "csv":
+                    AnalyticsGenerator(base_path).export_to_csv(output)
+
+            elif command == "dashboard":
+                output = args.get("output", "dashboard.html")
+                AnalyticsGenerator(base_path).generate_html_dashboard(output)
 
-        else:
-            print(f"Unknown command: {command}")
-            sys.exit(1)
+            else:
+                print(f"Unknown command: {command}")
+                sys.exit(1)
+
+        if profiler:
+            # Reports go next to the command's output
+            output = args.get("output")
+            if command in ("export", "dashboard") and isinstance(output, str):
+                profiler.write(Path(output).resolve().parent)
+            else:
+                profiler.write(Path(base_path) / ".analytics")
 
     except Exception as e:
         print(f"❌ Error: {e}", file=sys.stderr)
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+产物结构化副本 - 每个 Markdown 产物旁的 JSON (<文件名>.json)
+
+队友文档 (01-05) 和一键工作流各步骤的输出写出时，同时写出一份结构化副本:
+标题树、各节正文、剩余的 [待 AI 生成] 占位，以及生成该产物的步骤给出的
+类型化数据 (如关键词提取结果)。下游 (队友 C/D/E 的提示词、包质量检查、
+破冰文案的关键词) 直接读取副本，不再逐行解析 Markdown。
+
+格式 (SCHEMA_VERSION 1，紧凑 JSON):
+
+    {
+      "schema": "interview-intel/artifact", "version": 1,
+      "kind": "teammate_c",                       # 生成者 (队友 ID / 工作流步骤)
+      "source": {"file": "03_interview_prep_report.md", "bytes": 5120,
+                 "hash": "<16 位 sha256>", "mtime_ns": 1760000000000000000},
+      "title": "面试准备报告",                     # 第一个一级标题
+      "sections": [{"level": 2, "title": "HR 面试", "path": "面试准备报告 > HR 面试",
+                    "line": 12, "text": "..."}],  # level 0 为第一个标题之前的正文
+      "placeholders": [{"line": 20, "section": "...", "hint": "生成: ..."}],
+      "data": {...}                               # 步骤自定义的类型化数据
+    }
+
+副本记录源文件的大小和 mtime，源文件被改写 (手工编辑、旧版本重新生成)
+后副本视为过期，load() 返回 None，调用方回退到解析 Markdown (parse_file)。
+
+用法:
+    python artifact_sidecar.py companies/阿里云-产品经理-张三/*.md     # 补写副本 (旧的包)
+    python artifact_sidecar.py companies/*/0*_*.md --check             # 检查副本是否有效、未过期
+"""
+
+import sys
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from state_io import atomic_write_json
+from tracing import inputs_hash, span
+
+SCHEMA = "interview-intel/artifact"
+SCHEMA_VERSION = 1
+
+# 顶层字段及类型
+FIELDS = {
+    "schema": str,
+    "version": int,
+    "kind": str,
+    "source": dict,
+    "title": str,
+    "sections": list,
+    "placeholders": list,
+    "data": dict
+}
+SECTION_FIELDS = {"level": int, "title": str, "path": str, "line": int, "text": str}
+PLACEHOLDER_FIELDS = {"line": int, "section": str, "hint": str}
+
+
+class SidecarError(ValueError):
+    """副本不符合格式"""
+
+
+def sidecar_path(path: Path) -> Path:
+    """产物的副本路径 (03_interview_prep_report.md -> 03_interview_prep_report.md.json)"""
+    path = Path(path)
+    return path.with_name(path.name + ".json")
+
+
+def parse_markdown(lines: Iterable[str]) -> Dict[str, Any]:
+    """
+    逐行解析一遍 Markdown
+
+    代码块中的 # 行不算标题；# 后必须有空白。
+
+    Returns:
+        {"bytes", "title", "sections": [...], "placeholders": [...]} (字段同副本)
+    """
+    from generation_backend import PLACEHOLDER
+
+    size = 0
+    title = ""
+    sections: List[Dict[str, Any]] = []
+    placeholders: List[Dict[str, Any]] = []
+    # 当前标题路径 [(级别, 标题)] 与当前节的正文行
+    trail: List = []
+    current = {"level": 0, "title": "", "path": "", "line": 0}
+    body: List[str] = []
+    in_code = False
+
+    def close():
+        text = "".join(body).strip()
+        if current["level"] or text:
+            sections.append({**current, "text": text})
+
+    for number, line in enumerate(lines, 1):
+        size += len(line.encode("utf-8"))
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            in_code = not in_code
+        elif not in_code and stripped.startswith("#"):
+            level = len(stripped) - len(stripped.lstrip("#"))
+            heading = stripped[level:].strip()
+            if level <= 6 and heading and stripped[level:level + 1].isspace():
+                close()
+                while trail and trail[-1][0] >= level:
+                    trail.pop()
+                trail.append((level, heading))
+                if level == 1 and not title:
+                    title = heading
+                current = {"level": level, "title": heading,
+                           "path": " > ".join(name for _, name in trail), "line": number}
+                body = []
+                continue
+        if not in_code and "待 AI" in line:
+            for match in PLACEHOLDER.finditer(line):
+                placeholders.append({"line": number, "section": current["path"], "hint": match.group(1).strip()})
+        body.append(line)
+    close()
+    return {"bytes": size, "title": title, "sections": sections, "placeholders": placeholders}
+
+
+def build(name: str, content: str, kind: str, data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    由产物内容构造副本
+
+    Args:
+        name: 产物文件名
+        content: 产物内容
+        kind: 生成者 (队友 ID / 工作流步骤)
+        data: 类型化数据 (可 JSON 序列化)
+    """
+    parsed = parse_markdown(content.splitlines(True))
+    return {
+        "schema": SCHEMA,
+        "version": SCHEMA_VERSION,
+        "kind": kind,
+        "source": {"file": name, "bytes": parsed["bytes"], "hash": inputs_hash(content), "mtime_ns": 0},
+        "title": parsed["title"],
+        "sections": parsed["sections"],
+        "placeholders": parsed["placeholders"],
+        "data": data or {}
+    }
+
+
+def check(document: Any) -> Dict[str, Any]:
+    """
+    按格式检查副本
+
+    Raises:
+        SidecarError: 缺少字段、类型不符或版本不支持
+    """
+    def fields(value: Any, spec: Dict[str, type], where: str):
+        if not isinstance(value, dict):
+            raise SidecarError(f"{where}: 应为对象")
+        for name, kind in spec.items():
+            if not isinstance(value.get(name), kind):
+                raise SidecarError(f"{where}.{name}: 应为 {kind.__name__}")
+
+    fields(document, FIELDS, "sidecar")
+    if document["schema"] != SCHEMA or document["version"] != SCHEMA_VERSION:
+        raise SidecarError(f"不支持的格式: {document['schema']} v{document['version']}")
+    fields(document["source"], {"file": str, "bytes": int, "hash": str, "mtime_ns": int}, "source")
+    for index, section in enumerate(document["sections"]):
+        fields(section, SECTION_FIELDS, f"sections[{index}]")
+    for index, placeholder in enumerate(document["placeholders"]):
+        fields(placeholder, PLACEHOLDER_FIELDS, f"placeholders[{index}]")
+    return document
+
+
+def write(path: Path, document: Dict[str, Any]) -> Path:
+    """在产物 path 写出之后写出其副本 (记录 path 当前的大小和 mtime)"""
+    path = Path(path)
+    stat = path.stat()
+    source = {**document["source"], "mtime_ns": stat.st_mtime_ns}
+    if stat.st_size != source["bytes"]:
+        # 产物已被改写，不写出过期的副本
+        raise SidecarError(f"{path.name}: 大小 {stat.st_size} 与副本 {source['bytes']} 不一致")
+    target = sidecar_path(path)
+    with span(f"write {target.name}", "io", path=str(target)):
+        atomic_write_json(target, {**document, "source": source}, indent=None)
+    return target
+
+
+def load(path: Path) -> Optional[Dict[str, Any]]:
+    """
+    产物 path 的副本; 没有副本、副本无效或产物在写出副本后被改写时返回 None
+
+    只比较产物的大小和 mtime，不读取产物内容。
+    """
+    path = Path(path)
+    try:
+        stat = path.stat()
+        with open(sidecar_path(path), 'r', encoding='utf-8') as f:
+            document = check(json.load(f))
+    except (OSError, ValueError):
+        return None
+    source = document["source"]
+    if source["bytes"] != stat.st_size or source["mtime_ns"] != stat.st_mtime_ns:
+        return None
+    return document
+
+
+def parse_file(path: Path, kind: str = "", data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    解析产物文件得到副本 (不写出)
+
+    Raises:
+        FileNotFoundError: 产物不存在
+    """
+    path = Path(path)
+    with span(f"parse {path.name}", "io", path=str(path)):
+        # 保留换行符原样，字节数与文件大小一致
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+    return build(path.name, content, kind, data)
+
+
+def read(path: Path, kind: str = "") -> Dict[str, Any]:
+    """有效的副本，否则解析产物文件"""
+    return load(path) or parse_file(path, kind)
+
+
+def ensure(path: Path, kind: str = "", data: Optional[Dict[str, Any]] = None) -> Path:
+    """产物没有有效副本时解析并写出 (已有有效副本时保持不变)"""
+    if load(path) is None:
+        write(path, parse_file(path, kind, data))
+    return sidecar_path(path)
+
+
+def digest(document: Dict[str, Any]) -> str:
+    """
+    供提示词使用的文档正文: 各节标题和正文，去掉未生成的占位行
+
+    下游队友的提示词只需要上游文档已有的内容，占位行只会浪费 token。
+    """
+    from generation_backend import PLACEHOLDER
+
+    lines = []
+    for section in document["sections"]:
+        if section["level"]:
+            lines.append("#" * section["level"] + " " + section["title"])
+        for line in section["text"].splitlines():
+            if "待 AI" in line and not PLACEHOLDER.sub("", line).strip(" \t-*|:：>"):
+                continue
+            if line.strip() or (lines and lines[-1].strip()):
+                lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def select(document: Dict[str, Any], titles: Iterable[str]) -> Dict[str, Any]:
+    """
+    只保留指定章节 (含其子节) 的副本，供只依赖上游部分章节的提示词使用
+
+    标题去掉空白后比较；一节都匹配不到时 (文档结构被手工改过) 返回原副本。
+    """
+    wanted = {"".join(title.split()) for title in titles}
+    sections = [section for section in document["sections"]
+                if wanted & {"".join(name.split()) for name in section["path"].split(" > ")}]
+    return {**document, "sections": sections} if sections else document
+
+
+def main():
+    """CLI: 为已有产物补写副本，或检查副本"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="产物结构化副本 (<文件名>.json)")
+    parser.add_argument("paths", nargs="+", help="Markdown / 文本产物")
+    parser.add_argument("--check", action="store_true", help="只检查副本是否有效、未过期")
+    args = parser.parse_args()
+
+    failed = 0
+    for value in args.paths:
+        path = Path(value)
+        if args.check:
+            ok = load(path) is not None
+            failed += not ok
+            print(f"{'✅' if ok else '❌'} {sidecar_path(path)}")
+            continue
+        try:
+            print(f"📝 {ensure(path)}")
+        except (OSError, SidecarError) as e:
+            failed += 1
+            print(f"❌ {path}: {e}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
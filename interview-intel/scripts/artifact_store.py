@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+产物仓库 - 队友之间在内存中传递文档
+
+队友写出的文档 (01_*.md ... 05_*.md) 以不可变字符串保存在内存中，下游队友
+直接取用，不再扫描目录、重新读取刚写出的文件。写盘在后台线程中异步完成
+(写后即返回)，put() 返回的 Future 在文件落盘后完成；flush() 等待全部写入。
+
+put() 可同时给出产物的结构化副本 (artifact_sidecar)，副本同样保存在内存中
+(sidecar() 取用)，并在文档落盘后写到文档旁。
+
+文档以原子替换写出 (临时文件 + rename)，读者不会看到写了一半的文档。流式
+生成时边生成边写入的是 partial_path() 临时文件，最终文档落盘后将其删除，
+因此文档本身只写一次。
+
+内存中没有的产物 (增量重跑、断点续跑时上一次运行的输出) 由调用方回退到磁盘读取。
+批量运行时每个包结束后调用 drop() 释放其产物。
+"""
+
+import threading
+import contextvars
+import concurrent.futures
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import artifact_sidecar
+from tracing import write_text
+
+
+def _key(path: Path) -> str:
+    return str(Path(path).resolve())
+
+
+def partial_path(path: Path) -> Path:
+    """流式生成过程中的临时文件 (.<文件名>.partial，文档落盘后删除)"""
+    path = Path(path)
+    return path.with_name(f".{path.name}.partial")
+
+
+class ArtifactStore:
+    """线程安全的内存产物表 + 异步写盘"""
+
+    def __init__(self, max_writers: int = 4):
+        """
+        Args:
+            max_writers: 后台写盘线程数
+        """
+        self.max_writers = max_writers
+        self._artifacts: Dict[str, str] = {}
+        self._sidecars: Dict[str, Dict[str, Any]] = {}
+        self._pending: Dict[str, concurrent.futures.Future] = {}
+        self._lock = threading.Lock()
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    def _writer(self) -> concurrent.futures.ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_writers, thread_name_prefix="artifact-writer")
+            return self._executor
+
+    def put(self, path: Path, content: str, sidecar: Optional[Dict[str, Any]] = None) -> concurrent.futures.Future:
+        """
+        保存产物并在后台写盘
+
+        写盘在调用方上下文的副本中执行，因此 write span 记录在当前 trace 中。
+
+        Args:
+            sidecar: 产物的结构化副本 (artifact_sidecar.build)，文档落盘后写出
+
+        Returns:
+            写盘完成 (结果为写入字节数) 或失败时完成的 Future
+        """
+        key = _key(path)
+        context = contextvars.copy_context()
+        with self._lock:
+            self._artifacts[key] = content
+            if sidecar is not None:
+                self._sidecars[key] = sidecar
+            else:
+                self._sidecars.pop(key, None)
+            previous = self._pending.get(key)
+
+        def write() -> int:
+            # 同一路径的写入按提交顺序落盘
+            if previous is not None:
+                concurrent.futures.wait([previous])
+            written = context.run(write_text, Path(path), content, atomic=True)
+            if sidecar is not None:
+                context.run(artifact_sidecar.write, Path(path), sidecar)
+            try:
+                partial_path(path).unlink()
+            except FileNotFoundError:
+                pass
+            return written
+
+        future = self._writer().submit(write)
+        with self._lock:
+            self._pending[key] = future
+        future.add_done_callback(lambda done: self._written(key, done))
+        return future
+
+    def _written(self, key: str, future: concurrent.futures.Future):
+        with self._lock:
+            if self._pending.get(key) is future:
+                del self._pending[key]
+
+    def get(self, path: Path) -> Optional[str]:
+        """内存中的产物内容; 没有时返回 None"""
+        with self._lock:
+            return self._artifacts.get(_key(path))
+
+    def sidecar(self, path: Path) -> Optional[Dict[str, Any]]:
+        """内存中的产物副本; 没有时返回 None"""
+        with self._lock:
+            return self._sidecars.get(_key(path))
+
+    def written(self, path: Path) -> concurrent.futures.Future:
+        """path 最近一次写盘的 Future (没有待写入时返回已完成的 Future)"""
+        with self._lock:
+            future = self._pending.get(_key(path))
+        if future is None:
+            future = concurrent.futures.Future()
+            future.set_result(0)
+        return future
+
+    def flush(self) -> List[BaseException]:
+        """等待全部待写入完成，返回写盘失败的异常"""
+        with self._lock:
+            pending = list(self._pending.values())
+        done, _ = concurrent.futures.wait(pending)
+        return [future.exception() for future in done if future.exception() is not None]
+
+    def drop(self, directory: Path):
+        """释放 directory 下的全部产物 (不影响已提交的写盘)"""
+        prefix = _key(directory).rstrip("/") + "/"
+        with self._lock:
+            for key in [key for key in self._artifacts if key.startswith(prefix)]:
+                del self._artifacts[key]
+                self._sidecars.pop(key, None)
+
+    def close(self):
+        """等待写盘完成并关闭后台线程"""
+        self.flush()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._artifacts)
@@ -0,0 +1,411 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+性能基准测试 - 可复现的合成数据 + 各子系统计时
+
+生成固定随机种子的合成语料 (JD、含多页 PDF 的简历、面试追踪历史)，
+分别计时以下子系统，并写出机器可读的 JSON 结果，便于在不同提交之间比较:
+
+- pdf_extraction:     PipelineTeam._read_resume (pdfplumber)
+- keyword_extraction: extract_jd_keywords.analyze_jd
+- pipeline:           PipelineTeam.launch (完整 5 人流水线)
+- analytics:          AnalyticsGenerator.generate_global_stats
+- registry_ops:       ResumeManager 创建 / 列表 / 推荐 / 定制
+
+用法:
+  python benchmark_pipeline.py --scale small
+  python benchmark_pipeline.py --scale medium --output bench.json
+  python benchmark_pipeline.py --compare old.json new.json
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import random
+import shutil
+import platform
+import statistics
+import subprocess
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from extract_jd_keywords import TECH_KEYWORDS, SOFT_SKILLS, analyze_jd
+from pipeline_team import PipelineTeam
+from resume_manager import ResumeManager
+from analytics_generator import AnalyticsGenerator
+from interview_tracker import InterviewTracker
+
+
+# 数据规模预设
+SCALES = {
+    "small": {"jds": 20, "resumes": 3, "resume_pages": 2, "packets": 3, "companies": 20, "rounds": 4, "versions": 5},
+    "medium": {"jds": 200, "resumes": 10, "resume_pages": 4, "packets": 10, "companies": 200, "rounds": 6, "versions": 20},
+    "large": {"jds": 1000, "resumes": 20, "resume_pages": 8, "packets": 30, "companies": 1000, "rounds": 8, "versions": 50},
+}
+
+RESULT_SCHEMA_VERSION = 1
+
+
+# ========== 合成数据 ==========
+
+def _plain_keywords() -> List[str]:
+    """TECH_KEYWORDS 中的正则转义还原为普通文本"""
+    return [kw.replace("\\", "") for keywords in TECH_KEYWORDS.values() for kw in keywords]
+
+
+def synthetic_jd(rng: random.Random) -> str:
+    """生成一份中英混合的合成 JD"""
+    keywords = _plain_keywords()
+    lines = [f"职位名称：{rng.choice(['产品经理', 'AI产品经理', 'Backend Engineer', 'Data Engineer'])}", "", "职位描述："]
+    for i in range(rng.randint(4, 8)):
+        tech = ", ".join(rng.sample(keywords, 3))
+        lines.append(f"{i + 1}. Build and operate services with {tech}. "
+                     f"Strong {rng.choice(SOFT_SKILLS)} and {rng.choice(SOFT_SKILLS)} required.")
+    lines.append("")
+    lines.append("任职要求：")
+    lines.append(f"1. {rng.randint(2, 8)}+ years of experience with {rng.choice(keywords)} is required.")
+    lines.append(f"2. Experience with {rng.choice(keywords)} is a plus. Nice to have {rng.choice(keywords)}.")
+    lines.append(f"3. {rng.choice(['Senior', 'Staff', 'Lead'])} level ownership; must have {rng.choice(SOFT_SKILLS)}.")
+    return "\n".join(lines)
+
+
+def _pdf_escape(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def write_synthetic_pdf(path: Path, pages: List[List[str]]):
+    """
+    写出一个最小的多页 PDF (Helvetica, ASCII 文本)，无需第三方库
+
+    Args:
+        path: 输出路径
+        pages: 每页的文本行
+    """
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>"]
+    kids = " ".join(f"{3 + i * 2} 0 R" for i in range(len(pages)))
+    objects.append(f"<< /Type /Pages /Kids [{kids}] /Count {len(pages)} >>")
+    font_id = 3 + len(pages) * 2
+
+    for i, lines in enumerate(pages):
+        ops = ["BT", "/F1 10 Tf", "14 TL", "50 760 Td"]
+        ops.extend(f"({_pdf_escape(line)}) Tj T*" for line in lines)
+        ops.append("ET")
+        stream = "\n".join(ops)
+        objects.append(f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents {4 + i * 2} 0 R "
+                       f"/Resources << /Font << /F1 {font_id} 0 R >> >> >>")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out = "%PDF-1.4\n"
+    offsets = []
+    for num, obj in enumerate(objects, 1):
+        offsets.append(len(out))
+        out += f"{num} 0 obj\n{obj}\nendobj\n"
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    out += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    out += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n"
+
+    path.write_bytes(out.encode("latin-1"))
+
+
+def synthetic_resume_pages(rng: random.Random, num_pages: int) -> List[List[str]]:
+    """生成简历每页的文本行"""
+    keywords = _plain_keywords()
+    pages = []
+    for page in range(num_pages):
+        lines = [f"Candidate {rng.randint(1000, 9999)} - Page {page + 1}"]
+        for _ in range(40):
+            lines.append(f"- Led {rng.choice(keywords)} project, improved "
+                         f"{rng.choice(['latency', 'revenue', 'retention', 'cost'])} by {rng.randint(5, 80)}%")
+        pages.append(lines)
+    return pages
+
+
+def build_corpus(root: Path, scale: Dict[str, int], seed: int) -> Dict[str, object]:
+    """
+    在 root 下生成完整的合成语料
+
+    Returns:
+        语料路径和内容的索引
+    """
+    rng = random.Random(seed)
+
+    jds = [synthetic_jd(rng) for _ in range(scale["jds"])]
+
+    resumes_dir = root / "corpus_resumes"
+    resumes_dir.mkdir(parents=True)
+    resumes = []
+    for i in range(scale["resumes"]):
+        path = resumes_dir / f"resume_{i:03d}.pdf"
+        write_synthetic_pdf(path, synthetic_resume_pages(rng, scale["resume_pages"]))
+        resumes.append(path)
+
+    # 追踪历史: AnalyticsGenerator 扫描 base_path 下含 interviews/ 的公司目录
+    analytics_base = root / "analytics_workspace"
+    analytics_base.mkdir()
+    start_date = datetime(2026, 1, 1)
+    with redirect_stdout(io.StringIO()):
+        for i in range(scale["companies"]):
+            company_dir = analytics_base / f"company_{i:04d}"
+            tracker = InterviewTracker(str(company_dir))
+            app_date = start_date + timedelta(days=rng.randint(0, 90))
+            tracker.init_tracking(f"Company {i}", rng.choice(["PM", "Engineer", "Analyst"]),
+                                  f"v{rng.randint(1, 3)}.0", application_date=app_date.strftime("%Y-%m-%d"))
+            tracker.add_interview_rounds([
+                {"round_num": r, "round_name": f"Round {r}",
+                 "date": (app_date + timedelta(days=7 * r)).strftime("%Y-%m-%d")}
+                for r in range(1, rng.randint(1, scale["rounds"]) + 1)
+            ])
+            for r in range(1, len(tracker.tracking["interviews"]) + 1):
+                if rng.random() < 0.7:
+                    tracker.update_round(r, status="completed",
+                                         result=rng.choice(["passed", "passed", "failed"]),
+                                         difficulty=rng.randint(1, 5), confidence=rng.randint(1, 5))
+
+    return {"jds": jds, "resumes": resumes, "analytics_base": analytics_base}
+
+
+# ========== 计时 ==========
+
+def _time_runs(func: Callable[[], object], repeat: int) -> Dict[str, float]:
+    """运行 repeat 次并汇总耗时 (秒)"""
+    durations = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            func()
+        durations.append(time.perf_counter() - start)
+    return {
+        "runs": repeat,
+        "min_s": min(durations),
+        "median_s": statistics.median(durations),
+        "mean_s": statistics.fmean(durations),
+        "max_s": max(durations)
+    }
+
+
+def _with_items(timing: Dict[str, float], items: int) -> Dict[str, float]:
+    timing["items"] = items
+    timing["per_item_ms"] = timing["median_s"] / items * 1000 if items else 0.0
+    return timing
+
+
+def bench_pdf_extraction(corpus: Dict, root: Path, repeat: int) -> Dict:
+    try:
+        import pdfplumber  # noqa: F401
+    except ImportError:
+        return {"skipped": "pdfplumber 未安装"}
+
+    team = PipelineTeam(str(root))
+    resumes = corpus["resumes"]
+    return _with_items(_time_runs(lambda: [team._read_resume(str(p)) for p in resumes], repeat), len(resumes))
+
+
+def bench_keyword_extraction(corpus: Dict, root: Path, repeat: int) -> Dict:
+    jds = corpus["jds"]
+    return _with_items(_time_runs(lambda: [analyze_jd(jd) for jd in jds], repeat), len(jds))
+
+
+def bench_pipeline(corpus: Dict, root: Path, repeat: int, packets: int) -> Dict:
+    base = root / "pipeline_workspace"
+    jds = corpus["jds"]
+    resumes = corpus["resumes"]
+
+    def run():
+        if base.exists():
+            shutil.rmtree(base)
+        team = PipelineTeam(str(base))
+        for i in range(packets):
+            team.launch(f"Company{i}", "PM", f"Candidate{i}", jds[i % len(jds)], str(resumes[i % len(resumes)]))
+
+    return _with_items(_time_runs(run, repeat), packets)
+
+
+def bench_analytics(corpus: Dict, root: Path, repeat: int) -> Dict:
+    base = corpus["analytics_base"]
+    companies = sum(1 for _ in base.iterdir())
+    # 每次新建实例，测量冷扫描 (与 CLI 单次调用一致)
+    return _with_items(_time_runs(lambda: AnalyticsGenerator(str(base)).generate_global_stats(), repeat), companies)
+
+
+def bench_registry_ops(corpus: Dict, root: Path, repeat: int, versions: int) -> Dict:
+    base = root / "registry_workspace"
+    resume = corpus["resumes"][0]
+    tailored_dir = root / "registry_tailored"
+
+    def run():
+        for path in (base, tailored_dir):
+            if path.exists():
+                shutil.rmtree(path)
+        manager = ResumeManager(str(base))
+        for v in range(versions):
+            manager.create_version(str(resume), f"v{v}.0", "synthetic", ["PM", "Engineer"], ["Python", "SQL"])
+        manager.list_versions(filter_target="PM")
+        manager.recommend_version("PM", ["Python", "AWS"])
+        for v in range(versions):
+            manager.tailor_resume(f"v{v}.0", f"Company{v}", "PM", str(tailored_dir))
+        manager.get_usage_report()
+
+    return _with_items(_time_runs(run, repeat), versions * 2)
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=str(Path(__file__).parent),
+                                capture_output=True, text=True)
+        return result.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_benchmarks(scale_name: str = "small", seed: int = 42, repeat: int = 3,
+                   only: Optional[List[str]] = None, keep: bool = False) -> Dict:
+    """
+    生成语料并运行全部 (或指定) 基准
+
+    Args:
+        scale_name: small / medium / large
+        seed: 随机种子 (相同种子 → 相同语料)
+        repeat: 每项重复次数
+        only: 只运行这些基准
+        keep: 保留临时工作目录
+
+    Returns:
+        机器可读的结果字典
+    """
+    scale = SCALES[scale_name]
+    root = Path(tempfile.mkdtemp(prefix="interview-intel-bench-"))
+
+    benches = {
+        "pdf_extraction": lambda c: bench_pdf_extraction(c, root, repeat),
+        "keyword_extraction": lambda c: bench_keyword_extraction(c, root, repeat),
+        "pipeline": lambda c: bench_pipeline(c, root, repeat, scale["packets"]),
+        "analytics": lambda c: bench_analytics(c, root, repeat),
+        "registry_ops": lambda c: bench_registry_ops(c, root, repeat, scale["versions"]),
+    }
+
+    try:
+        corpus_start = time.perf_counter()
+        corpus = build_corpus(root, scale, seed)
+        corpus_time = time.perf_counter() - corpus_start
+
+        results = {}
+        for name, bench in benches.items():
+            if only and name not in only:
+                continue
+            print(f"⏱️  {name} ...", flush=True)
+            results[name] = bench(corpus)
+    finally:
+        if not keep:
+            shutil.rmtree(root, ignore_errors=True)
+
+    return {
+        "schema_version": RESULT_SCHEMA_VERSION,
+        "meta": {
+            "generated_at": datetime.now().isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "scale": scale_name,
+            "scale_params": scale,
+            "seed": seed,
+            "repeat": repeat,
+            "corpus_build_s": corpus_time,
+            "workdir": str(root) if keep else None
+        },
+        "results": results
+    }
+
+
+def compare_results(old: Dict, new: Dict, threshold: float = 0.10) -> List[Dict]:
+    """
+    比较两次结果的中位耗时
+
+    Args:
+        threshold: 超过该比例的变慢视为回归
+
+    Returns:
+        每项基准的对比行
+    """
+    rows = []
+    for name, new_result in new["results"].items():
+        old_result = old["results"].get(name)
+        if not old_result or "median_s" not in old_result or "median_s" not in new_result:
+            continue
+        change = (new_result["median_s"] - old_result["median_s"]) / old_result["median_s"]
+        rows.append({
+            "name": name,
+            "old_median_s": old_result["median_s"],
+            "new_median_s": new_result["median_s"],
+            "change": change,
+            "regression": change > threshold
+        })
+    return rows
+
+
+def print_results(report: Dict):
+    meta = report["meta"]
+    print()
+    print(f"📊 基准结果 (scale={meta['scale']}, seed={meta['seed']}, commit={meta['git_commit']})")
+    print("─" * 60)
+    for name, result in report["results"].items():
+        if "skipped" in result:
+            print(f"   ⏭️  {name:<20} 跳过: {result['skipped']}")
+        else:
+            print(f"   {name:<22} median {result['median_s'] * 1000:9.1f}ms "
+                  f"({result['per_item_ms']:.2f}ms × {result['items']})")
+
+
+def main():
+    """CLI 入口"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="性能基准测试 - 可复现的合成数据 + 各子系统计时")
+    parser.add_argument("--scale", choices=sorted(SCALES), default="small", help="数据规模 (默认: small)")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子 (默认: 42)")
+    parser.add_argument("--repeat", type=int, default=3, help="每项重复次数 (默认: 3)")
+    parser.add_argument("--only", action="append", help="只运行指定基准 (可重复)")
+    parser.add_argument("--output", help="结果 JSON 路径 (默认: bench_results/<时间>-<commit>.json)")
+    parser.add_argument("--keep", action="store_true", help="保留临时工作目录")
+    parser.add_argument("--compare", nargs=2, metavar=("OLD", "NEW"), help="比较两次结果 JSON")
+    parser.add_argument("--threshold", type=float, default=0.10, help="回归阈值 (默认: 0.10 = 10%%)")
+
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0], 'r', encoding='utf-8') as f:
+            old = json.load(f)
+        with open(args.compare[1], 'r', encoding='utf-8') as f:
+            new = json.load(f)
+
+        rows = compare_results(old, new, args.threshold)
+        print(f"\n📊 {old['meta']['git_commit']} → {new['meta']['git_commit']}\n")
+        for row in rows:
+            icon = "❌" if row["regression"] else "✅"
+            print(f"{icon} {row['name']:<22} {row['old_median_s'] * 1000:9.1f}ms → "
+                  f"{row['new_median_s'] * 1000:9.1f}ms ({row['change']:+.1%})")
+        sys.exit(1 if any(row["regression"] for row in rows) else 0)
+
+    report = run_benchmarks(args.scale, args.seed, args.repeat, args.only, args.keep)
+    print_results(report)
+
+    output = Path(args.output) if args.output else (
+        Path("bench_results") / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{report['meta']['git_commit'] or 'nogit'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    print(f"\n💾 结果已保存: {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+公司情报缓存 - 跨候选人复用 Teammate A 的 01_company_intel_brief.md
+
+公司研究只取决于公司、职位和 JD，与候选人无关。同一个职位准备十位候选人时，
+Teammate A 先查缓存: 新鲜的条目直接返回；过期的条目先返回旧内容，同时在
+后台线程重新生成并写回缓存；没有条目时生成并写入缓存。
+
+缓存位于 <base_path>/.cache/company_intel/<公司>/<键哈希>.json，配置在
+pipeline_config.json 的 teammates.company_researcher.cache:
+
+    "cache": {"enabled": true, "key": ["company", "role", "jd"], "ttl_hours": 168}
+
+- key: 参与缓存键的字段 (company 必选; 去掉 role / jd 可在同公司的不同职位间共享)
+- ttl_hours: 新鲜期 (小时)；null 表示永不过期
+
+用法:
+    python company_intel_cache.py list [--company 阿里云]
+    python company_intel_cache.py invalidate --company 阿里云 [--role 产品经理]
+    python company_intel_cache.py store companies/阿里云-产品经理-张三   # 用已填充的简报替换缓存
+"""
+
+import sys
+import time
+import shutil
+import argparse
+import threading
+import contextvars
+import concurrent.futures
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from state_io import read_json, write_json
+from tracing import inputs_hash, read_text
+
+CACHE_DIR = Path(".cache") / "company_intel"
+
+DEFAULT_KEY = ("company", "role", "jd")
+DEFAULT_TTL_HOURS = 168
+
+# get_or_create() 返回的状态
+HIT, STALE, MISS = "hit", "stale", "miss"
+
+
+def _normalize_jd(jd_content: str) -> str:
+    # 空白差异 (换行、缩进) 不应使缓存失效
+    return " ".join(jd_content.split())
+
+
+class CompanyIntelCache:
+    """按公司 (+ 职位 / JD) 缓存公司情报简报，过期条目后台刷新"""
+
+    def __init__(self, base_path: str = ".", key: Sequence[str] = DEFAULT_KEY,
+                 ttl_hours: Optional[float] = DEFAULT_TTL_HOURS):
+        """
+        Args:
+            base_path: 项目基础路径
+            key: 参与缓存键的字段 ("company"、"role"、"jd")
+            ttl_hours: 新鲜期 (小时)，None 为永不过期
+        """
+        from setup_company_folder import sanitize_name
+
+        self.root = Path(base_path) / CACHE_DIR
+        self.key_fields = tuple(dict.fromkeys(("company",) + tuple(key)))
+        self.ttl = None if ttl_hours is None else ttl_hours * 3600
+        self._sanitize = sanitize_name
+        self._lock = threading.Lock()
+        self._key_locks: Dict[str, threading.Lock] = {}
+        self._refreshing: Dict[str, concurrent.futures.Future] = {}
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_config(cls, base_path: str, config: Dict) -> Optional["CompanyIntelCache"]:
+        """按 pipeline_config.json 创建；配置中关闭缓存时返回 None"""
+        researcher = next((t for t in config.get("teammates", {}).values() if t.get("id") == "teammate_a"), {})
+        settings = researcher.get("cache", {})
+        if not settings.get("enabled", True):
+            return None
+        return cls(base_path, settings.get("key", DEFAULT_KEY), settings.get("ttl_hours", DEFAULT_TTL_HOURS))
+
+    def key(self, company: str, role: str, jd_content: str) -> str:
+        """缓存键 (按配置的字段哈希)"""
+        values = {"company": company, "role": role, "jd": _normalize_jd(jd_content or "")}
+        return inputs_hash(*(f"{field}={values[field]}" for field in self.key_fields))
+
+    def _path(self, company: str, key: str) -> Path:
+        return self.root / self._sanitize(company) / f"{key}.json"
+
+    def _is_fresh(self, entry: Dict) -> bool:
+        return self.ttl is None or time.time() - entry["created"] < self.ttl
+
+    def lookup(self, company: str, role: str, jd_content: str) -> Optional[Dict]:
+        """缓存条目 (附 "fresh")；没有时返回 None"""
+        entry = read_json(self._path(company, self.key(company, role, jd_content)))
+        if not entry or "content" not in entry:
+            return None
+        entry["fresh"] = self._is_fresh(entry)
+        return entry
+
+    def store(self, company: str, role: str, jd_content: str, content: str, source: str = "generated") -> Path:
+        """写入 (覆盖) 一个条目"""
+        path = self._path(company, self.key(company, role, jd_content))
+        path.parent.mkdir(parents=True, exist_ok=True)
+        write_json(path, {
+            "company": company,
+            "role": role,
+            "key": list(self.key_fields),
+            "created": time.time(),
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "source": source,
+            "content": content
+        })
+        return path
+
+    def get_or_create(self, company: str, role: str, jd_content: str,
+                      compose: Callable[[], str], refresh: bool = False) -> Tuple[str, str]:
+        """
+        取简报: 新鲜命中直接返回；过期时返回旧内容并后台刷新；未命中时生成并写入
+
+        同一进程中并发请求同一个键时只生成一次，其余等待后命中。
+
+        Args:
+            compose: 生成简报内容
+            refresh: 忽略缓存，重新生成并覆盖
+
+        Returns:
+            (内容, HIT / STALE / MISS)
+        """
+        key = self.key(company, role, jd_content)
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            entry = None if refresh else self.lookup(company, role, jd_content)
+            if entry is None:
+                content = compose()
+                self.store(company, role, jd_content, content)
+                return content, MISS
+
+        if not entry["fresh"]:
+            self.refresh(company, role, jd_content, compose)
+            return entry["content"], STALE
+        return entry["content"], HIT
+
+    def refresh(self, company: str, role: str, jd_content: str,
+                compose: Callable[[], str]) -> concurrent.futures.Future:
+        """在后台线程重新生成一个条目 (同一个键同时只刷新一次)"""
+        key = self.key(company, role, jd_content)
+        context = contextvars.copy_context()
+
+        def run():
+            try:
+                self.store(company, role, jd_content, context.run(compose))
+            finally:
+                with self._lock:
+                    self._refreshing.pop(key, None)
+
+        with self._lock:
+            future = self._refreshing.get(key)
+            if future is None:
+                if self._executor is None:
+                    self._executor = concurrent.futures.ThreadPoolExecutor(
+                        max_workers=2, thread_name_prefix="intel-refresh")
+                future = self._refreshing[key] = self._executor.submit(run)
+        return future
+
+    def wait(self):
+        """等待进行中的后台刷新"""
+        with self._lock:
+            pending = list(self._refreshing.values())
+        concurrent.futures.wait(pending)
+
+    def entries(self, company: Optional[str] = None) -> List[Dict]:
+        """全部条目 (附 "fresh" 和 "path")，可按公司过滤"""
+        directories = [self.root / self._sanitize(company)] if company else sorted(self.root.glob("*"))
+        entries = []
+        for directory in directories:
+            for path in sorted(directory.glob("*.json")):
+                entry = read_json(path)
+                if entry and "content" in entry:
+                    entry.update(fresh=self._is_fresh(entry), path=str(path))
+                    entries.append(entry)
+        return entries
+
+    def invalidate(self, company: Optional[str] = None, role: Optional[str] = None) -> int:
+        """
+        删除条目
+
+        Args:
+            company: 只删除该公司的条目 (None: 清空缓存)
+            role: 只删除该职位的条目
+
+        Returns:
+            删除的条目数
+        """
+        if company is None and role is None:
+            count = len(self.entries())
+            shutil.rmtree(self.root, ignore_errors=True)
+            return count
+
+        count = 0
+        for entry in self.entries(company):
+            if role is None or entry.get("role") == role:
+                Path(entry["path"]).unlink()
+                count += 1
+        return count
+
+
+def main():
+    """CLI: 查看、失效或写入公司情报缓存"""
+    from pipeline_team import PACKET_METADATA_FILE, load_pipeline_config
+
+    parser = argparse.ArgumentParser(description="公司情报缓存 (Teammate A 简报跨候选人复用)")
+    parser.add_argument("--base-path", default=".", help="项目基础路径 (默认: .)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="列出缓存条目")
+    list_parser.add_argument("--company", help="只列出该公司")
+
+    invalidate_parser = subparsers.add_parser("invalidate", help="删除缓存条目")
+    invalidate_parser.add_argument("--company", help="公司 (缺省且未指定 --all 时报错)")
+    invalidate_parser.add_argument("--role", help="只删除该职位")
+    invalidate_parser.add_argument("--all", action="store_true", help="清空整个缓存")
+
+    store_parser = subparsers.add_parser("store", help="用包目录中的 01_company_intel_brief.md 替换缓存条目")
+    store_parser.add_argument("packet_dir", help="包目录 (companies/<公司>-<职位>-<候选人>)")
+
+    args = parser.parse_args()
+    cache = CompanyIntelCache.from_config(args.base_path, load_pipeline_config())
+    if cache is None:
+        print("⚠️  pipeline_config.json 中已关闭公司情报缓存")
+        return 1
+
+    if args.command == "list":
+        entries = cache.entries(args.company)
+        for entry in entries:
+            status = "新鲜" if entry["fresh"] else "过期"
+            print(f"{entry['company']:<16} {entry['role']:<16} {entry['created_at']}  {status}  {entry['source']}")
+        print(f"共 {len(entries)} 条")
+    elif args.command == "invalidate":
+        if not args.company and not args.all:
+            parser.error("invalidate 需要 --company 或 --all")
+        count = cache.invalidate(None if args.all else args.company, args.role)
+        print(f"🗑️  已删除 {count} 条")
+    else:
+        packet_dir = Path(args.packet_dir)
+        metadata = read_json(packet_dir / PACKET_METADATA_FILE)
+        if not metadata:
+            print(f"❌ 不是包目录: {packet_dir}")
+            return 1
+        jd_content = read_text(packet_dir / "raw_data" / "jd_original.txt")
+        content = read_text(packet_dir / "01_company_intel_brief.md")
+        path = cache.store(metadata["company"], metadata["role"], jd_content, content, source=str(packet_dir))
+        print(f"✅ 已写入缓存: {path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Interview Intel Daemon
+
+Long-lived local server that keeps pipeline config, resume registries and
+analytics scans warm in memory and serves requests over a Unix socket using the
+line-delimited JSON protocol described in daemon_client.py.
+
+Before answering, every request re-checks the config and its workspace's
+registry / folder signatures (a handful of stat calls) and reloads or
+invalidates whatever changed on disk, so a client always sees its own
+writes, e.g. `resume_manager.py create` followed at once by `list`. A
+background watcher does the same check periodically so caches are already
+warm when the next request arrives.
+
+Methods:
+    ping                                  Daemon status
+    config                                pipeline_config.json
+    keywords          {text | file[, base_path]}
+                                          extract_jd_keywords.analyze_jd (memoized, see
+                                          jd_analysis_cache.py; on disk under base_path)
+    score             {base_path, target, requirements}
+                                          ResumeManager.recommend_version
+    registry.list     {base_path, filter} ResumeManager.list_versions
+    analytics.global  {base_path}         AnalyticsGenerator.generate_global_stats
+    analytics.company {base_path, company}
+                                          AnalyticsGenerator.generate_company_stats
+    pipeline.launch   {base_path, company, role, candidate, jd_content, resume_path[, trace, history]}
+                                          PipelineTeam.launch (with the warm config)
+    shutdown                              Stop the daemon
+"""
+
+import os
+import sys
+import json
+import time
+import threading
+import socketserver
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from daemon_client import DaemonUnavailable, call, default_socket_path
+import jd_analysis_cache
+from resume_manager import ResumeManager
+from analytics_generator import AnalyticsGenerator
+from pipeline_team import CONFIG_PATH, PipelineTeam, load_pipeline_config
+
+
+def _mtime_signature(paths: List[Path]) -> Tuple:
+    """Build a cheap change signature from the mtimes of the given paths."""
+    signature = []
+    for path in paths:
+        try:
+            stat = path.stat()
+            signature.append((str(path), stat.st_mtime_ns, stat.st_size, stat.st_ino))
+        except FileNotFoundError:
+            signature.append((str(path), None, None, None))
+    return tuple(signature)
+
+
+class Workspace:
+    """Warm, watched state for one InterviewIntel base path."""
+
+    def __init__(self, base_path: str):
+        """
+        Initialize workspace state.
+
+        Args:
+            base_path: Base directory (contains resumes/ and company folders)
+        """
+        self.base_path = Path(base_path).resolve()
+        self.lock = threading.RLock()
+        self._resume_manager: Optional[ResumeManager] = None
+        self._analytics: Optional[AnalyticsGenerator] = None
+        self._registry_signature = self._registry_state()
+        self._folders_signature = self._folders_state()
+
+    @property
+    def resume_manager(self) -> ResumeManager:
+        """Resume manager with the registry parsed once and kept in memory."""
+        if self._resume_manager is None:
+            self._resume_manager = ResumeManager(str(self.base_path))
+        return self._resume_manager
+
+    @property
+    def analytics(self) -> AnalyticsGenerator:
+        """Analytics generator whose folder scan and tracking data stay cached."""
+        if self._analytics is None:
+            self._analytics = AnalyticsGenerator(str(self.base_path))
+        return self._analytics
+
+    def _registry_state(self) -> Tuple:
+        return _mtime_signature([self.base_path / "resumes" / "resume_registry.json"])
+
+    def _folders_state(self) -> Tuple:
+        """Signature of the base dir and every company folder / interviews dir."""
+        paths = [self.base_path]
+        try:
+            for item in self.base_path.iterdir():
+                if item.is_dir() and not item.name.startswith('.'):
+                    paths.append(item)
+                    paths.append(item / "interviews")
+        except FileNotFoundError:
+            pass
+        return _mtime_signature(paths)
+
+    def refresh_if_changed(self) -> List[str]:
+        """
+        Reload cached state whose files changed on disk.
+
+        Returns:
+            Names of the caches that were refreshed
+        """
+        refreshed = []
+        registry_signature = self._registry_state()
+        folders_signature = self._folders_state()
+
+        with self.lock:
+            if registry_signature != self._registry_signature:
+                self._registry_signature = registry_signature
+                if self._resume_manager is not None:
+                    self._resume_manager.registry = self._resume_manager._load_registry()
+                if self._analytics is not None:
+                    self._analytics.invalidate_cache()
+                refreshed.append("registry")
+
+            if folders_signature != self._folders_signature:
+                self._folders_signature = folders_signature
+                if self._analytics is not None:
+                    self._analytics.invalidate_cache()
+                refreshed.append("folders")
+
+        return refreshed
+
+
+class DaemonState:
+    """Everything the daemon keeps warm between requests."""
+
+    def __init__(self, config_path: Optional[str] = None):
+        self.started_at = time.time()
+        self.config_path = Path(config_path) if config_path else CONFIG_PATH
+        self.config = load_pipeline_config(str(self.config_path))
+        self._config_signature = _mtime_signature([self.config_path])
+        self.workspaces: Dict[str, Workspace] = {}
+        self.requests_served = 0
+        self._lock = threading.Lock()
+
+    def workspace(self, base_path: str) -> Workspace:
+        """
+        Get (or create) the warm workspace for a base path.
+
+        Caches whose files changed since the last check are refreshed first,
+        so the caller never answers from state older than the disk.
+        """
+        key = str(Path(base_path).resolve())
+        with self._lock:
+            if key not in self.workspaces:
+                self.workspaces[key] = Workspace(key)
+                return self.workspaces[key]
+            workspace = self.workspaces[key]
+        workspace.refresh_if_changed()
+        return workspace
+
+    def current_config(self) -> Dict[str, Any]:
+        """The pipeline config, reloaded first if pipeline_config.json changed."""
+        self._refresh_config()
+        return self.config
+
+    def _refresh_config(self) -> bool:
+        config_signature = _mtime_signature([self.config_path])
+        if config_signature == self._config_signature:
+            return False
+        self._config_signature = config_signature
+        try:
+            self.config = load_pipeline_config(str(self.config_path))
+        except (OSError, ValueError) as e:
+            print(f"⚠️  配置重载失败: {e}", file=sys.stderr)
+            return False
+        return True
+
+    def refresh_if_changed(self) -> List[str]:
+        """Poll config and all workspaces for changes."""
+        refreshed = ["config"] if self._refresh_config() else []
+
+        with self._lock:
+            workspaces = list(self.workspaces.values())
+        for workspace in workspaces:
+            refreshed.extend(f"{workspace.base_path}:{name}" for name in workspace.refresh_if_changed())
+
+        return refreshed
+
+
+# ========== Request handlers ==========
+
+def _handle_ping(state: DaemonState, params: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "pid": os.getpid(),
+        "uptime": time.time() - state.started_at,
+        "requests_served": state.requests_served,
+        "workspaces": sorted(state.workspaces)
+    }
+
+
+def _handle_config(state: DaemonState, params: Dict[str, Any]) -> Dict[str, Any]:
+    return state.current_config()
+
+
+def _handle_keywords(state: DaemonState, params: Dict[str, Any]) -> Dict[str, Any]:
+    if "text" in params:
+        jd_text = params["text"]
+    else:
+        with open(params["file"], 'r', encoding='utf-8') as f:
+            jd_text = f.read()
+    return jd_analysis_cache.analyze(jd_text, params.get("base_path"))
+
+
+def _handle_score(state: DaemonState, params: Dict[str, Any]) -> Dict[str, Any]:
+    workspace = state.workspace(params["base_path"])
+    with workspace.lock:
+        return workspace.resume_manager.recommend_version(
+            target_position=params["target"],
+            key_requirements=params["requirements"]
+        )
+
+
+def _handle_registry_list(state: DaemonState, params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    workspace = state.workspace(params["base_path"])
+    with workspace.lock:
+        return workspace.resume_manager.list_versions(filter_target=params.get("filter"))
+
+
+def _handle_analytics_global(state: DaemonState, params: Dict[str, Any]) -> Dict[str, Any]:
+    workspace = state.workspace(params["base_path"])
+    with workspace.lock:
+        return workspace.analytics.generate_global_stats()
+
+
+def _handle_analytics_company(state: DaemonState, params: Dict[str, Any]) -> Dict[str, Any]:
+    workspace = state.workspace(params["base_path"])
+    with workspace.lock:
+        return workspace.analytics.generate_company_stats(params["company"])
+
+
+def _handle_pipeline_launch(state: DaemonState, params: Dict[str, Any]) -> Dict[str, Any]:
+    team = PipelineTeam(params["base_path"], trace=params.get("trace", True),
+                        history=params.get("history", True), config=state.current_config())
+    output_dir = team.launch(
+        company=params["company"],
+        role=params["role"],
+        candidate=params["candidate"],
+        jd_content=params["jd_content"],
+        resume_path=params["resume_path"]
+    )
+    return {"output_dir": str(output_dir)}
+
+
+HANDLERS: Dict[str, Callable[[DaemonState, Dict[str, Any]], Any]] = {
+    "ping": _handle_ping,
+    "config": _handle_config,
+    "keywords": _handle_keywords,
+    "score": _handle_score,
+    "registry.list": _handle_registry_list,
+    "analytics.global": _handle_analytics_global,
+    "analytics.company": _handle_analytics_company,
+    "pipeline.launch": _handle_pipeline_launch,
+}
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    """Serve line-delimited JSON requests on one connection."""
+
+    def handle(self):
+        server: "DaemonServer" = self.server
+        for line in self.rfile:
+            if not line.strip():
+                continue
+
+            request_id = None
+            try:
+                request = json.loads(line)
+                request_id = request.get("id")
+                method = request["method"]
+
+                if method == "shutdown":
+                    response = {"id": request_id, "ok": True, "result": "bye"}
+                    threading.Thread(target=server.shutdown, daemon=True).start()
+                elif method not in HANDLERS:
+                    response = {"id": request_id, "ok": False, "error": f"Unknown method: {method}"}
+                else:
+                    result = HANDLERS[method](server.state, request.get("params") or {})
+                    response = {"id": request_id, "ok": True, "result": result}
+                server.state.requests_served += 1
+            except Exception as e:
+                response = {"id": request_id, "ok": False, "error": f"{type(e).__name__}: {e}"}
+
+            self.wfile.write(json.dumps(response, ensure_ascii=False, default=str).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix-socket server holding the shared DaemonState."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, state: DaemonState):
+        self.state = state
+        super().__init__(socket_path, _RequestHandler)
+
+
+def _watch(state: DaemonState, stop: threading.Event, interval: float):
+    """Poll for workspace changes until stopped."""
+    while not stop.wait(interval):
+        try:
+            refreshed = state.refresh_if_changed()
+        except Exception as e:
+            print(f"⚠️  监控出错: {e}", file=sys.stderr)
+            continue
+        if refreshed:
+            print(f"🔄 已刷新: {', '.join(refreshed)}")
+
+
+def serve(socket_path: Optional[str] = None, base_paths: Optional[List[str]] = None,
+          watch_interval: float = 1.0):
+    """
+    Run the daemon in the foreground until shutdown.
+
+    Args:
+        socket_path: Unix socket path (default: daemon_client.default_socket_path())
+        base_paths: Workspaces to pre-warm
+        watch_interval: Seconds between change polls
+    """
+    path = socket_path or default_socket_path()
+
+    if os.path.exists(path):
+        try:
+            call("ping", socket_path=path, timeout=1.0)
+            raise RuntimeError(f"Daemon already running on {path}")
+        except DaemonUnavailable:
+            os.unlink(path)  # stale socket from a crashed daemon
+
+    state = DaemonState()
+    for base_path in base_paths or []:
+        workspace = state.workspace(base_path)
+        workspace.resume_manager
+        workspace.analytics._get_all_company_folders()
+
+    stop = threading.Event()
+    watcher = threading.Thread(target=_watch, args=(state, stop, watch_interval), daemon=True)
+
+    server = DaemonServer(path, state)
+    os.chmod(path, 0o600)
+    watcher.start()
+
+    print(f"🔌 Interview Intel daemon listening on {path} (pid {os.getpid()})")
+    try:
+        server.serve_forever()
+    finally:
+        stop.set()
+        server.server_close()
+        if os.path.exists(path):
+            os.unlink(path)
+        print("👋 Daemon stopped")
+
+
+def main():
+    """Main CLI entry point."""
+    if len(sys.argv) < 2:
+        print("Interview Intel Daemon")
+        print("\nUsage:")
+        print("  python daemon.py start [--socket <path>] [--base-path <path>...] [--interval <seconds>]")
+        print("  python daemon.py status [--socket <path>]")
+        print("  python daemon.py stop [--socket <path>]")
+        print("\nExamples:")
+        print('  python daemon.py start --base-path ~/InterviewIntel &')
+        print('  python extract_jd_keywords.py jd.txt   # served by the daemon when running')
+        print('  python daemon.py stop')
+        sys.exit(1)
+
+    command = sys.argv[1]
+
+    # Parse arguments (--base-path may repeat)
+    args = {}
+    base_paths = []
+    i = 2
+    while i < len(sys.argv):
+        if sys.argv[i].startswith("--") and i + 1 < len(sys.argv):
+            key = sys.argv[i][2:]
+            if key == "base-path":
+                base_paths.append(sys.argv[i + 1])
+            else:
+                args[key] = sys.argv[i + 1]
+            i += 2
+        else:
+            i += 1
+
+    socket_path = args.get("socket")
+
+    try:
+        if command == "start":
+            serve(socket_path, base_paths, float(args.get("interval", 1.0)))
+
+        elif command == "status":
+            status = call("ping", socket_path=socket_path, timeout=2.0)
+            print(f"✅ Daemon running (pid {status['pid']})")
+            print(f"⏱️  Uptime: {status['uptime']:.0f}s")
+            print(f"📨 Requests served: {status['requests_served']}")
+            for workspace in status["workspaces"]:
+                print(f"📁 {workspace}")
+
+        elif command == "stop":
+            call("shutdown", socket_path=socket_path, timeout=2.0)
+            print("✅ Daemon stopping")
+
+        else:
+            print(f"Unknown command: {command}")
+            sys.exit(1)
+
+    except DaemonUnavailable:
+        print("⚠️  Daemon is not running")
+        sys.exit(1)
+    except KeyboardInterrupt:
+        print("\n⚠️  用户中断")
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Daemon Client
+
+Minimal client for the Interview Intel daemon (see daemon.py). CLIs call
+try_call() first and fall back to running locally when no daemon is listening,
+so everything keeps working without one.
+
+Protocol: one JSON object per line over a Unix socket.
+    request:  {"id": 1, "method": "keywords", "params": {...}}
+    response: {"id": 1, "ok": true, "result": ...}
+              {"id": 1, "ok": false, "error": "..."}
+
+Environment:
+    INTERVIEW_INTEL_SOCKET      Socket path (default: $TMPDIR/interview-intel-<uid>.sock)
+    INTERVIEW_INTEL_NO_DAEMON   Set to 1 to always run locally
+"""
+
+import os
+import json
+import socket
+from typing import Any, Dict, Optional, Tuple
+
+SOCKET_ENV = "INTERVIEW_INTEL_SOCKET"
+DISABLE_ENV = "INTERVIEW_INTEL_NO_DAEMON"
+
+
+class DaemonUnavailable(ConnectionError):
+    """No daemon is listening on the socket."""
+
+
+class DaemonError(RuntimeError):
+    """The daemon handled the request but reported an error."""
+
+
+def default_socket_path() -> str:
+    """Return the socket path shared by the daemon and its clients."""
+    if os.environ.get(SOCKET_ENV):
+        return os.environ[SOCKET_ENV]
+    tmp_dir = os.environ.get("TMPDIR", "/tmp")
+    uid = os.getuid() if hasattr(os, "getuid") else 0
+    return os.path.join(tmp_dir, f"interview-intel-{uid}.sock")
+
+
+def call(method: str, params: Optional[Dict[str, Any]] = None,
+         socket_path: Optional[str] = None, timeout: Optional[float] = None) -> Any:
+    """
+    Send one request to the daemon and return its result.
+
+    Args:
+        method: Method name (e.g. "keywords", "analytics.global")
+        params: Method parameters
+        socket_path: Override the socket path
+        timeout: Socket timeout in seconds (None waits indefinitely)
+
+    Returns:
+        The response's "result" value
+
+    Raises:
+        DaemonUnavailable: No daemon is listening
+        DaemonError: The daemon returned an error response
+    """
+    path = socket_path or default_socket_path()
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(path):
+        raise DaemonUnavailable(path)
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        try:
+            sock.connect(path)
+        except OSError as e:
+            raise DaemonUnavailable(f"{path}: {e}")
+
+        request = {"id": 1, "method": method, "params": params or {}}
+        sock.sendall(json.dumps(request, ensure_ascii=False).encode("utf-8") + b"\n")
+
+        with sock.makefile("rb") as reader:
+            line = reader.readline()
+    finally:
+        sock.close()
+
+    if not line:
+        raise DaemonUnavailable(f"{path}: connection closed")
+
+    response = json.loads(line)
+    if not response.get("ok"):
+        raise DaemonError(response.get("error", "unknown daemon error"))
+    return response.get("result")
+
+
+def try_call(method: str, params: Optional[Dict[str, Any]] = None) -> Tuple[bool, Any]:
+    """
+    Call the daemon if one is running.
+
+    Returns:
+        (True, result) when the daemon handled the request,
+        (False, None) when the caller should run locally
+    """
+    if os.environ.get(DISABLE_ENV) == "1":
+        return False, None
+    try:
+        return True, call(method, params)
+    except DaemonUnavailable:
+        return False, None
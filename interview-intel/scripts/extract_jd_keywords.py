@@ -4,12 +4,32 @@ JD Keyword Extractor
 
 Extracts key technical skills, requirements, and important phrases from job descriptions.
 Helps quickly identify the most important aspects of a JD for interview preparation.
+
+In-process API (stable across releases; changes bump EXTRACTOR_VERSION):
+
+    from extract_jd_keywords import analyze_jd
+    analysis = analyze_jd(jd_text)
+    analysis["ranked_keywords"][0]    # RankedKeyword(keyword='Python', category='languages', mentions=3, score=1.0)
+    analysis["key_phrases"][0]        # KeyPhrase(phrase='backend engineer', count=2, score=1.0)
+
+Usage:
+    python extract_jd_keywords.py jd.txt                          # readable report
+    python extract_jd_keywords.py jd.txt --format json            # the analyze_jd dict
+    python extract_jd_keywords.py jds/*.txt --format jsonl        # one {"file", ...analysis} per line
+    python extract_jd_keywords.py jds/*.txt --format binary > out.msgpack   # MessagePack stream
 """
 
+import os
 import re
+import json
 import sys
 from collections import Counter
-from typing import Dict, List, Set
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Set, Tuple
+
+# Version of the analysis output (keyword lists, scoring, fields)
+EXTRACTOR_VERSION = "2"
+
+OUTPUT_FORMATS = ["text", "json", "jsonl", "binary"]
 
 # Common technical skills and technologies
 TECH_KEYWORDS = {
@@ -60,25 +80,51 @@ SOFT_SKILLS = [
 STRONG_INDICATORS = ['required', 'must have', 'must-have', 'essential', 'critical']
 PREFERRED_INDICATORS = ['preferred', 'nice to have', 'nice-to-have', 'bonus', 'plus']
 
+# Mention weights for ranking: a keyword in a "required" sentence counts more
+# than one in a "nice to have" sentence
+REQUIRED_WEIGHT = 2.0
+PREFERRED_WEIGHT = 0.5
+
+# (category, pattern) for every technical keyword, compiled on first use
+_tech_patterns: List[Tuple[str, "re.Pattern"]] = []
+
+
+def tech_patterns() -> List[Tuple[str, "re.Pattern"]]:
+    """Compiled TECH_KEYWORDS patterns, in category order."""
+    if not _tech_patterns:
+        _tech_patterns.extend(
+            (category, re.compile(r'\b' + keyword + r'\b', re.IGNORECASE))
+            for category, keywords in TECH_KEYWORDS.items()
+            for keyword in keywords)
+    return _tech_patterns
+
+
+class RankedKeyword(NamedTuple):
+    """A technical keyword ranked by weighted mentions (score 1.0 = top keyword)."""
+    keyword: str
+    category: str
+    mentions: int
+    score: float
+
+
+class KeyPhrase(NamedTuple):
+    """A frequent 2-3 word phrase (score 1.0 = most frequent phrase)."""
+    phrase: str
+    count: int
+    score: float
+
 
 def extract_tech_keywords(text: str) -> Dict[str, List[str]]:
     """Extract technical keywords by category."""
-    found = {}
-    text_lower = text.lower()
-
-    for category, keywords in TECH_KEYWORDS.items():
-        category_matches = []
-        for keyword in keywords:
-            pattern = re.compile(r'\b' + keyword + r'\b', re.IGNORECASE)
-            matches = pattern.findall(text)
-            if matches:
-                # Use the actual match (preserves case) instead of the pattern
-                category_matches.extend(set(matches))
+    found: Dict[str, Set[str]] = {}
 
-        if category_matches:
-            found[category] = sorted(set(category_matches))
+    for category, pattern in tech_patterns():
+        matches = pattern.findall(text)
+        if matches:
+            # Use the actual match (preserves case) instead of the pattern
+            found.setdefault(category, set()).update(matches)
 
-    return found
+    return {category: sorted(matches) for category, matches in found.items()}
 
 
 def extract_experience_requirements(text: str) -> List[str]:
@@ -89,7 +135,8 @@ def extract_experience_requirements(text: str) -> List[str]:
         matches = re.findall(pattern, text, re.IGNORECASE)
         requirements.extend(matches)
 
-    return list(set(requirements))
+    # Unique, in order of first appearance
+    return list(dict.fromkeys(requirements))
 
 
 def extract_soft_skills(text: str) -> List[str]:
@@ -104,6 +151,42 @@ def extract_soft_skills(text: str) -> List[str]:
     return found
 
 
+def _sentence_weight(sentence: str) -> float:
+    sentence_lower = sentence.lower()
+    if any(indicator in sentence_lower for indicator in STRONG_INDICATORS):
+        return REQUIRED_WEIGHT
+    if any(indicator in sentence_lower for indicator in PREFERRED_INDICATORS):
+        return PREFERRED_WEIGHT
+    return 1.0
+
+
+def rank_tech_keywords(text: str) -> List[RankedKeyword]:
+    """
+    Rank technical keywords by mentions weighted by requirement strength.
+
+    Each mention counts REQUIRED_WEIGHT in a sentence with a "required"
+    indicator, PREFERRED_WEIGHT in a "nice to have" sentence and 1 otherwise.
+    Scores are relative to the top keyword; ties keep first-mention order.
+    """
+    sentences = [(sentence, _sentence_weight(sentence)) for sentence in re.split(r'[.!?]\s+', text)]
+    ranked = []
+    for category, pattern in tech_patterns():
+        mentions, weight, first = 0, 0.0, None
+        for sentence, sentence_weight in sentences:
+            matches = pattern.findall(sentence)
+            if matches:
+                first = first or matches[0]
+                mentions += len(matches)
+                weight += len(matches) * sentence_weight
+        if mentions:
+            ranked.append((weight, -text.find(first), first, category, mentions))
+
+    ranked.sort(reverse=True)
+    top = ranked[0][0] if ranked else 1.0
+    return [RankedKeyword(keyword, category, mentions, round(weight / top, 3))
+            for weight, _, keyword, category, mentions in ranked]
+
+
 def categorize_requirements(text: str) -> Dict[str, List[str]]:
     """Categorize requirements by strength (required vs preferred)."""
     result = {'required': [], 'preferred': []}
@@ -126,7 +209,7 @@ def categorize_requirements(text: str) -> Dict[str, List[str]]:
     return result
 
 
-def extract_key_phrases(text: str, top_n: int = 10) -> List[tuple]:
+def extract_key_phrases(text: str, top_n: int = 10) -> List[KeyPhrase]:
     """Extract most common meaningful phrases (2-3 words)."""
     # Remove common stop words
     stop_words = {'the', 'a', 'an', 'and', 'or', 'but', 'in', 'on', 'at', 'to', 'for',
@@ -147,22 +230,78 @@ def extract_key_phrases(text: str, top_n: int = 10) -> List[tuple]:
             trigrams.append(f"{words[i]} {words[i+1]} {words[i+2]}")
 
     # Count frequencies
-    phrase_counts = Counter(bigrams + trigrams)
+    phrase_counts = Counter(bigrams + trigrams).most_common(top_n)
+    top = phrase_counts[0][1] if phrase_counts else 1
 
-    return phrase_counts.most_common(top_n)
+    return [KeyPhrase(phrase, count, round(count / top, 3)) for phrase, count in phrase_counts]
 
 
 def analyze_jd(jd_text: str) -> Dict:
-    """Main analysis function."""
+    """
+    Main analysis function.
+
+    Returns:
+        {
+            "extractor_version": EXTRACTOR_VERSION,
+            "tech_keywords": {category: [keyword, ...]},
+            "ranked_keywords": [RankedKeyword, ...],          # highest score first
+            "experience_requirements": [str, ...],
+            "soft_skills": [str, ...],
+            "categorized_requirements": {"required": [sentence, ...], "preferred": [...]},
+            "key_phrases": [KeyPhrase, ...]                    # most frequent first
+        }
+        NamedTuples serialize as arrays in JSON / MessagePack output.
+    """
     return {
-        'tech_keywords': extract_tech_keywords(jd_text),
-        'experience_requirements': extract_experience_requirements(jd_text),
-        'soft_skills': extract_soft_skills(jd_text),
-        'categorized_requirements': categorize_requirements(jd_text),
-        'key_phrases': extract_key_phrases(jd_text)
+        'extractor_version': EXTRACTOR_VERSION,
+        **{key: step(jd_text) for key, step in ANALYSIS_STEPS}
     }
 
 
+def _analyze_profiled(jd_text: str) -> Dict:
+    """analyze_jd with each step as a named profiling region (--profile-target)."""
+    from profiling import profiled
+
+    analysis = {'extractor_version': EXTRACTOR_VERSION}
+    for key, step in ANALYSIS_STEPS:
+        with profiled(key):
+            analysis[key] = step(jd_text)
+    return analysis
+
+
+# analyze_jd's result keys in order, each with the function computing it;
+# the keys double as --profile-target names
+ANALYSIS_STEPS = [
+    ('tech_keywords', extract_tech_keywords),
+    ('ranked_keywords', rank_tech_keywords),
+    ('experience_requirements', extract_experience_requirements),
+    ('soft_skills', extract_soft_skills),
+    ('categorized_requirements', categorize_requirements),
+    ('key_phrases', extract_key_phrases)
+]
+
+
+def restore_analysis(data: Dict) -> Dict:
+    """
+    Rebuild an analysis read back from JSON / MessagePack.
+
+    Ranked keywords and key phrases come back as arrays; this turns them into
+    RankedKeyword / KeyPhrase again so the result equals analyze_jd's.
+    """
+    return {
+        **data,
+        'ranked_keywords': [RankedKeyword(*entry) for entry in data.get('ranked_keywords', [])],
+        'key_phrases': [KeyPhrase(*entry) for entry in data.get('key_phrases', [])]
+    }
+
+
+def analyze_files(paths: Iterable[str]) -> Iterator[Tuple[str, Dict]]:
+    """Analyze several JD files: yields (path, analysis) in order."""
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            yield path, analyze_jd(f.read())
+
+
 def format_output(analysis: Dict) -> str:
     """Format analysis results as readable text."""
     output = []
@@ -223,7 +362,7 @@ def format_output(analysis: Dict) -> str:
     output.append("## KEY PHRASES (Most Common)\n")
     key_phrases = analysis['key_phrases']
     if key_phrases:
-        for phrase, count in key_phrases:
+        for phrase, count, *_ in key_phrases:
             output.append(f"  - '{phrase}' (mentioned {count}x)")
         output.append("")
 
@@ -232,29 +371,95 @@ def format_output(analysis: Dict) -> str:
     return "\n".join(output)
 
 
+def write_output(results: List[Tuple[str, Dict]], output_format: str, stream=None):
+    """
+    Write analyses in one of OUTPUT_FORMATS.
+
+    One input prints the analysis itself (json / binary: a single object);
+    several inputs print one {"file", ...analysis} record each (json: an
+    array, jsonl: one per line, binary: a stream of MessagePack objects).
+    """
+    stream = stream or sys.stdout
+    single = len(results) == 1
+    records = [analysis if single else {"file": path, **analysis} for path, analysis in results]
+
+    if output_format == "binary":
+        from msgpack_lite import pack
+
+        stream.flush()
+        stream.buffer.write(b"".join(pack(record) for record in records))
+        stream.buffer.flush()
+    elif output_format == "json":
+        print(json.dumps(records[0] if single else records, ensure_ascii=False), file=stream)
+    elif output_format == "jsonl":
+        for path, analysis in results:
+            print(json.dumps({"file": path, **analysis}, ensure_ascii=False), file=stream)
+    else:
+        for path, analysis in results:
+            if not single:
+                print(f"\n📄 {path}", file=stream)
+            print(format_output(analysis), file=stream)
+
+
 def main():
     """Main entry point."""
-    if len(sys.argv) > 1:
-        # Read from file
-        file_path = sys.argv[1]
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Extract keywords, requirements and key phrases from job descriptions")
+    parser.add_argument("files", nargs="*", help="JD text files (default: read one JD from stdin)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="text",
+                        help="text report (default), json, jsonl (one record per file) or binary (MessagePack)")
+    parser.add_argument("--json", action="store_true", help="Same as --format json")
+    parser.add_argument("--profile", action="store_true", help="cProfile the run (report next to the JD file)")
+    parser.add_argument("--profile-memory", action="store_true", help="tracemalloc the run")
+    parser.add_argument("--profile-target", choices=[key for key, _ in ANALYSIS_STEPS],
+                        help="Only profile one analysis step (implies --profile)")
+    args = parser.parse_args()
+    output_format = "json" if args.json else args.format
+
+    inputs = []
+    for file_path in args.files:
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                jd_text = f.read()
+                inputs.append((file_path, f.read()))
         except FileNotFoundError:
             print(f"Error: File '{file_path}' not found.", file=sys.stderr)
             sys.exit(1)
-    else:
-        # Read from stdin
-        print("Paste the job description (press Ctrl+D when done):")
-        jd_text = sys.stdin.read()
+    if not inputs:
+        # Read from stdin (keep stdout clean for machine-readable formats)
+        print("Paste the job description (press Ctrl+D when done):",
+              file=sys.stdout if output_format == "text" else sys.stderr)
+        inputs.append(("-", sys.stdin.read()))
 
-    if not jd_text.strip():
+    if len(inputs) == 1 and not inputs[0][1].strip():
         print("Error: No input provided.", file=sys.stderr)
         sys.exit(1)
 
-    analysis = analyze_jd(jd_text)
-    output = format_output(analysis)
-    print(output)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    if args.profile or args.profile_memory or args.profile_target:
+        # Profile a local run; reports go next to the first JD file (or the cwd for stdin)
+        import profiling
+
+        profiler = profiling.from_flags(args.profile, args.profile_memory, args.profile_target,
+                                        label="extract_jd_keywords")
+        with profiling.activate(profiler):
+            results = [(path, _analyze_profiled(text)) for path, text in inputs]
+        write_output(results, output_format)
+        first = inputs[0][0]
+        profiler.write(os.path.dirname(os.path.abspath(first)) if first != "-" else os.getcwd())
+        return
+
+    # Served by the daemon when one is running (see daemon.py); repeated JDs
+    # in one batch are analyzed once (jd_analysis_cache.py)
+    from daemon_client import try_call
+    from jd_analysis_cache import analyze
+
+    results = []
+    for path, text in inputs:
+        handled, analysis = try_call("keywords", {"text": text})
+        results.append((path, analysis if handled else analyze(text)))
+    write_output(results, output_format)
 
 
 if __name__ == "__main__":
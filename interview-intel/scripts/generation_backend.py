@@ -0,0 +1,565 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+生成后端 - 队友按段落调用模型填充 [待 AI 生成] 占位
+
+队友文档 (assets/templates/teammate_*.md) 中每个 **[待 AI ...]** 占位是一个
+段落请求: 所在小节标题、占位提示和队友输入 (公司、职位、JD、简历、上游文档)
+组成提示词，由生成后端返回内容替换占位。配置在 pipeline_config.json 的
+generation:
+
+    "generation": {
+      "backend": "placeholder",        # placeholder (保留占位) / http
+      "url": "http://127.0.0.1:8765",  # http 后端地址 (本地桩服务见 generation_stub.py)
+      "batch_size": 16,                # 每次调用最多合并的段落数
+      "batch_window": 0.02,            # 合并等待窗口 (秒)
+      "max_in_flight": 8,              # 全局同时进行的调用数
+      "tokens_per_minute": 0,          # 全局 token 速率上限 (0 为不限)
+      "max_tokens": 512,               # 每个段落的生成上限
+      "stream": false,                 # 流式生成，边生成边写入产物文件
+      "timeout": 120,
+      "cache": {"enabled": true, "max_mb": 256}   # 响应缓存 (见 response_cache.py)
+    }
+
+- 批量: 各队友、各包提交的段落请求在 batch_window 内合并为一次调用
+  (POST /generate)；
+- 限流: 所有调用共享 max_in_flight 和 tokens_per_minute (令牌桶，按提示词与
+  max_tokens 估算)；
+- 流式: stream 为 true 时每个段落单独调用 POST /stream (逐行 JSON)，文档按顺序
+  边生成边写入输出文件旁的临时文件 (.<文件名>.partial，见 artifact_store.partial_path)，
+  可以在生成过程中查看；最终文档由 ArtifactStore 原子写出后删除临时文件；
+- 缓存: 提示词、模板版本和后端相同的段落直接取自响应缓存，同一进程中正在
+  生成的相同段落只请求一次。
+
+http 后端协议:
+    POST /generate  {"requests": [{"id", "prompt", "section", "inline", "max_tokens"}, ...]}
+                    → {"responses": [{"id", "text"}, ...]}
+    POST /stream    {"request": {...}} → 每行一个 {"text": "..."}，最后一行 {"done": true}
+"""
+
+import re
+import json
+import time
+import queue
+import itertools
+import threading
+import contextvars
+import concurrent.futures
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from tracing import span
+
+DEFAULT_SETTINGS = {
+    "backend": "placeholder",
+    "url": "http://127.0.0.1:8765",
+    "batch_size": 16,
+    "batch_window": 0.02,
+    "max_in_flight": 8,
+    "tokens_per_minute": 0,
+    "max_tokens": 512,
+    "stream": False,
+    "timeout": 120
+}
+
+# 队友文档中的待生成占位: **[待 AI 生成 - 提示]**、**[待 AI 识别]**、清单中的 [待 AI 生成] 等
+PLACEHOLDER = re.compile(r"(?:\*\*)?\[待 AI ([^\]]*)\](?:\*\*)?")
+_HEADING = re.compile(r"^#{1,6}\s+(.+?)\s*$", re.M)
+
+# 提示词中每份上游文档 / JD / 简历的最大字符数
+MAX_CONTEXT_CHARS = 6000
+
+# 段落请求 id 的进程内序号: 同一队友的多次 fill() (分节文档各节) 可能进入同一批次，
+# id 必须在批次内唯一
+_request_ids = itertools.count(1)
+
+
+class GenerationError(Exception):
+    """生成后端调用失败"""
+
+
+def estimate_tokens(text: str) -> int:
+    """粗略估算 token 数 (中文约 1 字 1 token，其他约 4 字符 1 token)"""
+    wide = sum(1 for char in text if ord(char) > 0x2E7F)
+    return max(1, wide + (len(text) - wide) // 4)
+
+
+class RateLimiter:
+    """全局并发上限 + token 速率上限 (令牌桶)"""
+
+    def __init__(self, max_in_flight: int = 8, tokens_per_minute: float = 0):
+        """
+        Args:
+            max_in_flight: 同时进行的调用数
+            tokens_per_minute: 每分钟 token 上限 (0 为不限)
+        """
+        self._slots = threading.BoundedSemaphore(max(1, max_in_flight))
+        self.rate = tokens_per_minute / 60.0
+        self.capacity = float(tokens_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take(self, tokens: int):
+        # 单次请求超过桶容量时等桶满后放行，避免永远等待
+        tokens = min(tokens, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait = (tokens - self._tokens) / self.rate
+            time.sleep(wait)
+
+    @contextmanager
+    def acquire(self, tokens: int) -> Iterator[None]:
+        """占用一个调用名额并扣除 tokens (阻塞直到可用)"""
+        with self._slots:
+            if self.rate > 0:
+                self._take(tokens)
+            yield
+
+
+class GenerationBackend:
+    """生成后端接口"""
+
+    # 是否经网络 / 子进程调用 (异步运行时据此把生成放到线程池中执行)
+    remote = True
+    # 参与响应缓存键: 不同后端的生成结果互不复用
+    name = ""
+
+    def generate(self, requests: List[Dict]) -> List[str]:
+        """一次调用生成多个段落，返回顺序与 requests 一致"""
+        raise NotImplementedError
+
+    def stream(self, request: Dict) -> Iterator[str]:
+        """流式生成一个段落 (默认: 整段返回)"""
+        yield self.generate([request])[0]
+
+
+class PlaceholderBackend(GenerationBackend):
+    """保留占位 (默认): 文档由外部 (Claude Code 等) 填充"""
+
+    remote = False
+    name = "placeholder"
+
+    def generate(self, requests: List[Dict]) -> List[str]:
+        return [request["placeholder"] for request in requests]
+
+
+class HTTPBackend(GenerationBackend):
+    """通过 HTTP 调用生成服务 (协议见模块说明)"""
+
+    def __init__(self, url: str, timeout: float = 120):
+        self.url = self.name = url.rstrip("/")
+        self.timeout = timeout
+
+    def _post(self, path: str, payload: Dict):
+        import urllib.request
+        import urllib.error
+
+        request = urllib.request.Request(
+            self.url + path, data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+            headers={"Content-Type": "application/json"}, method="POST")
+        try:
+            return urllib.request.urlopen(request, timeout=self.timeout)
+        except (urllib.error.URLError, OSError) as e:
+            raise GenerationError(f"{self.url}{path}: {e}") from e
+
+    @staticmethod
+    def _wire(request: Dict) -> Dict:
+        return {key: request[key] for key in ("id", "prompt", "section", "inline", "max_tokens")}
+
+    def generate(self, requests: List[Dict]) -> List[str]:
+        ids = [r["id"] for r in requests]
+        if len(set(ids)) != len(ids):
+            # 响应按 id 对应回请求，重复的 id 会让段落取到别的段落的内容
+            duplicates = sorted({id_ for id_ in ids if ids.count(id_) > 1})
+            raise GenerationError(f"批次中段落 id 重复: {', '.join(duplicates)}")
+        with self._post("/generate", {"requests": [self._wire(r) for r in requests]}) as response:
+            texts = {item["id"]: item["text"] for item in json.load(response)["responses"]}
+        missing = [r["id"] for r in requests if r["id"] not in texts]
+        if missing:
+            raise GenerationError(f"响应缺少段落: {', '.join(missing)}")
+        return [texts[r["id"]] for r in requests]
+
+    def stream(self, request: Dict) -> Iterator[str]:
+        with self._post("/stream", {"request": self._wire(request)}) as response:
+            for line in response:
+                if not line.strip():
+                    continue
+                message = json.loads(line)
+                if message.get("done"):
+                    return
+                yield message["text"]
+
+
+class SectionBatcher:
+    """把各线程提交的段落请求在短窗口内合并为批量调用"""
+
+    def __init__(self, backend: GenerationBackend, limiter: RateLimiter, batch_size: int,
+                 window: float, workers: int, stats: Dict[str, int], lock: threading.Lock):
+        self.backend = backend
+        self.limiter = limiter
+        self.batch_size = max(1, batch_size)
+        self.window = window
+        # 与 Generator 共用的统计和锁 (流式段落在其他线程中更新同一份统计)
+        self.stats = stats
+        self._stats_lock = lock
+        self._queue: "queue.Queue" = queue.Queue()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, workers), thread_name_prefix="generation")
+        self._dispatcher = threading.Thread(target=self._dispatch, name="generation-batcher", daemon=True)
+        self._dispatcher.start()
+
+    def submit(self, request: Dict) -> concurrent.futures.Future:
+        """提交一个段落请求，返回结果为生成文本的 Future"""
+        future: concurrent.futures.Future = concurrent.futures.Future()
+        self._queue.put((request, future, contextvars.copy_context()))
+        return future
+
+    def _dispatch(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get(timeout=max(0.0, deadline - time.monotonic())))
+                except queue.Empty:
+                    break
+            # 在第一个请求的上下文中调用，span 记录在其 trace 中
+            self._executor.submit(batch[0][2].run, self._call, batch)
+
+    def _call(self, batch: List):
+        requests = [request for request, _, _ in batch]
+        tokens = sum(estimate_tokens(r["prompt"]) + r["max_tokens"] for r in requests)
+        try:
+            with self.limiter.acquire(tokens), span("generate", "generation", sections=len(requests)):
+                texts = self.backend.generate(requests)
+        except Exception as e:
+            for _, future, _ in batch:
+                future.set_exception(e)
+            return
+        with self._stats_lock:
+            self.stats["calls"] += 1
+            self.stats["sections"] += len(requests)
+            self.stats["tokens"] += tokens
+        for (_, future, _), text in zip(batch, texts):
+            future.set_result(text)
+
+
+def find_sections(draft: str) -> List[Dict]:
+    """
+    草稿中的待生成段落
+
+    Returns:
+        [{"start", "end", "placeholder", "hint", "section", "inline"}, ...]；
+        inline 为 True 表示占位不独占一行 (表格、列表项)，只能填一行文本
+    """
+    headings = [(m.start(), m.group(1)) for m in _HEADING.finditer(draft)]
+    sections = []
+    for match in PLACEHOLDER.finditer(draft):
+        line_start = draft.rfind("\n", 0, match.start()) + 1
+        line_end = draft.find("\n", match.end())
+        line = draft[line_start:len(draft) if line_end < 0 else line_end]
+        heading = next((text for position, text in reversed(headings) if position < match.start()), "")
+        sections.append({
+            "start": match.start(),
+            "end": match.end(),
+            "placeholder": match.group(0),
+            "hint": match.group(1).strip(),
+            "section": heading,
+            "inline": line.strip() != match.group(0)
+        })
+    return sections
+
+
+def _clip(text: str) -> str:
+    return text if len(text) <= MAX_CONTEXT_CHARS else text[:MAX_CONTEXT_CHARS] + "\n…(已截断)"
+
+
+def build_prompt(section: Dict, context: Dict) -> str:
+    """段落的提示词: 角色与任务、段落要求、队友输入"""
+    lines = [
+        f"你是{context.get('author', '面试准备顾问')}，正在为「{context.get('company', '')}」"
+        f"的「{context.get('role', '')}」职位撰写《{context.get('document', '')}》。",
+        f"请只输出「{section['section']}」部分的内容（{section['hint']}），使用 Markdown，不要编造事实。",
+    ]
+    if section["inline"]:
+        lines.append("输出一行文本，不要换行。")
+    if context.get("candidate"):
+        lines.append(f"候选人: {context['candidate']}")
+    for title, key in (("JD", "jd"), ("简历", "resume")):
+        if context.get(key):
+            lines += ["", f"## {title}", _clip(context[key])]
+    for prefix, document in sorted(context.get("upstream", {}).items()):
+        # 上游文档为结构化副本 (artifact_sidecar)，同一文档中先生成的节为文本
+        if not isinstance(document, str):
+            from artifact_sidecar import digest
+
+            document = digest(document)
+        lines += ["", f"## 上游文档 {prefix}", _clip(document)]
+    return "\n".join(lines)
+
+
+def _inline(text: str) -> str:
+    # 表格单元格 / 列表项内只能放一行
+    return " ".join(text.split()).replace("|", "\\|")
+
+
+class Generator:
+    """队友调用的段落生成入口 (批量、限流、流式)"""
+
+    def __init__(self, backend: GenerationBackend, settings: Optional[Dict] = None, cache=None):
+        """
+        Args:
+            backend: 生成后端
+            settings: generation 配置
+            cache: 响应缓存 (ResponseCache)，None 为不缓存
+        """
+        self.backend = backend
+        self.settings = {**DEFAULT_SETTINGS, **(settings or {})}
+        self.cache = cache
+        self.limiter = RateLimiter(self.settings["max_in_flight"], self.settings["tokens_per_minute"])
+        self.stats = {"calls": 0, "sections": 0, "tokens": 0}
+        self._batcher: Optional[SectionBatcher] = None
+        self._lock = threading.Lock()
+        # 缓存键 -> 正在生成的 Future (同一进程中相同段落只请求一次)
+        self._inflight: Dict[str, concurrent.futures.Future] = {}
+
+    @property
+    def active(self) -> bool:
+        """是否真正生成 (占位后端时队友文档保持原样)"""
+        return not isinstance(self.backend, PlaceholderBackend)
+
+    @property
+    def remote(self) -> bool:
+        return self.backend.remote
+
+    def _batch(self) -> SectionBatcher:
+        with self._lock:
+            if self._batcher is None:
+                self._batcher = SectionBatcher(
+                    self.backend, self.limiter, self.settings["batch_size"], self.settings["batch_window"],
+                    self.settings["max_in_flight"], self.stats, self._lock)
+            return self._batcher
+
+    def requests(self, draft: str, context: Dict) -> List[Dict]:
+        """草稿的段落请求 (附 prompt / max_tokens / id)"""
+        requests = []
+        for section in find_sections(draft):
+            request = dict(section, prompt=build_prompt(section, context),
+                           max_tokens=self.settings["max_tokens"])
+            request["id"] = f"{context.get('teammate', 'doc')}-{next(_request_ids)}"
+            request["key"] = self._key(request, context)
+            requests.append(request)
+        return requests
+
+    def _key(self, request: Dict, context: Dict) -> str:
+        from response_cache import ResponseCache
+        return ResponseCache.key(request["prompt"], context.get("template", ""), self.backend.name,
+                                 request["max_tokens"])
+
+    def _cached(self, request: Dict) -> Optional[str]:
+        return None if self.cache is None else self.cache.get(request["key"])
+
+    def _submit(self, request: Dict) -> Tuple[concurrent.futures.Future, bool]:
+        """提交到批量调用; 相同段落正在生成时复用其 Future (返回 (Future, 是否新提交))"""
+        batcher = self._batch()
+        with self._lock:
+            future = self._inflight.get(request["key"])
+            if future is not None:
+                return future, False
+            future = self._inflight[request["key"]] = batcher.submit(request)
+
+        def done(_):
+            with self._lock:
+                self._inflight.pop(request["key"], None)
+
+        future.add_done_callback(done)
+        return future, True
+
+    def fill(self, draft: str, context: Dict, output_file: Optional[Path] = None) -> str:
+        """
+        生成草稿中的全部段落并替换占位
+
+        Args:
+            draft: 模板渲染出的文档
+            context: {"teammate", "author", "document", "company", "role"[, "candidate", "jd", "resume", "upstream"]}
+            output_file: 流式生成时边生成边写入该文件 (路径，实际写入其 partial_path() 临时文件；
+                或 OrderedWriter.part() 等可写对象)
+
+        Returns:
+            填充后的文档
+        """
+        requests = self.requests(draft, context)
+        if not requests:
+            return draft
+
+        if self.settings["stream"] and output_file is not None:
+            if hasattr(output_file, "write"):
+                return self._fill_streaming(draft, requests, output_file)
+            from artifact_store import partial_path
+
+            partial = partial_path(output_file)
+            try:
+                with open(partial, 'w', encoding='utf-8') as f:
+                    return self._fill_streaming(draft, requests, f)
+            except BaseException:
+                # 成功时由最终文档的原子写入删除
+                partial.unlink(missing_ok=True)
+                raise
+        return self._fill_batched(draft, requests)
+
+    def flush(self):
+        """把本次运行的响应缓存命中统计累加到 stats.json (每次运行结束时调用一次，不在每次 fill 后写盘)"""
+        if self.cache is not None:
+            self.cache.save_stats()
+
+    def _fill_batched(self, draft: str, requests: List[Dict]) -> str:
+        texts: List[Optional[str]] = [self._cached(request) for request in requests]
+        pending = {index: self._submit(request) for index, request in enumerate(requests) if texts[index] is None}
+        for index, (future, submitted) in pending.items():
+            texts[index] = future.result()
+            if submitted and self.cache is not None:
+                self.cache.put(requests[index]["key"], texts[index])
+        return self._assemble(draft, requests, texts)
+
+    @staticmethod
+    def _assemble(draft: str, requests: List[Dict], texts: List[str]) -> str:
+        parts, position = [], 0
+        for request, text in zip(requests, texts):
+            parts.append(draft[position:request["start"]])
+            parts.append(_inline(text) if request["inline"] else text.strip())
+            position = request["end"]
+        parts.append(draft[position:])
+        return "".join(parts)
+
+    def _stream_section(self, request: Dict) -> Iterator[str]:
+        tokens = estimate_tokens(request["prompt"]) + request["max_tokens"]
+        with self.limiter.acquire(tokens), span("stream", "generation", section=request["section"]):
+            yield from self.backend.stream(request)
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["sections"] += 1
+            self.stats["tokens"] += tokens
+
+    def _fill_streaming(self, draft: str, requests: List[Dict], f) -> str:
+        # 按文档顺序逐段流式生成，收到的内容立即追加到输出
+        parts, position = [], 0
+
+        def emit(text: str):
+            parts.append(text)
+            f.write(text)
+            f.flush()
+
+        for request in requests:
+            emit(draft[position:request["start"]])
+            cached = self._cached(request)
+            chunks = []
+            for chunk in self._stream_section(request) if cached is None else [cached]:
+                chunks.append(chunk)
+                if request["inline"]:
+                    chunk = _inline(chunk) + (" " if chunk[-1:].isspace() else "")
+                f.write(chunk)
+                f.flush()
+            # 内存中的内容与批量模式一致 (去掉首尾空白 / 行内折叠)
+            text = "".join(chunks)
+            if cached is None and self.cache is not None:
+                self.cache.put(request["key"], text)
+            parts.append(_inline(text) if request["inline"] else text.strip())
+            position = request["end"]
+        emit(draft[position:])
+        return "".join(parts)
+
+
+class OrderedWriter:
+    """
+    并发生成的文档各部分按顺序流式写入一个文件
+
+    当前部分的内容直接写入文件，后面部分的内容先缓冲，前面的部分完成后依次
+    写出，文件内容始终是文档的一个前缀。写入的是 path 的 partial_path() 临时
+    文件，最终文档由 ArtifactStore 原子写出 (生成失败时 close(False) 删除临时文件)。
+    """
+
+    class Part:
+        """一个部分的可写对象 (传给 Generator.fill 的 output_file)"""
+
+        def __init__(self, writer: "OrderedWriter", index: int):
+            self.writer = writer
+            self.index = index
+            self.written = False
+
+        def write(self, text: str):
+            self.written = True
+            self.writer._write(self.index, text)
+
+        def flush(self):
+            pass
+
+    def __init__(self, path: Path, parts: int):
+        from artifact_store import partial_path
+
+        self.path = partial_path(path)
+        self._file = open(self.path, 'w', encoding='utf-8')
+        self._buffers: List[List[str]] = [[] for _ in range(parts)]
+        self._done = [False] * parts
+        self._current = 0
+        self._lock = threading.Lock()
+
+    def part(self, index: int) -> "OrderedWriter.Part":
+        return OrderedWriter.Part(self, index)
+
+    def _write(self, index: int, text: str):
+        with self._lock:
+            if index == self._current:
+                self._file.write(text)
+                self._file.flush()
+            else:
+                self._buffers[index].append(text)
+
+    def finish(self, index: int):
+        """第 index 部分已完成; 依次写出后续已缓冲的部分"""
+        with self._lock:
+            self._done[index] = True
+            while self._current < len(self._done) and self._done[self._current]:
+                self._current += 1
+                if self._current < len(self._done):
+                    self._file.write("".join(self._buffers[self._current]))
+                    self._buffers[self._current] = []
+            self._file.flush()
+
+    def close(self, completed: bool = True):
+        self._file.close()
+        if not completed:
+            self.path.unlink(missing_ok=True)
+
+
+def create_generator(config: Dict, url: Optional[str] = None, base_path: str = ".") -> Generator:
+    """
+    按 pipeline_config.json 的 generation 创建生成入口
+
+    Args:
+        url: 指定时改用该地址的 http 后端 (覆盖配置)
+        base_path: 项目基础路径 (响应缓存位于其 .cache/generation/)
+    """
+    settings = {**DEFAULT_SETTINGS, **config.get("generation", {})}
+    if url:
+        settings.update(backend="http", url=url)
+
+    if settings["backend"] == "placeholder":
+        backend: GenerationBackend = PlaceholderBackend()
+    elif settings["backend"] == "http":
+        backend = HTTPBackend(settings["url"], settings["timeout"])
+    else:
+        raise ValueError(f"未知的生成后端: {settings['backend']}")
+
+    cache = None
+    if settings["backend"] != "placeholder":
+        from response_cache import ResponseCache
+        cache = ResponseCache.from_config(base_path, settings.get("cache", {}))
+    return Generator(backend, settings, cache)
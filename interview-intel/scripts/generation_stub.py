@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+生成后端本地桩服务 - 测试 http 生成后端、批量、限流和流式写入
+
+实现 generation_backend.py 中的 http 协议，按提示词哈希返回确定性的文本
+(同一提示词总是得到同样的内容)，可模拟调用延迟和生成速度。
+
+用法:
+    python generation_stub.py --port 8765 --latency 0.2 --tokens-per-second 200
+    python pipeline_team.py batch candidates.json --generation-url http://127.0.0.1:8765
+
+    # 代码中 (端口 0 为自动分配):
+    with running(latency=0.05) as url:
+        generator = create_generator(config, url=url)
+"""
+
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Iterator, List
+
+
+def _words(request: Dict) -> List[str]:
+    digest = hashlib.sha256(request["prompt"].encode("utf-8")).hexdigest()[:8]
+    words = [f"【{request.get('section') or '正文'}】", "桩服务生成内容", f"({digest})"]
+    if not request.get("inline"):
+        words += ["\n\n-", "要点一:", f"{digest[:4]}", "\n-", "要点二:", f"{digest[4:]}"]
+    return words
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """POST /generate、POST /stream、GET /health"""
+
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _json(self, payload: Dict):
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read(self) -> Dict:
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def do_GET(self):
+        if self.path != "/health":
+            self.send_error(404)
+            return
+        self._json({"ok": True, "calls": self.server.calls, "sections": self.server.sections})
+
+    def do_POST(self):
+        payload = self._read()
+        with self.server.lock:
+            self.server.calls += 1
+        time.sleep(self.server.latency)
+
+        if self.path == "/generate":
+            requests = payload.get("requests", [])
+            with self.server.lock:
+                self.server.sections += len(requests)
+                self.server.batch_sizes.append(len(requests))
+            self._json({"responses": [{"id": r["id"], "text": " ".join(_words(r))} for r in requests]})
+        elif self.path == "/stream":
+            request = payload["request"]
+            with self.server.lock:
+                self.server.sections += 1
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for word in self._stream(request):
+                self.wfile.write(json.dumps({"text": word}, ensure_ascii=False).encode("utf-8") + b"\n")
+                self.wfile.flush()
+            self.wfile.write(b'{"done": true}\n')
+            self.close_connection = True
+        else:
+            self.send_error(404)
+
+    def _stream(self, request: Dict) -> Iterator[str]:
+        words = _words(request)
+        for index, word in enumerate(words):
+            if self.server.tokens_per_second:
+                time.sleep(1.0 / self.server.tokens_per_second)
+            yield word if index == len(words) - 1 else word + " "
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int, latency: float = 0.0, tokens_per_second: float = 0.0, verbose: bool = False):
+        super().__init__(("127.0.0.1", port), StubHandler)
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.verbose = verbose
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.sections = 0
+        self.batch_sizes: List[int] = []
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+@contextmanager
+def running(port: int = 0, latency: float = 0.0, tokens_per_second: float = 0.0) -> Iterator[StubServer]:
+    """在后台线程运行桩服务 (server.url 为地址)"""
+    server = StubServer(port, latency, tokens_per_second)
+    thread = threading.Thread(target=server.serve_forever, name="generation-stub", daemon=True)
+    thread.start()
+    try:
+        yield server
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成后端本地桩服务")
+    parser.add_argument("--port", type=int, default=8765, help="端口 (默认: 8765)")
+    parser.add_argument("--latency", type=float, default=0.0, help="每次调用的延迟 (秒)")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="流式生成速度 (0 为不限)")
+    parser.add_argument("--verbose", action="store_true", help="打印请求日志")
+    args = parser.parse_args()
+
+    server = StubServer(args.port, args.latency, args.tokens_per_second, args.verbose)
+    print(f"🧪 生成桩服务: {server.url} (Ctrl+C 停止)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"共 {server.calls} 次调用，{server.sections} 个段落")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,6 +13,10 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from template_engine import render as render_template
+
 
 class IcebreakerGenerator:
     """Generates icebreaker messages for job applications."""
@@ -216,101 +220,19 @@ class IcebreakerGenerator:
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(content)
 
-        return str(output_file)
-
-    def _format_messages(self, messages: Dict[str, Any]) -> str:
-        """Format messages as markdown."""
-        report = f"""# 破冰开场白 - {messages['company']} {messages['role']}
-
-**生成时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
----
-
-## 策略 A: 实力精准匹配
-
-### 适用场景
-{self._format_list(messages['strategy_a_professional']['适用场景'])}
-
-### 开场白文案
-
-```
-{messages['strategy_a_professional']['message']}
-```
-
-**字数**: {messages['strategy_a_professional']['word_count']} 字
-
-### 结构拆解
-- **挂钩**: {messages['strategy_a_professional']['structure']['hook']}
-- **证明**: {messages['strategy_a_professional']['structure']['proof']}
-- **行动**: {messages['strategy_a_professional']['structure']['cta']}
-
-### 优势
-{messages['strategy_a_professional']['优势']}
-
-### 注意事项
-{self._format_list(messages['strategy_a_professional']['注意事项'])}
-
----
-
-## 策略 B: 业务痛点共鸣
-
-### 适用场景
-{messages['strategy_b_insight']['适用场景']}
+        import artifact_sidecar
 
-### 开场白文案
+        # Structured copy next to the report (<file>.json): the messages data for downstream tools
+        artifact_sidecar.write(output_file, artifact_sidecar.parse_file(output_file, "generate_icebreaker", messages))
 
-```
-{messages['strategy_b_insight']['message']}
-```
-
-**字数**: {messages['strategy_b_insight']['word_count']} 字
-
-### 结构拆解
-- **挂钩**: {messages['strategy_b_insight']['structure']['hook']}
-- **证明**: {messages['strategy_b_insight']['structure']['proof']}
-- **行动**: {messages['strategy_b_insight']['structure']['cta']}
-
-### 优势
-{messages['strategy_b_insight']['优势']}
-
-### 注意事项
-{self._format_list(messages['strategy_b_insight']['注意事项'])}
-
----
-
-## 使用指南
-
-### 如何选择策略
-
-**使用策略 A 当**:
-{self._format_list(messages['usage_guide']['选择策略']['使用策略A'])}
-
-**使用策略 B 当**:
-{self._format_list(messages['usage_guide']['选择策略']['使用策略B'])}
-
-### 最佳发送时机
-{self._format_list(messages['usage_guide']['发送时机'])}
-
-### 禁忌词汇
-{self._format_list(messages['usage_guide']['禁忌词汇'])}
-
-### 加分技巧
-{self._format_list(messages['usage_guide']['加分技巧'])}
-
----
+        return str(output_file)
 
-**生成工具**: Interview Intel - Icebreaker Generator
-"""
-        return report
-
-    def _format_list(self, items) -> str:
-        """Format items as markdown list."""
-        if isinstance(items, str):
-            return f"- {items}"
-        elif isinstance(items, list):
-            return '\n'.join([f"- {item}" for item in items])
-        else:
-            return str(items)
+    def _format_messages(self, messages: Dict[str, Any]) -> str:
+        """Format messages as markdown (assets/templates/icebreaker.md)."""
+        return render_template("icebreaker.md", {
+            **messages,
+            "generated_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        })
 
 
 def main():
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Interview Intel CLI
+
+Single entry point for all scripts:
+
+    interview-intel <command> [args...]
+
+Each subcommand's implementation module is imported only when that subcommand
+runs, so `interview-intel --help` and every command pay for nothing but the
+modules they actually use. Keep this file's top-level imports to modules the
+interpreter has already loaded at startup (`os`, `sys`).
+"""
+
+import os
+import sys
+
+# command -> (module, description, import-time budget in ms)
+# Budgets cover the module's own import (cumulative, from `python -X importtime`)
+# on top of the bare interpreter; `interview-intel startup-check` enforces them.
+COMMANDS = {
+    "pipeline": ("pipeline_team", "专业化流水线团队 - 并行生成面试准备包", 40),
+    "history": ("run_history", "流水线运行历史: 各队友 / 阶段耗时 p50/p95/p99", 30),
+    "watch": ("pipeline_watch", "监控 JD / 简历变更并增量重跑受影响的队友", 45),
+    "all-in-one": ("all_in_one", "一键执行完整面试准备工作流", 35),
+    "setup": ("setup_company_folder", "创建公司文件夹结构", 30),
+    "keywords": ("extract_jd_keywords", "提取 JD 关键词", 20),
+    "optimize": ("resume_optimizer", "简历-JD 匹配与 STAR 改写", 30),
+    "strategy": ("interview_strategy", "生成面试攻防策略", 30),
+    "icebreaker": ("icebreaker_generator", "生成破冰文案", 30),
+    "resume": ("resume_manager", "简历版本管理", 35),
+    "track": ("interview_tracker", "面试轮次追踪", 35),
+    "import-rounds": ("round_importer", "从 CSV / ICS 批量导入面试轮次", 40),
+    "analytics": ("analytics_generator", "统计分析与看板", 35),
+    "daemon": ("daemon", "常驻守护进程 (Unix socket JSON API)", 60),
+    "bench": ("benchmark_pipeline", "合成数据性能基准 (输出 JSON 结果，可跨提交比较)", 60),
+}
+
+PROG = "interview-intel"
+
+
+def print_usage():
+    """Print top-level help."""
+    print("Interview Intel")
+    print(f"\nUsage:\n  {PROG} <command> [args...]\n")
+    print("Commands:")
+    width = max(len(name) for name in COMMANDS)
+    for name, (_, description, _) in COMMANDS.items():
+        print(f"  {name:<{width}}  {description}")
+    print(f"  {'startup-check':<{width}}  测量各命令的导入耗时并检查预算")
+    print(f"\nRun '{PROG} <command>' without arguments for command-specific help.")
+
+
+def _ensure_scripts_on_path():
+    """Make sibling script modules importable regardless of the caller's cwd."""
+    scripts_dir = os.path.dirname(os.path.abspath(__file__))
+    if scripts_dir not in sys.path:
+        sys.path.insert(0, scripts_dir)
+    return scripts_dir
+
+
+def run_command(name: str, argv: list) -> int:
+    """
+    Import a subcommand's module and run its main() with the given arguments.
+
+    Args:
+        name: Subcommand name (key of COMMANDS)
+        argv: Arguments after the subcommand
+
+    Returns:
+        Process exit code
+    """
+    module_name = COMMANDS[name][0]
+    _ensure_scripts_on_path()
+
+    module = __import__(module_name)
+
+    sys.argv = [f"{PROG} {name}"] + list(argv)
+    try:
+        module.main()
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    return 0
+
+
+def measure_import_ms(module_name: str, scripts_dir: str) -> float:
+    """
+    Measure a module's cumulative import time in a fresh interpreter.
+
+    Returns:
+        Import time in milliseconds (best of 3 runs)
+    """
+    import subprocess
+
+    best = None
+    for _ in range(3):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+            cwd=scripts_dir, capture_output=True, text=True
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Failed to import {module_name}: {result.stderr.strip().splitlines()[-1]}")
+
+        for line in result.stderr.splitlines():
+            parts = [p.strip() for p in line.split("|")]
+            if len(parts) == 3 and parts[2] == module_name:
+                cumulative_ms = int(parts[1]) / 1000
+                best = cumulative_ms if best is None else min(best, cumulative_ms)
+                break
+
+    return best or 0.0
+
+
+def startup_check() -> int:
+    """
+    Compare every subcommand's import time against its budget.
+
+    Returns:
+        0 when all commands are within budget, 1 otherwise
+    """
+    scripts_dir = _ensure_scripts_on_path()
+
+    print(f"\n⏱️  Import-time budget check ({sys.executable})\n")
+    print(f"  {'command':<14} {'module':<22} {'import':>9} {'budget':>8}")
+
+    over_budget = []
+    for name, (module_name, _, budget_ms) in COMMANDS.items():
+        elapsed = measure_import_ms(module_name, scripts_dir)
+        status = "✅" if elapsed <= budget_ms else "❌"
+        if elapsed > budget_ms:
+            over_budget.append(name)
+        print(f"{status} {name:<14} {module_name:<22} {elapsed:>7.1f}ms {budget_ms:>6}ms")
+
+    if over_budget:
+        print(f"\n❌ Over budget: {', '.join(over_budget)}")
+        return 1
+
+    print("\n✅ All commands within budget")
+    return 0
+
+
+def main():
+    """Main CLI entry point."""
+    if len(sys.argv) < 2 or sys.argv[1] in ("-h", "--help", "help"):
+        print_usage()
+        sys.exit(0 if len(sys.argv) >= 2 else 1)
+
+    command = sys.argv[1]
+
+    if command == "startup-check":
+        sys.exit(startup_check())
+
+    if command not in COMMANDS:
+        print(f"Unknown command: {command}", file=sys.stderr)
+        print_usage()
+        sys.exit(1)
+
+    sys.exit(run_command(command, sys.argv[2:]))
+
+
+if __name__ == "__main__":
+    main()
@@ -13,6 +13,10 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from template_engine import render as render_template
+
 
 class InterviewStrategy:
     """Generates comprehensive interview preparation strategies."""
@@ -410,182 +414,19 @@ class InterviewStrategy:
         with open(output_file, 'w', encoding='utf-8') as f:
             f.write(content)
 
-        return str(output_file)
-
-    def _format_strategy_report(self, strategy: Dict[str, Any]) -> str:
-        """Format strategy as markdown report."""
-        report = f"""# 面试攻防策略
-
-**生成时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-**目标职位**: {strategy['role']}
-**简历版本**: {strategy['resume_version']}
-
----
-
-## 一、Round 1: HR 筛选面试
-
-### 关注重点
-{self._format_list(strategy['round_1_hr']['focus_areas'])}
-
-### 识别到的风险点
-{self._format_risk_points(strategy['round_1_hr']['risk_points'])}
-
-### 防坑话术
-{self._format_defense_scripts(strategy['round_1_hr']['defense_scripts'])}
-
-### 准备建议
-{self._format_list(strategy['round_1_hr']['preparation_tips'])}
-
----
-
-## 二、Round 2: 业务负责人面试
-
-### 关注重点
-{self._format_list(strategy['round_2_business']['focus_areas'])}
-
-### 高概率问题
-{self._format_questions(strategy['round_2_business']['likely_questions'])}
-
-### 可能深挖的话题
-{self._format_list(strategy['round_2_business']['deep_dive_topics'])}
+        import artifact_sidecar
 
-### 准备建议
-{self._format_list(strategy['round_2_business']['preparation_tips'])}
+        # Structured copy next to the report (<file>.json): the strategy report data for downstream tools
+        artifact_sidecar.write(output_file, artifact_sidecar.parse_file(output_file, "generate_strategy", strategy))
 
----
-
-## 三、Round 3: 高管/终面
-
-### 关注重点
-{self._format_list(strategy['round_3_executive']['focus_areas'])}
-
-### 高概率问题
-{self._format_executive_questions(strategy['round_3_executive']['likely_questions'])}
-
-### 宏观话题
-{self._format_macro_topics(strategy['round_3_executive'].get('macro_topics', []))}
-
-### 准备建议
-{self._format_list(strategy['round_3_executive']['preparation_tips'])}
-
----
-
-## 四、必杀技案例准备
-
-{self._format_killer_cases(strategy['killer_cases'])}
-
----
-
-## 五、风险缓解策略
-
-{self._format_risk_mitigation(strategy['risk_mitigation'])}
-
----
+        return str(output_file)
 
-**生成工具**: Interview Intel - Interview Strategy
-"""
-        return report
-
-    def _format_list(self, items: List[str]) -> str:
-        """Format list items."""
-        return '\n'.join([f"- {item}" for item in items])
-
-    def _format_risk_points(self, risks: List[Dict[str, str]]) -> str:
-        """Format risk points."""
-        if not risks:
-            return "- 未识别到明显风险"
-
-        output = []
-        for risk in risks:
-            output.append(f"**{risk['risk_type']}**: {risk['concern']}")
-        return '\n\n'.join(output)
-
-    def _format_defense_scripts(self, scripts: List[Dict[str, str]]) -> str:
-        """Format defense scripts."""
-        output = []
-        for i, script in enumerate(scripts, 1):
-            output.append(f"""
-#### 话术 {i}
-
-**❌ 错误示范**: {script.get('bad_answer', 'N/A')}
-
-**✅ 正确示范**: {script.get('good_answer', 'N/A')}
-
-**关键要点**:
-{self._format_list(script.get('key_points', []))}
-""")
-        return '\n'.join(output)
-
-    def _format_questions(self, questions: List[Dict[str, str]]) -> str:
-        """Format predicted questions."""
-        output = []
-        for i, q in enumerate(questions, 1):
-            output.append(f"""
-#### 问题 {i}: {q['question']}
-
-**为什么会问**: {q['why_asked']}
-
-**回答框架**: {q['answer_framework']}
-""")
-        return '\n'.join(output)
-
-    def _format_executive_questions(self, questions: List[Dict[str, str]]) -> str:
-        """Format executive round questions."""
-        output = []
-        for i, q in enumerate(questions, 1):
-            output.append(f"""
-#### 问题 {i}: {q['question']}
-
-**回答方向**: {q['answer_direction']}
-""")
-        return '\n'.join(output)
-
-    def _format_macro_topics(self, topics: List[Dict[str, str]]) -> str:
-        """Format macro topics."""
-        if not topics:
-            return "- 暂无特定话题"
-
-        output = []
-        for topic in topics:
-            output.append(f"- **{topic['topic']}**: {topic['angle']}")
-        return '\n'.join(output)
-
-    def _format_killer_cases(self, cases: List[Dict[str, Any]]) -> str:
-        """Format killer cases."""
-        output = []
-        for i, case in enumerate(cases, 1):
-            output.append(f"""
-### 案例 {i}: {case['case_name']}
-
-**要求**: {case['requirement']}
-
-**结构**:
-{self._format_case_structure(case['structure'])}
-
-**准备检查清单**:
-{self._format_list(case['prep_checklist'])}
-""")
-        return '\n'.join(output)
-
-    def _format_case_structure(self, structure: Dict[str, str]) -> str:
-        """Format case structure."""
-        output = []
-        for key, value in structure.items():
-            output.append(f"- **{key}**: {value}")
-        return '\n'.join(output)
-
-    def _format_risk_mitigation(self, mitigation: Dict[str, Any]) -> str:
-        """Format risk mitigation."""
-        output = [f"**识别风险**: {', '.join(mitigation['identified_risks']) if mitigation['identified_risks'] else '无明显风险'}"]
-
-        if mitigation['mitigation_strategies']:
-            output.append("\n**缓解策略**:")
-            for strategy in mitigation['mitigation_strategies']:
-                output.append(f"\n**风险**: {strategy['risk']}")
-                output.append(f"**策略**: {strategy['approach']}")
-                output.append(f"**战术**:\n{self._format_list(strategy['tactics'])}")
-
-        return '\n'.join(output)
+    def _format_strategy_report(self, strategy: Dict[str, Any]) -> str:
+        """Format strategy as markdown report (assets/templates/interview_strategy.md)."""
+        return render_template("interview_strategy.md", {
+            "strategy": strategy,
+            "generated_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        })
 
 
 def main():
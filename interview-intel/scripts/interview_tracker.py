@@ -9,9 +9,14 @@ import os
 import sys
 import json
 from pathlib import Path
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from state_io import file_lock, read_json, write_json
+
 
 class InterviewTracker:
     """Manages interview tracking data for a company."""
@@ -32,19 +37,38 @@ class InterviewTracker:
 
         # Load tracking data
         self.tracking = self._load_tracking()
+        self._transaction_depth = 0
 
     def _load_tracking(self) -> Dict[str, Any]:
         """Load tracking data from disk."""
-        if self.tracking_path.exists():
-            with open(self.tracking_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        else:
-            return None
+        return read_json(self.tracking_path)
 
     def _save_tracking(self):
-        """Save tracking data to disk."""
-        with open(self.tracking_path, 'w', encoding='utf-8') as f:
-            json.dump(self.tracking, f, indent=2, ensure_ascii=False)
+        """Save tracking data to disk (atomic replace under an exclusive lock)."""
+        write_json(self.tracking_path, self.tracking)
+
+    @contextmanager
+    def _transaction(self):
+        """
+        Lock tracking.json, reload the latest data, and save it on exit.
+
+        Keeps concurrent trackers for the same company from overwriting each
+        other's updates with a stale in-memory copy.
+        """
+        if self._transaction_depth:
+            # Nested call (e.g. add_timeline_event from add_interview_round):
+            # the outer transaction already holds the lock and will save.
+            yield
+            return
+
+        with file_lock(self.tracking_path):
+            self.tracking = self._load_tracking()
+            self._transaction_depth += 1
+            try:
+                yield
+            finally:
+                self._transaction_depth -= 1
+            self._save_tracking()
 
     def init_tracking(
         self,
@@ -69,54 +93,54 @@ class InterviewTracker:
         Returns:
             Dictionary with tracking data
         """
-        if self.tracking:
-            raise ValueError("Tracking already initialized. Use update commands instead.")
-
-        app_date = application_date or datetime.now().strftime("%Y-%m-%d")
-
-        self.tracking = {
-            "application": {
-                "company": company,
-                "role": role,
-                "application_date": app_date,
-                "application_method": application_method,
-                "referral": None,
-                "resume_version_used": resume_version,
-                "cover_letter": False,
-                "jd_file": jd_file
-            },
-            "timeline": [
-                {
-                    "date": app_date,
-                    "event": "Application Submitted",
-                    "status": "submitted"
-                }
-            ],
-            "interviews": [],
-            "overall_status": "submitted",
-            "current_stage": "application_submitted",
-            "total_rounds_expected": 0,
-            "total_rounds_completed": 0,
-            "pass_rate": 0.0,
-            "decision": None,
-            "decision_date": None,
-            "offer_details": None
-        }
+        with self._transaction():
+            if self.tracking:
+                raise ValueError("Tracking already initialized. Use update commands instead.")
+
+            app_date = application_date or datetime.now().strftime("%Y-%m-%d")
+
+            self.tracking = {
+                "application": {
+                    "company": company,
+                    "role": role,
+                    "application_date": app_date,
+                    "application_method": application_method,
+                    "referral": None,
+                    "resume_version_used": resume_version,
+                    "cover_letter": False,
+                    "jd_file": jd_file
+                },
+                "timeline": [
+                    {
+                        "date": app_date,
+                        "event": "Application Submitted",
+                        "status": "submitted"
+                    }
+                ],
+                "interviews": [],
+                "overall_status": "submitted",
+                "current_stage": "application_submitted",
+                "total_rounds_expected": 0,
+                "total_rounds_completed": 0,
+                "pass_rate": 0.0,
+                "decision": None,
+                "decision_date": None,
+                "offer_details": None
+            }
 
-        self._save_tracking()
         return self.tracking
 
     def add_timeline_event(self, date: str, event: str, status: str):
         """Add an event to the timeline."""
-        if not self.tracking:
-            raise ValueError("Tracking not initialized. Run 'init' first.")
+        with self._transaction():
+            if not self.tracking:
+                raise ValueError("Tracking not initialized. Run 'init' first.")
 
-        self.tracking["timeline"].append({
-            "date": date,
-            "event": event,
-            "status": status
-        })
-        self._save_tracking()
+            self.tracking["timeline"].append({
+                "date": date,
+                "event": event,
+                "status": status
+            })
 
     def add_interview_round(
         self,
@@ -149,50 +173,96 @@ class InterviewTracker:
         Returns:
             Dictionary with round data
         """
-        if not self.tracking:
-            raise ValueError("Tracking not initialized. Run 'init' first.")
-
-        round_data = {
-            "round": round_num,
-            "round_name": round_name,
-            "date": date,
-            "time": time,
-            "duration_minutes": duration_minutes,
-            "format": format,
-            "platform": platform,
-            "interviewer": {
-                "name": interviewer_name,
-                "title": interviewer_title,
-                "linkedin": "",
-                "email": ""
-            },
-            "focus_areas": focus_areas or [],
-            "status": "scheduled",
-            "result": None,
-            "difficulty": 0,
-            "confidence": 0,
-            "feedback": {
-                "positive": [],
-                "areas_to_improve": [],
-                "questions_asked": 0,
-                "questions_answered_well": 0
-            },
-            "notes_file": f"interviews/round_{round_num}_notes.md",
-            "follow_up": {
-                "thank_you_sent": False,
-                "thank_you_date": None,
-                "connections_made": []
+        with self._transaction():
+            if not self.tracking:
+                raise ValueError("Tracking not initialized. Run 'init' first.")
+
+            round_data = {
+                "round": round_num,
+                "round_name": round_name,
+                "date": date,
+                "time": time,
+                "duration_minutes": duration_minutes,
+                "format": format,
+                "platform": platform,
+                "interviewer": {
+                    "name": interviewer_name,
+                    "title": interviewer_title,
+                    "linkedin": "",
+                    "email": ""
+                },
+                "focus_areas": focus_areas or [],
+                "status": "scheduled",
+                "result": None,
+                "difficulty": 0,
+                "confidence": 0,
+                "feedback": {
+                    "positive": [],
+                    "areas_to_improve": [],
+                    "questions_asked": 0,
+                    "questions_answered_well": 0
+                },
+                "notes_file": f"interviews/round_{round_num}_notes.md",
+                "follow_up": {
+                    "thank_you_sent": False,
+                    "thank_you_date": None,
+                    "connections_made": []
+                }
             }
-        }
 
-        self.tracking["interviews"].append(round_data)
-        self._save_tracking()
+            self.tracking["interviews"].append(round_data)
 
-        # Add to timeline
-        self.add_timeline_event(date, f"Round {round_num}: {round_name} scheduled", "scheduled")
+            # Add to timeline
+            self.add_timeline_event(date, f"Round {round_num}: {round_name} scheduled", "scheduled")
 
         return round_data
 
+    def add_interview_rounds(self, rounds: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Add many interview rounds with a single load and a single save.
+
+        Rounds without a "round_num" are numbered after the highest existing
+        round. Rounds that already exist (same number, or same name and date
+        when unnumbered) are skipped, so re-importing a calendar is idempotent.
+
+        Args:
+            rounds: Keyword-argument dicts for add_interview_round
+
+        Returns:
+            Dictionary with "added" and "skipped" round lists
+        """
+        added = []
+        skipped = []
+
+        with self._transaction():
+            if not self.tracking:
+                raise ValueError("Tracking not initialized. Run 'init' first.")
+
+            existing_nums = {interview["round"] for interview in self.tracking["interviews"]}
+            existing_keys = {
+                (interview["round_name"], interview["date"])
+                for interview in self.tracking["interviews"]
+            }
+
+            for round_kwargs in rounds:
+                round_kwargs = dict(round_kwargs)
+                key = (round_kwargs["round_name"], round_kwargs["date"])
+
+                if round_kwargs.get("round_num") is None:
+                    if key in existing_keys:
+                        skipped.append(round_kwargs)
+                        continue
+                    round_kwargs["round_num"] = max(existing_nums, default=0) + 1
+                elif round_kwargs["round_num"] in existing_nums:
+                    skipped.append(round_kwargs)
+                    continue
+
+                added.append(self.add_interview_round(**round_kwargs))
+                existing_nums.add(round_kwargs["round_num"])
+                existing_keys.add(key)
+
+        return {"added": added, "skipped": skipped}
+
     def update_round(
         self,
         round_num: int,
@@ -219,78 +289,76 @@ class InterviewTracker:
             questions_asked: Number of questions asked
             questions_answered_well: Number of questions answered well
         """
-        if not self.tracking:
-            raise ValueError("Tracking not initialized. Run 'init' first.")
-
-        # Find the round
-        round_data = None
-        for interview in self.tracking["interviews"]:
-            if interview["round"] == round_num:
-                round_data = interview
-                break
-
-        if not round_data:
-            raise ValueError(f"Round {round_num} not found")
-
-        # Update fields
-        if status:
-            round_data["status"] = status
-        if result:
-            round_data["result"] = result
-        if difficulty is not None:
-            round_data["difficulty"] = difficulty
-        if confidence is not None:
-            round_data["confidence"] = confidence
-
-        # Update feedback
-        if positive_feedback:
-            round_data["feedback"]["positive"] = positive_feedback
-        if improvement_areas:
-            round_data["feedback"]["areas_to_improve"] = improvement_areas
-        if questions_asked is not None:
-            round_data["feedback"]["questions_asked"] = questions_asked
-        if questions_answered_well is not None:
-            round_data["feedback"]["questions_answered_well"] = questions_answered_well
-
-        # Update overall statistics
-        if status == "completed":
-            self.tracking["total_rounds_completed"] = sum(
-                1 for i in self.tracking["interviews"] if i["status"] == "completed"
-            )
-
-            passed_rounds = sum(
-                1 for i in self.tracking["interviews"]
-                if i["status"] == "completed" and i["result"] == "passed"
-            )
-
-            if self.tracking["total_rounds_completed"] > 0:
-                self.tracking["pass_rate"] = passed_rounds / self.tracking["total_rounds_completed"]
-
-        self._save_tracking()
-
-        # Add to timeline
-        if status == "completed" and result:
-            self.add_timeline_event(
-                datetime.now().strftime("%Y-%m-%d"),
-                f"Round {round_num} completed - {result}",
-                result
-            )
+        with self._transaction():
+            if not self.tracking:
+                raise ValueError("Tracking not initialized. Run 'init' first.")
+
+            # Find the round
+            round_data = None
+            for interview in self.tracking["interviews"]:
+                if interview["round"] == round_num:
+                    round_data = interview
+                    break
+
+            if not round_data:
+                raise ValueError(f"Round {round_num} not found")
+
+            # Update fields
+            if status:
+                round_data["status"] = status
+            if result:
+                round_data["result"] = result
+            if difficulty is not None:
+                round_data["difficulty"] = difficulty
+            if confidence is not None:
+                round_data["confidence"] = confidence
+
+            # Update feedback
+            if positive_feedback:
+                round_data["feedback"]["positive"] = positive_feedback
+            if improvement_areas:
+                round_data["feedback"]["areas_to_improve"] = improvement_areas
+            if questions_asked is not None:
+                round_data["feedback"]["questions_asked"] = questions_asked
+            if questions_answered_well is not None:
+                round_data["feedback"]["questions_answered_well"] = questions_answered_well
+
+            # Update overall statistics
+            if status == "completed":
+                self.tracking["total_rounds_completed"] = sum(
+                    1 for i in self.tracking["interviews"] if i["status"] == "completed"
+                )
+
+                passed_rounds = sum(
+                    1 for i in self.tracking["interviews"]
+                    if i["status"] == "completed" and i["result"] == "passed"
+                )
+
+                if self.tracking["total_rounds_completed"] > 0:
+                    self.tracking["pass_rate"] = passed_rounds / self.tracking["total_rounds_completed"]
+
+            # Add to timeline
+            if status == "completed" and result:
+                self.add_timeline_event(
+                    datetime.now().strftime("%Y-%m-%d"),
+                    f"Round {round_num} completed - {result}",
+                    result
+                )
 
     def update_follow_up(self, round_num: int, thank_you_sent: bool, thank_you_date: str = None, connections: List[str] = None):
         """Update follow-up actions for a round."""
-        if not self.tracking:
-            raise ValueError("Tracking not initialized. Run 'init' first.")
-
-        for interview in self.tracking["interviews"]:
-            if interview["round"] == round_num:
-                interview["follow_up"]["thank_you_sent"] = thank_you_sent
-                if thank_you_date:
-                    interview["follow_up"]["thank_you_date"] = thank_you_date
-                if connections:
-                    interview["follow_up"]["connections_made"] = connections
-                break
-
-        self._save_tracking()
+        with self._transaction():
+            if not self.tracking:
+                raise ValueError("Tracking not initialized. Run 'init' first.")
+
+            for interview in self.tracking["interviews"]:
+                if interview["round"] == round_num:
+                    interview["follow_up"]["thank_you_sent"] = thank_you_sent
+                    if thank_you_date:
+                        interview["follow_up"]["thank_you_date"] = thank_you_date
+                    if connections:
+                        interview["follow_up"]["connections_made"] = connections
+                    break
 
     def update_decision(self, decision: str, decision_date: str = None, offer_details: Dict[str, Any] = None):
         """
@@ -301,24 +369,23 @@ class InterviewTracker:
             decision_date: Date of decision
             offer_details: Details if offer received
         """
-        if not self.tracking:
-            raise ValueError("Tracking not initialized. Run 'init' first.")
+        with self._transaction():
+            if not self.tracking:
+                raise ValueError("Tracking not initialized. Run 'init' first.")
 
-        self.tracking["decision"] = decision
-        self.tracking["decision_date"] = decision_date or datetime.now().strftime("%Y-%m-%d")
-        self.tracking["overall_status"] = decision
+            self.tracking["decision"] = decision
+            self.tracking["decision_date"] = decision_date or datetime.now().strftime("%Y-%m-%d")
+            self.tracking["overall_status"] = decision
 
-        if offer_details:
-            self.tracking["offer_details"] = offer_details
+            if offer_details:
+                self.tracking["offer_details"] = offer_details
 
-        self._save_tracking()
-
-        # Add to timeline
-        self.add_timeline_event(
-            self.tracking["decision_date"],
-            f"Decision: {decision}",
-            decision
-        )
+            # Add to timeline
+            self.add_timeline_event(
+                self.tracking["decision_date"],
+                f"Decision: {decision}",
+                decision
+            )
 
     def get_status(self) -> Dict[str, Any]:
         """Get current status summary."""
@@ -386,10 +453,12 @@ def main():
         print("  python interview_tracker.py update --company-path <path> --round <num> --status <status> --result <result>")
         print("  python interview_tracker.py status --company-path <path>")
         print("  python interview_tracker.py timeline --company-path <path> [--format text|json]")
+        print("  python interview_tracker.py import --file <rounds.csv|calendar.ics> [--base-path <path>]")
         print("\nExamples:")
         print('  python interview_tracker.py init --company-path ~/InterviewIntel/SIF --company SIF --role "Backend Engineer" --resume v2.0')
         print('  python interview_tracker.py add-round --company-path ~/InterviewIntel/SIF --round 1 --name "Phone Screen" --date 2026-01-25')
         print('  python interview_tracker.py update --company-path ~/InterviewIntel/SIF --round 1 --status completed --result passed')
+        print('  python interview_tracker.py import --file calendar.ics --base-path ~/InterviewIntel')
         sys.exit(1)
 
     command = sys.argv[1]
@@ -489,6 +558,12 @@ def main():
             timeline = tracker.generate_timeline(format)
             print(timeline)
 
+        elif command == "import":
+            from round_importer import bulk_import, format_summary
+
+            summary = bulk_import(args.get("base-path", os.getcwd()), args["file"])
+            print(format_summary(summary))
+
         else:
             print(f"Unknown command: {command}")
             sys.exit(1)
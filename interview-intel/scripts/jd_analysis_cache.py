@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JD 分析缓存 - 同一 JD 的 extract_jd_keywords.analyze_jd 结果只计算一次
+
+重新发布的 JD 很常见 (同一职位多次投递、多位候选人、一键工作流重跑)。
+分析结果只取决于 JD 文本和分析器版本，缓存键为:
+
+    sha256(KEY_VERSION + EXTRACTOR_VERSION + "\\0" + 归一化的 JD 文本)
+
+归一化 (Unicode NFC、空白折叠) 只用于计算键: 换行、缩进、全角空格不同的
+同一 JD 共用一个条目。分析本身在调用方传入的原文上进行 (与直接调用
+analyze_jd 一致)；只有空白不同的两份 JD 共享先分析的那份的结果，差异仅在
+句子内部的空白。
+
+两级缓存:
+
+- 进程内 LRU (默认 256 条): 命中只是一次字典查找；
+- 磁盘 (<base_path>/.cache/jd_analysis/<键前两位>/<键>.json，原子写入):
+  跨进程、跨运行复用；不给 base_path 时只用进程内缓存。
+
+分析器版本变化 (EXTRACTOR_VERSION) 后旧条目不再命中。返回的分析结果在
+调用方之间共享，只读使用。
+
+用法:
+    python jd_analysis_cache.py stats [--json]
+    python jd_analysis_cache.py clear
+
+    # 代码中:
+    from jd_analysis_cache import analyze
+    analysis = analyze(jd_text, base_path)
+"""
+
+import sys
+import json
+import time
+import shutil
+import hashlib
+import argparse
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from state_io import atomic_write_json
+
+CACHE_DIR = Path(".cache") / "jd_analysis"
+
+DEFAULT_MAX_ENTRIES = 256
+
+# 键格式版本: 2 起分析原文而不是归一化文本，旧条目不再命中
+KEY_VERSION = 2
+
+
+def normalize_jd(text: str) -> str:
+    """JD 文本归一化: NFC、空白折叠"""
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+class JDAnalysisCache:
+    """analyze_jd 的进程内 LRU + 磁盘缓存"""
+
+    def __init__(self, base_path: Optional[str] = None, max_entries: int = DEFAULT_MAX_ENTRIES):
+        """
+        Args:
+            base_path: 项目基础路径 (磁盘缓存位置)；None 为只用进程内缓存
+            max_entries: 进程内 LRU 的条目数
+        """
+        self.root = None if base_path is None else Path(base_path) / CACHE_DIR
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0}
+
+    @staticmethod
+    def key(normalized: str) -> str:
+        """缓存键 (归一化文本 + 键格式版本 + 分析器版本的 SHA-256)"""
+        from extract_jd_keywords import EXTRACTOR_VERSION
+
+        return hashlib.sha256(f"{KEY_VERSION}\0{EXTRACTOR_VERSION}\0{normalized}".encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _remember(self, key: str, analysis: Dict):
+        with self._lock:
+            self._memory[key] = analysis
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[Dict]:
+        from extract_jd_keywords import EXTRACTOR_VERSION, restore_analysis
+
+        try:
+            with open(self._path(key), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+            if entry["version"] != EXTRACTOR_VERSION:
+                return None
+            return restore_analysis(entry["analysis"])
+        except (OSError, ValueError, KeyError, TypeError):
+            # 不存在或内容损坏都按未命中处理
+            return None
+
+    def analyze(self, jd_text: str) -> Dict:
+        """JD 的分析结果 (extract_jd_keywords.analyze_jd 的返回格式，只读)"""
+        key = self.key(normalize_jd(jd_text))
+        with self._lock:
+            analysis = self._memory.get(key)
+            if analysis is not None:
+                self._memory.move_to_end(key)
+                self.stats["memory_hits"] += 1
+                return analysis
+
+        analysis = self._load(key) if self.root is not None else None
+        if analysis is not None:
+            with self._lock:
+                self.stats["disk_hits"] += 1
+        else:
+            from extract_jd_keywords import EXTRACTOR_VERSION, analyze_jd
+
+            analysis = analyze_jd(jd_text)
+            with self._lock:
+                self.stats["misses"] += 1
+            if self.root is not None:
+                atomic_write_json(self._path(key), {"version": EXTRACTOR_VERSION, "created": time.time(),
+                                                    "analysis": analysis}, indent=None)
+        self._remember(key, analysis)
+        return analysis
+
+    def report(self) -> Dict:
+        """{"entries", "bytes", "memory_entries", ...stats}"""
+        entries = list(self.root.glob("??/*.json")) if self.root is not None else []
+        return {
+            "entries": len(entries),
+            "bytes": sum(path.stat().st_size for path in entries),
+            "memory_entries": len(self._memory),
+            **self.stats
+        }
+
+    def clear(self):
+        """清空进程内和磁盘缓存"""
+        with self._lock:
+            self._memory.clear()
+        if self.root is not None:
+            shutil.rmtree(self.root, ignore_errors=True)
+
+
+# base_path (None 为只用进程内缓存) -> 本进程共享的缓存
+_caches: Dict[Optional[str], JDAnalysisCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_cache(base_path: Optional[str] = None) -> JDAnalysisCache:
+    """本进程中 base_path 对应的共享缓存"""
+    key = None if base_path is None else str(Path(base_path).resolve())
+    with _caches_lock:
+        if key not in _caches:
+            _caches[key] = JDAnalysisCache(key)
+        return _caches[key]
+
+
+def analyze(jd_text: str, base_path: Optional[str] = None) -> Dict:
+    """带缓存的 analyze_jd (base_path 为 None 时只用进程内缓存)"""
+    return get_cache(base_path).analyze(jd_text)
+
+
+def main():
+    """CLI: 查看或清空 JD 分析缓存"""
+    parser = argparse.ArgumentParser(description="JD 分析缓存")
+    parser.add_argument("--base-path", default=".", help="项目基础路径 (默认: .)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    stats_parser = subparsers.add_parser("stats", help="条目数和大小")
+    stats_parser.add_argument("--json", action="store_true", help="输出 JSON")
+    subparsers.add_parser("clear", help="清空缓存")
+    args = parser.parse_args()
+
+    cache = JDAnalysisCache(args.base_path)
+    if args.command == "stats":
+        report = cache.report()
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False, indent=2))
+        else:
+            print(f"条目: {report['entries']}  大小: {report['bytes'] / 1024:.1f} KB")
+    else:
+        cache.clear()
+        print("🗑️  已清空 JD 分析缓存")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JD 修订差异 - 新旧 JD 的要求逐句对齐，确定需要重新生成的章节
+
+同一职位的 JD 重新保存时往往只改了一两句要求，整包重跑却要重新生成全部
+段落。本模块:
+
+1. 拆分要求句 (与 extract_jd_keywords.categorize_requirements 相同的思路，
+   补充中文标点和列表编号): 每句归入 required (任职要求) / preferred (加分项) /
+   responsibility (岗位职责) / other。句内的强弱信号词优先，其次取所在小标题
+   (「任职要求:」「加分项:」「岗位职责:」等)；
+2. 对齐新旧要求句: 归一化后完全相同的句子先配对 (分类变化的算修改)，其余
+   按 difflib 相似度从高到低贪心配对 (≥ MODIFIED_THRESHOLD 为修改)，剩下的
+   为新增 / 删除；
+3. 映射到章节 (plan_revision): pipeline_config.json 中读取 JD 的队友以
+   jd_sections 声明各类要求影响的章节 (二级标题)；分节文档 (sections) 的各节以
+   「前缀#标题」声明依赖的上游章节，只重新生成依赖已变化章节的节；其余依赖
+   已变化上游的文档整篇重新生成。
+
+流水线中由 PipelineTeam.revise (pipeline_team.py --revise) 按计划只重新生成
+受影响的章节，其余章节原样保留。
+
+用法:
+    python jd_diff.py old_jd.txt new_jd.txt            # 变更的要求与受影响的章节
+    python jd_diff.py old_jd.txt new_jd.txt --json
+"""
+
+import re
+import sys
+import json
+import argparse
+import difflib
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+CATEGORIES = ("required", "preferred", "responsibility", "other")
+
+# 归一化文本的相似度不低于该值时，未完全相同的两句视为同一要求的修改
+MODIFIED_THRESHOLD = 0.5
+
+# 中文信号词 (英文沿用 extract_jd_keywords 的 STRONG_INDICATORS / PREFERRED_INDICATORS)
+STRONG_INDICATORS_ZH = ("必须", "须具备", "需具备", "硬性")
+PREFERRED_INDICATORS_ZH = ("优先", "加分", "更佳", "者佳")
+
+# 小标题 -> 分类 (按顺序匹配，「加分项要求」归 preferred)
+HEADING_CATEGORIES = (
+    ("preferred", ("加分", "优先", "preferred", "nice to have", "bonus", "plus")),
+    ("required", ("要求", "任职", "资格", "requirement", "qualification")),
+    ("responsibility", ("职责", "工作内容", "职位描述", "岗位描述", "responsibilit", "what you")),
+)
+
+# 句末标点 (中文标点后直接断开，英文标点后需有空白)
+_SENTENCE_END = re.compile(r"(?<=[。！？；;])|(?<=[.!?])\s+")
+# 行首的列表标记: - * • 1. 1、 1) (1)
+_LIST_MARKER = re.compile(r"^\s*(?:[-*•·▪]|\d{1,2}[.、)）]|[（(]\d{1,2}[)）])\s*")
+# 小标题最长字符数
+_HEADING_MAX_CHARS = 20
+# 文档切分的章节标题 (一级 / 二级)
+_BLOCK_HEADING = re.compile(r"^#{1,2}\s+(.+?)\s*$")
+
+
+def _key(text: str) -> str:
+    """对齐用的归一化文本: 大小写折叠，去掉空白和标点"""
+    return re.sub(r"[\W_]+", "", text.casefold())
+
+
+def _heading_category(line: str) -> Optional[str]:
+    """小标题行 (「任职要求:」「## 加分项」) 的分类；不是小标题时返回 None"""
+    text = line.strip().lstrip("#").strip()
+    is_heading = line.lstrip().startswith("#") or (text.endswith((":", "：")) and len(text) <= _HEADING_MAX_CHARS)
+    if not is_heading:
+        return None
+    lowered = text.casefold()
+    for category, words in HEADING_CATEGORIES:
+        if any(word in lowered for word in words):
+            return category
+    return "other"
+
+
+def _sentence_category(sentence: str, heading: str) -> str:
+    from extract_jd_keywords import PREFERRED_INDICATORS, STRONG_INDICATORS
+
+    lowered = sentence.casefold()
+    if any(word in lowered for word in PREFERRED_INDICATORS + list(PREFERRED_INDICATORS_ZH)):
+        return "preferred"
+    if any(word in lowered for word in STRONG_INDICATORS + list(STRONG_INDICATORS_ZH)):
+        return "required"
+    return heading
+
+
+def split_requirements(text: str) -> List[Dict]:
+    """
+    JD 的要求句
+
+    Returns:
+        [{"text", "category", "line"}] (按出现顺序；line 从 1 开始)
+    """
+    requirements = []
+    heading = "other"
+    for number, line in enumerate(text.splitlines(), 1):
+        category = _heading_category(line)
+        if category is not None:
+            heading = category
+            continue
+        for sentence in _SENTENCE_END.split(_LIST_MARKER.sub("", line)):
+            sentence = sentence.strip()
+            if _key(sentence):
+                requirements.append({"text": sentence, "category": _sentence_category(sentence, heading),
+                                     "line": number})
+    return requirements
+
+
+def _similarity(a: str, b: str) -> float:
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    if matcher.real_quick_ratio() < MODIFIED_THRESHOLD or matcher.quick_ratio() < MODIFIED_THRESHOLD:
+        return 0.0
+    return matcher.ratio()
+
+
+def diff_requirements(old_text: str, new_text: str) -> Dict:
+    """
+    新旧 JD 的要求差异
+
+    Returns:
+        {"added": [要求], "removed": [要求], "modified": [{"old", "new", "similarity"}],
+         "unchanged": 数量}；要求为 split_requirements 的条目，各列表按在 JD 中的顺序
+    """
+    old, new = split_requirements(old_text), split_requirements(new_text)
+    old_keys, new_keys = [_key(r["text"]) for r in old], [_key(r["text"]) for r in new]
+
+    # 完全相同的句子 (可能重复出现，按顺序配对)
+    positions: Dict[str, deque] = defaultdict(deque)
+    for index, key in enumerate(old_keys):
+        positions[key].append(index)
+    pairs: Dict[int, Tuple[int, float]] = {}
+    for index, key in enumerate(new_keys):
+        if positions[key]:
+            pairs[index] = (positions[key].popleft(), 1.0)
+
+    # 其余句子按相似度贪心配对
+    matched_old = {old_index for old_index, _ in pairs.values()}
+    candidates = sorted(
+        ((_similarity(old_keys[i], new_keys[j]), i, j)
+         for i in range(len(old)) if i not in matched_old
+         for j in range(len(new)) if j not in pairs),
+        key=lambda item: (-item[0], item[2], item[1]))
+    for score, i, j in candidates:
+        if score < MODIFIED_THRESHOLD:
+            break
+        if i not in matched_old and j not in pairs:
+            pairs[j] = (i, score)
+            matched_old.add(i)
+
+    result = {"added": [], "removed": [], "modified": [], "unchanged": 0}
+    for j, requirement in enumerate(new):
+        if j not in pairs:
+            result["added"].append(requirement)
+            continue
+        i, score = pairs[j]
+        if score == 1.0 and old[i]["category"] == requirement["category"]:
+            result["unchanged"] += 1
+        else:
+            result["modified"].append({"old": old[i], "new": requirement, "similarity": round(score, 3)})
+    result["removed"] = [requirement for i, requirement in enumerate(old) if i not in matched_old]
+    return result
+
+
+def changed_categories(diff: Dict) -> List[str]:
+    """差异涉及的要求分类 (修改同时计入修改前后的分类)"""
+    categories = {r["category"] for r in diff["added"] + diff["removed"]}
+    for change in diff["modified"]:
+        categories.update((change["old"]["category"], change["new"]["category"]))
+    return [category for category in CATEGORIES if category in categories]
+
+
+def _changed_by(dependency: str, changed: Set[str]) -> bool:
+    """
+    依赖是否受已变化章节影响
+
+    changed 中「前缀」为整篇变化，「前缀#章节」为只有该章节 (标题或节 id，
+    去掉空白) 变化；依赖「前缀」受该文档任何变化影响，「前缀#标题」只受
+    该章节或整篇变化影响。
+    """
+    prefix, _, title = dependency.partition("#")
+    if prefix in changed:
+        return True
+    if title:
+        return f"{prefix}#{''.join(title.split())}" in changed
+    return any(key.startswith(prefix + "#") for key in changed)
+
+
+def plan_revision(diff: Dict, config: Dict) -> Dict[str, Optional[List[str]]]:
+    """
+    需要重新生成的章节
+
+    读取 JD 的队友 (inputs 含 "jd")，有 jd_sections 时取各变更分类声明的章节
+    标题，否则整篇；分节文档 (sections) 取依赖已变化上游章节 (或同文档中需
+    重新生成的节) 的节 id；其余依赖已变化上游的文档整篇重新生成。上游按
+    章节记录变化，只依赖上游部分章节 (「01#职位深度分析」) 的节不受其他章节
+    变化影响。
+
+    Returns:
+        {teammate_id: 章节标题 / 节 id 列表，None 为整篇}，不需要重新生成的队友不出现
+        (按阶段顺序)
+    """
+    categories = changed_categories(diff)
+    if not categories:
+        return {}
+
+    teammates = {teammate["id"]: teammate for teammate in config["teammates"].values()}
+    order = [tid for stage in config["stages"].values() for tid in stage["teammates"]]
+    plan: Dict[str, Optional[List[str]]] = {}
+    changed: Set[str] = set()
+    for teammate_id in order:
+        teammate = teammates[teammate_id]
+        if "jd" in teammate.get("inputs", []):
+            if "jd_sections" in teammate:
+                titles = []
+                for category in categories:
+                    titles += [title for title in teammate["jd_sections"].get(category, []) if title not in titles]
+                selected = titles
+            else:
+                selected = None
+        elif "sections" in teammate:
+            selected = []
+            for section in teammate["sections"]:
+                dependencies = section.get("dependencies", teammate.get("dependencies", []))
+                if any(d in selected or _changed_by(d, changed) for d in dependencies):
+                    selected.append(section["id"])
+        else:
+            selected = None if any(_changed_by(d, changed) for d in teammate.get("dependencies", [])) else []
+
+        prefix = teammate["output_file"][:2]
+        if selected is None:
+            plan[teammate_id] = None
+            changed.add(prefix)
+        elif selected:
+            plan[teammate_id] = selected
+            changed.update(f"{prefix}#{''.join(title.split())}" for title in selected)
+    return plan
+
+
+def split_blocks(text: str) -> List[Tuple[str, str]]:
+    """
+    按一级 / 二级标题切分文档 (代码块中的 # 行不算标题)
+
+    Returns:
+        [(标题, 文本)]；第一个标题之前的正文标题为 ""，各段文本依次拼接即为原文
+    """
+    blocks = []
+    title, lines, in_code = "", [], False
+    for line in text.splitlines(True):
+        stripped = line.strip()
+        if stripped.startswith("```"):
+            in_code = not in_code
+        match = None if in_code else _BLOCK_HEADING.match(stripped)
+        if match:
+            if lines:
+                blocks.append((title, "".join(lines)))
+            title, lines = match.group(1), []
+        lines.append(line)
+    if lines:
+        blocks.append((title, "".join(lines)))
+    return blocks
+
+
+def locate_parts(content: str, parts: List[str]) -> Optional[List[int]]:
+    """
+    草稿各部分在已生成文档中的起始位置
+
+    有标题的部分以其第一个标题行定位；没有标题的部分 (如页脚) 须不含待生成
+    占位，以全文定位。按顺序向后查找，第一部分从文档开头算起。
+
+    Returns:
+        各部分的起始偏移；有部分定位不到时返回 None
+    """
+    from generation_backend import PLACEHOLDER
+
+    starts, position = [], 0
+    for index, part in enumerate(parts):
+        heading = next((line.strip() for line in part.splitlines() if line.lstrip().startswith("#")), None)
+        if heading is not None:
+            match = re.compile(rf"^[ \t]*{re.escape(heading)}[ \t]*$", re.M).search(content, position)
+            found = match.start() if match else -1
+        elif part.strip() and not PLACEHOLDER.search(part):
+            found = content.find(part.strip(), position)
+        else:
+            return None
+        if found < 0:
+            return None
+        starts.append(0 if index == 0 else found)
+        position = found + 1
+    return starts
+
+
+def main():
+    """CLI: 比较两份 JD，列出变更的要求和需要重新生成的章节"""
+    from pipeline_team import load_pipeline_config
+    from tracing import read_text
+
+    parser = argparse.ArgumentParser(description="JD 修订差异与受影响的章节")
+    parser.add_argument("old", help="旧 JD 文件")
+    parser.add_argument("new", help="新 JD 文件")
+    parser.add_argument("--json", action="store_true", help="输出 JSON")
+    args = parser.parse_args()
+
+    diff = diff_requirements(read_text(Path(args.old)), read_text(Path(args.new)))
+    plan = plan_revision(diff, load_pipeline_config())
+    if args.json:
+        print(json.dumps({"diff": diff, "plan": plan}, ensure_ascii=False, indent=2))
+        return 0
+
+    for requirement in diff["added"]:
+        print(f"+ [{requirement['category']}] {requirement['text']}")
+    for requirement in diff["removed"]:
+        print(f"- [{requirement['category']}] {requirement['text']}")
+    for change in diff["modified"]:
+        print(f"~ [{change['new']['category']}] {change['old']['text']}")
+        print(f"    → {change['new']['text']} ({change['similarity']:.0%})")
+    print(f"\n新增 {len(diff['added'])}，删除 {len(diff['removed'])}，修改 {len(diff['modified'])}，"
+          f"未变 {diff['unchanged']}")
+    if not plan:
+        print("无需重新生成")
+    for teammate_id, sections in plan.items():
+        print(f"🔄 {teammate_id}: {'整篇' if sections is None else '、'.join(sections)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+近似重复 JD 索引 - 这份 JD 是否已经处理过?
+
+同一职位的 JD 常被重新发布: 改了几个词、调整了段落顺序、加了一行福利。
+精确缓存 (jd_analysis_cache、公司情报缓存) 的键是归一化文本的哈希，这类
+改动都会错过。本索引覆盖 <base_path>/companies/*/raw_data/jd_original*.txt
+(流水线包与一键工作流保存的原始 JD)，给出与新 JD 近似重复的已有 JD、所在
+的包目录和估计的相似度。
+
+相似度为字符 SHINGLE-gram 集合的 Jaccard 相似度，用 MinHash 签名估计:
+
+- 签名: 单次哈希的 MinHash (one permutation hashing)。每个 shingle 只算一次
+  crc32 (乘法散列打散)，高 7 位选桶、低 25 位取最小值，共 BINS 个桶；短文本
+  的空桶取右侧第一个非空桶的值加距离偏移 (rotation densification)，
+  两份签名相同位置相等的概率即 Jaccard 相似度；
+- 检索: 签名分为 BANDS 段，任一段完全相同的条目为候选 (LSH)。每段 8 个值，
+  相似度 0.8 的 JD 成为候选的概率约 95%，0.5 的约 6%；
+- 候选按签名的相等比例估计相似度，不低于阈值的返回。
+
+索引持久化在 <base_path>/.cache/jd_index.json (原子写入)，记录每个 JD 文件的
+大小、mtime 和签名；refresh() 只为新增或改动的文件重新计算签名。查询 (签名 +
+分段查找 + 比较候选) 在内存中进行，通常不到 1 毫秒。
+
+用法:
+    python jd_index.py build                      # 建立/刷新索引
+    python jd_index.py query jd.txt               # 近似重复的已有 JD
+    python jd_index.py query jd.txt --threshold 0.6 --json
+
+    # 代码中:
+    from jd_index import find_similar
+    matches = find_similar(jd_text, base_path)     # [{"path", "packet", "similarity", ...}]
+"""
+
+import sys
+import json
+import time
+import zlib
+import base64
+import argparse
+from array import array
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from state_io import atomic_write_json
+
+INDEX_FILE = Path(".cache") / "jd_index.json"
+INDEX_VERSION = 1
+
+# 被索引的原始 JD (流水线包: jd_original.txt；一键工作流: jd_original_<职位>.txt)
+JD_PATTERN = "companies/*/raw_data/jd_original*.txt"
+
+# 字符 shingle 长度 (中英文混排时 5 个字符约为 2-3 个词)
+SHINGLE = 5
+# 签名长度与 LSH 分段 (BINS = BANDS * 每段值数)
+BINS = 128
+BANDS = 16
+ROWS = BINS // BANDS
+
+DEFAULT_THRESHOLD = 0.8
+
+_BIN_BITS = 7
+_VALUE_BITS = 32 - _BIN_BITS
+_VALUE_MASK = (1 << _VALUE_BITS) - 1
+_EMPTY = 1 << 32
+
+
+def shingles(text: str) -> set:
+    """归一化 (NFC、空白折叠、大小写折叠) 后的字符 shingle 集合"""
+    from jd_analysis_cache import normalize_jd
+
+    normalized = normalize_jd(text).casefold()
+    if len(normalized) <= SHINGLE:
+        return {normalized} if normalized else set()
+    return {normalized[i:i + SHINGLE] for i in range(len(normalized) - SHINGLE + 1)}
+
+
+def signature(text: str) -> Optional[array]:
+    """JD 的 MinHash 签名 (BINS 个 32 位值)；空文本返回 None"""
+    mins = [_EMPTY] * BINS
+    for shingle in shingles(text):
+        value = (zlib.crc32(shingle.encode("utf-8")) * 0x9E3779B1) & 0xFFFFFFFF
+        index = value >> _VALUE_BITS
+        value &= _VALUE_MASK
+        if value < mins[index]:
+            mins[index] = value
+    if all(value == _EMPTY for value in mins):
+        return None
+
+    # 空桶: 右侧 (循环) 第一个非空桶的值 + 距离偏移，与该桶自身的值区分开
+    filled = array("I", bytes(4 * BINS))
+    for index in range(BINS):
+        distance = 0
+        value = mins[index]
+        while value == _EMPTY:
+            distance += 1
+            value = mins[(index + distance) % BINS]
+        filled[index] = value + (distance << _VALUE_BITS)
+    return filled
+
+
+def similarity(a: array, b: array) -> float:
+    """两份签名估计的 Jaccard 相似度"""
+    return sum(x == y for x, y in zip(a, b)) / BINS
+
+
+def describe(base_path: Path, relative: str) -> Dict:
+    """
+    已索引 JD 所在的包
+
+    Returns:
+        {"path", "packet", "kind", "company", "role", "candidate"}；kind 为 "packet"
+        (流水线包，有 packet.json) 或 "workflow" (一键工作流的公司文件夹)
+    """
+    from state_io import read_json
+
+    path = Path(base_path) / relative
+    packet = path.parent.parent
+    metadata = read_json(packet / "packet.json")
+    if metadata:
+        return {"path": str(path), "packet": str(packet), "kind": "packet",
+                "company": metadata.get("company"), "role": metadata.get("role"),
+                "candidate": metadata.get("candidate")}
+    role = path.stem[len("jd_original_"):] if path.stem.startswith("jd_original_") else None
+    return {"path": str(path), "packet": str(packet), "kind": "workflow",
+            "company": packet.name, "role": role, "candidate": None}
+
+
+class JDIndex:
+    """已保存 JD 的 MinHash + LSH 索引"""
+
+    def __init__(self, base_path: str = "."):
+        """
+        Args:
+            base_path: 项目基础路径 (包含 companies/)
+        """
+        self.base_path = Path(base_path)
+        self.path = self.base_path / INDEX_FILE
+        # 相对路径 -> {"size", "mtime_ns", "signature"}
+        self.entries: Dict[str, Dict] = {}
+        # 每段: 该段签名字节 -> 相对路径列表
+        self._bands: List[Dict[bytes, List[str]]] = [{} for _ in range(BANDS)]
+
+    def load(self) -> "JDIndex":
+        """读取持久化的索引 (不存在、损坏或参数不同时为空)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data["version"] != INDEX_VERSION or data["params"] != [SHINGLE, BINS, BANDS]:
+                return self
+            for relative, entry in data["entries"].items():
+                self._add(relative, entry["size"], entry["mtime_ns"],
+                          array("I", base64.b64decode(entry["signature"])))
+        except (OSError, ValueError, KeyError, TypeError):
+            self.entries = {}
+            self._bands = [{} for _ in range(BANDS)]
+        return self
+
+    def save(self):
+        """原子写出索引"""
+        atomic_write_json(self.path, {
+            "version": INDEX_VERSION,
+            "params": [SHINGLE, BINS, BANDS],
+            "entries": {
+                relative: {"size": entry["size"], "mtime_ns": entry["mtime_ns"],
+                           "signature": base64.b64encode(entry["signature"].tobytes()).decode("ascii")}
+                for relative, entry in sorted(self.entries.items())
+            }
+        }, indent=None)
+
+    @staticmethod
+    def _band_keys(sig: array) -> Iterable[bytes]:
+        data = sig.tobytes()
+        width = 4 * ROWS
+        return (data[band * width:(band + 1) * width] for band in range(BANDS))
+
+    def _add(self, relative: str, size: int, mtime_ns: int, sig: array):
+        self.entries[relative] = {"size": size, "mtime_ns": mtime_ns, "signature": sig}
+        for band, key in zip(self._bands, self._band_keys(sig)):
+            band.setdefault(key, []).append(relative)
+
+    def _remove(self, relative: str):
+        entry = self.entries.pop(relative)
+        for band, key in zip(self._bands, self._band_keys(entry["signature"])):
+            bucket = band[key]
+            bucket.remove(relative)
+            if not bucket:
+                del band[key]
+
+    def refresh(self, save: bool = True) -> Dict[str, int]:
+        """
+        与磁盘上的 JD 同步: 新增或改动 (大小/mtime 变化) 的文件重新计算签名，删除的移除
+
+        Returns:
+            {"added", "updated", "removed", "entries"}
+        """
+        from tracing import read_text
+
+        counts = {"added": 0, "updated": 0, "removed": 0}
+        seen = set()
+        for path in sorted(self.base_path.glob(JD_PATTERN)):
+            relative = path.relative_to(self.base_path).as_posix()
+            seen.add(relative)
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entry = self.entries.get(relative)
+            if entry and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                continue
+            if entry:
+                self._remove(relative)
+            sig = signature(read_text(path))
+            if sig is None:
+                continue
+            self._add(relative, stat.st_size, stat.st_mtime_ns, sig)
+            counts["updated" if entry else "added"] += 1
+
+        for relative in [relative for relative in self.entries if relative not in seen]:
+            self._remove(relative)
+            counts["removed"] += 1
+
+        if save and any(counts.values()):
+            self.save()
+        return {**counts, "entries": len(self.entries)}
+
+    def query(self, text: str, threshold: float = DEFAULT_THRESHOLD,
+              exclude: Iterable[Path] = ()) -> List[Dict]:
+        """
+        与 text 近似重复的已索引 JD，按相似度从高到低
+
+        Args:
+            text: JD 文本
+            threshold: 最低相似度 (0-1)
+            exclude: 不参与比较的 JD 文件 (如本次运行自己保存的 JD)
+
+        Returns:
+            [{"path", "packet", "kind", "company", "role", "candidate", "similarity"}]
+        """
+        sig = signature(text)
+        if sig is None:
+            return []
+        skip = set()
+        for path in exclude:
+            try:
+                skip.add(Path(path).resolve().relative_to(self.base_path.resolve()).as_posix())
+            except ValueError:
+                continue
+
+        candidates = set()
+        for band, key in zip(self._bands, self._band_keys(sig)):
+            candidates.update(band.get(key, ()))
+        scored = [(similarity(sig, self.entries[relative]["signature"]), relative)
+                  for relative in candidates - skip]
+        return [{**describe(self.base_path, relative), "similarity": round(score, 3)}
+                for score, relative in sorted(scored, key=lambda item: (-item[0], item[1]))
+                if score >= threshold]
+
+
+def find_similar(text: str, base_path: str = ".", threshold: float = DEFAULT_THRESHOLD,
+                 exclude: Iterable[Path] = ()) -> List[Dict]:
+    """刷新 base_path 的索引后查询近似重复的 JD (参数与返回值同 JDIndex.query)"""
+    index = JDIndex(base_path).load()
+    index.refresh()
+    return index.query(text, threshold, exclude)
+
+
+def main():
+    """CLI: 建立索引，或查询近似重复的 JD"""
+    parser = argparse.ArgumentParser(description="近似重复 JD 索引 (MinHash + LSH)")
+    parser.add_argument("--base-path", default=".", help="项目基础路径 (默认: .)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    subparsers.add_parser("build", help="建立/刷新索引")
+    query_parser = subparsers.add_parser("query", help="查询近似重复的已有 JD")
+    query_parser.add_argument("jd", help="JD 文件")
+    query_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                              help=f"最低相似度 (默认: {DEFAULT_THRESHOLD})")
+    query_parser.add_argument("--json", action="store_true", help="输出 JSON")
+    args = parser.parse_args()
+
+    index = JDIndex(args.base_path).load()
+    start = time.perf_counter()
+    counts = index.refresh()
+    refresh_time = time.perf_counter() - start
+
+    if args.command == "build":
+        print(f"📇 索引 {counts['entries']} 份 JD (新增 {counts['added']}，更新 {counts['updated']}，"
+              f"移除 {counts['removed']})，耗时 {refresh_time * 1000:.1f} ms")
+        return 0
+
+    from tracing import read_text
+
+    text = read_text(Path(args.jd))
+    start = time.perf_counter()
+    matches = index.query(text, args.threshold, exclude=[Path(args.jd)])
+    query_time = time.perf_counter() - start
+
+    if args.json:
+        print(json.dumps(matches, ensure_ascii=False, indent=2))
+    elif not matches:
+        print(f"✅ 没有相似度 ≥ {args.threshold:.0%} 的已有 JD ({counts['entries']} 份，查询 {query_time * 1000:.2f} ms)")
+    else:
+        for match in matches:
+            print(f"🔁 {match['similarity']:.0%}  {match['packet']}  ({match['path']})")
+        print(f"\n{len(matches)} 份近似重复 ({counts['entries']} 份，查询 {query_time * 1000:.2f} ms)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Minimal MessagePack encoder/decoder.
+
+Covers the types the analysis scripts emit: None, bool, int, float, str,
+bytes, list/tuple and dict (str keys). The output is standard MessagePack,
+so it can be read with the ``msgpack`` package, which is not a dependency
+of this repo. Several packed objects can be concatenated into one stream;
+``unpack_stream`` reads them back one at a time.
+
+Usage:
+    data = pack({"keywords": ["Python", "SQL"]})
+    unpack(data)                           # {'keywords': ['Python', 'SQL']}
+    list(unpack_stream(pack(a) + pack(b)))  # [a, b]
+"""
+
+import struct
+from typing import Any, Iterator, Tuple
+
+
+def _header(size: int, fix: int, fix_limit: int, codes: Tuple[int, int, int]) -> bytes:
+    if size < fix_limit:
+        return bytes([fix | size])
+    for code, fmt, limit in zip(codes, (">B", ">H", ">I"), (0x100, 0x10000, 0x100000000)):
+        if code and size < limit:
+            return bytes([code]) + struct.pack(fmt, size)
+    raise ValueError(f"object too large to pack: {size}")
+
+
+# Integer formats, smallest first: (code, struct format, bound)
+_UINTS = ((0xcc, ">B", 1 << 8), (0xcd, ">H", 1 << 16), (0xce, ">I", 1 << 32), (0xcf, ">Q", 1 << 64))
+_INTS = ((0xd0, ">b", -(1 << 7)), (0xd1, ">h", -(1 << 15)), (0xd2, ">i", -(1 << 31)), (0xd3, ">q", -(1 << 63)))
+
+
+def _pack_int(value: int) -> bytes:
+    for code, fmt, bound in (_UINTS if value > 0 else _INTS):
+        if (value < bound) if value > 0 else (value >= bound):
+            return bytes([code]) + struct.pack(fmt, value)
+    raise ValueError(f"integer out of range: {value}")
+
+
+def _pack(value: Any, out: bytearray):
+    if value is None:
+        out.append(0xc0)
+    elif value is True or value is False:
+        out.append(0xc3 if value else 0xc2)
+    elif isinstance(value, int):
+        if 0 <= value < 0x80:
+            out.append(value)
+        elif -32 <= value < 0:
+            out.append(value & 0xff)
+        else:
+            out += _pack_int(value)
+    elif isinstance(value, float):
+        out += b"\xcb" + struct.pack(">d", value)
+    elif isinstance(value, str):
+        data = value.encode("utf-8")
+        out += _header(len(data), 0xa0, 32, (0xd9, 0xda, 0xdb)) + data
+    elif isinstance(value, (bytes, bytearray)):
+        out += _header(len(value), 0, 0, (0xc4, 0xc5, 0xc6)) + bytes(value)
+    elif isinstance(value, (list, tuple)):
+        out += _header(len(value), 0x90, 16, (0, 0xdc, 0xdd))
+        for item in value:
+            _pack(item, out)
+    elif isinstance(value, dict):
+        out += _header(len(value), 0x80, 16, (0, 0xde, 0xdf))
+        for key, item in value.items():
+            _pack(key, out)
+            _pack(item, out)
+    else:
+        raise TypeError(f"cannot pack {type(value).__name__}")
+
+
+def pack(value: Any) -> bytes:
+    """Serialize value as MessagePack (tuples become arrays)."""
+    out = bytearray()
+    _pack(value, out)
+    return bytes(out)
+
+
+# Fixed-width formats: code -> (struct format, size)
+_FIXED = {
+    0xca: (">f", 4), 0xcb: (">d", 8),
+    0xcc: (">B", 1), 0xcd: (">H", 2), 0xce: (">I", 4), 0xcf: (">Q", 8),
+    0xd0: (">b", 1), 0xd1: (">h", 2), 0xd2: (">i", 4), 0xd3: (">q", 8),
+}
+# Sized formats: code -> (kind, length format, length size)
+_SIZED = {
+    0xd9: ("str", ">B", 1), 0xda: ("str", ">H", 2), 0xdb: ("str", ">I", 4),
+    0xc4: ("bin", ">B", 1), 0xc5: ("bin", ">H", 2), 0xc6: ("bin", ">I", 4),
+    0xdc: ("array", ">H", 2), 0xdd: ("array", ">I", 4),
+    0xde: ("map", ">H", 2), 0xdf: ("map", ">I", 4),
+}
+
+
+def _unpack(data: bytes, offset: int) -> Tuple[Any, int]:
+    code = data[offset]
+    offset += 1
+    if code < 0x80:
+        return code, offset
+    if code >= 0xe0:
+        return code - 0x100, offset
+    if code == 0xc0:
+        return None, offset
+    if code in (0xc2, 0xc3):
+        return code == 0xc3, offset
+    if code in _FIXED:
+        fmt, size = _FIXED[code]
+        return struct.unpack_from(fmt, data, offset)[0], offset + size
+
+    if 0xa0 <= code <= 0xbf:
+        kind, size = "str", code & 0x1f
+    elif 0x90 <= code <= 0x9f:
+        kind, size = "array", code & 0x0f
+    elif 0x80 <= code <= 0x8f:
+        kind, size = "map", code & 0x0f
+    elif code in _SIZED:
+        kind, fmt, width = _SIZED[code]
+        size = struct.unpack_from(fmt, data, offset)[0]
+        offset += width
+    else:
+        raise ValueError(f"unsupported MessagePack type 0x{code:02x}")
+
+    if kind in ("str", "bin"):
+        chunk = data[offset:offset + size]
+        if len(chunk) < size:
+            raise ValueError("truncated MessagePack data")
+        return (chunk.decode("utf-8") if kind == "str" else bytes(chunk)), offset + size
+    if kind == "array":
+        items = []
+        for _ in range(size):
+            item, offset = _unpack(data, offset)
+            items.append(item)
+        return items, offset
+    result = {}
+    for _ in range(size):
+        key, offset = _unpack(data, offset)
+        result[key], offset = _unpack(data, offset)
+    return result, offset
+
+
+def unpack(data: bytes) -> Any:
+    """Deserialize one MessagePack object (arrays come back as lists)."""
+    try:
+        value, offset = _unpack(data, 0)
+    except (IndexError, struct.error):
+        raise ValueError("truncated MessagePack data") from None
+    if offset != len(data):
+        raise ValueError(f"{len(data) - offset} trailing bytes after MessagePack object")
+    return value
+
+
+def unpack_stream(data: bytes) -> Iterator[Any]:
+    """Deserialize a stream of concatenated MessagePack objects."""
+    offset = 0
+    while offset < len(data):
+        try:
+            value, offset = _unpack(data, offset)
+        except (IndexError, struct.error):
+            raise ValueError("truncated MessagePack data") from None
+        yield value
@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+包质量检查 - 按 pipeline_config.json 的 quality 规则检查生成的面试准备包
+
+每个产物 (01-05) 取其结构化副本 (artifact_sidecar，副本缺失或过期时逐行解析
+一遍 Markdown)，检查:
+
+- 大小: 不小于 quality.min_file_sizes (KB)；
+- 必需章节: quality.required_sections 中的每个名称都出现在某个标题中
+  (忽略空白，允许标题更长: "HR面试" 匹配 "## HR 面试"，"开场白" 匹配
+  "## 针对不同面试官的开场白")；代码块中的 # 行不算标题；
+- 未生成的占位: 剩余的 [待 AI 生成] 等占位及其所在章节。
+
+报告 (--json / --jsonl) 中每个包列出未通过检查的队友 ("failed") 和需要重新
+生成的队友 ("regenerate"，含下游)，--regenerate 直接按此重跑。大量包目录
+在多个进程中并行检查。
+
+用法:
+    python packet_validator.py companies/                       # 检查全部包
+    python packet_validator.py companies/阿里云-产品经理-张三 --json
+    python packet_validator.py companies/ --jsonl --output report.jsonl --workers 8
+    python packet_validator.py companies/ --regenerate --generation-url http://127.0.0.1:8765
+"""
+
+import os
+import sys
+import json
+import argparse
+import concurrent.futures
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+# 少于该数量的包在当前进程中检查 (启动进程池的开销更大)
+PARALLEL_THRESHOLD = 32
+
+# 问题类型
+MISSING_FILE, TOO_SMALL, MISSING_SECTION, PLACEHOLDER = "missing_file", "too_small", "missing_section", "placeholder"
+
+
+def _normalize(text: str) -> str:
+    return "".join(text.split())
+
+
+def load_rules(config: Dict) -> Dict[str, Dict]:
+    """
+    {前缀: {"file", "teammate", "min_bytes", "required_sections"}} (来自 quality 与 teammates)
+    """
+    quality = config.get("quality", {})
+    sizes = quality.get("min_file_sizes", {})
+    sections = quality.get("required_sections", {})
+    rules = {}
+    for teammate in config["teammates"].values():
+        prefix = teammate["output_file"][:2]
+        rules[prefix] = {
+            "file": teammate["output_file"],
+            "teammate": teammate["id"],
+            "min_bytes": int(sizes.get(prefix, 0) * 1024),
+            "required_sections": list(sections.get(prefix, []))
+        }
+    return rules
+
+
+def validate_file(path: Path, rule: Dict, placeholders: bool = True) -> Dict:
+    """
+    检查一个产物 (优先用未过期的结构化副本，否则逐行解析一遍 Markdown)
+
+    Returns:
+        {"file", "teammate", "ok", "bytes", "headings", "issues": [...], "placeholders": [...]}；
+        issue 为 {"type", ...}，placeholder 为 {"line", "section", "hint"}
+    """
+    import artifact_sidecar
+
+    result = {"file": rule["file"], "teammate": rule["teammate"], "ok": True, "bytes": 0,
+              "headings": 0, "issues": [], "placeholders": []}
+    try:
+        document = artifact_sidecar.read(path, rule["teammate"])
+    except FileNotFoundError:
+        result.update(ok=False, issues=[{"type": MISSING_FILE}])
+        return result
+
+    headings = [section["title"] for section in document["sections"] if section["level"]]
+    result.update(bytes=document["source"]["bytes"], headings=len(headings))
+    if placeholders:
+        result["placeholders"] = document["placeholders"]
+
+    normalized = [_normalize(title) for title in headings]
+    if result["bytes"] < rule["min_bytes"]:
+        result["issues"].append({"type": TOO_SMALL, "bytes": result["bytes"], "min_bytes": rule["min_bytes"]})
+    for name in rule["required_sections"]:
+        key = _normalize(name)
+        if not any(key in title for title in normalized):
+            result["issues"].append({"type": MISSING_SECTION, "section": name})
+    if result["placeholders"]:
+        result["issues"].append({"type": PLACEHOLDER, "count": len(result["placeholders"])})
+    result["ok"] = not result["issues"]
+    return result
+
+
+def validate_packet(output_dir: Path, config: Dict, placeholders: bool = True) -> Dict:
+    """
+    检查一个包目录
+
+    Returns:
+        {"packet", "ok", "files": {前缀: 文件结果}, "failed": [teammate_id], "regenerate": [teammate_id]}
+    """
+    from pipeline_team import downstream_teammates
+
+    output_dir = Path(output_dir)
+    files = {prefix: validate_file(output_dir / rule["file"], rule, placeholders)
+             for prefix, rule in sorted(load_rules(config).items())}
+    failed = [result["teammate"] for result in files.values() if not result["ok"]]
+    return {
+        "packet": str(output_dir),
+        "ok": not failed,
+        "files": files,
+        "failed": failed,
+        # 下游基于失败队友的输出生成，需要一起重跑
+        "regenerate": downstream_teammates(config, failed) if failed else []
+    }
+
+
+def find_packets(paths: Iterable[str]) -> List[Path]:
+    """包目录: 直接给出的包目录，或给出目录 (如 companies/) 下的各个包"""
+    from pipeline_team import PACKET_METADATA_FILE
+
+    def is_packet(directory: Path) -> bool:
+        return (directory / PACKET_METADATA_FILE).exists() or any(directory.glob("0[1-5]_*.md"))
+
+    packets = []
+    for value in paths:
+        path = Path(value)
+        if is_packet(path):
+            packets.append(path)
+        elif path.is_dir():
+            packets.extend(child for child in sorted(path.iterdir()) if child.is_dir() and is_packet(child))
+    return packets
+
+
+def _validate_chunk(args) -> List[Dict]:
+    packets, config, placeholders = args
+    return [validate_packet(packet, config, placeholders) for packet in packets]
+
+
+def validate_packets(packets: List[Path], config: Dict, workers: Optional[int] = None,
+                     placeholders: bool = True) -> List[Dict]:
+    """
+    并行检查多个包 (顺序与 packets 一致)
+
+    Args:
+        workers: 进程数 (默认: CPU 数)；包少于 PARALLEL_THRESHOLD 时在当前进程检查
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(packets) < PARALLEL_THRESHOLD:
+        return _validate_chunk((packets, config, placeholders))
+
+    # 按块分发，减少进程间往返
+    size = max(1, len(packets) // (workers * 4))
+    chunks = [(packets[i:i + size], config, placeholders) for i in range(0, len(packets), size)]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+        return [report for chunk in executor.map(_validate_chunk, chunks) for report in chunk]
+
+
+def summarize(report: Dict) -> str:
+    """一个包的单行摘要"""
+    name = Path(report["packet"]).name
+    if report["ok"]:
+        return f"✅ {name}: 全部通过"
+    problems = []
+    for prefix, result in report["files"].items():
+        for issue in result["issues"]:
+            if issue["type"] == MISSING_FILE:
+                problems.append(f"{prefix} 缺失")
+            elif issue["type"] == TOO_SMALL:
+                problems.append(f"{prefix} {issue['bytes'] / 1024:.1f}K < {issue['min_bytes'] / 1024:.0f}K")
+            elif issue["type"] == MISSING_SECTION:
+                problems.append(f"{prefix} 缺少「{issue['section']}」")
+            else:
+                problems.append(f"{prefix} {issue['count']} 处待生成")
+    return f"❌ {name}: " + "；".join(problems)
+
+
+def main():
+    """CLI: 检查包目录，输出报告，可按报告重跑未通过的队友"""
+    from pipeline_team import load_pipeline_config
+
+    parser = argparse.ArgumentParser(description="按 pipeline_config.json 的 quality 规则检查面试准备包")
+    parser.add_argument("paths", nargs="+", help="包目录，或包含多个包的目录 (如 companies/)")
+    parser.add_argument("--workers", type=int, help="并行进程数 (默认: CPU 数)")
+    parser.add_argument("--allow-placeholders", action="store_true", help="不检查剩余的 [待 AI 生成] 占位")
+    output = parser.add_mutually_exclusive_group()
+    output.add_argument("--json", action="store_true", help="输出 JSON 报告")
+    output.add_argument("--jsonl", action="store_true", help="每个包一行 JSON")
+    parser.add_argument("--output", help="报告写入文件 (默认: 标准输出)")
+    parser.add_argument("--regenerate", action="store_true", help="重跑未通过的队友及其下游")
+    parser.add_argument("--generation-url", help="重跑时使用的 http 生成后端 (见 generation_stub.py)")
+    parser.add_argument("--base-path", default=".", help="项目基础路径 (默认: .)")
+    args = parser.parse_args()
+
+    config = load_pipeline_config()
+    packets = find_packets(args.paths)
+    if not packets:
+        print("❌ 没有找到包目录")
+        return 1
+    reports = validate_packets(packets, config, args.workers, not args.allow_placeholders)
+
+    if args.json or args.jsonl:
+        text = (json.dumps(reports, ensure_ascii=False, indent=2) + "\n" if args.json else
+                "".join(json.dumps(report, ensure_ascii=False) + "\n" for report in reports))
+        if args.output:
+            Path(args.output).write_text(text, encoding="utf-8")
+        else:
+            sys.stdout.write(text)
+    else:
+        for report in reports:
+            print(summarize(report))
+        passed = sum(report["ok"] for report in reports)
+        print(f"\n共 {len(reports)} 个包，{passed} 个通过")
+
+    failed = [report for report in reports if not report["ok"]]
+    if args.regenerate and failed:
+        from pipeline_team import PipelineTeam
+
+        team = PipelineTeam(args.base_path, generation_url=args.generation_url, config=config)
+        for report in failed:
+            print(f"🔄 {Path(report['packet']).name}: 重跑 {', '.join(report['regenerate'])}", file=sys.stderr)
+            team.rerun(Path(report["packet"]), report["regenerate"])
+        reports = validate_packets([Path(report["packet"]) for report in failed], config, args.workers,
+                                   not args.allow_placeholders)
+        failed = [report for report in reports if not report["ok"]]
+        print(f"重跑后仍未通过: {len(failed)} 个包", file=sys.stderr)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+异步流水线运行时 - 每个队友是一个协程
+
+队友大部分时间在等待 (公司研究、模型调用、文件读写)，因此在一个事件循环里
+以协程运行，而不是每个队友占用一个线程。队友的产物经 team.artifacts
+(ArtifactStore) 在内存中交给下游，写盘在后台进行，run_packet() 返回前等待
+该包的写盘完成并记录运行清单。并发按资源类别限制
+(pipeline_config.json 的 team_mode.concurrency):
+
+- research: 公司研究类队友 (teammate.resource = "research")
+- model:    模型生成类队友 (teammate.resource = "model")
+- file_io:  文件读写和 PDF 解析; 标准库没有异步文件 I/O，这些调用在一个
+            大小为 file_io 的线程池中执行
+
+生成后端 (team.generator) 经网络调用时，队友的内容生成在一个大小为
+research + model 的线程池中执行，不阻塞事件循环；各包的段落请求由生成
+后端合并批量并统一限流。占位后端的模板渲染同样不在事件循环线程中进行，
+而是在文件 I/O 线程池中执行。
+
+每次尝试受队友的 timeout (缺省 team_mode.teammate_timeout) 限制，出错或超时
+后按 retries / retry_backoff 指数退避重试。上游未成功时，下游按 on_missing_input
+跳过 ("skip") 或用已有输入降级生成 ("degrade")。fallback_on_error 为
+"sequential" 时，重试后仍失败的队友及其下游最后再逐个重跑一次。取消运行
+(Ctrl-C 或取消外层任务) 会取消所有未完成的队友。
+数百个包可以在同一进程中并发运行，线程数始终不超过 file_io + 1。
+
+用法:
+    async with AsyncPipelineRuntime(team, config) as runtime:
+        packet["resume_content"] = await runtime.prepare(output_dir, packet)
+        results = await runtime.run_packet(output_dir, packet)
+
+PipelineTeam.launch() / rerun() / launch_concurrent() 是本运行时的同步包装。
+"""
+
+import time
+import asyncio
+import contextvars
+import concurrent.futures
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from tracing import span, read_text
+from profiling import profiled
+from pipeline_scheduler import PREPARE_TASK, MissingInputs, is_retryable, retry_delay, teammate_policy, unavailable_inputs
+
+# 资源类别的默认并发上限 (配置缺省时)
+DEFAULT_CONCURRENCY = {"research": 4, "model": 8, "file_io": 8}
+
+# 队友未声明 resource 时的类别
+DEFAULT_RESOURCE = "model"
+
+
+class AsyncPipelineRuntime:
+    """在一个事件循环中运行队友协程，按资源类别限制并发"""
+
+    def __init__(self, team, config: Dict, concurrency: Optional[Dict[str, int]] = None,
+                 timeout: Optional[float] = None):
+        """
+        Args:
+            team: PipelineTeam (提供准备目录、简历解析和各队友的内容生成)
+            config: 流水线配置
+            concurrency: 覆盖配置中的 {资源类别: 并发上限}
+            timeout: 覆盖所有队友的 timeout (秒，0 为不限制)
+        """
+        from pipeline_team import teammate_dependencies
+
+        team_mode = config.get("team_mode", {})
+        self.team = team
+        self.config = config
+        self.limits = {**DEFAULT_CONCURRENCY, **team_mode.get("concurrency", {}), **(concurrency or {})}
+        self.fallback_on_error = team_mode.get("fallback_on_error")
+
+        self.specs = {teammate["id"]: teammate for teammate in config["teammates"].values()}
+        self.order = [tid for stage in config["stages"].values() for tid in stage["teammates"]]
+        self.dependencies = teammate_dependencies(config)
+        self.policies = {tid: teammate_policy(config, tid) for tid in self.specs}
+        if timeout is not None:
+            for policy in self.policies.values():
+                policy["timeout"] = timeout
+
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._model_executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        # 包目录 -> 等待写盘的任务
+        self._writes: Dict[str, List[asyncio.Future]] = {}
+
+    async def __aenter__(self) -> "AsyncPipelineRuntime":
+        # 信号量需在运行中的事件循环内创建 (Python 3.8/3.9)
+        self._semaphores = {name: asyncio.Semaphore(limit) for name, limit in self.limits.items()}
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.limits["file_io"], thread_name_prefix="pipeline-io")
+        if self.team.generator.remote:
+            self._model_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.limits["research"] + self.limits["model"], thread_name_prefix="pipeline-model")
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._executor.shutdown(wait=True)
+        self._executor = None
+        if self._model_executor is not None:
+            self._model_executor.shutdown(wait=True)
+            self._model_executor = None
+
+    async def io(self, name: str, func: Callable, *args):
+        """
+        在文件 I/O 线程池中执行阻塞调用 (受 file_io 并发限制)
+
+        调用在当前上下文的副本中执行，tracer 和 span 栈随之传入工作线程；
+        name 是性能分析区域名。队友名只用于该队友的内容生成，读取上游、记录
+        运行清单等簿记 I/O 用各自的区域名 ("load_upstream"、"manifest")，
+        --profile-target <队友> 的报告不含这些调用。
+        """
+        context = contextvars.copy_context()
+
+        def call():
+            with profiled(name):
+                return func(*args)
+
+        async with self._semaphores["file_io"]:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, context.run, call)
+
+    async def prepare(self, output_dir: Path, packet: Dict[str, str], manifest=None) -> str:
+        """创建包目录、复制简历并解析 PDF，返回简历内容 (manifest: 完成后记录到运行清单)"""
+        with span(f"prepare {Path(output_dir).name}", "prepare"):
+            await self.io("prepare", self.team._prepare_output_directory, output_dir,
+                          packet["company"], packet["role"], packet["candidate"],
+                          packet["jd_content"], packet["resume_path"])
+            content = await self.io("read_resume", self.team._read_resume, packet["resume_path"])
+        if manifest is not None:
+            await self.io("manifest", manifest.record, PREPARE_TASK,
+                          self.team._prepare_outputs(output_dir, packet["resume_path"]))
+        return content
+
+    def _compose(self, teammate_id: str, output_dir: Path, metadata: Dict[str, str],
+                 upstream: Dict[str, Dict]) -> str:
+        team = self.team
+        if teammate_id == "teammate_a":
+            return team._company_intel(metadata["company"], metadata["role"], metadata["jd_content"], output_dir)
+
+        output_file = Path(output_dir) / self.specs[teammate_id]["output_file"]
+        if teammate_id == "teammate_b":
+            draft = team._compose_resume_matching(metadata["candidate"])
+            return team._generate(teammate_id, draft, output_dir, metadata, output_file=output_file)
+        if self.specs[teammate_id].get("sections"):
+            # 分节文档 (C / D): 各节并发生成
+            return team._compose_sections(teammate_id, upstream, output_dir, metadata, output_file)
+        composers = {"teammate_e": team._compose_final_report}
+        return team._generate(teammate_id, composers[teammate_id](upstream), output_dir, metadata, upstream, output_file)
+
+    async def _generate(self, teammate_id: str, output_dir: Path, metadata: Dict[str, str],
+                        upstream: Dict[str, Dict]) -> str:
+        # 生成后端经网络调用时在模型线程池中生成，否则在文件 I/O 线程池中渲染 (模板渲染、
+        # 公司情报缓存的文件锁和 fsync 都不阻塞其他队友的 I/O)
+        if self._model_executor is None:
+            return await self.io(teammate_id, self._compose, teammate_id, output_dir, metadata, upstream)
+
+        context = contextvars.copy_context()
+
+        def call():
+            with profiled(teammate_id):
+                return self._compose(teammate_id, output_dir, metadata, upstream)
+
+        return await asyncio.get_running_loop().run_in_executor(self._model_executor, context.run, call)
+
+    async def _teammate_body(self, teammate_id: str, output_dir: Path, metadata: Dict[str, str],
+                             unavailable: Tuple[str, ...]) -> Tuple[Path, List[str], concurrent.futures.Future]:
+        upstream, missing = await self.io("load_upstream", self.team._load_upstream, teammate_id, output_dir, unavailable)
+        if teammate_id == "teammate_a" and "jd_content" not in metadata:
+            # 重跑时 JD 取自包目录
+            metadata = {**metadata, "jd_content": await self.io(
+                "load_upstream", read_text, Path(output_dir) / "raw_data" / "jd_original.txt")}
+
+        spec = self.specs[teammate_id]
+        async with self._semaphores[spec.get("resource", DEFAULT_RESOURCE)]:
+            content = await self._generate(teammate_id, output_dir, metadata, upstream)
+
+        output_file = output_dir / spec["output_file"]
+        return output_file, missing, self.team._put_artifact(teammate_id, output_file, content)
+
+    async def _persist(self, teammate_id: str, written: concurrent.futures.Future, result: Dict, manifest=None):
+        # 等待后台写盘; 成功后记录运行清单，失败时改写结果状态
+        try:
+            await asyncio.wrap_future(written)
+        except Exception as e:
+            result["status"] = f"error: 写入失败 {e}"
+            return
+        if manifest is not None and result["status"] == "success":
+            await self.io("manifest", manifest.record, teammate_id, [result["file"]])
+
+    async def flush(self, output_dir: Path):
+        """等待包目录中已完成队友的写盘和运行清单记录"""
+        pending = self._writes.pop(str(output_dir), [])
+        if pending:
+            await asyncio.gather(*pending)
+
+    async def teammate(self, teammate_id: str, output_dir: Path, metadata: Dict[str, str],
+                       unavailable: Tuple[str, ...] = (), manifest=None) -> Dict:
+        """
+        运行一个队友 (出错或超时时按策略退避重试)
+
+        Args:
+            unavailable: 本次运行中未成功的上游前缀
+            manifest: 写盘完成后记录到运行清单 (RunManifest)
+
+        Returns:
+            {"status", "time", "attempts", "started", "finished"[, "file", "missing_inputs"]}；
+            status 为 "success"、"degraded"、"skipped: ..."、"timeout" 或 "error: ..."
+        """
+        policy = self.policies[teammate_id]
+        started = time.time()
+        attempt = 0
+        with span(teammate_id, "teammate", inputs=(teammate_id, str(output_dir))) as current:
+            while True:
+                attempt += 1
+                try:
+                    output_file, missing, written = await asyncio.wait_for(
+                        self._teammate_body(teammate_id, output_dir, metadata, unavailable),
+                        policy["timeout"] or None)
+                    result = {"status": "degraded" if missing else "success", "file": str(output_file)}
+                    if missing:
+                        result["missing_inputs"] = missing
+                except MissingInputs as e:
+                    result = {"status": f"skipped: {e}"}
+                except asyncio.TimeoutError:
+                    result = {"status": "timeout"}
+                except Exception as e:
+                    result = {"status": f"error: {e}"}
+
+                if not is_retryable(result) or attempt > policy["retries"]:
+                    break
+                await asyncio.sleep(retry_delay(policy, attempt))
+
+            current.set("status", result["status"])
+            current.set("attempts", attempt)
+
+        if "file" in result:
+            self._writes.setdefault(str(output_dir), []).append(
+                asyncio.ensure_future(self._persist(teammate_id, written, result, manifest)))
+
+        finished = time.time()
+        result.update(time=finished - started, attempts=attempt, started=started, finished=finished)
+        return result
+
+    async def run_packet(self, output_dir: Path, metadata: Dict[str, str],
+                         teammate_ids: Optional[List[str]] = None, manifest=None) -> Dict[str, Dict]:
+        """
+        按依赖图运行一个包的队友，无依赖关系的队友并发执行
+
+        Args:
+            output_dir: 已准备好的包目录
+            metadata: 公司 / 职位 / 候选人
+            teammate_ids: 只运行这些队友 (其余上游视为已在磁盘上完成)
+            manifest: 每个队友成功后记录到运行清单 (RunManifest)
+
+        Returns:
+            {teammate_id: 执行结果} (返回时产物均已写盘)
+        """
+        selected = [tid for tid in self.order if teammate_ids is None or tid in teammate_ids]
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_one(teammate_id: str) -> Dict:
+            upstream = {tid: await tasks[tid] for tid in self.dependencies[teammate_id] if tid in tasks}
+            return await self.teammate(teammate_id, output_dir, metadata,
+                                       unavailable_inputs(self.config, upstream), manifest)
+
+        for teammate_id in selected:
+            tasks[teammate_id] = asyncio.ensure_future(run_one(teammate_id))
+
+        results = dict(zip(tasks, await asyncio.gather(*tasks.values())))
+
+        if self.fallback_on_error == "sequential" and any(is_retryable(r) for r in results.values()):
+            await self.fallback(output_dir, metadata, results, manifest)
+        try:
+            await self.flush(output_dir)
+        finally:
+            self.team.artifacts.drop(output_dir)
+        return results
+
+    async def fallback(self, output_dir: Path, metadata: Dict[str, str], results: Dict[str, Dict],
+                       manifest=None) -> Dict[str, Dict]:
+        """
+        顺序回退: 逐个重跑出错 / 超时的队友及其下游 (就地更新 results)
+
+        并发运行失败往往是资源争用或上游抖动造成的，单独再跑一次可以挽回
+        这个包，而不必重跑整个批量。
+        """
+        from pipeline_team import downstream_teammates
+
+        failed = [tid for tid, result in results.items() if is_retryable(result)]
+        for teammate_id in downstream_teammates(self.config, failed):
+            if teammate_id not in results:
+                continue
+            result = await self.teammate(teammate_id, output_dir, metadata,
+                                         unavailable_inputs(self.config, results), manifest)
+            result["fallback"] = True
+            results[teammate_id] = result
+        return results
+
+    async def run_packets(self, packets: List[Dict]) -> List[Dict]:
+        """
+        并发运行多个包 (准备 + 全部队友)
+
+        Args:
+            packets: [{"output_dir", "company", "role", "candidate", "jd_content", "resume_path"}, ...]；
+                可选 "manifest" (运行清单)、"prepare" (False 跳过准备) 和 "teammate_ids" (只运行这些队友)
+
+        Returns:
+            每个包的 {"output_dir", "results", "prepare_time", "time"[, "error"]} (顺序与 packets 一致)
+        """
+        async def run_one(packet: Dict) -> Dict:
+            start = time.time()
+            entry = {"output_dir": packet["output_dir"], "results": {}, "prepare_time": 0.0}
+            manifest = packet.get("manifest")
+            if packet.get("prepare", True):
+                try:
+                    packet["resume_content"] = await self.prepare(packet["output_dir"], packet, manifest)
+                except Exception as e:
+                    entry.update(error=str(e), time=time.time() - start)
+                    return entry
+                entry["prepare_time"] = time.time() - start
+            entry["results"] = await self.run_packet(packet["output_dir"], packet,
+                                                     packet.get("teammate_ids"), manifest)
+            entry["time"] = time.time() - start
+            return entry
+
+        return list(await asyncio.gather(*(run_one(packet) for packet in packets)))
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+关键路径调度 - 多个包共享一个工作池时的任务排序
+
+每个包是一个小 DAG (prepare → A/B → C/D → E)。多个包同时运行时，
+就绪任务按"剩余关键路径长度" (自身预期耗时 + 最长下游路径) 从大到小启动，
+因此耗时长、下游链路长的任务 (如公司研究) 会先于提交顺序靠前的短任务开始。
+
+预期耗时来自运行历史 (run_history.expected_durations)，样本不足时回退到
+pipeline_config.json 的 estimated_time。simulate() 用同样的策略模拟调度，
+得到预测 makespan，供与实际 makespan 对比。
+
+队友的失败处理策略 (teammate_policy) 也在这里: 每次尝试的超时、出错后的
+指数退避重试，以及上游缺失时跳过 ("skip") 还是降级生成 ("degrade")。
+线程调度 (PipelineTeam.launch_many) 和异步运行时 (pipeline_async.py) 共用。
+"""
+
+import heapq
+from typing import Dict, Hashable, List, Tuple
+
+# 每个包在队友之前的准备任务 (创建目录、复制简历、解析 PDF)
+PREPARE_TASK = "prepare"
+
+# 下游可以使用其输出的队友状态 ("degraded": 缺少部分输入但已生成)
+OK_STATUSES = ("success", "degraded")
+
+
+class MissingInputs(Exception):
+    """队友的上游输入缺失 (on_missing_input 为 "skip" 时不运行)"""
+
+    def __init__(self, missing: List[str]):
+        self.missing = missing
+        super().__init__("缺少输入 " + ", ".join(missing))
+
+
+def teammate_policy(config: Dict, teammate_id: str) -> Dict:
+    """
+    队友的超时 / 重试 / 缺少输入策略 (队友配置覆盖 team_mode 默认值)
+
+    Returns:
+        {"timeout", "retries", "backoff", "backoff_max", "on_missing_input"}
+    """
+    team_mode = config.get("team_mode", {})
+    spec = next(t for t in config["teammates"].values() if t["id"] == teammate_id)
+    return {
+        "timeout": spec.get("timeout", team_mode.get("teammate_timeout")),
+        "retries": spec.get("retries", team_mode.get("retries", 0)),
+        "backoff": spec.get("retry_backoff", team_mode.get("retry_backoff", 1.0)),
+        "backoff_max": team_mode.get("retry_backoff_max", 30.0),
+        "on_missing_input": spec.get("on_missing_input", "skip")
+    }
+
+
+def retry_delay(policy: Dict, attempt: int) -> float:
+    """第 attempt 次失败后的等待秒数: 指数退避，不超过 backoff_max，带抖动避免同时重试"""
+    import random  # 延迟导入: 只有重试时才需要
+
+    delay = min(policy["backoff"] * 2 ** (attempt - 1), policy["backoff_max"])
+    return delay * random.uniform(0.5, 1.0)
+
+
+def is_retryable(result: Dict) -> bool:
+    """出错或超时的队友可以重试 / 回退; 因缺少输入跳过的不重试"""
+    return result["status"] == "timeout" or result["status"].startswith("error")
+
+
+def unavailable_inputs(config: Dict, results: Dict[str, Dict]) -> Tuple[str, ...]:
+    """本次运行中未成功的队友的输出前缀 (下游视为缺少这些输入)"""
+    return tuple(
+        teammate["output_file"][:2]
+        for teammate in config["teammates"].values()
+        if teammate["id"] in results and results[teammate["id"]]["status"] not in OK_STATUSES
+    )
+
+
+def packet_graph(dependencies: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """
+    在队友依赖图前加入 prepare 任务
+
+    Args:
+        dependencies: {teammate_id: [上游 teammate_id]}
+
+    Returns:
+        {task_id: [上游 task_id]}，无上游的队友依赖 prepare
+    """
+    graph = {PREPARE_TASK: []}
+    for teammate_id, upstream in dependencies.items():
+        graph[teammate_id] = list(upstream) if upstream else [PREPARE_TASK]
+    return graph
+
+
+def successors(graph: Dict[str, List[str]]) -> Dict[str, List[str]]:
+    """反转依赖图: {task_id: [下游 task_id]}"""
+    result = {task: [] for task in graph}
+    for task, upstream in graph.items():
+        for parent in upstream:
+            result[parent].append(task)
+    return result
+
+
+def critical_path_ranks(graph: Dict[str, List[str]], durations: Dict[str, float]) -> Dict[str, float]:
+    """
+    每个任务的剩余关键路径长度 (upward rank)
+
+    rank(t) = duration(t) + max(rank(s) for s in successors(t))
+    """
+    downstream = successors(graph)
+    ranks: Dict[str, float] = {}
+
+    def rank(task: str) -> float:
+        if task not in ranks:
+            tail = max((rank(child) for child in downstream[task]), default=0.0)
+            ranks[task] = durations.get(task, 0.0) + tail
+        return ranks[task]
+
+    for task in graph:
+        rank(task)
+    return ranks
+
+
+def simulate(graph: Dict[str, List[str]], durations: Dict[str, float],
+             packets: int, workers: int) -> Tuple[float, List[Tuple[float, int, str]]]:
+    """
+    用关键路径优先的列表调度模拟 packets 个包在 workers 个工作线程上的执行
+
+    Returns:
+        (预测 makespan 秒数, [(开始时间, 包序号, task_id), ...])
+    """
+    ranks = critical_path_ranks(graph, durations)
+    downstream = successors(graph)
+
+    ready: List[Tuple[float, int, int, str]] = []
+    pending = {}
+    seq = 0
+    for packet in range(packets):
+        for task, upstream in graph.items():
+            pending[(packet, task)] = len(upstream)
+            if not upstream:
+                heapq.heappush(ready, (-ranks[task], seq, packet, task))
+                seq += 1
+
+    running: List[Tuple[float, int, int, str]] = []
+    starts = []
+    now = 0.0
+    while ready or running:
+        while ready and len(running) < workers:
+            _, _, packet, task = heapq.heappop(ready)
+            starts.append((now, packet, task))
+            heapq.heappush(running, (now + durations.get(task, 0.0), seq, packet, task))
+            seq += 1
+
+        now, _, packet, task = heapq.heappop(running)
+        for child in downstream[task]:
+            pending[(packet, child)] -= 1
+            if pending[(packet, child)] == 0:
+                heapq.heappush(ready, (-ranks[child], seq, packet, child))
+                seq += 1
+
+    return now, starts
+
+
+class ReadyQueue:
+    """按剩余关键路径长度出队的就绪任务队列 (同优先级按入队顺序)"""
+
+    def __init__(self, graph: Dict[str, List[str]], ranks: Dict[str, float]):
+        self.graph = graph
+        self.ranks = ranks
+        self._downstream = successors(graph)
+        self._heap: List[Tuple[float, int, Hashable, str]] = []
+        self._pending: Dict[Tuple[Hashable, str], int] = {}
+        self._seq = 0
+
+    def add_packet(self, packet: Hashable):
+        """登记一个包的全部任务，根任务立即就绪"""
+        for task, upstream in self.graph.items():
+            self._pending[(packet, task)] = len(upstream)
+            if not upstream:
+                self._push(packet, task)
+
+    def _push(self, packet: Hashable, task: str):
+        heapq.heappush(self._heap, (-self.ranks.get(task, 0.0), self._seq, packet, task))
+        self._seq += 1
+
+    def pop(self) -> Tuple[Hashable, str]:
+        """取出优先级最高的就绪任务"""
+        _, _, packet, task = heapq.heappop(self._heap)
+        return packet, task
+
+    def complete(self, packet: Hashable, task: str):
+        """任务完成，释放其下游"""
+        for child in self._downstream[task]:
+            key = (packet, child)
+            if key not in self._pending:
+                continue
+            self._pending[key] -= 1
+            if self._pending[key] == 0:
+                self._push(packet, child)
+
+    def skip_downstream(self, packet: Hashable, task: str) -> List[str]:
+        """任务失败: 该包的所有下游任务不再调度"""
+        skipped = []
+        stack = list(self._downstream[task])
+        while stack:
+            child = stack.pop()
+            if self._pending.pop((packet, child), None) is not None:
+                skipped.append(child)
+                stack.extend(self._downstream[child])
+        return skipped
+
+    def __len__(self) -> int:
+        return len(self._heap)
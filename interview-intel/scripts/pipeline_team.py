@@ -16,21 +16,119 @@ import os
 import sys
 import json
 import time
-import shutil
+import contextvars
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
-import concurrent.futures
+from typing import Any, Dict, List, Optional, Tuple
 
 # 添加父目录到路径
 sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent))
+
+from state_io import read_json, write_json
+from tracing import TRACE_FILE, Tracer, activate, read_text, span, write_text
+import profiling
+from profiling import profiled
+import run_history
+import pipeline_scheduler
+import artifact_sidecar
+from template_engine import default_engine, render as render_template
+from pipeline_scheduler import OK_STATUSES, MissingInputs, is_retryable, retry_delay, teammate_policy, unavailable_inputs
+
+# 团队配置文件
+CONFIG_PATH = Path(__file__).parent.parent / "pipeline_config.json"
+
+
+# 可单独分析的区域名 (--profile-target)
+PROFILE_TARGETS = ["read_resume", "teammate_a", "teammate_b", "teammate_c", "teammate_d", "teammate_e"]
+
+# 包元数据文件 (记录公司/职位/候选人，供增量重跑使用)
+PACKET_METADATA_FILE = "packet.json"
+
+# 队友文档模板 (assets/templates/); C / D 的文档按节声明 (pipeline_config.json 的 sections)
+TEAMMATE_TEMPLATES = {
+    "teammate_a": "teammate_a_company_intel.md",
+    "teammate_b": "teammate_b_resume_matching.md",
+    "teammate_e": "teammate_e_final_report.md",
+}
+
+def load_pipeline_config(config_path: Optional[str] = None) -> Dict:
+    """加载流水线团队配置 (pipeline_config.json)"""
+    path = Path(config_path) if config_path else CONFIG_PATH
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def teammate_dependencies(config: Dict) -> Dict[str, List[str]]:
+    """
+    将配置中按输出文件前缀声明的依赖 ("01", "02") 解析为队友 ID
+
+    Returns:
+        {teammate_id: [上游 teammate_id, ...]}
+    """
+    by_prefix = {
+        teammate["output_file"][:2]: teammate["id"]
+        for teammate in config["teammates"].values()
+    }
+    return {
+        teammate["id"]: [by_prefix[prefix] for prefix in teammate.get("dependencies", [])]
+        for teammate in config["teammates"].values()
+    }
+
+
+def downstream_teammates(config: Dict, teammate_ids: List[str]) -> List[str]:
+    """teammate_ids 及其全部下游，按阶段顺序排列"""
+    dependencies = teammate_dependencies(config)
+    selected = set(teammate_ids)
+    changed = True
+    while changed:
+        changed = False
+        for teammate_id, upstream in dependencies.items():
+            if teammate_id not in selected and selected & set(upstream):
+                selected.add(teammate_id)
+                changed = True
+
+    order = [tid for stage in config["stages"].values() for tid in stage["teammates"]]
+    return [tid for tid in order if tid in selected]
+
+
+def affected_teammates(config: Dict, changed_inputs: List[str]) -> List[str]:
+    """
+    计算输入变更 ("jd", "resume") 后需要重跑的队友 (含全部下游)
+
+    Args:
+        config: 流水线配置
+        changed_inputs: 变更的原始输入名称
+
+    Returns:
+        按阶段顺序排列的 teammate_id 列表
+    """
+    affected = [
+        teammate["id"]
+        for teammate in config["teammates"].values()
+        if set(teammate.get("inputs", [])) & set(changed_inputs)
+    ]
+    return downstream_teammates(config, affected)
 
 
 class PipelineTeam:
     """专业化流水线团队"""
 
-    def __init__(self, base_path: str = "."):
+    def __init__(self, base_path: str = ".", trace: bool = True, history: bool = True,
+                 refresh_intel: bool = False, generation_url: Optional[str] = None,
+                 config: Optional[Dict] = None):
+        """
+        Args:
+            base_path: 项目基础路径 (包含 companies/ 和 resumes/)
+            trace: 记录 span 并在输出目录写出 trace.json (Chrome trace-event 格式)
+            history: 将每次运行的耗时追加到 .analytics/run_history.jsonl
+            refresh_intel: 忽略公司情报缓存，重新生成 01 简报并覆盖缓存
+            generation_url: 改用该地址的 http 生成后端 (覆盖 pipeline_config.json 的 generation)
+            config: 流水线配置 (默认读取 pipeline_config.json；守护进程传入常驻内存的配置)
+        """
         self.base_path = Path(base_path)
+        # 配置只在创建时读取一次，各队友 / 各节的辅助方法共用
+        self.config = config if config is not None else load_pipeline_config()
         self.companies_path = self.base_path / "companies"
         self.resumes_path = self.base_path / "resumes"
 
@@ -38,106 +136,291 @@ class PipelineTeam:
         self.tasks: Dict[str, Dict] = {}
         self.start_time = None
         self.teammate_results = {}
+        self.stage_times: Dict[str, float] = {}
 
-    def launch(self, company: str, role: str, candidate: str,
-               jd_content: str, resume_path: str) -> Path:
-        """启动专业化流水线团队"""
+        self.trace = trace
+        self.history = history
+        self.tracer: Optional[Tracer] = None
 
-        self.start_time = time.time()
-        output_dir = self.companies_path / f"{company}-{role}-{candidate}"
+        # 队友产物: 内存中交给下游，后台写盘 (concurrent.futures 等在此延迟导入，不计入 CLI 启动耗时)
+        from artifact_store import ArtifactStore
+        self.artifacts = ArtifactStore()
 
-        self._print_header(company, role, candidate, output_dir)
+        # 公司情报缓存: 01 简报跨候选人复用 (配置中关闭时为 None)
+        from company_intel_cache import CompanyIntelCache
+        self.intel_cache = CompanyIntelCache.from_config(base_path, self.config)
+        self.refresh_intel = refresh_intel
 
-        # 准备工作
-        self._prepare_output_directory(output_dir, company, role, candidate, jd_content, resume_path)
+        # 生成后端: 队友文档的 [待 AI 生成] 段落 (默认保留占位，见 generation_backend.py)
+        from generation_backend import create_generator
+        self.generator = create_generator(self.config, generation_url, base_path)
+        # 分节文档 (C / D) 各节并发生成的线程池 (首次使用时创建)
+        self._section_executor: Optional["concurrent.futures.ThreadPoolExecutor"] = None
 
-        # 读取简历（共享资源）
-        resume_content = self._read_resume(resume_path)
+    def launch(self, company: str, role: str, candidate: str,
+               jd_content: str, resume_path: str, resume: bool = False,
+               reuse_from: Optional[Path] = None) -> Path:
+        """
+        启动专业化流水线团队 (异步运行时的同步包装，见 pipeline_async.py)
 
-        # === 阶段 1: 并行执行 A 和 B ===
-        print("📍 阶段 1/3: 公司研究 + 简历分析")
-        print("─" * 60)
+        resume 为 True 时从运行清单 (run_manifest.json) 中断处继续: 已完成且输出
+        未变的节点跳过，只运行未完成的队友及其下游。
 
-        stage1_start = time.time()
+        reuse_from 为 JD 近似重复的已有包 (见 jd_index.py) 时，沿用其中不受
+        差异影响的队友产物，只生成其余队友 (见 _reuse_artifacts)。
+        """
+        import asyncio
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-            # 提交任务 A: 公司研究
-            future_a = executor.submit(
-                self._teammate_a_company_researcher,
-                company, role, jd_content, output_dir
-            )
+        self.tracer = Tracer() if self.trace else None
 
-            # 提交任务 B: 简历分析
-            future_b = executor.submit(
-                self._teammate_b_resume_analyst,
-                resume_content, jd_content, output_dir, candidate
-            )
+        with activate(self.tracer):
+            with span("pipeline", "pipeline", inputs=(company, role, candidate, jd_content, resume_path)):
+                output_dir = asyncio.run(self.launch_async(company, role, candidate, jd_content, resume_path,
+                                                           resume, reuse_from))
 
-            # 等待完成
-            concurrent.futures.wait([future_a, future_b])
+        self.generator.flush()
+        self._export_trace(output_dir, company=company, role=role, candidate=candidate)
+        self._auto_validate([output_dir])
+        self._record_history("resume" if resume else "launch", {"company": company, "role": role, "candidate": candidate})
+        return output_dir
 
-            # 获取结果
-            result_a = future_a.result()
-            result_b = future_b.result()
+    def _runtime(self):
+        from pipeline_async import AsyncPipelineRuntime
+        return AsyncPipelineRuntime(self, self.config)
 
-        stage1_time = time.time() - stage1_start
+    async def launch_async(self, company: str, role: str, candidate: str,
+                           jd_content: str, resume_path: str, resume: bool = False,
+                           reuse_from: Optional[Path] = None) -> Path:
+        """launch() 的协程版本，供已在事件循环中的调用方使用 (不写 trace / 运行历史)"""
+        self.start_time = time.time()
+        self.teammate_results = {}
+        self.stage_times = {}
+        output_dir = self.companies_path / f"{company}-{role}-{candidate}"
+        packet = {"company": company, "role": role, "candidate": candidate,
+                  "jd_content": jd_content, "resume_path": resume_path}
 
-        print(f"✅ Teammate A (公司研究员): {result_a['status']} ({result_a['time']:.1f}s)")
-        print(f"✅ Teammate B (简历分析师): {result_b['status']} ({result_b['time']:.1f}s)")
-        print(f"⏱️  阶段1总耗时: {stage1_time:.1f}s")
-        print()
+        self._print_header(company, role, candidate, output_dir)
 
-        # === 阶段 2: 并行执行 C 和 D ===
-        print("📍 阶段 2/3: 面试策略 + 破冰文案")
-        print("─" * 60)
+        manifest = self._open_manifest(output_dir, packet, resume)
+        run_prepare, teammate_ids = self._resume_plan(manifest)
+        if resume:
+            self._print_resume_plan(run_prepare, teammate_ids)
 
-        stage2_start = time.time()
+        async with self._runtime() as runtime:
+            # 准备工作: 目录、JD、简历复制和解析 (解析结果随包信息交给队友，不再重复解析)
+            prepare_start = time.time()
+            if run_prepare:
+                packet["resume_content"] = await runtime.prepare(output_dir, packet, manifest)
+                self.stage_times[pipeline_scheduler.PREPARE_TASK] = time.time() - prepare_start
 
-        with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
-            # 提交任务 C: 面试策略
-            future_c = executor.submit(
-                self._teammate_c_interview_coach,
-                output_dir
-            )
+            if reuse_from is not None and teammate_ids:
+                # 复制产物、按 JD 差异修订章节都是阻塞调用，放到文件 I/O 线程池中
+                reused = await runtime.io("reuse", self._reuse_artifacts, Path(reuse_from), output_dir,
+                                          packet, manifest)
+                teammate_ids = [tid for tid in teammate_ids if tid not in reused]
 
-            # 提交任务 D: 破冰文案
-            future_d = executor.submit(
-                self._teammate_d_copywriter,
-                output_dir
-            )
+            # 按依赖图运行队友: A/B 并发，C/D 在 A、B 完成后并发，最后 E
+            self.teammate_results = await runtime.run_packet(output_dir, packet, teammate_ids, manifest)
 
-            # 等待完成
-            concurrent.futures.wait([future_c, future_d])
+        self._print_stages(self.teammate_results)
+        self._print_completion(output_dir, time.time() - prepare_start)
 
-            # 获取结果
-            result_c = future_c.result()
-            result_d = future_d.result()
+        return output_dir
 
-        stage2_time = time.time() - stage2_start
+    @staticmethod
+    def _prepare_outputs(output_dir: Path, resume_path: str) -> List[Path]:
+        """准备阶段写出的文件 (记录到运行清单)"""
+        return [
+            Path(output_dir) / "raw_data" / "jd_original.txt",
+            Path(output_dir) / "resumes" / Path(resume_path).name,
+            Path(output_dir) / PACKET_METADATA_FILE
+        ]
+
+    def _open_manifest(self, output_dir: Path, packet: Dict[str, str], resume: bool):
+        """打开包目录的运行清单; 输入 (公司/职位/候选人/JD/简历文件) 变化时从头开始"""
+        from run_manifest import MANIFEST_FILE, RunManifest, file_digest
+        from tracing import inputs_hash
+
+        digest = inputs_hash(packet["company"], packet["role"], packet["candidate"],
+                             packet["jd_content"], file_digest(Path(packet["resume_path"])) or "")
+        return RunManifest.open(Path(output_dir) / MANIFEST_FILE, digest, resume)
+
+    def _resume_plan(self, manifest) -> Tuple[bool, List[str]]:
+        """
+        需要运行的节点: 准备是否未完成，以及未完成的队友及其全部下游
 
-        print(f"✅ Teammate C (面试教练): {result_c['status']} ({result_c['time']:.1f}s)")
-        print(f"✅ Teammate D (文案专家): {result_d['status']} ({result_d['time']:.1f}s)")
-        print(f"⏱️  阶段2总耗时: {stage2_time:.1f}s")
+        Returns:
+            (是否运行准备, 按阶段顺序的 teammate_id 列表)
+        """
+        config = self.config
+        order = [tid for stage in config["stages"].values() for tid in stage["teammates"]]
+        teammate_ids = downstream_teammates(config, manifest.incomplete(order))
+        return not manifest.is_complete(pipeline_scheduler.PREPARE_TASK), teammate_ids
+
+    def _print_resume_plan(self, run_prepare: bool, teammate_ids: List[str]):
+        """打印 --resume-run 跳过的节点"""
+        config = self.config
+        order = [tid for stage in config["stages"].values() for tid in stage["teammates"]]
+        done = ([] if run_prepare else [pipeline_scheduler.PREPARE_TASK]) + [
+            tid for tid in order if tid not in teammate_ids]
+        if not done:
+            print("♻️  断点续跑: 没有已完成的节点，从头开始")
+        elif not teammate_ids and not run_prepare:
+            print("♻️  断点续跑: 全部节点已完成，无需运行")
+        else:
+            print(f"♻️  断点续跑: 跳过已完成的 {', '.join(done)}")
         print()
 
-        # === 阶段 3: 执行 E ===
-        print("📍 阶段 3/3: 最终分析报告")
-        print("─" * 60)
-
-        stage3_start = time.time()
-
-        result_e = self._teammate_e_strategy_consultant(output_dir)
+    def _reuse_artifacts(self, source_dir: Path, output_dir: Path, packet: Dict[str, str], manifest) -> List[str]:
+        """
+        从 JD 近似重复的已有包复制可沿用的队友产物 (连同结构化副本)，记录到运行清单
 
-        stage3_time = time.time() - stage3_start
+        公司或职位不同时按 JD 变更处理，候选人或简历内容不同时按简历变更处理。
+        否则把已有包的 JD 与新 JD 逐句对齐 (jd_diff.plan_revision，与 --revise
+        相同): 计划中的章节在复制后原地重新生成，计划为整篇或章节定位不到的
+        队友连同下游重新生成。受变更影响的队友、已有包中缺少产物的队友及其
+        下游也重新生成，其余队友的产物直接复制。
 
-        print(f"✅ Teammate E (战略顾问): {result_e['status']} ({result_e['time']:.1f}s)")
-        print(f"⏱️  阶段3总耗时: {stage3_time:.1f}s")
+        Returns:
+            沿用 (含按章节修订) 的 teammate_id (按阶段顺序)
+        """
+        import shutil
+        import jd_diff
+        from run_manifest import file_digest
+
+        config = self.config
+        previous = self.load_packet_metadata(source_dir)
+        changed = []
+        if (previous["company"], previous["role"]) != (packet["company"], packet["role"]):
+            changed.append("jd")
+        resume_file = previous.get("resume_file")
+        resume_digest = file_digest(source_dir / "resumes" / resume_file) if resume_file else None
+        if (previous["candidate"] != packet["candidate"] or resume_digest is None
+                or resume_digest != file_digest(Path(packet["resume_path"]))):
+            changed.append("resume")
+
+        plan = {}
+        source_jd = source_dir / "raw_data" / "jd_original.txt"
+        if "jd" not in changed and not source_jd.is_file():
+            changed.append("jd")
+        elif "jd" not in changed:
+            plan = jd_diff.plan_revision(jd_diff.diff_requirements(read_text(source_jd), packet["jd_content"]), config)
+
+        teammates = {teammate["id"]: teammate for teammate in config["teammates"].values()}
+        missing = [tid for tid, teammate in teammates.items() if not (source_dir / teammate["output_file"]).is_file()]
+        regenerate = (set(affected_teammates(config, changed)) | set(downstream_teammates(config, missing))
+                      | set(downstream_teammates(config, [tid for tid, sections in plan.items() if sections is None])))
+
+        order = [tid for stage in config["stages"].values() for tid in stage["teammates"]]
+        reused, revised = [], []
+        for teammate_id in order:
+            if teammate_id in regenerate:
+                continue
+            name = teammates[teammate_id]["output_file"]
+            target = output_dir / name
+            with span(f"reuse {name}", "io", path=str(source_dir / name)):
+                # copy2 保留 mtime，副本记录的大小和 mtime 仍与产物一致
+                shutil.copy2(source_dir / name, target)
+                sidecar = artifact_sidecar.sidecar_path(source_dir / name)
+                if sidecar.is_file():
+                    shutil.copy2(sidecar, artifact_sidecar.sidecar_path(target))
+            if teammate_id in plan:
+                # 按阶段顺序修订: 上游修订写出后再修订下游
+                with span(f"revise {teammate_id}", "teammate") as current:
+                    try:
+                        sections = self._revise_sections(teammate_id, plan[teammate_id], output_dir, packet)
+                    except Exception as e:
+                        # 修订失败时整篇重新生成 (按队友的重试 / 失败策略)
+                        current.set("status", f"error: {e}")
+                        sections = None
+                if sections is None:
+                    regenerate |= set(downstream_teammates(config, [teammate_id]))
+                    continue
+                revised.append(teammate_id)
+            manifest.record(teammate_id, [target])
+            reused.append(teammate_id)
+
+        if reused:
+            print(f"♻️  沿用近似重复 JD 的包 {source_dir.name}: {', '.join(reused)}")
+            if revised:
+                print(f"   按 JD 差异重新生成章节: {', '.join(revised)}")
+        else:
+            print(f"♻️  近似重复 JD 的包 {source_dir.name} 没有可沿用的产物")
         print()
+        return reused
+
+    def _record_stage_times(self, results: Dict[str, Dict]):
+        """各阶段的实际耗时: 阶段内首个队友开始到最后一个结束"""
+        for stage_id, stage in self.config["stages"].items():
+            timed = [results[tid] for tid in stage["teammates"] if "started" in results.get(tid, {})]
+            if timed:
+                self.stage_times[stage_id] = max(r["finished"] for r in timed) - min(r["started"] for r in timed)
+
+    def _print_stages(self, results: Dict[str, Dict]):
+        """按阶段打印队友结果"""
+        self._record_stage_times(results)
+
+        config = self.config
+        names = {teammate["id"]: f"{teammate['name']} ({teammate['role']})"
+                 for teammate in config["teammates"].values()}
+        stages = list(config["stages"].items())
+
+        for index, (stage_id, stage) in enumerate(stages, 1):
+            if not any(tid in results for tid in stage["teammates"]):
+                continue
+            print(f"📍 阶段 {index}/{len(stages)}: {stage['name']}")
+            print("─" * 60)
+            for tid in stage["teammates"]:
+                if tid in results:
+                    result = results[tid]
+                    icon = {"success": "✅", "degraded": "⚠️ "}.get(result["status"], "❌")
+                    notes = []
+                    if result.get("attempts", 1) > 1:
+                        notes.append(f"尝试 {result['attempts']} 次")
+                    if result.get("fallback"):
+                        notes.append("顺序回退")
+                    if result.get("missing_inputs"):
+                        notes.append("缺少 " + ", ".join(result["missing_inputs"]))
+                    suffix = f" [{'; '.join(notes)}]" if notes else ""
+                    print(f"{icon} {names[tid]}: {result['status']} ({result['time']:.1f}s){suffix}")
+            print(f"⏱️  阶段{index}总耗时: {self.stage_times.get(stage_id, 0.0):.1f}s")
+            print()
+
+    def _run_teammate(self, teammate_id: str, func, *args) -> Dict:
+        """在当前线程激活 tracer 并以 span 包裹一个队友的执行，出错时按策略退避重试"""
+        policy = teammate_policy(self.config, teammate_id)
+        attempt = 0
+        with activate(self.tracer):
+            with span(teammate_id, "teammate", inputs=args) as current:
+                while True:
+                    attempt += 1
+                    result = func(*args)
+                    if not is_retryable(result) or attempt > policy["retries"]:
+                        break
+                    time.sleep(retry_delay(policy, attempt))
+                result["attempts"] = attempt
+                current.set("status", result["status"])
+                current.set("attempts", attempt)
+        return result
+
+    def _record_history(self, kind: str, packet: Dict[str, str]):
+        """将本次运行的耗时追加到运行历史"""
+        if not self.history or not self.teammate_results:
+            return
+        try:
+            run_history.record_run(
+                str(self.base_path), kind, packet, self.teammate_results,
+                self.stage_times, time.time() - self.start_time
+            )
+        except OSError as e:
+            print(f"⚠️  运行历史写入失败: {e}")
 
-        # 完成
-        self._print_completion(output_dir, stage1_time, stage2_time, stage3_time)
-
-        return output_dir
+    def _export_trace(self, output_dir: Path, **metadata):
+        """将本次运行的 span 写入输出目录的 trace.json"""
+        if self.tracer is None:
+            return
+        trace_file = self.tracer.export(Path(output_dir) / TRACE_FILE, metadata)
+        print(f"🧭 Trace: {trace_file} (chrome://tracing 或 ui.perfetto.dev 打开)")
 
     def _print_header(self, company: str, role: str, candidate: str, output_dir: Path):
         """打印标题"""
@@ -152,9 +435,27 @@ class PipelineTeam:
         print(f"   输出: {output_dir}")
         print()
 
-    def _print_completion(self, output_dir: Path, t1: float, t2: float, t3: float):
+    def _auto_validate(self, output_dirs: List[Path]):
+        """
+        quality.auto_validate: 运行结束后按质量规则检查包并打印摘要 (见 packet_validator.py)
+
+        只在启用生成后端时检查; 占位后端生成的是待外部填充的框架，填充后再运行
+        packet_validator.py。
+        """
+        config = self.config
+        if not output_dirs or not self.generator.active or not config.get("quality", {}).get("auto_validate"):
+            return
+
+        from packet_validator import summarize, validate_packets
+
+        print()
+        for report in validate_packets(output_dirs, config):
+            print(f"🔎 {summarize(report)}")
+            if not report["ok"]:
+                print(f"   重新生成: python packet_validator.py {report['packet']} --regenerate")
+
+    def _print_completion(self, output_dir: Path, total_time: float):
         """打印完成信息"""
-        total_time = t1 + t2 + t3
 
         print("╔" + "═" * 58 + "╗")
         print("║" + " " * 20 + "🎉 全部完成!" + " " * 27 + "║")
@@ -170,12 +471,24 @@ class PipelineTeam:
                 file_size = files[0].stat().st_size / 1024
                 print(f"   ✅ 0{i}_{files[0].stem.split('_', 1)[1]}.md ({file_size:.1f}K)")
         print()
-        print(f"⚡ 并行加速: 原串行 ~200s → 现在 {total_time:.1f}s ({200/total_time:.2f}x)")
+        # 串行基线: 各队友观测耗时 p50 之和。只有每个队友都有足够的运行历史时才打印:
+        # 配置中的 estimated_time 是人工估计，与实际耗时不可比
+        try:
+            observed = run_history.observed_durations(self.config, str(self.base_path))
+        except (OSError, ValueError):
+            observed = {}
+
+        sequential = sum(observed.values())
+        if len(observed) == len(self.config["teammates"]) and sequential and total_time > 0:
+            print(f"⚡ 并行加速: 串行基线 (历史 p50) ~{sequential:.1f}s → 现在 {total_time:.1f}s "
+                  f"({sequential / total_time:.2f}x)")
 
     def _prepare_output_directory(self, output_dir: Path, company: str,
                                   role: str, candidate: str,
                                   jd_content: str, resume_path: str):
         """准备输出目录"""
+        import shutil
+
         output_dir.mkdir(parents=True, exist_ok=True)
 
         # 创建子目录
@@ -183,100 +496,795 @@ class PipelineTeam:
         (output_dir / "resumes").mkdir(exist_ok=True)
 
         # 保存 JD
-        with open(output_dir / "raw_data" / "jd_original.txt", 'w', encoding='utf-8') as f:
-            f.write(jd_content)
+        write_text(output_dir / "raw_data" / "jd_original.txt", jd_content)
 
         # 复制简历
         resume_name = Path(resume_path).name
-        shutil.copy(resume_path, output_dir / "resumes" / resume_name)
+        with span(f"copy {resume_name}", "io", path=str(resume_path)) as current:
+            shutil.copy(resume_path, output_dir / "resumes" / resume_name)
+            current.add_bytes(os.path.getsize(resume_path))
+
+        # 记录包元数据
+        write_json(output_dir / PACKET_METADATA_FILE, {
+            "company": company,
+            "role": role,
+            "candidate": candidate,
+            "resume_file": resume_name
+        })
+
+    @staticmethod
+    def load_packet_metadata(output_dir: Path) -> Dict:
+        """读取包元数据; 旧包没有 packet.json 时从目录名 {company}-{role}-{candidate} 推断"""
+        metadata = read_json(Path(output_dir) / PACKET_METADATA_FILE)
+        if metadata:
+            return metadata
+
+        parts = Path(output_dir).name.split("-")
+        if len(parts) != 3:
+            raise ValueError(f"无法识别包目录 (缺少 {PACKET_METADATA_FILE}): {output_dir}")
+
+        resumes = sorted((Path(output_dir) / "resumes").glob("*"))
+        return {
+            "company": parts[0],
+            "role": parts[1],
+            "candidate": parts[2],
+            "resume_file": resumes[0].name if resumes else None
+        }
+
+    def rerun(self, output_dir: Path, teammate_ids: List[str]) -> Dict[str, Dict]:
+        """
+        在已有输出目录中只重跑指定队友 (按依赖图, 互不依赖的队友并发)
 
-    def _read_resume(self, resume_path: str) -> str:
-        """读取简历内容"""
+        Args:
+            output_dir: 已生成的包目录
+            teammate_ids: 需要重跑的 teammate_id
+
+        Returns:
+            {teammate_id: 执行结果}
+        """
+        output_dir = Path(output_dir)
+        self.tracer = Tracer() if self.trace else None
+        self.start_time = time.time()
+        self.teammate_results = {}
+        self.stage_times = {}
+
+        with activate(self.tracer):
+            with span("rerun", "pipeline", teammates=",".join(teammate_ids)):
+                results = self._rerun(output_dir, teammate_ids)
+
+        self.generator.flush()
+        self._export_trace(output_dir, rerun=teammate_ids)
+        self._auto_validate([output_dir])
+        self._record_history("rerun", self.load_packet_metadata(output_dir))
+        return results
+
+    def _rerun(self, output_dir: Path, teammate_ids: List[str]) -> Dict[str, Dict]:
+        """按依赖图重跑指定队友"""
+        metadata = self.load_packet_metadata(output_dir)
+
+        # 简历可能已被替换: 记录 resumes/ 中最新的文件
+        if "teammate_b" in teammate_ids:
+            resumes = sorted((output_dir / "resumes").glob("*"), key=lambda p: p.stat().st_mtime)
+            if resumes and resumes[-1].name != metadata.get("resume_file"):
+                metadata["resume_file"] = resumes[-1].name
+                write_json(output_dir / PACKET_METADATA_FILE, metadata)
+
+        import asyncio
+
+        async def run() -> Dict[str, Dict]:
+            async with self._runtime() as runtime:
+                return await runtime.run_packet(output_dir, metadata, teammate_ids)
+
+        results = asyncio.run(run())
+        self.teammate_results = dict(results)
+        self._record_stage_times(results)
+        return results
+
+    def revise(self, output_dir: Path, jd_content: str) -> Dict:
+        """
+        JD 修订: 与包中保存的 JD 逐句对齐要求，只重新生成受变更影响的章节 (见 jd_diff.py)
+
+        章节在已生成的文档中按标题定位后原地替换，其余章节原样保留；定位不到
+        (文档被手工改过结构) 或计划为整篇的文档整篇重新生成。计划中的队友全部
+        成功后才保存新 JD，运行清单按新 JD 记录各节点已完成；有队友失败时包中
+        保留旧 JD，用同一 JD 再次修订会重新计算差异并重试。
+
+        Args:
+            output_dir: 已生成的包目录
+            jd_content: 修订后的 JD
+
+        Returns:
+            {"diff": 要求差异, "plan": {teammate_id: 章节 (None 为整篇)}, "results": {teammate_id: 执行结果},
+             "jd_updated": 是否已保存新 JD}
+        """
+        import jd_diff
+
+        output_dir = Path(output_dir)
+        jd_file = output_dir / "raw_data" / "jd_original.txt"
+        config = self.config
+        diff = jd_diff.diff_requirements(read_text(jd_file), jd_content)
+        plan = jd_diff.plan_revision(diff, config)
+        metadata = {**self.load_packet_metadata(output_dir), "jd_content": jd_content}
+
+        self.tracer = Tracer() if self.trace else None
+        self.start_time = time.time()
+        self.teammate_results = {}
+        self.stage_times = {}
+
+        with activate(self.tracer):
+            with span("revise", "pipeline", teammates=",".join(plan)):
+                results = self._revise(output_dir, metadata, plan)
+                jd_updated = all(result["status"] in OK_STATUSES + ("revised",) for result in results.values())
+                if jd_updated:
+                    write_text(jd_file, jd_content, atomic=True)
+
+        self.teammate_results = results
+        if jd_updated:
+            self._record_revision(output_dir, metadata, results)
+        self.generator.flush()
+        self._export_trace(output_dir, revise=list(plan))
+        self._auto_validate([output_dir])
+        self._record_history("revise", metadata)
+        return {"diff": diff, "plan": plan, "results": results, "jd_updated": jd_updated}
+
+    def _revise(self, output_dir: Path, metadata: Dict, plan: Dict[str, Optional[List[str]]]) -> Dict[str, Dict]:
+        """按修订计划逐个队友重新生成 (阶段顺序: 上游修订写出后再修订下游)"""
+        results = {}
         try:
-            import pdfplumber
+            for teammate_id, sections in plan.items():
+                start = time.time()
+                with span(f"revise {teammate_id}", "teammate") as current:
+                    try:
+                        revised = None if sections is None else self._revise_sections(
+                            teammate_id, sections, output_dir, metadata)
+                    except Exception as e:
+                        results[teammate_id] = {"status": f"error: {e}", "time": time.time() - start}
+                    else:
+                        if revised is None:
+                            # 整篇重新生成 (与 rerun 相同的队友入口)
+                            resume_content = (self._read_resume(str(output_dir / "resumes" / metadata["resume_file"]))
+                                              if teammate_id == "teammate_b" else "")
+                            runner, *args = self._teammate_runners(
+                                output_dir, metadata, metadata["jd_content"], resume_content)[teammate_id]
+                            results[teammate_id] = self._run_teammate(teammate_id, runner, *args)
+                        else:
+                            results[teammate_id] = {"status": "revised", "time": time.time() - start,
+                                                    "file": str(output_dir / self._output_file(teammate_id)),
+                                                    "sections": revised}
+                    current.set("status", results[teammate_id]["status"])
+        finally:
+            self.artifacts.flush()
+            self.artifacts.drop(output_dir)
+        return results
+
+    def _output_file(self, teammate_id: str) -> str:
+        return next(t["output_file"] for t in self.config["teammates"].values() if t["id"] == teammate_id)
+
+    def _revise_sections(self, teammate_id: str, sections: List[str], output_dir: Path,
+                         metadata: Dict) -> Optional[List[str]]:
+        """
+        只重新生成文档中的指定章节，写出修订后的文档
 
-            with pdfplumber.open(resume_path) as pdf:
-                content = ''
-                for page in pdf.pages:
-                    content += page.extract_text() + '\n'
-            return content
-        except ImportError:
-            print("⚠️  警告: pdfplumber 未安装，尝试使用备用方法")
-            # 备用方法：返回文件路径，让后续处理
-            return f"FILE:{resume_path}"
+        分节文档 (sections) 按节 id，其余文档按草稿中的一级 / 二级标题。
 
-    # ========== Teammate A: 公司研究员 ==========
+        Returns:
+            重新生成的章节；文档不存在或章节定位不到时返回 None (由调用方整篇生成)
+        """
+        import jd_diff
+
+        output_file = output_dir / self._output_file(teammate_id)
+        if not output_file.is_file():
+            return None
+        current = read_text(output_file)
+        spec = next(t for t in self.config["teammates"].values() if t["id"] == teammate_id)
+
+        if "sections" in spec:
+            upstream, _ = self._load_upstream(teammate_id, output_dir)
+            parts = self._render_sections(teammate_id, {"upstream": upstream})
+            starts = jd_diff.locate_parts(current, [draft for _, draft in parts])
+            if starts is None:
+                return None
+            ends = starts[1:] + [len(current)]
+            keep = {section["id"]: current[start:end]
+                    for (section, _), start, end in zip(parts, starts, ends) if section["id"] not in sections}
+            content = self._compose_sections(teammate_id, upstream, output_dir, {}, keep=keep)
+            revised = [section["id"] for section, _ in parts if section["id"] not in keep]
+        else:
+            if teammate_id == "teammate_a":
+                draft = self._compose_company_intel(metadata["company"], metadata["role"])
+            elif teammate_id == "teammate_b":
+                draft = self._compose_resume_matching(metadata["candidate"])
+            else:
+                return None
+            blocks = jd_diff.split_blocks(draft)
+            starts = jd_diff.locate_parts(current, [text for _, text in blocks])
+            wanted = {"".join(title.split()) for title in sections}
+            selected = [index for index, (title, _) in enumerate(blocks) if "".join(title.split()) in wanted]
+            if starts is None or not selected:
+                return None
+
+            title = _document_title(draft)
+            futures = {index: self._section_pool().submit(
+                contextvars.copy_context().run, self._generate, teammate_id, blocks[index][1], output_dir,
+                metadata, None, None, None, title) for index in selected}
+            ends = starts[1:] + [len(current)]
+            content = "".join(futures[index].result() if index in futures else current[start:end]
+                              for index, (start, end) in enumerate(zip(starts, ends)))
+            revised = [blocks[index][0] for index in selected]
+
+        self._put_artifact(teammate_id, output_file, content).result()
+        if teammate_id == "teammate_a" and self.intel_cache is not None:
+            # 修订后的简报按新 JD 写入公司情报缓存，其他候选人直接复用
+            self.intel_cache.store(metadata["company"], metadata["role"], metadata["jd_content"], content, "revised")
+        return revised
+
+    def _record_revision(self, output_dir: Path, metadata: Dict, results: Dict[str, Dict]):
+        """运行清单改为新 JD 的输入，记录准备阶段和未失败的队友为已完成"""
+        from run_manifest import MANIFEST_FILE
+
+        if not (output_dir / MANIFEST_FILE).exists() or not metadata.get("resume_file"):
+            return
+        resume_path = str(output_dir / "resumes" / metadata["resume_file"])
+        manifest = self._open_manifest(output_dir, {**metadata, "resume_path": resume_path}, False)
+        manifest.record(pipeline_scheduler.PREPARE_TASK, self._prepare_outputs(output_dir, resume_path))
+        for teammate in self.config["teammates"].values():
+            result = results.get(teammate["id"], {"status": "success"})
+            output_file = output_dir / teammate["output_file"]
+            if result["status"] in OK_STATUSES + ("revised",) and output_file.is_file():
+                manifest.record(teammate["id"], [output_file])
+
+    def _teammate_runners(self, output_dir: Path, metadata: Dict, jd_content: str,
+                          resume_content: str, unavailable: Tuple[str, ...] = ()) -> Dict[str, Tuple]:
+        """{teammate_id: (方法, 参数...)}，供 _run_teammate 调用 (unavailable: 失败的上游前缀)"""
+        return {
+            "teammate_a": (self._teammate_a_company_researcher,
+                           metadata["company"], metadata["role"], jd_content, output_dir),
+            "teammate_b": (self._teammate_b_resume_analyst,
+                           resume_content, jd_content, output_dir, metadata["candidate"]),
+            "teammate_c": (self._teammate_c_interview_coach, output_dir, unavailable),
+            "teammate_d": (self._teammate_d_copywriter, output_dir, unavailable),
+            "teammate_e": (self._teammate_e_strategy_consultant, output_dir, unavailable),
+        }
+
+    def launch_many(self, packets: List[Dict], max_workers: Optional[int] = None,
+                    resume: bool = False) -> List[Dict]:
+        """
+        多个包共享一个工作池，按关键路径优先调度全部任务
 
-    def _teammate_a_company_researcher(self, company: str, role: str,
-                                      jd_content: str, output_dir: Path) -> Dict:
-        """Teammate A: 公司研究员 - 生成 01_company_intel_brief.md"""
-        start = time.time()
+        就绪任务按剩余关键路径长度 (历史观测耗时，缺省为 estimated_time) 排序，
+        而不是按提交顺序，结束后报告预测与实际 makespan。
 
+        出错的队友在工作线程内退避重试；超过 timeout (覆盖全部重试) 的任务被放弃，
+        下游按缺少输入处理。线程无法被终止，被放弃的任务会一直占用其工作线程，
+        因此批量结束时不等待这些线程。fallback_on_error 为 "sequential" 时，
+        出错 / 超时的队友及其下游最后再逐个重跑一次。
+
+        Args:
+            packets: [{"company", "role", "candidate", "jd_content", "resume_path"}, ...]
+            max_workers: 工作线程数 (默认: 配置 team_mode.max_workers)
+            resume: 按各包的运行清单跳过已完成的节点
+
+        Returns:
+            每个包的 {"output_dir", "results", "time"} (顺序与 packets 一致)
+        """
+        import concurrent.futures
+
+        config = self.config
+        workers = max_workers or config.get("team_mode", {}).get("max_workers", 2)
+
+        graph = pipeline_scheduler.packet_graph(teammate_dependencies(config))
+        durations = run_history.expected_durations(config, str(self.base_path))
+        durations[pipeline_scheduler.PREPARE_TASK] = run_history.expected_stage_duration(
+            str(self.base_path), pipeline_scheduler.PREPARE_TASK)
+        ranks = pipeline_scheduler.critical_path_ranks(graph, durations)
+        predicted, _ = pipeline_scheduler.simulate(graph, durations, len(packets), workers)
+
+        print(f"🗓️  批量调度: {len(packets)} 个包, {workers} 个工作线程, 关键路径优先")
+        print("   任务优先级: " + ", ".join(
+            f"{task}={ranks[task]:.2f}s" for task in sorted(ranks, key=ranks.get, reverse=True)))
+
+        self.tracer = Tracer() if self.trace else None
+        queue = pipeline_scheduler.ReadyQueue(graph, ranks)
+        state = []
+        for index, packet in enumerate(packets):
+            output_dir = self.companies_path / f"{packet['company']}-{packet['role']}-{packet['candidate']}"
+            manifest = self._open_manifest(output_dir, packet, resume)
+            run_prepare, teammate_ids = self._resume_plan(manifest)
+            state.append({
+                "packet": packet,
+                "output_dir": output_dir,
+                "manifest": manifest,
+                "pending": set(teammate_ids) | ({pipeline_scheduler.PREPARE_TASK} if run_prepare else set()),
+                "resumed": len(self.config["teammates"]) - len(teammate_ids),
+                "results": {},
+                "start": None,
+                "end": None
+            })
+            queue.add_packet(index)
+
+        def run_task(index: int, task: str):
+            entry = state[index]
+            packet = entry["packet"]
+            if task not in entry["pending"]:
+                # 运行清单中已完成 (--resume-run)
+                return None
+
+            if task == pipeline_scheduler.PREPARE_TASK:
+                prepare_start = time.time()
+                with activate(self.tracer), span(f"prepare {entry['output_dir'].name}", "prepare"):
+                    self._prepare_output_directory(
+                        entry["output_dir"], packet["company"], packet["role"], packet["candidate"],
+                        packet["jd_content"], packet["resume_path"])
+                    with profiled("read_resume"):
+                        entry["resume_content"] = self._read_resume(packet["resume_path"])
+                entry["prepare_time"] = time.time() - prepare_start
+                entry["manifest"].record(task, self._prepare_outputs(entry["output_dir"], packet["resume_path"]))
+                return None
+
+            if task == "teammate_b" and "resume_content" not in entry:
+                with activate(self.tracer), profiled("read_resume"):
+                    entry["resume_content"] = self._read_resume(packet["resume_path"])
+
+            runners = self._teammate_runners(entry["output_dir"], packet, packet["jd_content"],
+                                             entry.get("resume_content", ""), unavailable_inputs(config, entry["results"]))
+            result = self._run_teammate(task, *runners[task])
+            if "file" in result:
+                self._record_when_written(entry["manifest"], task, result)
+            return result
+
+        timeouts = {tid: teammate_policy(config, tid)["timeout"] for tid in graph if tid != pipeline_scheduler.PREPARE_TASK}
+
+        batch_start = time.time()
+        in_flight = {}
+        abandoned = 0
+        executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
         try:
-            # 生成占位内容（实际使用时会由 AI 填充）
-            content = f"""# 公司背景业务信息
+            while len(queue) or in_flight:
+                while len(queue) and len(in_flight) < workers:
+                    index, task = queue.pop()
+                    now = time.time()
+                    if state[index]["start"] is None:
+                        state[index]["start"] = now
+                    deadline = now + timeouts[task] if timeouts.get(task) else None
+                    in_flight[executor.submit(run_task, index, task)] = (index, task, now, deadline)
+
+                deadlines = [deadline for _, _, _, deadline in in_flight.values() if deadline]
+                wait_for = max(0.0, min(deadlines) - time.time()) if deadlines else None
+                done, _ = concurrent.futures.wait(in_flight, timeout=wait_for,
+                                                  return_when=concurrent.futures.FIRST_COMPLETED)
+
+                now = time.time()
+                for future, (index, task, started, deadline) in list(in_flight.items()):
+                    if future in done or deadline is None or now < deadline:
+                        continue
+                    # 超时: 放弃该任务 (线程继续运行直到返回)，下游按缺少输入处理
+                    del in_flight[future]
+                    abandoned += 1
+                    entry = state[index]
+                    entry["results"][task] = {"status": "timeout", "time": now - started}
+                    entry["end"] = now
+                    print(f"⏰ {entry['output_dir'].name}: {task} 超时 ({timeouts[task]}s)")
+                    queue.complete(index, task)
+
+                for future in done:
+                    index, task, _, _ = in_flight.pop(future)
+                    entry = state[index]
+                    entry["end"] = time.time()
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # 准备失败: 该包的队友都无法运行
+                        skipped = queue.skip_downstream(index, task)
+                        print(f"❌ {entry['output_dir'].name}: {task} 失败 ({e})，跳过 {', '.join(skipped)}")
+                        continue
+                    if result is not None:
+                        entry["results"][task] = result
+                    queue.complete(index, task)
+        finally:
+            executor.shutdown(wait=not abandoned)
+        self.artifacts.flush()
+        self.generator.flush()
+
+        if config.get("team_mode", {}).get("fallback_on_error") == "sequential":
+            self._fallback_batch(config, [entry for entry in state
+                                          if any(is_retryable(r) for r in entry["results"].values())])
+        for entry in state:
+            self.artifacts.drop(entry["output_dir"])
+
+        actual = time.time() - batch_start
+        self._report_batch(state, predicted, actual)
+        return [
+            {"output_dir": entry["output_dir"], "results": entry["results"],
+             "time": (entry["end"] - entry["start"]) if entry["start"] else 0.0}
+            for entry in state
+        ]
+
+    def _record_when_written(self, manifest, task: str, result: Dict):
+        """产物写盘后记录运行清单 (写盘失败时结果改为 error)，不阻塞工作线程"""
+        def done(written: "concurrent.futures.Future"):
+            if written.exception() is not None:
+                result["status"] = f"error: 写入失败 {written.exception()}"
+            elif result["status"] == "success":
+                manifest.record(task, [result["file"]])
+
+        self.artifacts.written(result["file"]).add_done_callback(done)
+
+    def _fallback_batch(self, config: Dict, entries: List[Dict]):
+        """顺序回退: 逐个重跑批量中出错 / 超时的队友及其下游"""
+        if not entries:
+            return
+        import asyncio
+
+        print(f"🔁 顺序回退: {len(entries)} 个包有出错 / 超时的队友")
+
+        async def run():
+            async with self._runtime() as runtime:
+                for entry in entries:
+                    await runtime.fallback(entry["output_dir"], entry["packet"], entry["results"], entry["manifest"])
+                    await runtime.flush(entry["output_dir"])
+                    entry["end"] = time.time()
+
+        with activate(self.tracer):
+            asyncio.run(run())
+
+    def launch_concurrent(self, packets: List[Dict], resume: bool = False) -> List[Dict]:
+        """
+        在一个事件循环中并发运行全部包 (异步运行时，按资源类别限制并发)
 
-## ⚠️ 事实声明
-本文档基于公开信息和 JD 内容生成，不包含编造信息。
+        与 launch_many 的线程池不同，包数不受工作线程数限制: 数百个包只占用
+        file_io 个 I/O 线程。
 
-## 核心信息速览
+        Args:
+            packets: [{"company", "role", "candidate", "jd_content", "resume_path"}, ...]
+            resume: 按各包的运行清单跳过已完成的节点
 
-| 项目 | 内容 |
-|------|------|
-| 公司名称 | {company} |
-| 目标职位 | {role} |
-| 生成时间 | {datetime.now().strftime('%Y-%m-%d %H:%M')} |
+        Returns:
+            每个包的 {"output_dir", "results", "time"} (顺序与 packets 一致)
+        """
+        import asyncio
+
+        runtime = self._runtime()
+        print(f"🗓️  并发运行: {len(packets)} 个包, 并发上限 "
+              + ", ".join(f"{name}={limit}" for name, limit in runtime.limits.items()))
+
+        self.tracer = Tracer() if self.trace else None
+        state = []
+        for packet in packets:
+            output_dir = self.companies_path / f"{packet['company']}-{packet['role']}-{packet['candidate']}"
+            manifest = self._open_manifest(output_dir, packet, resume)
+            run_prepare, teammate_ids = self._resume_plan(manifest)
+            state.append({**packet, "output_dir": output_dir, "manifest": manifest,
+                          "prepare": run_prepare, "teammate_ids": teammate_ids})
+
+        async def run() -> List[Dict]:
+            async with runtime:
+                return await runtime.run_packets(state)
+
+        batch_start = time.time()
+        with activate(self.tracer):
+            entries = asyncio.run(run())
+        actual = time.time() - batch_start
+        self.generator.flush()
+
+        report = []
+        for packet, planned, entry in zip(packets, state, entries):
+            if "error" in entry:
+                print(f"❌ {entry['output_dir'].name}: prepare 失败 ({entry['error']})")
+            report.append({
+                "packet": packet, "output_dir": entry["output_dir"], "results": entry["results"],
+                "resumed": len(self.config["teammates"]) - len(planned["teammate_ids"]),
+                "prepare_time": entry["prepare_time"], "start": batch_start, "end": batch_start + entry["time"]
+            })
+        self._report_batch(report, None, actual)
+        return [{"output_dir": entry["output_dir"], "results": entry["results"], "time": entry["time"]}
+                for entry in entries]
+
+    def _report_batch(self, state: List[Dict], predicted: Optional[float], actual: float):
+        """打印批量结果、预测与实际 makespan，并记录运行历史 / trace"""
+        print()
+        total = len(self.config["teammates"])
+        for entry in state:
+            completed = [tid for tid, result in entry["results"].items() if result["status"] in OK_STATUSES]
+            failed = [f"{tid} {result['status']}" for tid, result in entry["results"].items()
+                      if result["status"] not in OK_STATUSES]
+            done = len(completed) + entry.get("resumed", 0)
+            icon = "✅" if done == total else "⚠️ "
+            detail = f" (未完成: {'; '.join(failed)})" if failed else ""
+            if entry.get("resumed"):
+                detail += f" (续跑: 跳过 {entry['resumed']} 个已完成队友)"
+            print(f"{icon} {entry['output_dir'].name}: {done}/{total} 队友完成{detail}")
+        self._auto_validate([entry["output_dir"] for entry in state if entry["results"]])
+
+        if predicted is None:
+            print(f"\n⏱️  makespan: {actual:.2f}s")
+        else:
+            error = (actual - predicted) / predicted if predicted else 0.0
+            print(f"\n⏱️  makespan: 预测 {predicted:.2f}s / 实际 {actual:.2f}s ({error:+.0%})")
+
+        if self.tracer is not None:
+            trace_dir = self.base_path / ".analytics" / "traces"
+            trace_dir.mkdir(parents=True, exist_ok=True)
+            trace_file = self.tracer.export(
+                trace_dir / f"batch-{datetime.now():%Y%m%d-%H%M%S}.json",
+                {"packets": len(state), "predicted_makespan": predicted, "actual_makespan": actual})
+            print(f"🧭 Trace: {trace_file}")
+
+        if self.history:
+            for entry in state:
+                if not entry["results"]:
+                    continue
+                try:
+                    stages = {pipeline_scheduler.PREPARE_TASK: entry["prepare_time"]} if "prepare_time" in entry else {}
+                    run_history.record_run(str(self.base_path), "batch", entry["packet"], entry["results"],
+                                           stages, entry["end"] - entry["start"])
+                except OSError as e:
+                    print(f"⚠️  运行历史写入失败: {e}")
 
----
+    def _read_resume(self, resume_path: str) -> str:
+        """读取简历内容"""
+        try:
+            import pdfplumber
 
-## 公司背景
+            with span(f"parse {Path(resume_path).name}", "pdf", inputs=(resume_path,)) as current:
+                with pdfplumber.open(resume_path) as pdf:
+                    content = ''
+                    for page in pdf.pages:
+                        content += page.extract_text() + '\n'
+                current.set("pages", len(pdf.pages))
+                current.set("chars", len(content))
+            return content
+        except ImportError:
+            print("⚠️  警告: pdfplumber 未安装，尝试使用备用方法")
+            # 备用方法：返回文件路径，让后续处理
+            return f"FILE:{resume_path}"
 
-**[待 AI 生成 - 基于网络搜索]**
+    def _load_upstream(self, teammate_id: str, output_dir: Path,
+                       unavailable: Tuple[str, ...] = ()) -> Tuple[Dict[str, Dict], List[str]]:
+        """
+        读取队友依赖的上游文档的结构化副本 (artifact_sidecar)
 
-- 发展历程
-- 融资上市情况
-- 行业地位
+        优先取产物仓库中本次运行写出的副本，其次是磁盘上未过期的副本；之前版本
+        生成的包没有副本 (或文档被手工修改过) 时解析 Markdown。
 
-## 业务模式
+        Args:
+            teammate_id: 队友 ID
+            output_dir: 包目录
+            unavailable: 本次运行中失败的上游前缀，磁盘上的旧文件也视为缺失
 
-**[待 AI 生成]**
+        Returns:
+            ({前缀: 副本}, 缺失的文件名列表)
 
-- 核心产品/服务
-- 收入结构
-- 目标客户
+        Raises:
+            MissingInputs: 有输入缺失且队友的 on_missing_input 不是 "degrade"
+        """
+        config = self.config
+        teammates = {teammate["output_file"][:2]: teammate for teammate in config["teammates"].values()}
+        spec = next(t for t in config["teammates"].values() if t["id"] == teammate_id)
+
+        upstream, missing = {}, []
+        for prefix in spec.get("dependencies", []):
+            path = Path(output_dir) / teammates[prefix]["output_file"]
+            # 本次运行写出的产物直接从内存取; 之前运行的输出从磁盘读取
+            document = None if prefix in unavailable else self.artifacts.sidecar(path)
+            if document is not None:
+                upstream[prefix] = document
+            elif prefix in unavailable or not path.exists():
+                missing.append(path.name)
+            else:
+                upstream[prefix] = artifact_sidecar.read(path, teammates[prefix]["id"])
+
+        if missing and teammate_policy(config, teammate_id)["on_missing_input"] != "degrade":
+            raise MissingInputs(missing)
+        return upstream, missing
+
+    def _put_artifact(self, teammate_id: str, output_file: Path, content: str) -> "concurrent.futures.Future":
+        """保存队友文档及其结构化副本 (后台写盘，见 ArtifactStore.put)"""
+        sidecar = artifact_sidecar.build(output_file.name, content, teammate_id,
+                                         {"prefix": output_file.name[:2]})
+        return self.artifacts.put(output_file, content, sidecar)
+
+    @staticmethod
+    def _completed(start: float, output_file: Path, missing: List[str]) -> Dict:
+        """生成成功的结果; 缺少部分输入时状态为 "degraded" 并列出缺失文件"""
+        result = {
+            "status": "degraded" if missing else "success",
+            "time": time.time() - start,
+            "file": str(output_file)
+        }
+        if missing:
+            result["missing_inputs"] = missing
+        return result
+
+    def _generation_context(self, teammate_id: str, output_dir: Path, metadata: Dict,
+                            upstream: Optional[Dict[str, Any]] = None) -> Dict:
+        """段落提示词的输入: 队友角色、包信息，以及配置中声明的输入 (JD / 简历) 和上游文档"""
+        spec = next(t for t in self.config["teammates"].values() if t["id"] == teammate_id)
+        inputs = spec.get("inputs", [])
+        if not {"company", "role"} <= set(metadata):
+            metadata = {**self.load_packet_metadata(output_dir), **metadata}
+        context = {
+            "teammate": teammate_id,
+            "author": spec.get("role", spec["name"]),
+            "company": metadata.get("company", ""),
+            "role": metadata.get("role", ""),
+            "upstream": upstream or {}
+        }
+        # 只有读简历或依赖候选人相关文档 (02 及其下游、同一文档中先生成的节) 的提示词写入
+        # 候选人: 公司研究、只依赖 01 的节 (反向提问等) 的提示词跨候选人相同，响应缓存可以复用
+        if "resume" in inputs or any(key in self._candidate_documents() or key not in self._document_prefixes()
+                                     for key in context["upstream"]):
+            context["candidate"] = metadata.get("candidate", "")
+        if "jd" in inputs:
+            context["jd"] = metadata.get("jd_content") or read_text(output_dir / "raw_data" / "jd_original.txt")
+        if "resume" in inputs:
+            resume_path = metadata.get("resume_path") or output_dir / "resumes" / metadata["resume_file"]
+            context["resume"] = metadata.get("resume_content") or self._read_resume(str(resume_path))
+        return context
+
+    def _document_prefixes(self) -> List[str]:
+        """各队友文档的前缀 ("01" ... "05")"""
+        return [teammate["output_file"][:2] for teammate in self.config["teammates"].values()]
+
+    def _candidate_documents(self) -> List[str]:
+        """内容与候选人相关的文档前缀: 读简历的队友及其全部下游"""
+        affected = affected_teammates(self.config, ["resume"])
+        return [teammate["output_file"][:2] for teammate in self.config["teammates"].values()
+                if teammate["id"] in affected]
+
+    def _generate(self, teammate_id: str, draft: str, output_dir: Path, metadata: Dict,
+                  upstream: Optional[Dict[str, Any]] = None, output_file=None,
+                  template: Optional[str] = None, document: Optional[str] = None) -> str:
+        """
+        用生成后端填充草稿中的 [待 AI 生成] 段落 (占位后端时原样返回)
+
+        Args:
+            draft: 模板渲染出的文档
+            metadata: 已知的包信息 (company / role / candidate / jd_content / resume_content)，
+                其余从包目录读取
+            output_file: 流式生成时边生成边写入该文件 (路径或可写对象)
+            template: 草稿的模板名 (缺省为 TEAMMATE_TEMPLATES 中的队友模板)
+            document: 文档标题 (缺省取草稿中的一级标题)
+        """
+        if not self.generator.active:
+            return draft
+
+        output_dir = Path(output_dir)
+        with span(f"generate {teammate_id}", "generation"):
+            context = self._generation_context(teammate_id, output_dir, metadata, upstream)
+            context["document"] = document or _document_title(draft)
+            # 模板版本参与响应缓存键: 修改模板后不再复用旧的生成结果
+            context["template"] = default_engine().get(template or TEAMMATE_TEMPLATES[teammate_id]).digest
+            return self.generator.fill(draft, context, output_file)
+
+    def _render_sections(self, teammate_id: str, values: Dict) -> List[Tuple[Dict, str]]:
+        """分节文档各节的草稿 [(节配置, 草稿), ...] (按 pipeline_config.json 的 sections 顺序)"""
+        spec = next(t for t in self.config["teammates"].values() if t["id"] == teammate_id)
+        return [(section, render_template(section["template"], values)) for section in spec["sections"]]
+
+    def _section_pool(self) -> "concurrent.futures.ThreadPoolExecutor":
+        """文档各节并发生成的线程池 (首次使用时创建)"""
+        if self._section_executor is None:
+            import concurrent.futures
+
+            self._section_executor = concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.generator.settings["max_in_flight"], thread_name_prefix="section")
+        return self._section_executor
+
+    def _compose_sections(self, teammate_id: str, upstream: Dict[str, Dict], output_dir: Path,
+                          metadata: Dict, output_file: Optional[Path] = None,
+                          keep: Optional[Dict[str, str]] = None) -> str:
+        """
+        分节文档: 各节分别渲染、并发生成，按声明顺序拼接
 
-## 竞争格局
+        每节的 dependencies 可以是上游文档前缀 (只把这些文档写入该节的提示词)、
+        「前缀#标题」(只写入上游文档的该章节，JD 修订按章节判断受影响的节) 或
+        同一文档中其他节的 id (等这些节生成后，把其内容作为输入)；没有依赖关系的
+        节并发生成，文档耗时取决于最慢的一条依赖链而不是各节之和。流式生成时
+        各节按顺序写入 output_file (OrderedWriter)。
 
-**[待 AI 生成]**
+        keep 中的节 ({节 id: 内容}，JD 修订时未受影响的节) 不重新生成，直接使用其内容。
+        """
+        keep = keep or {}
+        sections = self._render_sections(teammate_id, {"upstream": upstream})
+        if not self.generator.active:
+            return "".join(keep.get(section["id"], draft) for section, draft in sections)
+
+        import concurrent.futures
+        from generation_backend import OrderedWriter
+
+        ids = [section["id"] for section, _ in sections]
+        title = _document_title(sections[0][1])
+        stream = output_file and self.generator.settings["stream"] and not keep
+        writer = OrderedWriter(output_file, len(sections)) if stream else None
+        executor = self._section_pool()
+
+        def generate(index: int, inputs: Dict[str, Any]) -> str:
+            section, draft = sections[index]
+            part = writer.part(index) if writer else None
+            with span(f"section {section['id']}", "generation"):
+                content = self._generate(teammate_id, draft, output_dir, metadata, inputs, part,
+                                         template=section["template"], document=title)
+            if part is not None:
+                # 没有待生成段落的节不经 fill() 写出
+                if not part.written:
+                    part.write(content)
+                writer.finish(index)
+            return content
 
-- 主要竞争对手
-- 差异化优势
-- 市场份额
+        results: Dict[str, str] = {section_id: keep[section_id] for section_id in ids if section_id in keep}
+        running: Dict["concurrent.futures.Future", int] = {}
+        waiting = [index for index, section_id in enumerate(ids) if section_id not in keep]
+        completed = False
+        try:
+            while waiting or running:
+                for index in [i for i in waiting if all(
+                        d in results or d not in ids for d in sections[i][0].get("dependencies", []))]:
+                    waiting.remove(index)
+                    dependencies = sections[index][0].get("dependencies")
+                    inputs = dict(upstream) if dependencies is None else _section_inputs(
+                        dependencies, upstream, {d: results[d] for d in dependencies if d in ids})
+                    future = executor.submit(contextvars.copy_context().run, generate, index, inputs)
+                    running[future] = index
+                if not running:
+                    raise ValueError(f"{teammate_id} 的 sections 存在循环依赖: {', '.join(ids[i] for i in waiting)}")
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    results[ids[running.pop(future)]] = future.result()
+            completed = True
+        finally:
+            if writer:
+                writer.close(completed)
+        return "".join(results[section_id] for section_id in ids)
 
-## 职位深度分析
+    # ========== Teammate A: 公司研究员 ==========
 
-**[待 AI 生成 - 基于 JD]**
+    def _compose_company_intel(self, company: str, role: str) -> str:
+        """Teammate A: 01_company_intel_brief.md 内容 (模板 assets/templates/teammate_a_company_intel.md)"""
+        return render_template(TEAMMATE_TEMPLATES["teammate_a"], {
+            "company": company,
+            "role": role,
+            "generated_at": datetime.now().strftime('%Y-%m-%d %H:%M')
+        })
 
-- 职位描述解读
-- 核心要求
-- 面试切入点
+    def _company_intel(self, company: str, role: str, jd_content: str, output_dir: Path) -> str:
+        """
+        Teammate A 内容，跨候选人复用
 
-## 核心洞察与策略
+        同一公司 / 职位 / JD 的简报取自公司情报缓存: 新鲜命中直接返回，过期时
+        先返回旧内容并在后台刷新，未命中时生成并写入缓存。简报可能被其他包
+        复用或在后台刷新，因此不流式写入包目录。
+        """
+        def compose() -> str:
+            return self._generate("teammate_a", self._compose_company_intel(company, role), output_dir,
+                                  {"company": company, "role": role, "jd_content": jd_content})
 
-**[待 AI 生成]**
+        if self.intel_cache is None:
+            return compose()
 
-- 公司诉求
-- 文化匹配
-- 风险应对
+        refresh = self.refresh_intel
+        if self.generator.active and not refresh:
+            # 开启生成后端之前缓存的是占位简报，重新生成
+            from generation_backend import PLACEHOLDER
+            entry = self.intel_cache.lookup(company, role, jd_content)
+            refresh = entry is not None and PLACEHOLDER.search(entry["content"]) is not None
 
----
+        with span("company_intel_cache", "cache", company=company) as current:
+            content, status = self.intel_cache.get_or_create(company, role, jd_content, compose, refresh=refresh)
+            current.set("status", status)
+        return content
 
-*本文件由 Teammate A (公司研究员) 生成*
-"""
+    def _teammate_a_company_researcher(self, company: str, role: str,
+                                      jd_content: str, output_dir: Path) -> Dict:
+        """Teammate A: 公司研究员 - 生成 01_company_intel_brief.md"""
+        start = time.time()
+
+        try:
+            # 生成占位内容（实际使用时会由 AI 填充）; 同一职位的其他候选人已生成过时取自缓存
+            with profiled("teammate_a"):
+                content = self._company_intel(company, role, jd_content, output_dir)
 
             output_file = output_dir / "01_company_intel_brief.md"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            self._put_artifact("teammate_a", output_file, content)
 
             return {
                 "status": "success",
@@ -291,80 +1299,23 @@ class PipelineTeam:
 
     # ========== Teammate B: 简历分析师 ==========
 
+    def _compose_resume_matching(self, candidate: str) -> str:
+        """Teammate B: 02_resume_jd_matching.md 内容 (模板 assets/templates/teammate_b_resume_matching.md)"""
+        return render_template(TEAMMATE_TEMPLATES["teammate_b"], {"candidate": candidate})
+
     def _teammate_b_resume_analyst(self, resume_content: str, jd_content: str,
                                    output_dir: Path, candidate: str) -> Dict:
         """Teammate B: 简历分析师 - 生成 02_resume_jd_matching.md"""
         start = time.time()
 
         try:
-            content = f"""# 简历分析和匹配
-
-## ⚠️ 事实声明
-⚠️ **重要**: 本文档所有分析严格基于候选人简历的真实数据。
-- ✅ 优点：来自简历中明确陈述的信息
-- ⚠️ 待提升：基于 JD 要求与简历对比的客观分析
-- ❌ 绝不编造：不包含任何简历中不存在的信息
-
-**来源**: 简历文件 → {candidate}
-**验证**: 所有数据点均可追溯至简历
-
----
-
-## 匹配度总览
-
-| 维度 | 匹配情况 | 说明 |
-|------|----------|------|
-| 综合评分 | **[待 AI 计算]** | 基于各维度加权评估 |
-| 核心优势 | **[待 AI 识别]** | 简历中突出的匹配点 |
-| 待提升点 | **[待 AI 分析]** | JD 要求与简历的差距 |
-
----
-
-## 逐项匹配分析
-
-**[待 AI 生成 - 逐项对比 JD 要求与简历]**
-
-格式示例:
-### JD要求1
-- **要求描述**: ...
-- **候选人情况**: [简历事实]
-- **匹配度**: ✅/⚠️/❌
-- **证据**: [简历具体内容]
-- **应对策略**: [如需改进]
-
----
-
-## 加分项匹配
-
-**[待 AI 生成 - 识别隐性优势]**
-
----
-
-## 待提升点应对
-
-**[待 AI 生成 - 针对性策略]**
-
-### 短板1
-- **问题**: ...
-- **应对策略**: ...
-- **话术建议**: ...
-
----
-
-## 核心竞争力总结
-
-**[待 AI 生成 - 提炼3-5个核心卖点]**
-
-面试中必须突出的能力...
-
----
-
-*本文件由 Teammate B (简历分析师) 生成*
-"""
-
             output_file = output_dir / "02_resume_jd_matching.md"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            with profiled("teammate_b"):
+                content = self._generate("teammate_b", self._compose_resume_matching(candidate), output_dir,
+                                         {"candidate": candidate, "jd_content": jd_content,
+                                          "resume_content": resume_content}, output_file=output_file)
+
+            self._put_artifact("teammate_b", output_file, content)
 
             return {
                 "status": "success",
@@ -379,113 +1330,29 @@ class PipelineTeam:
 
     # ========== Teammate C: 面试教练 ==========
 
-    def _teammate_c_interview_coach(self, output_dir: Path) -> Dict:
+    def _compose_interview_prep(self, upstream: Dict[str, Dict]) -> str:
+        """Teammate C: 03_interview_prep_report.md 内容 (分节模板 assets/templates/teammate_c/; upstream: {前缀: 上游文档副本})"""
+        return "".join(draft for _, draft in self._render_sections("teammate_c", {"upstream": upstream}))
+
+    def _teammate_c_interview_coach(self, output_dir: Path, unavailable: Tuple[str, ...] = ()) -> Dict:
         """Teammate C: 面试教练 - 生成 03_interview_prep_report.md"""
         start = time.time()
 
         try:
-            # 读取依赖文件
-            file_01 = list(output_dir.glob("01_*.md"))[0]
-            file_02 = list(output_dir.glob("02_*.md"))[0]
-
-            with open(file_01, 'r', encoding='utf-8') as f:
-                content_01 = f.read()
-            with open(file_02, 'r', encoding='utf-8') as f:
-                content_02 = f.read()
-
-            content = f"""# 面试准备报告
-
-> 基于 01_company_intel_brief.md 和 02_resume_jd_matching.md 生成
-
----
-
-## HR 面试
-
-### 自我介绍框架
-
-**[待 AI 生成 - 1/2/3分钟版本]**
-
-### 常见问题
-
-#### 1. 请介绍一下自己
-**[待 AI 生成 - 基于简历]**
-
-#### 2. 为什么离开上一家公司？
-**[待 AI 生成 - 积极正面]**
-
-#### 3. 职业规划是什么？
-**[待 AI 生成 - 与公司匹配]**
-
-### 薪资谈判
-
-**[待 AI 生成 - 策略和话术]**
-
----
-
-## 业务面试
-
-### STAR 案例
-
-**[待 AI 生成 - 基于简历真实经历]**
-
-#### 案例1: [项目名称]
-- **Situation**: [简历事实]
-- **Task**: [简历事实]
-- **Action**: [简历事实]
-- **Result**: [简历事实，带数据]
-
-#### 案例2: [项目名称]
-- **Situation**: ...
-- **Task**: ...
-- **Action**: ...
-- **Result**: ...
-
-### 技术问题准备
-
-**[待 AI 生成 - 基于JD技术要求]**
-
----
-
-## 高管面试
-
-### 行业观点
-
-**[待 AI 生成 - 基于公司研究和行业分析]**
-
-### 3-6个月规划
-
-**[待 AI 生成 - 与职位匹配]**
-
-### 优劣势分析
-
-**[待 AI 生成 - 客观认知]**
-
----
-
-## 面试准备清单
-
-### 面试前
-- [ ] [待 AI 生成]
-
-### 面试中
-- [ ] [待 AI 生成]
-
-### 面试后
-- [ ] [待 AI 生成]
-
----
-
-*本文件由 Teammate C (面试教练) 生成*
-"""
+            # 读取依赖文件 (缺失时按 on_missing_input 跳过或降级)
+            upstream, missing = self._load_upstream("teammate_c", output_dir, unavailable)
 
             output_file = output_dir / "03_interview_prep_report.md"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            with profiled("teammate_c"):
+                content = self._compose_sections("teammate_c", upstream, output_dir, {}, output_file)
+
+            self._put_artifact("teammate_c", output_file, content)
 
+            return self._completed(start, output_file, missing)
+        except MissingInputs as e:
             return {
-                "status": "success",
-                "time": time.time() - start,
-                "file": str(output_file)
+                "status": f"skipped: {e}",
+                "time": time.time() - start
             }
         except Exception as e:
             return {
@@ -495,132 +1362,29 @@ class PipelineTeam:
 
     # ========== Teammate D: 文案专家 ==========
 
-    def _teammate_d_copywriter(self, output_dir: Path) -> Dict:
+    def _compose_icebreaker(self, upstream: Dict[str, Dict]) -> str:
+        """Teammate D: 04_icebreaker_messages.md 内容 (分节模板 assets/templates/teammate_d/; upstream: {前缀: 上游文档副本})"""
+        return "".join(draft for _, draft in self._render_sections("teammate_d", {"upstream": upstream}))
+
+    def _teammate_d_copywriter(self, output_dir: Path, unavailable: Tuple[str, ...] = ()) -> Dict:
         """Teammate D: 文案专家 - 生成 04_icebreaker_messages.md"""
         start = time.time()
 
         try:
-            # 读取依赖文件
-            file_01 = list(output_dir.glob("01_*.md"))[0]
-            file_02 = list(output_dir.glob("02_*.md"))[0]
-
-            with open(file_01, 'r', encoding='utf-8') as f:
-                content_01 = f.read()
-            with open(file_02, 'r', encoding='utf-8') as f:
-                content_02 = f.read()
-
-            content = f"""# 破冰文案
-
-> 基于 01_company_intel_brief.md 和 02_resume_jd_matching.md 生成
-
----
-
-## 自我介绍
-
-### 30秒版本 (电梯演讲)
-
-**[待 AI 生成 - 简洁有力]**
-
-```
-[模板]
-我是[姓名]，拥有[X年][领域]经验。曾在[公司]负责[项目]，实现了[成果]。现在应聘贵公司的[职位]，希望能用我的[核心能力]为团队创造价值。
-```
-
-### 1分钟版本 (标准介绍)
-
-**[待 AI 生成 - 全面覆盖]**
-
-```
-[模板]
-• 背景：[教育/工作经历]
-• 经验：[核心能力1]、[核心能力2]
-• 成就：[1-2个关键数据]
-• 动机：[为什么选择这家公司]
-```
-
-### 2分钟版本 (深度介绍)
-
-**[待 AI 生成 - 详细展开]**
-
-包含：完整经历 + 核心项目 + 个人特色 + 职业规划
-
----
-
-## 针对不同面试官的开场白
-
-### HR 面试官
-
-**[待 AI 生成 - 强调匹配度和稳定性]**
-
-### 业务负责人
-
-**[待 AI 生成 - 强调专业能力和项目经验]**
-
-### 高管/创始人
-
-**[待 AI 生成 - 强调行业认知和战略思维]**
-
----
-
-## 场景化开场
-
-### 面试官自我介绍后
-
-**[待 AI 生成 - 承接话题]**
-
-### 直接进入提问
-
-**[待 AI 生成 - 专业回应]**
-
-### 时间限制30秒
-
-**[待 AI 生成 - 精炼版本]**
-
----
-
-## 反向提问
-
-### 问HR
-
-1. **[待 AI 生成 - 职业发展]**
-2. **[待 AI 生成 - 团队文化]**
-3. **[待 AI 生成 - 岗位期望]**
-
-### 问业务负责人
-
-1. **[待 AI 生成 - 业务挑战]**
-2. **[待 AI 生成 - 产品规划]**
-3. **[待 AI 生成 - 团队协作]**
-
-### 问高管
-
-1. **[待 AI 生成 - 公司战略]**
-2. **[待 AI 生成 - 行业趋势]**
-3. **[待 AI 生成 - 长期愿景]**
-
----
-
-## 开场选择指南
-
-| 面试官类型 | 推荐开场 | 时长 | 侧重点 |
-|------------|----------|------|--------|
-| HR | 自我介绍1分钟版 | 1分钟 | 匹配度、稳定性 |
-| 业务负责人 | 项目案例开场 | 1-2分钟 | 专业能力 |
-| 高管 | 行业观点开场 | 2分钟 | 战略思维 |
-
----
-
-*本文件由 Teammate D (文案专家) 生成*
-"""
+            # 读取依赖文件 (缺失时按 on_missing_input 跳过或降级)
+            upstream, missing = self._load_upstream("teammate_d", output_dir, unavailable)
 
             output_file = output_dir / "04_icebreaker_messages.md"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(content)
+            with profiled("teammate_d"):
+                content = self._compose_sections("teammate_d", upstream, output_dir, {}, output_file)
+
+            self._put_artifact("teammate_d", output_file, content)
 
+            return self._completed(start, output_file, missing)
+        except MissingInputs as e:
             return {
-                "status": "success",
-                "time": time.time() - start,
-                "file": str(output_file)
+                "status": f"skipped: {e}",
+                "time": time.time() - start
             }
         except Exception as e:
             return {
@@ -630,148 +1394,189 @@ class PipelineTeam:
 
     # ========== Teammate E: 战略顾问 ==========
 
-    def _teammate_e_strategy_consultant(self, output_dir: Path) -> Dict:
+    def _compose_final_report(self, upstream: Dict[str, Dict]) -> str:
+        """Teammate E: 05_final_analysis_report.md 内容 (模板 assets/templates/teammate_e_final_report.md; upstream: {前缀: 上游文档副本})"""
+        return render_template(TEAMMATE_TEMPLATES["teammate_e"], {"upstream": upstream})
+
+    def _teammate_e_strategy_consultant(self, output_dir: Path, unavailable: Tuple[str, ...] = ()) -> Dict:
         """Teammate E: 战略顾问 - 生成 05_final_analysis_report.md"""
         start = time.time()
 
         try:
-            # 读取所有依赖文件
-            contents = {}
-            for i in range(1, 5):
-                files = list(output_dir.glob(f"0{i}_*.md"))
-                if files:
-                    with open(files[0], 'r', encoding='utf-8') as f:
-                        contents[f"0{i}"] = f.read()
-
-            content = f"""# 最终分析报告
-
-> 综合前面四个文件的完整分析
-
----
-
-## 综合评估
-
-### 优势总结
-
-**[待 AI 生成 - 基于 02_resume_jd_matching.md]**
-
-### 待提升点
-
-**[待 AI 生成 - 基于 02_resume_jd_matching.md]**
+            # 读取所有依赖文件 (缺失时按 on_missing_input 跳过或降级)
+            upstream, missing = self._load_upstream("teammate_e", output_dir, unavailable)
 
-### 应对策略
-
-**[待 AI 生成 - 基于 03_interview_prep_report.md]**
-
----
-
-## 核心竞争力定位
-
-### 能力1: [能力名称]
-
-**[待 AI 生成 - 深度分析]**
-- 什么是这个能力
-- 候选人如何体现
-- 为什么重要
-
-### 能力2: [能力名称]
-
-**[待 AI 生成]**
-
-### 能力3: [能力名称]
-
-**[待 AI 生成]**
-
----
-
-## 面试成功要素
-
-### 1. 展示了解
-
-**[待 AI 生成 - 基于 01_company_intel_brief.md]**
-
-### 2. 证明匹配
-
-**[待 AI 生成 - 基于 02_resume_jd_matching.md]**
-
-### 3. 展示学习
-
-**[待 AI 生成 - 基于 03_interview_prep_report.md]**
-
----
-
-## 风险评估
-
-### 高风险问题
-
-| 风险问题 | 风险等级 | 应对策略 |
-|----------|----------|----------|
-| **[待 AI 识别]** | 高/中/低 | **[待 AI 设计]** |
-| **[待 AI 识别]** | 高/中/低 | **[待 AI 设计]** |
-| **[待 AI 识别]** | 高/中/低 | **[待 AI 设计]** |
-
----
-
-## 行动计划
-
-### 立即行动 (今天)
-
-- [ ] **[待 AI 生成]**
-
-### 本周准备
+            output_file = output_dir / "05_final_analysis_report.md"
+            with profiled("teammate_e"):
+                content = self._generate("teammate_e", self._compose_final_report(upstream), output_dir, {}, upstream,
+                                         output_file)
 
-- [ ] **[待 AI 生成]**
-- [ ] **[待 AI 生成]**
+            self._put_artifact("teammate_e", output_file, content)
 
-### 面试前一天
+            return self._completed(start, output_file, missing)
+        except MissingInputs as e:
+            return {
+                "status": f"skipped: {e}",
+                "time": time.time() - start
+            }
+        except Exception as e:
+            return {
+                "status": f"error: {e}",
+                "time": time.time() - start
+            }
 
-- [ ] **[待 AI 生成]**
 
-### 面试当天
+def _document_title(draft: str) -> str:
+    """草稿中的一级标题"""
+    return next((line[2:].strip() for line in draft.splitlines() if line.startswith("# ")), "")
+
+
+def _section_inputs(dependencies: List[str], upstream: Dict[str, Dict], siblings: Dict[str, str]) -> Dict[str, Any]:
+    """
+    分节文档中一节的提示词输入
+
+    「前缀#标题」按前缀合并为上游副本的这些章节 (artifact_sidecar.select)，
+    同时依赖整篇的前缀取整篇；siblings 为已生成的同文档节 {节 id: 内容}。
+    """
+    titles: Dict[str, Optional[List[str]]] = {}
+    for dependency in dependencies:
+        prefix, _, title = dependency.partition("#")
+        if dependency in siblings or prefix not in upstream:
+            continue
+        if not title:
+            titles[prefix] = None
+        elif titles.get(prefix, []) is not None:
+            titles[prefix] = titles.get(prefix, []) + [title]
+    inputs: Dict[str, Any] = {prefix: upstream[prefix] if selected is None
+                              else artifact_sidecar.select(upstream[prefix], selected)
+                              for prefix, selected in titles.items()}
+    inputs.update(siblings)
+    return inputs
+
+
+def _read_jd_argument(value: str) -> str:
+    """--jd 可以是文件路径或 JD 内容"""
+    jd_path = Path(value)
+    if jd_path.exists():
+        with open(jd_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    return value
 
-- [ ] **[待 AI 生成]**
 
----
+def _resolve_resume(value: str, base_path: str) -> Path:
+    """定位简历文件 (直接路径或 <base_path>/resumes/ 下)，不存在时退出"""
+    resume_path = Path(value)
+    if not resume_path.exists():
+        # 尝试在 resumes 目录查找
+        resume_in_resumes = Path(base_path) / "resumes" / value
+        if resume_in_resumes.exists():
+            resume_path = resume_in_resumes
+        else:
+            print(f"❌ 错误: 简历文件不存在: {value}")
+            sys.exit(1)
+    return resume_path
 
-## 核心数据速查表
 
-| 维度 | 核心数据 | 来源 |
-|------|----------|------|
-| **[待 AI 提炼]** | **[数据]** | 简历 |
-| **[待 AI 提炼]** | **[数据]** | 简历 |
-| **[待 AI 提炼]** | **[数据]** | JD分析 |
+def _packet_dir(args) -> Path:
+    """命令行参数对应的包目录"""
+    return Path(args.base_path) / "companies" / f"{args.company}-{args.role}-{args.candidate}"
 
-**提示**: 面试前熟记这些数据，随时引用。
 
----
+def _run_revise(args, jd_content: str):
+    """--revise: 包中已有 JD 的修订版，只重新生成受变更要求影响的章节"""
+    output_dir = _packet_dir(args)
+    if not (output_dir / "raw_data" / "jd_original.txt").exists():
+        print(f"❌ 错误: 包不存在或没有保存的 JD: {output_dir}")
+        sys.exit(1)
 
-## 成功概率评估
+    team = PipelineTeam(args.base_path, trace=not args.no_trace, history=not args.no_history,
+                        generation_url=args.generation_url)
+    report = team.revise(output_dir, jd_content)
+    diff = report["diff"]
+    print(f"📝 JD 修订: 新增 {len(diff['added'])}、删除 {len(diff['removed'])}、修改 {len(diff['modified'])} 条要求"
+          f" (未变 {diff['unchanged']} 条)")
+    if not report["plan"]:
+        print("✅ 没有受影响的章节，已更新包中的 JD")
+    for teammate_id, result in report["results"].items():
+        ok = result["status"] in OK_STATUSES + ("revised",)
+        detail = "、".join(result["sections"]) if "sections" in result else "整篇"
+        print(f"   {'✅' if ok else '❌'} {teammate_id}: {detail} ({result['time']:.1f}s)"
+              + ("" if ok else f" {result['status']}"))
+    if not report["jd_updated"]:
+        print("⚠️  有队友修订失败，包中保留旧 JD: 用同一 JD 再次 --revise 重试")
+    _print_generation_stats(team)
+
+
+def _similar_packet(args, jd_content: str) -> Optional[Path]:
+    """
+    JD 近似重复的已有流水线包 (见 jd_index.py): 打印匹配; 加 --reuse-similar 时返回
+    相似度最高的包供沿用，否则返回 None
+
+    本次的输出目录自身不参与比较 (重跑同一个包不算重复)。
+    """
+    from jd_index import DEFAULT_THRESHOLD, find_similar
+
+    output_dir = _packet_dir(args)
+    threshold = DEFAULT_THRESHOLD if args.similarity is None else args.similarity
+    matches = find_similar(jd_content, args.base_path, threshold,
+                           exclude=[output_dir / "raw_data" / "jd_original.txt"])
+    if not matches:
+        return None
+
+    for match in matches[:3]:
+        print(f"🔁 近似重复 JD: {match['packet']} (相似度 {match['similarity']:.0%})")
+    packets = [match for match in matches if match["kind"] == "packet"]
+    if not args.reuse_similar:
+        if packets:
+            print("   加 --reuse-similar 沿用其中不受影响的产物")
+        print()
+        return None
+    if not packets:
+        print("   匹配的是一键工作流的公司文件夹，没有可沿用的流水线产物")
+        print()
+        return None
+    return Path(packets[0]["packet"])
 
-**[待 AI 生成 - 基于综合分析]**
 
-- 综合评分: **XX/100**
-- 成功概率: **XX%**
-- 关键因素: **[待 AI 列出]**
+def _run_batch(args, profiler):
+    """--batch: 多个包共享工作池，关键路径优先调度"""
+    with open(args.batch, 'r', encoding='utf-8') as f:
+        entries = json.load(f)
 
----
+    packets = [{
+        "company": entry["company"],
+        "role": entry["role"],
+        "candidate": entry["candidate"],
+        "jd_content": _read_jd_argument(entry["jd"]),
+        "resume_path": str(_resolve_resume(entry["resume"], args.base_path))
+    } for entry in entries]
 
-*本文件由 Teammate E (战略顾问) 生成*
-"""
+    team = PipelineTeam(args.base_path, trace=not args.no_trace, history=not args.no_history,
+                        refresh_intel=args.refresh_intel, generation_url=args.generation_url)
+    try:
+        with profiling.activate(profiler):
+            if args.use_async:
+                team.launch_concurrent(packets, resume=args.resume_run)
+            else:
+                team.launch_many(packets, args.workers, resume=args.resume_run)
+    except KeyboardInterrupt:
+        print("\n\n⚠️  用户中断 (已完成的节点记录在各包的 run_manifest.json，加 --resume-run 从中断处继续)")
+        sys.exit(1)
+    _print_generation_stats(team)
+    if profiler:
+        profiler.write(Path(args.base_path) / ".analytics")
 
-            output_file = output_dir / "05_final_analysis_report.md"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                f.write(content)
 
-            return {
-                "status": "success",
-                "time": time.time() - start,
-                "file": str(output_file)
-            }
-        except Exception as e:
-            return {
-                "status": f"error: {e}",
-                "time": time.time() - start
-            }
+def _print_generation_stats(team: PipelineTeam):
+    """生成后端的调用统计 (占位后端时不输出)"""
+    if team.generator.active:
+        stats = team.generator.stats
+        print(f"🤖 生成后端: {stats['calls']} 次调用，{stats['sections']} 个段落，约 {stats['tokens']} tokens")
+        if team.generator.cache is not None:
+            cache = team.generator.cache.stats
+            lookups = cache["hits"] + cache["misses"]
+            print(f"🗄️  响应缓存: 命中 {cache['hits']} / {lookups} ({cache['hits'] / lookups if lookups else 0:.0%})，"
+                  f"淘汰 {cache['evictions']} 条 (response_cache.py stats 查看累计)")
 
 
 def main():
@@ -794,54 +1599,121 @@ def main():
   # 指定基础路径
   python pipeline_team.py --company "腾讯" --role "产品经理" --candidate "李四" \\
                           --jd "jd.txt" --resume "resume.pdf" --base-path ".."
+
+  # 批量: 多个包共享工作池，按关键路径优先调度
+  # packets.json: [{"company", "role", "candidate", "jd", "resume"}, ...]
+  python pipeline_team.py --batch packets.json --workers 8
+
+  # 批量: 全部包在一个事件循环中并发 (并发上限见 team_mode.concurrency)
+  python pipeline_team.py --batch packets.json --async
+
+  # 中断后继续: 相同参数加 --resume-run，只运行未完成的队友及其下游
+  python pipeline_team.py --batch packets.json --resume-run
+
+  # JD 修订: 只重新生成受变更要求影响的章节 (见 jd_diff.py)
+  python pipeline_team.py --company "腾讯" --role "产品经理" --candidate "李四" \\
+                          --jd "jd_v2.txt" --revise
+
+  # JD 与已有包近似重复 (见 jd_index.py) 时沿用其中不受影响的产物
+  python pipeline_team.py --company "腾讯" --role "产品经理" --candidate "王五" \\
+                          --jd "jd.txt" --resume "resume.pdf" --reuse-similar
+
+  # 用本地桩服务测试生成后端 (另一个终端: python generation_stub.py --port 8765)
+  python pipeline_team.py --batch packets.json --async --generation-url http://127.0.0.1:8765
         """
     )
 
-    parser.add_argument("--company", required=True, help="公司名称")
-    parser.add_argument("--role", required=True, help="职位名称")
-    parser.add_argument("--candidate", required=True, help="候选人姓名")
-    parser.add_argument("--jd", required=True, help="JD文件路径或内容")
-    parser.add_argument("--resume", required=True, help="简历文件路径 (PDF)")
+    parser.add_argument("--company", help="公司名称")
+    parser.add_argument("--role", help="职位名称")
+    parser.add_argument("--candidate", help="候选人姓名")
+    parser.add_argument("--jd", help="JD文件路径或内容")
+    parser.add_argument("--resume", help="简历文件路径 (PDF)")
+    parser.add_argument("--batch", help="批量运行: 包列表 JSON 文件")
+    parser.add_argument("--workers", type=int, help="批量运行的工作线程数 (默认: team_mode.max_workers)")
+    parser.add_argument("--async", dest="use_async", action="store_true",
+                        help="批量运行改用异步运行时 (所有包在一个事件循环中并发)")
+    parser.add_argument("--resume-run", action="store_true",
+                        help="断点续跑: 按输出目录的 run_manifest.json 跳过已完成的节点")
+    parser.add_argument("--refresh-intel", action="store_true",
+                        help="忽略公司情报缓存，重新生成 01 简报并覆盖缓存 (缓存管理见 company_intel_cache.py)")
+    parser.add_argument("--revise", action="store_true",
+                        help="JD 修订: 与包中已有 JD 比较，只重新生成受变更要求影响的章节 (见 jd_diff.py)")
+    parser.add_argument("--reuse-similar", action="store_true",
+                        help="JD 与已有包近似重复时沿用其中不受影响的队友产物 (见 jd_index.py)")
+    parser.add_argument("--similarity", type=float, default=None,
+                        help="近似重复的最低相似度 (默认: jd_index.DEFAULT_THRESHOLD)")
+    parser.add_argument("--generation-url",
+                        help="用该地址的 http 生成后端填充 [待 AI 生成] 段落 (本地测试见 generation_stub.py)")
     parser.add_argument("--base-path", default=".", help="项目基础路径 (默认: .)")
+    parser.add_argument("--no-trace", action="store_true", help="不写出 trace.json")
+    parser.add_argument("--no-history", action="store_true", help="不记录运行历史")
+    profiling.add_arguments(parser, PROFILE_TARGETS)
 
     args = parser.parse_args()
 
-    # 读取 JD
-    jd_path = Path(args.jd)
-    if jd_path.exists():
-        with open(jd_path, 'r', encoding='utf-8') as f:
-            jd_content = f.read()
-    else:
-        jd_content = args.jd
+    profiler = profiling.from_flags(args.profile, args.profile_memory, args.profile_target, "pipeline")
 
-    # 验证简历文件
-    resume_path = Path(args.resume)
-    if not resume_path.exists():
-        # 尝试在 resumes 目录查找
-        resume_in_resumes = Path(args.base_path) / "resumes" / args.resume
-        if resume_in_resumes.exists():
-            resume_path = resume_in_resumes
-        else:
-            print(f"❌ 错误: 简历文件不存在: {args.resume}")
-            sys.exit(1)
+    if args.batch:
+        _run_batch(args, profiler)
+        return
+
+    required = ("company", "role", "candidate", "jd") + (() if args.revise else ("resume",))
+    missing = [name for name in required if not getattr(args, name)]
+    if missing:
+        parser.error("缺少参数: " + ", ".join(f"--{name}" for name in missing))
+
+    jd_content = _read_jd_argument(args.jd)
+    if args.revise:
+        _run_revise(args, jd_content)
+        return
 
-    # 启动团队
-    team = PipelineTeam(args.base_path)
+    resume_path = _resolve_resume(args.resume, args.base_path)
+    saved_jd = _packet_dir(args) / "raw_data" / "jd_original.txt"
+    if not args.resume_run and saved_jd.exists() and read_text(saved_jd) != jd_content:
+        print("💡 包中已有不同版本的 JD: 加 --revise 只重新生成受变更要求影响的章节\n")
+    reuse_from = _similar_packet(args, jd_content)
 
+    # 守护进程运行时交由其执行 (见 daemon.py)，否则本地启动团队; 性能分析、续跑、刷新公司情报、指定生成后端和沿用已有包时始终本地运行
+    from daemon_client import try_call
+
+    local = profiler or args.resume_run or args.refresh_intel or args.generation_url or reuse_from
     try:
-        output_dir = team.launch(
-            company=args.company,
-            role=args.role,
-            candidate=args.candidate,
-            jd_content=jd_content,
-            resume_path=str(resume_path)
-        )
+        handled, result = (False, None) if local else try_call("pipeline.launch", {
+            "base_path": str(Path(args.base_path).resolve()),
+            "company": args.company,
+            "role": args.role,
+            "candidate": args.candidate,
+            "jd_content": jd_content,
+            "resume_path": str(resume_path.resolve()),
+            "trace": not args.no_trace,
+            "history": not args.no_history
+        })
+
+        if handled:
+            output_dir = Path(result["output_dir"])
+            print(f"🔌 已由守护进程生成: {output_dir}")
+        else:
+            team = PipelineTeam(args.base_path, trace=not args.no_trace, history=not args.no_history,
+                                refresh_intel=args.refresh_intel, generation_url=args.generation_url)
+            with profiling.activate(profiler):
+                output_dir = team.launch(
+                    company=args.company,
+                    role=args.role,
+                    candidate=args.candidate,
+                    jd_content=jd_content,
+                    resume_path=str(resume_path),
+                    resume=args.resume_run,
+                    reuse_from=reuse_from
+                )
+            _print_generation_stats(team)
+            if profiler:
+                profiler.write(output_dir)
 
         print("\n💡 提示: 文件已生成框架，请使用 Claude Code 填充完整内容")
         print(f"💡 例如: '帮我填充 {output_dir} 中的所有文件'")
 
     except KeyboardInterrupt:
-        print("\n\n⚠️  用户中断")
+        print("\n\n⚠️  用户中断 (已完成的队友记录在 run_manifest.json，加 --resume-run 从中断处继续)")
         sys.exit(1)
     except Exception as e:
         print(f"\n\n❌ 错误: {e}")
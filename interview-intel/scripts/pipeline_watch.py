@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流水线监控模式 - 输入变更后增量重跑受影响的队友
+
+监控每个包目录的原始输入:
+- raw_data/jd_original.txt  → "jd"
+- resumes/*                 → "resume"
+
+按 pipeline_config.json 中声明的 inputs / dependencies 计算受影响的队友，
+合并一段时间内的连续修改 (debounce) 后只重跑这些队友及其下游。
+例如: JD 变更 → A, B → C/D → E；替换简历 → B → C/D → E。
+
+使用标准库轮询 + mtime 缓存实现 (标准库没有 inotify 绑定)，无额外依赖。
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from pipeline_team import PipelineTeam, affected_teammates, load_pipeline_config
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    """文件的 (mtime_ns, size)，不存在时返回 None"""
+    try:
+        stat = path.stat()
+        return (stat.st_mtime_ns, stat.st_size)
+    except FileNotFoundError:
+        return None
+
+
+class PacketWatcher:
+    """轮询包目录的输入文件，变更后增量重跑"""
+
+    def __init__(self, base_path: str = ".", packets: Optional[List[str]] = None,
+                 interval: float = 1.0, debounce: float = 2.0):
+        """
+        Args:
+            base_path: 项目基础路径 (包含 companies/)
+            packets: 只监控这些包目录 (默认监控 companies/ 下全部包)
+            interval: 轮询间隔 (秒)
+            debounce: 最后一次修改后等待多久再重跑 (秒)
+        """
+        self.base_path = Path(base_path)
+        self.packets = [Path(p) for p in packets] if packets else None
+        self.interval = interval
+        self.debounce = debounce
+
+        self.config = load_pipeline_config()
+        self.team = PipelineTeam(str(self.base_path), config=self.config)
+
+        self._snapshots: Dict[Path, Dict[str, object]] = {}
+        self._pending: Dict[Path, Set[str]] = {}
+        self._last_change = 0.0
+
+    def _packet_dirs(self) -> List[Path]:
+        """需要监控的包目录 (含 raw_data/jd_original.txt)"""
+        if self.packets is not None:
+            return self.packets
+
+        companies_path = self.base_path / "companies"
+        if not companies_path.exists():
+            return []
+        return [
+            item for item in companies_path.iterdir()
+            if item.is_dir() and (item / "raw_data" / "jd_original.txt").exists()
+        ]
+
+    @staticmethod
+    def _snapshot(packet_dir: Path) -> Dict[str, object]:
+        """记录输入文件的 mtime 签名"""
+        resumes_dir = packet_dir / "resumes"
+        resumes = tuple(sorted(
+            (p.name, _file_signature(p)) for p in resumes_dir.glob("*") if p.is_file()
+        )) if resumes_dir.exists() else ()
+
+        return {
+            "jd": _file_signature(packet_dir / "raw_data" / "jd_original.txt"),
+            "resume": resumes
+        }
+
+    def poll(self) -> Dict[Path, Set[str]]:
+        """
+        检查一次所有包的输入
+
+        Returns:
+            {包目录: 变更的输入名称集合}；首次见到的包只建立基线
+        """
+        changes = {}
+        for packet_dir in self._packet_dirs():
+            snapshot = self._snapshot(packet_dir)
+            previous = self._snapshots.get(packet_dir)
+            self._snapshots[packet_dir] = snapshot
+
+            if previous is None:
+                continue
+
+            changed = {name for name, value in snapshot.items() if previous.get(name) != value}
+            if changed:
+                changes[packet_dir] = changed
+        return changes
+
+    def flush(self) -> Dict[Path, Dict[str, Dict]]:
+        """重跑所有待处理包中受影响的队友"""
+        results = {}
+        pending, self._pending = self._pending, {}
+
+        for packet_dir, inputs in pending.items():
+            teammates = affected_teammates(self.config, sorted(inputs))
+            if not teammates:
+                continue
+
+            print(f"🔁 {packet_dir.name}: {', '.join(sorted(inputs))} 变更 → 重跑 {', '.join(teammates)}")
+            start = time.time()
+            try:
+                results[packet_dir] = self.team.rerun(packet_dir, teammates)
+            except Exception as e:
+                print(f"❌ {packet_dir.name}: 重跑失败: {e}")
+                continue
+
+            for teammate_id, result in results[packet_dir].items():
+                print(f"   ✅ {teammate_id}: {result['status']} ({result['time']:.1f}s)")
+            print(f"   ⏱️  {time.time() - start:.1f}s")
+
+            # 重跑可能改写了元数据，刷新基线避免重复触发
+            self._snapshots[packet_dir] = self._snapshot(packet_dir)
+
+        return results
+
+    def step(self, now: Optional[float] = None) -> Dict[Path, Dict[str, Dict]]:
+        """轮询一次；静默期超过 debounce 时执行重跑"""
+        now = time.time() if now is None else now
+
+        for packet_dir, inputs in self.poll().items():
+            self._pending.setdefault(packet_dir, set()).update(inputs)
+            self._last_change = now
+
+        if self._pending and now - self._last_change >= self.debounce:
+            return self.flush()
+        return {}
+
+    def run(self):
+        """持续监控直到 Ctrl-C"""
+        self.poll()  # 建立基线
+        print(f"👀 监控中: {len(self._snapshots)} 个包 (轮询 {self.interval}s, 防抖 {self.debounce}s)")
+        print("   按 Ctrl-C 退出")
+
+        while True:
+            time.sleep(self.interval)
+            self.step()
+
+
+def main():
+    """CLI 入口"""
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="流水线监控模式 - 输入变更后增量重跑受影响的队友",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+示例:
+  # 监控 companies/ 下所有包
+  python pipeline_watch.py --base-path ..
+
+  # 只监控一个包
+  python pipeline_watch.py --packet ../companies/阿里云-AI产品经理-王蕾
+        """
+    )
+    parser.add_argument("--base-path", default=".", help="项目基础路径 (默认: .)")
+    parser.add_argument("--packet", action="append", help="只监控指定包目录 (可重复)")
+    parser.add_argument("--interval", type=float, default=1.0, help="轮询间隔秒数 (默认: 1.0)")
+    parser.add_argument("--debounce", type=float, default=2.0, help="防抖秒数 (默认: 2.0)")
+
+    args = parser.parse_args()
+
+    watcher = PacketWatcher(args.base_path, args.packet, args.interval, args.debounce)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        print("\n👋 已停止监控")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+"""
+Profiling
+
+Opt-in cProfile / tracemalloc hooks for the CLI entry points
+(pipeline_team.py, all_in_one.py, analytics_generator.py,
+extract_jd_keywords.py).
+
+    --profile              cProfile the run → <label>.prof (+ .prof.txt summary)
+    --profile-memory       tracemalloc the run → <label>.memory.txt (top allocations)
+    --profile-target NAME  Only profile the named teammate / step / analysis step
+                           (pipeline_team, all_in_one, extract_jd_keywords;
+                           analytics commands are one sequential operation, so
+                           --profile already covers exactly that work)
+
+Reports are written next to the command's outputs. cProfile only sees the
+thread it is enabled in, so each profiled region running in a worker thread
+gets its own profiler and the results are merged into one .prof file. Python
+subprocesses launched inside a profiled region (the all-in-one steps) are run
+under `-m cProfile` and their profiles saved as <label>.<script>.prof.
+tracemalloc is process-wide, so a targeted memory report also includes
+allocations made concurrently by other threads.
+"""
+
+import shutil
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+_active: Optional["Profiler"] = None
+
+
+class Profiler:
+    """Collects CPU and/or memory profiles for one CLI run."""
+
+    def __init__(self, cpu: bool = True, memory: bool = False,
+                 target: Optional[str] = None, label: str = "profile", top: int = 25):
+        """
+        Args:
+            cpu: Record a cProfile profile
+            memory: Record a tracemalloc snapshot
+            target: Only profile the region with this name (None: whole run)
+            label: Report file name prefix
+            top: Number of entries in the text summaries
+        """
+        self.cpu = cpu
+        self.memory = memory
+        self.target = target
+        self.label = f"{label}.{target}" if target else label
+        self.top = top
+
+        self.matched: List[str] = []
+        self._profiles = []
+        self._snapshot = None
+        self._peak_bytes = 0
+        self._running = False
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._child_dir: Optional[str] = None
+
+    def _in_profile(self) -> bool:
+        return getattr(self._local, "depth", 0) > 0
+
+    @contextmanager
+    def _profile_thread(self) -> Iterator[None]:
+        """Enable cProfile for the current thread unless it is already profiled."""
+        if not self.cpu or self._in_profile():
+            self._local.depth = getattr(self._local, "depth", 0) + 1
+            try:
+                yield
+            finally:
+                self._local.depth -= 1
+            return
+
+        import cProfile
+
+        profile = cProfile.Profile()
+        self._local.depth = 1
+        profile.enable()
+        try:
+            yield
+        finally:
+            profile.disable()
+            self._local.depth = 0
+            with self._lock:
+                self._profiles.append(profile)
+
+    @contextmanager
+    def _trace_memory(self) -> Iterator[None]:
+        if not self.memory:
+            yield
+            return
+
+        import tracemalloc
+
+        tracemalloc.start(10)
+        try:
+            yield
+        finally:
+            self._snapshot = tracemalloc.take_snapshot()
+            self._peak_bytes = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    @contextmanager
+    def run(self) -> Iterator["Profiler"]:
+        """Wrap the whole command; profiles everything unless a target is set."""
+        self._running = True
+        try:
+            if self.target is None:
+                with self._trace_memory(), self._profile_thread():
+                    yield self
+            else:
+                yield self
+        finally:
+            self._running = False
+
+    @contextmanager
+    def region(self, name: str) -> Iterator[None]:
+        """
+        Mark a named teammate / step.
+
+        In whole-run mode this profiles worker threads the run would otherwise
+        miss; in target mode only the matching region is profiled.
+        """
+        if not self._running or (self.target is not None and name != self.target):
+            yield
+            return
+
+        self.matched.append(name)
+        if self.target is None:
+            with self._profile_thread():
+                yield
+        else:
+            with self._trace_memory(), self._profile_thread():
+                yield
+
+    def child_command(self, cmd: List[str]) -> List[str]:
+        """Run a Python script command under cProfile when inside a profiled region."""
+        if not self.cpu or not self._in_profile() or len(cmd) < 2:
+            return cmd
+
+        if self._child_dir is None:
+            import tempfile
+            self._child_dir = tempfile.mkdtemp(prefix="interview-intel-prof-")
+
+        output = Path(self._child_dir) / f"{self.label}.{Path(cmd[1]).stem}.prof"
+        return [cmd[0], "-m", "cProfile", "-o", str(output)] + list(cmd[1:])
+
+    def write(self, directory: Path) -> List[Path]:
+        """
+        Write the collected reports into directory.
+
+        Returns:
+            Paths of the written files
+        """
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        written = []
+
+        if self.target is not None and not self.matched:
+            print(f"⚠️  Profile target '{self.target}' did not run; no profile written")
+
+        if self._profiles:
+            import io
+            import pstats
+
+            stats = pstats.Stats(self._profiles[0])
+            for profile in self._profiles[1:]:
+                stats.add(profile)
+
+            prof_file = directory / f"{self.label}.prof"
+            stats.dump_stats(str(prof_file))
+
+            summary = io.StringIO()
+            pstats.Stats(str(prof_file), stream=summary).sort_stats("cumulative").print_stats(self.top)
+            summary_file = directory / f"{self.label}.prof.txt"
+            summary_file.write_text(summary.getvalue(), encoding="utf-8")
+            written.extend([prof_file, summary_file])
+
+        if self._child_dir is not None:
+            for child in sorted(Path(self._child_dir).glob("*.prof")):
+                destination = directory / child.name
+                shutil.move(str(child), destination)
+                written.append(destination)
+            shutil.rmtree(self._child_dir, ignore_errors=True)
+            self._child_dir = None
+
+        if self._snapshot is not None:
+            memory_file = directory / f"{self.label}.memory.txt"
+            memory_file.write_text(self._format_memory_report(), encoding="utf-8")
+            written.append(memory_file)
+
+        for path in written:
+            print(f"🔬 Profile: {path}")
+        return written
+
+    def _format_memory_report(self) -> str:
+        import tracemalloc
+
+        snapshot = self._snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+        stats = snapshot.statistics("lineno")
+        total = sum(stat.size for stat in stats)
+
+        lines = [
+            f"# tracemalloc report: {self.label}",
+            f"Peak traced memory: {self._peak_bytes / 1024:.1f} KiB",
+            f"Live at end of region: {total / 1024:.1f} KiB in {len(stats)} locations",
+            "",
+            f"Top {self.top} allocation sites (by size):",
+        ]
+        for index, stat in enumerate(stats[:self.top], 1):
+            frame = stat.traceback[0]
+            lines.append(f"{index:3d}. {frame.filename}:{frame.lineno}: "
+                         f"{stat.size / 1024:.1f} KiB in {stat.count} blocks")
+        return "\n".join(lines) + "\n"
+
+
+def from_flags(cpu: bool, memory: bool, target: Optional[str] = None,
+               label: str = "profile") -> Optional[Profiler]:
+    """Build a Profiler from CLI flags; None when profiling was not requested."""
+    if not (cpu or memory or target):
+        return None
+    # --profile-target alone implies --profile
+    return Profiler(cpu=cpu or not memory, memory=memory, target=target, label=label)
+
+
+def add_arguments(parser, targets: Optional[List[str]] = None):
+    """Add --profile / --profile-memory (and --profile-target) to an argparse parser."""
+    parser.add_argument("--profile", action="store_true", help="cProfile 性能分析 (写出 .prof 文件)")
+    parser.add_argument("--profile-memory", action="store_true", help="tracemalloc 内存分析 (写出分配报告)")
+    if targets:
+        parser.add_argument("--profile-target", choices=targets, help="只分析指定的队友 / 步骤")
+
+
+@contextmanager
+def activate(profiler: Optional[Profiler]) -> Iterator[Optional[Profiler]]:
+    """Make profiler the process-wide active profiler and run it."""
+    global _active
+    if profiler is None:
+        yield None
+        return
+
+    previous = _active
+    _active = profiler
+    try:
+        with profiler.run():
+            yield profiler
+    finally:
+        _active = previous
+
+
+@contextmanager
+def profiled(name: str) -> Iterator[None]:
+    """Named region on the active profiler; a no-op when profiling is off."""
+    profiler = _active
+    if profiler is None:
+        yield
+        return
+    with profiler.region(name):
+        yield
+
+
+def child_command(cmd: List[str]) -> List[str]:
+    """Profile a child Python script when the active profiler covers this point."""
+    profiler = _active
+    return profiler.child_command(cmd) if profiler is not None else cmd
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+生成响应缓存 - 相同段落请求跨队友、跨包、跨进程复用生成结果
+
+同一公司背景、同一职位族的反向提问等段落反复出现，提示词相同的请求直接
+返回缓存的生成结果，不再调用生成后端。缓存键是以下内容的哈希:
+
+- 归一化的提示词 (空白折叠，「生成时间」等行中的时间戳替换): 提示词已包含
+  段落要求和全部输入 (JD、简历、上游文档)，上游文档表头中的生成时间不应使
+  缓存失效；JD、简历正文中的日期 (截止日期等) 原样参与，不同的日期不共用结果；
+- 模板版本 (队友模板内容的哈希): 修改模板后旧结果不再命中；
+- 生成后端 (后端地址) 和 max_tokens。
+
+缓存位于 <base_path>/.cache/generation/，每个条目一个文件
+(<键前两位>/<键>.json，原子写入)，命中时更新文件 mtime 作为 LRU 时钟；
+总大小超过上限时在文件锁内按 mtime 淘汰最久未用的条目，直到低于上限的 90%。
+多个进程可以同时读写同一个缓存目录。命中 / 未命中次数在每次运行结束时
+(Generator.flush) 累加到 stats.json。
+
+配置在 pipeline_config.json 的 generation.cache:
+
+    "cache": {"enabled": true, "max_mb": 256}
+
+用法:
+    python response_cache.py stats
+    python response_cache.py prune --max-mb 64
+    python response_cache.py clear
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import shutil
+import argparse
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from state_io import atomic_write_json, file_lock, read_json, update_json
+from tracing import inputs_hash
+
+CACHE_DIR = Path(".cache") / "generation"
+STATS_FILE = "stats.json"
+
+DEFAULT_MAX_MB = 256
+
+# 淘汰后保留的比例 (避免每次写入都触发淘汰)
+LOW_WATERMARK = 0.9
+
+# 缓存键版本: 之前写入的条目可能有误时递增，旧条目不再命中，由 LRU 淘汰
+# (2: 分节文档同批次的段落 id 重复，曾把其他段落的内容写入缓存)
+KEY_VERSION = 2
+
+_TIMESTAMP = re.compile(r"\d{4}-\d{2}-\d{2}(?:[ T]\d{2}:\d{2}(?::\d{2})?)?")
+# 生成的文档表头中记录时间的行 (「| 生成时间 | ... |」「**生成时间**: ...」)
+_TIMESTAMP_LINE = re.compile(r"^.*(?:生成时间|更新时间|Generated).*$", re.M | re.I)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """提示词归一化: 生成时间行中的时间戳替换为占位、空白折叠 (其他文本中的日期原样保留)"""
+    prompt = _TIMESTAMP_LINE.sub(lambda line: _TIMESTAMP.sub("<time>", line.group(0)), prompt)
+    return " ".join(prompt.split())
+
+
+class ResponseCache:
+    """按提示词 / 模板版本 / 后端缓存段落生成结果，按大小 LRU 淘汰"""
+
+    def __init__(self, base_path: str = ".", max_mb: float = DEFAULT_MAX_MB):
+        """
+        Args:
+            base_path: 项目基础路径
+            max_mb: 缓存总大小上限 (MB)
+        """
+        self.root = Path(base_path) / CACHE_DIR
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        # 本进程估计的缓存大小 (首次写入时扫描)，超过上限时在文件锁内重新扫描并淘汰
+        self._size: Optional[int] = None
+        # 尚未累加到 stats.json 的计数
+        self._pending = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0}
+        self.stats = dict(self._pending)
+
+    @classmethod
+    def from_config(cls, base_path: str, settings: Dict) -> Optional["ResponseCache"]:
+        """按 generation.cache 配置创建；关闭时返回 None"""
+        if not settings.get("enabled", True):
+            return None
+        return cls(base_path, settings.get("max_mb", DEFAULT_MAX_MB))
+
+    @staticmethod
+    def key(prompt: str, template: str = "", backend: str = "", max_tokens: int = 0) -> str:
+        """缓存键"""
+        return inputs_hash(KEY_VERSION, normalize_prompt(prompt), template, backend, max_tokens)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _count(self, name: str, count: int = 1):
+        with self._lock:
+            self._pending[name] += count
+            self.stats[name] += count
+
+    def get(self, key: str) -> Optional[str]:
+        """缓存的生成结果；未命中时返回 None"""
+        path = self._path(key)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                text = json.load(f)["text"]
+            os.utime(path)
+        except (OSError, ValueError, KeyError):
+            # 不存在、被其他进程淘汰或内容损坏都按未命中处理
+            self._count("misses")
+            return None
+        self._count("hits")
+        return text
+
+    def put(self, key: str, text: str):
+        """写入一个生成结果 (超过大小上限时淘汰最久未用的条目)"""
+        path = self._path(key)
+        atomic_write_json(path, {"text": text, "created": time.time()}, indent=None)
+        self._count("stores")
+
+        size = path.stat().st_size
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan()[1]
+            else:
+                self._size += size
+            over = self._size > self.max_bytes
+        if over:
+            self.prune()
+
+    def _entries(self) -> List[Tuple[float, int, Path]]:
+        entries = []
+        for path in self.root.glob("??/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def _scan(self) -> Tuple[int, int]:
+        entries = self._entries()
+        return len(entries), sum(size for _, size, _ in entries)
+
+    def prune(self, max_bytes: Optional[int] = None) -> int:
+        """
+        按 mtime 淘汰最久未用的条目，直到总大小低于上限的 LOW_WATERMARK
+
+        Returns:
+            淘汰的条目数
+        """
+        limit = self.max_bytes if max_bytes is None else max_bytes
+        evicted = 0
+        # 同一时间只有一个进程淘汰; 其他进程的读取遇到已删除的条目按未命中处理
+        with file_lock(self.root / "evict"):
+            entries = sorted(self._entries())
+            total = sum(size for _, size, _ in entries)
+            if total > limit:
+                target = limit * LOW_WATERMARK
+                for _, size, path in entries:
+                    if total <= target:
+                        break
+                    try:
+                        path.unlink()
+                    except OSError:
+                        continue
+                    total -= size
+                    evicted += 1
+            with self._lock:
+                self._size = total
+        if evicted:
+            self._count("evictions", evicted)
+        return evicted
+
+    def save_stats(self):
+        """把本进程新增的计数累加到 stats.json (多进程安全)"""
+        with self._lock:
+            pending, self._pending = self._pending, dict.fromkeys(self._pending, 0)
+        if not any(pending.values()):
+            return
+
+        def merge(stats: Dict):
+            for name, count in pending.items():
+                stats[name] = stats.get(name, 0) + count
+
+        update_json(self.root / STATS_FILE, merge)
+
+    def report(self) -> Dict:
+        """{"entries", "bytes", "max_bytes", "hits", "misses", "hit_rate", ...} (累计计数取自 stats.json)"""
+        stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, **read_json(self.root / STATS_FILE, {})}
+        entries, size = self._scan()
+        lookups = stats["hits"] + stats["misses"]
+        stats.update(entries=entries, bytes=size, max_bytes=self.max_bytes,
+                     hit_rate=stats["hits"] / lookups if lookups else 0.0)
+        return stats
+
+    def clear(self):
+        """删除全部条目和统计"""
+        shutil.rmtree(self.root, ignore_errors=True)
+        with self._lock:
+            self._size = 0
+
+
+def main():
+    """CLI: 查看统计、按大小淘汰或清空生成响应缓存"""
+    from pipeline_team import load_pipeline_config
+
+    parser = argparse.ArgumentParser(description="生成响应缓存")
+    parser.add_argument("--base-path", default=".", help="项目基础路径 (默认: .)")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    stats_parser = subparsers.add_parser("stats", help="命中率、条目数和大小")
+    stats_parser.add_argument("--json", action="store_true", help="输出 JSON")
+    prune_parser = subparsers.add_parser("prune", help="按 LRU 淘汰到指定大小以下")
+    prune_parser.add_argument("--max-mb", type=float, help="大小上限 (默认: generation.cache.max_mb)")
+    subparsers.add_parser("clear", help="清空缓存")
+
+    args = parser.parse_args()
+    settings = load_pipeline_config().get("generation", {}).get("cache", {})
+    cache = ResponseCache(args.base_path, settings.get("max_mb", DEFAULT_MAX_MB))
+
+    if args.command == "stats":
+        report = cache.report()
+        if args.json:
+            print(json.dumps(report, ensure_ascii=False, indent=2))
+        else:
+            print(f"条目: {report['entries']}  大小: {report['bytes'] / 1024 / 1024:.2f} / "
+                  f"{report['max_bytes'] / 1024 / 1024:.0f} MB")
+            print(f"命中: {report['hits']}  未命中: {report['misses']}  命中率: {report['hit_rate']:.1%}  "
+                  f"淘汰: {report['evictions']}")
+    elif args.command == "prune":
+        max_bytes = None if args.max_mb is None else int(args.max_mb * 1024 * 1024)
+        print(f"🗑️  已淘汰 {cache.prune(max_bytes)} 条")
+        cache.save_stats()
+    else:
+        cache.clear()
+        print("🗑️  已清空生成响应缓存")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -12,9 +12,14 @@ import json
 import shutil
 import hashlib
 from pathlib import Path
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from state_io import file_lock, read_json, write_json
+
 
 class ResumeManager:
     """Manages resume versions and their associated metadata."""
@@ -38,19 +43,22 @@ class ResumeManager:
 
     def _load_registry(self) -> Dict[str, Any]:
         """Load the resume registry from disk."""
-        if self.registry_path.exists():
-            with open(self.registry_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
-        else:
-            return {
-                "versions": [],
-                "tailored_versions": []
-            }
+        return read_json(self.registry_path, default={
+            "versions": [],
+            "tailored_versions": []
+        })
 
     def _save_registry(self):
-        """Save the resume registry to disk."""
-        with open(self.registry_path, 'w', encoding='utf-8') as f:
-            json.dump(self.registry, f, indent=2, ensure_ascii=False)
+        """Save the resume registry to disk (atomic replace under an exclusive lock)."""
+        write_json(self.registry_path, self.registry)
+
+    @contextmanager
+    def _registry_transaction(self):
+        """Lock the registry, reload the latest data, and save it on exit."""
+        with file_lock(self.registry_path):
+            self.registry = self._load_registry()
+            yield
+            self._save_registry()
 
     def _calculate_file_hash(self, file_path: Path) -> str:
         """Calculate SHA256 hash of a file."""
@@ -90,42 +98,42 @@ class ResumeManager:
         if not source_file.exists():
             raise FileNotFoundError(f"Resume file not found: {file_path}")
 
-        # Check if version already exists
-        for version in self.registry["versions"]:
-            if version["version_id"] == version_id:
-                raise ValueError(f"Version {version_id} already exists")
-
-        # Copy file to resumes directory
-        file_ext = self._get_file_extension(source_file)
-        dest_filename = f"master_resume_{version_id}{file_ext}"
-        dest_path = self.resumes_path / dest_filename
-        shutil.copy2(source_file, dest_path)
-
-        # Calculate file hash
-        file_hash = self._calculate_file_hash(dest_path)
-
-        # Create version metadata
-        version_data = {
-            "version_id": version_id,
-            "file": dest_filename,
-            "file_path": str(dest_path),
-            "file_hash": file_hash,
-            "created_at": datetime.now().isoformat(),
-            "description": description,
-            "target_positions": target_positions,
-            "key_skills": key_skills,
-            "file_size_bytes": dest_path.stat().st_size
-        }
+        with self._registry_transaction():
+            # Check if version already exists
+            for version in self.registry["versions"]:
+                if version["version_id"] == version_id:
+                    raise ValueError(f"Version {version_id} already exists")
+
+            # Copy file to resumes directory
+            file_ext = self._get_file_extension(source_file)
+            dest_filename = f"master_resume_{version_id}{file_ext}"
+            dest_path = self.resumes_path / dest_filename
+            shutil.copy2(source_file, dest_path)
 
-        # Add change tracking if not first version
-        if self.registry["versions"]:
-            version_data["changes_from_previous"] = {
-                "note": "Manual change tracking - describe changes here"
+            # Calculate file hash
+            file_hash = self._calculate_file_hash(dest_path)
+
+            # Create version metadata
+            version_data = {
+                "version_id": version_id,
+                "file": dest_filename,
+                "file_path": str(dest_path),
+                "file_hash": file_hash,
+                "created_at": datetime.now().isoformat(),
+                "description": description,
+                "target_positions": target_positions,
+                "key_skills": key_skills,
+                "file_size_bytes": dest_path.stat().st_size
             }
 
-        # Add to registry
-        self.registry["versions"].append(version_data)
-        self._save_registry()
+            # Add change tracking if not first version
+            if self.registry["versions"]:
+                version_data["changes_from_previous"] = {
+                    "note": "Manual change tracking - describe changes here"
+                }
+
+            # Add to registry
+            self.registry["versions"].append(version_data)
 
         return version_data
 
@@ -170,57 +178,57 @@ class ResumeManager:
         Returns:
             Dictionary with tailored version metadata
         """
-        # Find base version
-        base = None
-        for version in self.registry["versions"]:
-            if version["version_id"] == base_version:
-                base = version
-                break
-
-        if not base:
-            raise ValueError(f"Base version {base_version} not found")
-
-        # Create output directory
-        output_path = Path(output_dir)
-        output_path.mkdir(parents=True, exist_ok=True)
-
-        # Copy file
-        base_file = Path(base["file_path"])
-        file_ext = self._get_file_extension(base_file)
-
-        # Sanitize role name for filename
-        role_sanitized = role.replace(" ", "_").replace("/", "_")
-        dest_filename = f"resume_{role_sanitized}_v1{file_ext}"
-        dest_path = output_path / dest_filename
-
-        # Check if file exists, increment version if needed
-        counter = 1
-        while dest_path.exists():
-            counter += 1
-            dest_filename = f"resume_{role_sanitized}_v{counter}{file_ext}"
+        with self._registry_transaction():
+            # Find base version
+            base = None
+            for version in self.registry["versions"]:
+                if version["version_id"] == base_version:
+                    base = version
+                    break
+
+            if not base:
+                raise ValueError(f"Base version {base_version} not found")
+
+            # Create output directory
+            output_path = Path(output_dir)
+            output_path.mkdir(parents=True, exist_ok=True)
+
+            # Copy file
+            base_file = Path(base["file_path"])
+            file_ext = self._get_file_extension(base_file)
+
+            # Sanitize role name for filename
+            role_sanitized = role.replace(" ", "_").replace("/", "_")
+            dest_filename = f"resume_{role_sanitized}_v1{file_ext}"
             dest_path = output_path / dest_filename
 
-        shutil.copy2(base_file, dest_path)
-
-        # Create tailored version metadata
-        tailored_data = {
-            "base_version": base_version,
-            "company": company,
-            "role": role,
-            "file": dest_filename,
-            "file_path": str(dest_path),
-            "created_at": datetime.now().isoformat(),
-            "tailoring": tailoring_notes or {
-                "emphasized": [],
-                "added_keywords": [],
-                "reordered_sections": False,
-                "notes": "Add tailoring details here"
+            # Check if file exists, increment version if needed
+            counter = 1
+            while dest_path.exists():
+                counter += 1
+                dest_filename = f"resume_{role_sanitized}_v{counter}{file_ext}"
+                dest_path = output_path / dest_filename
+
+            shutil.copy2(base_file, dest_path)
+
+            # Create tailored version metadata
+            tailored_data = {
+                "base_version": base_version,
+                "company": company,
+                "role": role,
+                "file": dest_filename,
+                "file_path": str(dest_path),
+                "created_at": datetime.now().isoformat(),
+                "tailoring": tailoring_notes or {
+                    "emphasized": [],
+                    "added_keywords": [],
+                    "reordered_sections": False,
+                    "notes": "Add tailoring details here"
+                }
             }
-        }
 
-        # Add to registry
-        self.registry["tailored_versions"].append(tailored_data)
-        self._save_registry()
+            # Add to registry
+            self.registry["tailored_versions"].append(tailored_data)
 
         return tailored_data
 
@@ -387,12 +395,12 @@ def main():
     # Determine base path (current directory or specified)
     base_path = os.getcwd()
 
-    # Initialize manager
-    manager = ResumeManager(base_path)
-
     command = sys.argv[1]
 
     try:
+        # Read-only commands are served by the daemon when one is running
+        from daemon_client import try_call
+
         if command == "create":
             # Parse arguments
             args = {}
@@ -408,7 +416,7 @@ def main():
                 else:
                     i += 1
 
-            result = manager.create_version(
+            result = ResumeManager(base_path).create_version(
                 file_path=args["file"],
                 version_id=args["version"],
                 description=args["desc"],
@@ -428,7 +436,9 @@ def main():
                 if idx + 1 < len(sys.argv):
                     filter_target = sys.argv[idx + 1]
 
-            versions = manager.list_versions(filter_target=filter_target)
+            handled, versions = try_call("registry.list", {"base_path": base_path, "filter": filter_target})
+            if not handled:
+                versions = ResumeManager(base_path).list_versions(filter_target=filter_target)
 
             if not versions:
                 print("No resume versions found.")
@@ -457,7 +467,7 @@ def main():
                 else:
                     i += 1
 
-            result = manager.tailor_resume(
+            result = ResumeManager(base_path).tailor_resume(
                 base_version=args["base"],
                 company=args["company"],
                 role=args["role"],
@@ -483,7 +493,7 @@ def main():
                 else:
                     i += 1
 
-            result = manager.compare_versions(args["v1"], args["v2"])
+            result = ResumeManager(base_path).compare_versions(args["v1"], args["v2"])
 
             print(f"\n📊 Comparison: {result['version1']} vs {result['version2']}\n")
             print(f"Time difference: {result['created_at_diff_days']} days")
@@ -508,10 +518,17 @@ def main():
                 else:
                     i += 1
 
-            result = manager.recommend_version(
-                target_position=args["target"],
-                key_requirements=args["requirements"].split(",")
-            )
+            params = {
+                "base_path": base_path,
+                "target": args["target"],
+                "requirements": args["requirements"].split(",")
+            }
+            handled, result = try_call("score", params)
+            if not handled:
+                result = ResumeManager(base_path).recommend_version(
+                    target_position=params["target"],
+                    key_requirements=params["requirements"]
+                )
 
             if result["recommended"]:
                 rec = result["recommended"]
@@ -535,7 +552,7 @@ def main():
                 if idx + 1 < len(sys.argv):
                     version_id = sys.argv[idx + 1]
 
-            result = manager.get_usage_report(version_id)
+            result = ResumeManager(base_path).get_usage_report(version_id)
 
             if version_id:
                 print(f"\n📊 Usage Report for {result['version_id']}:\n")
@@ -13,6 +13,11 @@ from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from state_io import write_json
+from template_engine import render as render_template
+
 
 class ResumeOptimizer:
     """Analyzes JD requirements and optimizes resume content for maximum matching."""
@@ -59,8 +64,7 @@ class ResumeOptimizer:
 
         # Save analysis
         output_file = self.company_path / f"jd_deep_analysis_{role.replace(' ', '_')}.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(analysis, f, indent=2, ensure_ascii=False)
+        write_json(output_file, analysis)
 
         return analysis
 
@@ -195,73 +199,15 @@ class ResumeOptimizer:
         Returns:
             Path to generated report
         """
-        report_content = f"""# 简历优化报告
-
-**生成时间**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-**简历版本**: {resume_version}
-**目标职位**: {jd_analysis['role']}
-
----
-
-## 一、JD 深度透视
-
-### 硬性门槛
-{self._format_hard_requirements(jd_analysis['hard_requirements'])}
-
-### 核心胜任力（高频关键词）
-{self._format_core_competencies(jd_analysis['core_competencies'])}
-
-### 潜台词洞察
-{self._format_hidden_insights(jd_analysis['hidden_insights'])}
-
----
-
-## 二、简历优化建议
-
-### 经历改写（STAR 法则）
-
-"""
-        for i, opt in enumerate(optimizations, 1):
-            report_content += f"""
-#### 经历 {i}
-
-**原文**:
-{opt['original']}
-
-**改写后** (关键词已高亮):
-{opt['optimized']}
-
-**优化逻辑**: {opt['optimization_logic']}
-
-**匹配度提升**: {opt['match_score']:.1%}
-
----
-"""
-
-        report_content += """
-## 三、匹配度分析
-
-### 整体匹配度
-- 硬性要求匹配: XX%
-- 技能匹配: XX%
-- 经验匹配: XX%
-- 关键词覆盖: XX%
-
-### 已匹配关键词
-[列表]
-
-### 缺失的关键能力
-[列表]
-
-### 改进建议
-1. [建议1]
-2. [建议2]
-3. [建议3]
-
----
-
-**生成工具**: Interview Intel - Resume Optimizer
-"""
+        report_content = render_template("resume_optimization.md", {
+            "generated_at": datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            "resume_version": resume_version,
+            "role": jd_analysis['role'],
+            "hard_requirements": {category: items for category, items in jd_analysis['hard_requirements'].items() if items},
+            "core_competencies": jd_analysis['core_competencies'][:10],  # Top 10
+            "hidden_insights": {key: value for key, value in jd_analysis['hidden_insights'].items() if value},
+            "optimizations": optimizations
+        })
 
         # Save report
         report_path = self.company_path / f"resume_optimization_{jd_analysis['role'].replace(' ', '_')}.md"
@@ -270,32 +216,6 @@ class ResumeOptimizer:
 
         return str(report_path)
 
-    def _format_hard_requirements(self, requirements: Dict[str, List[str]]) -> str:
-        """Format hard requirements for report."""
-        output = []
-        for category, items in requirements.items():
-            if items:
-                output.append(f"- **{category}**: {', '.join(items)}")
-        return '\n'.join(output) if output else "- 无特殊硬性要求"
-
-    def _format_core_competencies(self, competencies: List[Dict[str, Any]]) -> str:
-        """Format core competencies for report."""
-        if not competencies:
-            return "- 待分析"
-
-        output = []
-        for comp in competencies[:10]:  # Top 10
-            output.append(f"- **{comp.get('skill', 'N/A')}** (提及 {comp.get('frequency', 0)} 次)")
-        return '\n'.join(output)
-
-    def _format_hidden_insights(self, insights: Dict[str, str]) -> str:
-        """Format hidden insights for report."""
-        output = []
-        for key, value in insights.items():
-            if value:
-                output.append(f"**{key}**: {value}")
-        return '\n\n'.join(output) if output else "待深入分析"
-
 
 def main():
     """Main CLI entry point."""
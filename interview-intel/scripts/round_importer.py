@@ -0,0 +1,355 @@
+#!/usr/bin/env python3
+"""
+Interview Round Importer
+
+Bulk-imports interview rounds from a CSV file or a local .ics calendar export.
+Rounds are grouped by company folder and each company's batch is applied with a
+single load and a single save of its tracking.json.
+"""
+
+import os
+import re
+import sys
+import csv
+from pathlib import Path
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Any, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from interview_tracker import InterviewTracker
+from setup_company_folder import sanitize_name
+
+
+# CSV header aliases -> canonical field names
+CSV_FIELDS = {
+    "company_path": ["company_path", "company-path", "folder"],
+    "company": ["company", "公司"],
+    "round": ["round", "round_num", "轮次"],
+    "name": ["name", "round_name", "面试名称"],
+    "date": ["date", "日期"],
+    "time": ["time", "时间"],
+    "duration": ["duration", "duration_minutes", "时长"],
+    "format": ["format", "形式"],
+    "platform": ["platform", "平台"],
+    "interviewer": ["interviewer", "interviewer_name", "面试官"],
+    "title": ["title", "interviewer_title", "职位"],
+    "focus": ["focus", "focus_areas", "重点"],
+}
+
+# "Company | Round name", "Company - Round name", "Company: Round name"
+ICS_SUMMARY_PATTERN = re.compile(r'^\s*(?P<company>.+?)\s*(?:\||｜|:|：|\s-\s|—)\s*(?P<name>.+?)\s*$')
+
+ICS_DURATION_PATTERN = re.compile(
+    r'^P(?:(?P<days>\d+)D)?(?:T(?:(?P<hours>\d+)H)?(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+)S)?)?$'
+)
+
+VIDEO_PLATFORMS = ["zoom", "teams", "meet", "腾讯会议", "飞书", "钉钉", "webex"]
+
+
+def _normalize_row(row: Dict[str, str]) -> Dict[str, str]:
+    """Map a CSV row's headers onto canonical field names."""
+    lowered = {(key or "").strip().lower(): (value or "").strip() for key, value in row.items()}
+    normalized = {}
+    for field, aliases in CSV_FIELDS.items():
+        for alias in aliases:
+            if lowered.get(alias):
+                normalized[field] = lowered[alias]
+                break
+    return normalized
+
+
+def parse_csv(csv_path: str) -> List[Dict[str, Any]]:
+    """
+    Parse interview rounds from a CSV file.
+
+    Required columns: company (or company_path), name, date.
+    Optional columns: round, time, duration, format, platform, interviewer, title,
+    focus (comma or semicolon separated).
+
+    Args:
+        csv_path: Path to CSV file
+
+    Returns:
+        List of round records
+    """
+    records = []
+
+    with open(csv_path, 'r', encoding='utf-8-sig', newline='') as f:
+        for line_num, row in enumerate(csv.DictReader(f), start=2):
+            fields = _normalize_row(row)
+
+            missing = [
+                name for name in ("name", "date")
+                if not fields.get(name)
+            ]
+            if not fields.get("company") and not fields.get("company_path"):
+                missing.insert(0, "company")
+            if missing:
+                raise ValueError(f"{csv_path}:{line_num}: missing {', '.join(missing)}")
+
+            focus = re.split(r'[;,，；]', fields.get("focus", ""))
+
+            records.append({
+                "company": fields.get("company", ""),
+                "company_path": fields.get("company_path", ""),
+                "round_num": int(fields["round"]) if fields.get("round") else None,
+                "round_name": fields["name"],
+                "date": fields["date"],
+                "time": fields.get("time", ""),
+                "duration_minutes": int(fields["duration"]) if fields.get("duration") else 0,
+                "format": fields.get("format", "video"),
+                "platform": fields.get("platform", ""),
+                "interviewer_name": fields.get("interviewer", ""),
+                "interviewer_title": fields.get("title", ""),
+                "focus_areas": [item.strip() for item in focus if item.strip()]
+            })
+
+    return records
+
+
+def _unfold_ics_lines(text: str) -> List[str]:
+    """Join RFC 5545 folded lines (continuations start with a space or tab)."""
+    lines = []
+    for raw in text.splitlines():
+        if raw[:1] in (" ", "\t") and lines:
+            lines[-1] += raw[1:]
+        else:
+            lines.append(raw)
+    return lines
+
+
+def _unescape_ics_text(value: str) -> str:
+    """Undo iCalendar TEXT escaping."""
+    return (value.replace("\\n", "\n").replace("\\N", "\n")
+            .replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\"))
+
+
+def _parse_ics_datetime(value: str) -> Tuple[datetime, bool]:
+    """
+    Parse an iCalendar DATE or DATE-TIME value.
+
+    UTC times (trailing ``Z``) are converted to naive local time, matching the
+    floating times the tracker stores for everything else.
+
+    Returns:
+        Tuple of (datetime, has_time)
+    """
+    value = value.strip()
+    if "T" in value:
+        parsed = datetime.strptime(value[:15], "%Y%m%dT%H%M%S")
+        if value.endswith("Z"):
+            parsed = parsed.replace(tzinfo=timezone.utc).astimezone().replace(tzinfo=None)
+        return parsed, True
+    return datetime.strptime(value[:8], "%Y%m%d"), False
+
+
+def _parse_ics_duration(value: str) -> int:
+    """Convert an iCalendar DURATION (e.g. PT1H30M) to minutes."""
+    match = ICS_DURATION_PATTERN.match(value.strip())
+    if not match:
+        return 0
+    parts = {key: int(val) for key, val in match.groupdict().items() if val}
+    return (parts.get("days", 0) * 1440 + parts.get("hours", 0) * 60
+            + parts.get("minutes", 0) + parts.get("seconds", 0) // 60)
+
+
+def parse_ics(ics_path: str) -> List[Dict[str, Any]]:
+    """
+    Parse interview rounds from a local .ics calendar export.
+
+    The company is taken from CATEGORIES when present, otherwise from a SUMMARY
+    of the form "Company | Round name" (also "-", ":" separators). Events whose
+    company cannot be determined are ignored.
+
+    Args:
+        ics_path: Path to .ics file
+
+    Returns:
+        List of round records
+    """
+    with open(ics_path, 'r', encoding='utf-8-sig') as f:
+        lines = _unfold_ics_lines(f.read())
+
+    records = []
+    event = None
+
+    for line in lines:
+        if line == "BEGIN:VEVENT":
+            event = {}
+            continue
+        if line == "END:VEVENT":
+            if event is not None:
+                record = _ics_event_to_record(event)
+                if record:
+                    records.append(record)
+            event = None
+            continue
+        if event is None or ":" not in line:
+            continue
+
+        name_part, value = line.split(":", 1)
+        prop = name_part.split(";", 1)[0].upper()
+        # Keep the first occurrence (e.g. first ATTENDEE)
+        event.setdefault(prop, value)
+
+    return records
+
+
+def _ics_event_to_record(event: Dict[str, str]) -> Optional[Dict[str, Any]]:
+    """Convert a parsed VEVENT into a round record."""
+    if "DTSTART" not in event:
+        return None
+
+    summary = _unescape_ics_text(event.get("SUMMARY", ""))
+    company = _unescape_ics_text(event.get("CATEGORIES", "")).split(",")[0].strip()
+    round_name = summary
+
+    match = ICS_SUMMARY_PATTERN.match(summary)
+    if match:
+        if not company:
+            company = match.group("company")
+        if match.group("company") == company:
+            round_name = match.group("name")
+
+    if not company or not round_name:
+        return None
+
+    start, has_time = _parse_ics_datetime(event["DTSTART"])
+
+    duration = 0
+    if "DTEND" in event:
+        end, _ = _parse_ics_datetime(event["DTEND"])
+        duration = int((end - start) / timedelta(minutes=1))
+    elif "DURATION" in event:
+        duration = _parse_ics_duration(event["DURATION"])
+
+    location = _unescape_ics_text(event.get("LOCATION", ""))
+    location_lower = location.lower()
+    platform = next((p for p in VIDEO_PLATFORMS if p in location_lower), "")
+
+    interviewer = ""
+    attendee = event.get("ATTENDEE", "")
+    if attendee:
+        interviewer = attendee.split(":", 1)[-1].replace("mailto:", "")
+
+    return {
+        "company": company,
+        "company_path": "",
+        "round_num": None,
+        "round_name": round_name,
+        "date": start.strftime("%Y-%m-%d"),
+        "time": start.strftime("%H:%M") if has_time else "",
+        "duration_minutes": duration if has_time else 0,
+        "format": "video" if platform else ("in-person" if location else "video"),
+        "platform": platform.capitalize() if platform.isascii() else platform,
+        "interviewer_name": interviewer,
+        "interviewer_title": "",
+        "focus_areas": []
+    }
+
+
+def resolve_company_path(base_path: str, record: Dict[str, Any]) -> Path:
+    """Resolve the company folder for a record (companies/<sanitized name> by default)."""
+    if record.get("company_path"):
+        path = Path(os.path.expanduser(record["company_path"]))
+        return path if path.is_absolute() else Path(base_path) / path
+    return Path(base_path) / "companies" / sanitize_name(record["company"])
+
+
+def bulk_import(base_path: str, source_file: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Import rounds from a CSV or .ics file into every affected company folder.
+
+    Args:
+        base_path: Base directory (contains companies/ folder)
+        source_file: CSV or .ics file
+
+    Returns:
+        Per-company summary with added/skipped counts or an error message
+    """
+    suffix = Path(source_file).suffix.lower()
+    if suffix == ".ics":
+        records = parse_ics(source_file)
+    elif suffix == ".csv":
+        records = parse_csv(source_file)
+    else:
+        raise ValueError(f"Unsupported file type: {suffix} (expected .csv or .ics)")
+
+    # Group by company folder, keeping each batch in date order
+    batches: Dict[Path, List[Dict[str, Any]]] = {}
+    for record in records:
+        batches.setdefault(resolve_company_path(base_path, record), []).append(record)
+
+    summary = {}
+    for company_path, batch in batches.items():
+        batch.sort(key=lambda r: (r["date"], r["time"]))
+        rounds = [
+            {k: v for k, v in record.items() if k not in ("company", "company_path")}
+            for record in batch
+        ]
+
+        if not (company_path / "interviews" / "tracking.json").exists():
+            summary[str(company_path)] = {"error": "Tracking not initialized. Run 'init' first."}
+            continue
+
+        try:
+            result = InterviewTracker(str(company_path)).add_interview_rounds(rounds)
+        except ValueError as e:
+            summary[str(company_path)] = {"error": str(e)}
+            continue
+
+        summary[str(company_path)] = {
+            "added": len(result["added"]),
+            "skipped": len(result["skipped"])
+        }
+
+    return summary
+
+
+def format_summary(summary: Dict[str, Dict[str, Any]]) -> str:
+    """Format a bulk_import summary for the terminal."""
+    output = []
+    total_added = 0
+    for company_path, result in summary.items():
+        if "error" in result:
+            output.append(f"⚠️  {company_path}: {result['error']}")
+        else:
+            total_added += result["added"]
+            output.append(f"✅ {company_path}: {result['added']} added, {result['skipped']} skipped")
+
+    output.append(f"\n📅 Imported {total_added} rounds across {len(summary)} companies")
+    return "\n".join(output)
+
+
+def main():
+    """Main CLI entry point."""
+    if len(sys.argv) < 2:
+        print("Interview Round Importer")
+        print("\nUsage:")
+        print("  python round_importer.py <file.csv|file.ics> [--base-path <path>]")
+        print("\nCSV columns:")
+        print("  company (or company_path), name, date, [round, time, duration, format, platform, interviewer, title, focus]")
+        print("\nExamples:")
+        print('  python round_importer.py interviews.csv --base-path ~/InterviewIntel')
+        print('  python round_importer.py calendar.ics --base-path ~/InterviewIntel')
+        sys.exit(1)
+
+    source_file = sys.argv[1]
+    base_path = os.getcwd()
+    if "--base-path" in sys.argv:
+        idx = sys.argv.index("--base-path")
+        if idx + 1 < len(sys.argv):
+            base_path = sys.argv[idx + 1]
+
+    try:
+        summary = bulk_import(base_path, source_file)
+        print(format_summary(summary))
+
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
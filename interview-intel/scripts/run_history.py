@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+流水线运行历史 - 记录每次运行的耗时并统计延迟分位数
+
+每次 PipelineTeam.launch / rerun 结束后向 <base_path>/.analytics/run_history.jsonl
+追加一行记录 (每个队友、每个阶段和总耗时)。`stats` 命令按队友 / 阶段报告
+p50 / p95 / p99，可按天 / 周 / 月分组查看趋势。
+
+expected_durations() 将观测到的耗时 (样本足够时) 与 pipeline_config.json 中
+静态的 estimated_time 合并，供调度和耗时预估使用。
+"""
+
+import sys
+import math
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from state_io import append_jsonl, read_jsonl
+
+HISTORY_FILE = Path(".analytics") / "run_history.jsonl"
+
+# 样本数少于该值时使用配置中的 estimated_time
+MIN_SAMPLES = 3
+
+
+def history_path(base_path: str = ".") -> Path:
+    """运行历史文件路径"""
+    return Path(base_path) / HISTORY_FILE
+
+
+def record_run(base_path: str, kind: str, packet: Dict[str, str],
+               teammates: Dict[str, Dict], stages: Dict[str, float], total: float):
+    """
+    追加一次运行记录
+
+    Args:
+        base_path: 项目基础路径
+        kind: "launch"、"rerun"、"revise" 或 "batch"
+        packet: 公司 / 职位 / 候选人
+        teammates: {teammate_id: 执行结果 ({"status", "time", ...})}
+        stages: {stage_id: 耗时秒数}
+        total: 总耗时秒数
+    """
+    append_jsonl(history_path(base_path), {
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "kind": kind,
+        "company": packet.get("company"),
+        "role": packet.get("role"),
+        "candidate": packet.get("candidate"),
+        "total": round(total, 4),
+        "stages": {stage_id: round(seconds, 4) for stage_id, seconds in stages.items()},
+        "teammates": {
+            teammate_id: {"time": round(result["time"], 4), "status": result["status"]}
+            for teammate_id, result in teammates.items()
+        }
+    })
+
+
+def load_runs(base_path: str = ".", since: Optional[str] = None,
+              last: Optional[int] = None) -> List[Dict]:
+    """
+    读取运行历史
+
+    Args:
+        since: 只保留该日期 (YYYY-MM-DD) 之后的记录
+        last: 只保留最近 N 条
+    """
+    runs = read_jsonl(history_path(base_path))
+    if since:
+        runs = [run for run in runs if run.get("timestamp", "") >= since]
+    if last:
+        runs = runs[-last:]
+    return runs
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """线性插值分位数 (pct: 0-100)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    if low == high:
+        return ordered[low]
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(values: List[float]) -> Dict[str, float]:
+    """样本数、p50/p95/p99、均值和最大值"""
+    return {
+        "count": len(values),
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "p99": percentile(values, 99),
+        "mean": sum(values) / len(values) if values else 0.0,
+        "max": max(values) if values else 0.0
+    }
+
+
+def teammate_samples(runs: List[Dict], successful_only: bool = True) -> Dict[str, List[float]]:
+    """按队友收集耗时样本"""
+    samples: Dict[str, List[float]] = {}
+    for run in runs:
+        for teammate_id, result in run.get("teammates", {}).items():
+            if successful_only and result.get("status") != "success":
+                continue
+            samples.setdefault(teammate_id, []).append(result["time"])
+    return samples
+
+
+def duration_stats(runs: List[Dict]) -> Dict[str, Dict]:
+    """
+    汇总运行历史
+
+    Returns:
+        {"runs", "teammates": {id: summary}, "stages": {id: summary}, "total": summary}
+    """
+    stages: Dict[str, List[float]] = {}
+    for run in runs:
+        for stage_id, seconds in run.get("stages", {}).items():
+            stages.setdefault(stage_id, []).append(seconds)
+
+    return {
+        "runs": len(runs),
+        "teammates": {tid: summarize(values) for tid, values in sorted(teammate_samples(runs).items())},
+        "stages": {sid: summarize(values) for sid, values in sorted(stages.items())},
+        "total": summarize([run["total"] for run in runs if run.get("kind") == "launch"])
+    }
+
+
+def observed_durations(config: Dict, base_path: str = ".", pct: float = 50,
+                       min_samples: int = MIN_SAMPLES) -> Dict[str, float]:
+    """
+    运行历史中样本足够的队友的耗时分位数 (样本不足的队友不出现)
+
+    Returns:
+        {teammate_id: 秒数}
+    """
+    samples = teammate_samples(load_runs(base_path))
+    observed = {}
+    for teammate in config["teammates"].values():
+        values = samples.get(teammate["id"], [])
+        if len(values) >= min_samples:
+            observed[teammate["id"]] = percentile(values, pct)
+    return observed
+
+
+def expected_durations(config: Dict, base_path: str = ".", pct: float = 50,
+                       min_samples: int = MIN_SAMPLES) -> Dict[str, float]:
+    """
+    每个队友的预期耗时: 样本足够时取观测分位数，否则取配置的 estimated_time
+
+    Args:
+        config: 流水线配置
+        base_path: 项目基础路径
+        pct: 使用的分位数
+        min_samples: 使用观测值所需的最少样本数
+
+    Returns:
+        {teammate_id: 秒数}
+    """
+    observed = observed_durations(config, base_path, pct, min_samples)
+    return {teammate["id"]: observed.get(teammate["id"], float(teammate.get("estimated_time", 0)))
+            for teammate in config["teammates"].values()}
+
+
+def expected_stage_duration(base_path: str, stage_id: str, pct: float = 50,
+                            min_samples: int = MIN_SAMPLES, default: float = 0.0) -> float:
+    """某个阶段 (如 "prepare") 的观测耗时分位数；样本不足时返回 default"""
+    samples = [run["stages"][stage_id] for run in load_runs(base_path) if stage_id in run.get("stages", {})]
+    return percentile(samples, pct) if len(samples) >= min_samples else default
+
+
+def _period_key(timestamp: str, group_by: str) -> str:
+    moment = datetime.fromisoformat(timestamp)
+    if group_by == "day":
+        return moment.strftime("%Y-%m-%d")
+    if group_by == "week":
+        year, week, _ = moment.isocalendar()
+        return f"{year}-W{week:02d}"
+    return moment.strftime("%Y-%m")
+
+
+def stats_by_period(runs: List[Dict], group_by: str) -> Dict[str, Dict]:
+    """按天 / 周 / 月分组的汇总"""
+    groups: Dict[str, List[Dict]] = {}
+    for run in runs:
+        groups.setdefault(_period_key(run["timestamp"], group_by), []).append(run)
+    return {period: duration_stats(group) for period, group in sorted(groups.items())}
+
+
+def _format_row(name: str, summary: Dict[str, float]) -> str:
+    return (f"   {name:<14} {summary['count']:>5}  {summary['p50']:>8.3f}s {summary['p95']:>8.3f}s "
+            f"{summary['p99']:>8.3f}s {summary['max']:>8.3f}s")
+
+
+def format_stats(stats: Dict[str, Dict]) -> str:
+    """文本报告"""
+    header = f"   {'':<14} {'n':>5}  {'p50':>9} {'p95':>9} {'p99':>9} {'max':>9}"
+    lines = [f"📈 运行历史: {stats['runs']} 次运行", "", header]
+    for teammate_id, summary in stats["teammates"].items():
+        lines.append(_format_row(teammate_id, summary))
+    lines.append("")
+    for stage_id, summary in stats["stages"].items():
+        lines.append(_format_row(stage_id, summary))
+    if stats["total"]["count"]:
+        lines.append("")
+        lines.append(_format_row("total", stats["total"]))
+    return "\n".join(lines)
+
+
+def main():
+    """CLI 入口"""
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description="流水线运行历史 - 耗时分位数统计")
+    subparsers = parser.add_subparsers(dest="command")
+
+    stats_parser = subparsers.add_parser("stats", help="报告每个队友 / 阶段的 p50/p95/p99")
+    stats_parser.add_argument("--base-path", default=".", help="项目基础路径 (默认: .)")
+    stats_parser.add_argument("--since", help="只统计该日期之后的运行 (YYYY-MM-DD)")
+    stats_parser.add_argument("--last", type=int, help="只统计最近 N 次运行")
+    stats_parser.add_argument("--group-by", choices=["day", "week", "month"], help="按时间分组查看趋势")
+    stats_parser.add_argument("--json", action="store_true", help="输出 JSON")
+
+    args = parser.parse_args()
+
+    if args.command != "stats":
+        parser.print_help()
+        sys.exit(1)
+
+    runs = load_runs(args.base_path, args.since, args.last)
+    if not runs:
+        print(f"⚠️  没有运行记录: {history_path(args.base_path)}")
+        sys.exit(0)
+
+    if args.group_by:
+        report = stats_by_period(runs, args.group_by)
+        if args.json:
+            print(json.dumps(report, indent=2, ensure_ascii=False))
+        else:
+            for period, stats in report.items():
+                print(f"\n── {period} ──")
+                print(format_stats(stats))
+    else:
+        stats = duration_stats(runs)
+        print(json.dumps(stats, indent=2, ensure_ascii=False) if args.json else format_stats(stats))
+
+
+if __name__ == "__main__":
+    main()
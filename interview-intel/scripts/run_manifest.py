@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+Run Manifest
+
+Checkpoint file for pipeline_team.py and all_in_one.py. Each completed node
+(pipeline teammate or workflow step) is recorded in the output directory
+together with the SHA-256 of the files it produced, as soon as it finishes:
+
+    {
+      "schema_version": 1,
+      "inputs_hash": "...",
+      "nodes": {
+        "teammate_a": {"completed_at": "...", "outputs": {"01_company_intel_brief.md": "<sha256>"}},
+        ...
+      }
+    }
+
+With --resume-run a node counts as complete only if it is recorded for the same
+inputs and every output still exists with the recorded hash; an interrupted
+run then picks up from the first incomplete node and only the in-flight work
+is lost. Records go through state_io.update_json, so teammates finishing
+concurrently in one packet cannot drop each other's entries.
+"""
+
+import hashlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from state_io import update_json, read_json, write_json
+
+MANIFEST_FILE = "run_manifest.json"
+SCHEMA_VERSION = 1
+
+# Recorded in place of a hash for directory outputs (only existence is checked)
+DIRECTORY = "<dir>"
+
+
+def file_digest(path: Path) -> Optional[str]:
+    """SHA-256 of a file, DIRECTORY for a directory, None if it does not exist."""
+    path = Path(path)
+    if path.is_dir():
+        return DIRECTORY
+    if not path.is_file():
+        return None
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 16), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class RunManifest:
+    """Completed nodes of one run, persisted next to its outputs."""
+
+    def __init__(self, path: Path, inputs_hash: str, nodes: Optional[Dict[str, Dict]] = None):
+        self.path = Path(path)
+        self.inputs_hash = inputs_hash
+        self.nodes: Dict[str, Dict] = nodes or {}
+
+    @classmethod
+    def open(cls, path: Path, inputs_hash: str, resume: bool = False) -> "RunManifest":
+        """
+        Start a run.
+
+        Args:
+            path: Manifest file
+            inputs_hash: Hash of the run's inputs (JD, resume, names, ...)
+            resume: Keep the nodes recorded by an earlier run with the same
+                inputs; otherwise the manifest is reset
+
+        Returns:
+            The manifest (nodes empty unless resuming)
+        """
+        nodes = {}
+        if resume:
+            previous = read_json(path) or {}
+            if previous.get("schema_version") == SCHEMA_VERSION and previous.get("inputs_hash") == inputs_hash:
+                nodes = previous.get("nodes", {})
+            elif previous:
+                print(f"⚠️  输入已变化，忽略旧的运行清单: {path}")
+
+        manifest = cls(path, inputs_hash, nodes)
+        if not resume or not nodes:
+            manifest._write()
+        return manifest
+
+    def _write(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        write_json(self.path, {
+            "schema_version": SCHEMA_VERSION,
+            "inputs_hash": self.inputs_hash,
+            "updated_at": datetime.now().isoformat(timespec="seconds"),
+            "nodes": self.nodes
+        })
+
+    def is_complete(self, node: str) -> bool:
+        """Recorded for these inputs and all outputs unchanged on disk."""
+        entry = self.nodes.get(node)
+        if entry is None:
+            return False
+        return all(file_digest(Path(self.path.parent) / name) == digest
+                   for name, digest in entry["outputs"].items())
+
+    def incomplete(self, nodes: Iterable[str]) -> List[str]:
+        """The given nodes that still have to run, in the given order."""
+        return [node for node in nodes if not self.is_complete(node)]
+
+    def result(self, node: str) -> Any:
+        """The result stored with a completed node (None if none was stored)."""
+        return self.nodes.get(node, {}).get("result")
+
+    def record(self, node: str, outputs: Iterable[Path], result: Any = None):
+        """
+        Mark a node complete.
+
+        Args:
+            node: Teammate id / step name
+            outputs: Files (or directories) the node produced
+            result: JSON-serializable value to hand back on resume
+        """
+        base = self.path.parent.resolve()
+        hashes = {}
+        for output in outputs:
+            output = Path(output).resolve()
+            try:
+                name = str(output.relative_to(base))
+            except ValueError:
+                name = str(output)
+            hashes[name] = file_digest(output)
+
+        entry = {"completed_at": datetime.now().isoformat(timespec="seconds"), "outputs": hashes}
+        if result is not None:
+            entry["result"] = result
+        self.nodes[node] = entry
+
+        def add(data: Dict) -> Dict:
+            if data.get("inputs_hash") != self.inputs_hash:
+                data = {"schema_version": SCHEMA_VERSION, "inputs_hash": self.inputs_hash, "nodes": {}}
+            data["nodes"][node] = entry
+            data["updated_at"] = entry["completed_at"]
+            return data
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        update_json(self.path, add)
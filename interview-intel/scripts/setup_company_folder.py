@@ -13,6 +13,10 @@ import json
 from pathlib import Path
 from datetime import datetime
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+from state_io import file_lock, atomic_write_json
+
 
 def sanitize_name(name: str) -> str:
     """
@@ -259,8 +263,11 @@ def create_tracking_template(tracking_path: Path, company_name: str, role_name:
         "offer_details": None
     }
 
-    with open(tracking_path, 'w', encoding='utf-8') as f:
-        json.dump(tracking_data, f, indent=2, ensure_ascii=False)
+    with file_lock(tracking_path):
+        # Another process may have initialized tracking since our exists() check
+        if tracking_path.exists():
+            return
+        atomic_write_json(tracking_path, tracking_data)
 
 
 def main():
@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+State I/O
+
+Crash-safe and concurrency-safe helpers for the JSON state files shared by all
+scripts (tracking.json, resume_registry.json, global_stats.json, workflow metadata).
+
+- Writes go to a temp file in the same directory, are fsync'd, then atomically
+  renamed over the target, so readers never see a half-written file.
+- Read-modify-write cycles hold an exclusive fcntl advisory lock so concurrent
+  pipelines cannot lose each other's updates. Lock files live in a per-user
+  directory (``$XDG_CACHE_HOME/interview-intel/locks``) rather than next to the
+  state file, so packet directories and scans never see ``*.lock`` sidecars.
+- Append-only JSONL logs (run history) append whole lines under the same lock.
+"""
+
+import os
+import json
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, Optional, Union
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
+
+
+PathLike = Union[str, Path]
+
+# Lock files are never deleted: unlinking a lock file while another process waits
+# on it would let a third process lock a fresh inode at the same path.
+LOCK_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "interview-intel" / "locks"
+
+# Per-process lock bookkeeping: flock() locks belong to an open file description,
+# so a nested lock on the same path from this process must reuse the held fd
+# instead of opening a second one (which would deadlock).
+_registry_guard = threading.Lock()
+_held_locks: Dict[str, Dict[str, Any]] = {}
+
+
+def _lock_path(path: PathLike) -> str:
+    """Return the lock file path for a state file (keyed by its absolute path)."""
+    import zlib  # deferred: hashlib costs ~9 ms at import
+
+    resolved = str(Path(path).resolve())
+    return str(LOCK_DIR / f"{zlib.crc32(resolved.encode('utf-8')):08x}-{Path(resolved).name}.lock")
+
+
+@contextmanager
+def file_lock(path: PathLike, shared: bool = False) -> Iterator[None]:
+    """
+    Hold an advisory lock on a state file for the duration of the block.
+
+    The lock is re-entrant within a process: nested calls on the same path
+    (e.g. a helper that saves while its caller already holds the lock) simply
+    increase a counter. Threads in the same process are serialized with an RLock.
+
+    A nested shared lock inside an exclusive one is fine, but a nested
+    exclusive lock inside a shared one cannot be granted: the held lock would
+    not be upgraded, and converting it with flock() is not atomic (another
+    process could slip in between). That case raises RuntimeError; take the
+    exclusive lock in the outermost block instead.
+
+    Args:
+        path: State file to lock (the lock file itself lives in ``LOCK_DIR``)
+        shared: Take a shared (read) lock instead of an exclusive one
+    """
+    key = _lock_path(path)
+
+    with _registry_guard:
+        entry = _held_locks.get(key)
+        if entry is None:
+            entry = {"rlock": threading.RLock(), "fd": None, "depth": 0, "shared": False}
+            _held_locks[key] = entry
+
+    entry["rlock"].acquire()
+    try:
+        if entry["depth"] and entry["shared"] and not shared:
+            raise RuntimeError(f"cannot take an exclusive lock on {path} while holding a shared lock on it")
+        if entry["depth"] == 0:
+            Path(key).parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(key, os.O_RDWR | os.O_CREAT, 0o644)
+            if fcntl is not None:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+                except BaseException:
+                    os.close(fd)
+                    raise
+            entry["fd"] = fd
+            entry["shared"] = shared
+        entry["depth"] += 1
+
+        try:
+            yield
+        finally:
+            entry["depth"] -= 1
+            if entry["depth"] == 0:
+                fd = entry["fd"]
+                entry["fd"] = None
+                if fcntl is not None:
+                    fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+    finally:
+        entry["rlock"].release()
+
+
+def _fsync_directory(directory: Path):
+    """Persist a rename by fsync'ing its parent directory (best effort)."""
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomic_write_bytes(path: PathLike, data: bytes):
+    """
+    Atomically replace ``path`` with ``data``.
+
+    Args:
+        path: Destination file
+        data: Full file contents
+    """
+    import tempfile  # deferred: only writers pay for it (pulls in random/hashlib)
+
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+
+    fd, tmp_name = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".tmp", dir=str(target.parent))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        if target.exists():
+            os.chmod(tmp_name, target.stat().st_mode & 0o777)
+        else:
+            os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+    _fsync_directory(target.parent)
+
+
+def atomic_write_text(path: PathLike, text: str, encoding: str = 'utf-8'):
+    """Atomically replace ``path`` with ``text``."""
+    atomic_write_bytes(path, text.encode(encoding))
+
+
+def atomic_write_json(path: PathLike, data: Any, indent: int = 2):
+    """Atomically replace ``path`` with ``data`` serialized as JSON."""
+    atomic_write_text(path, json.dumps(data, indent=indent, ensure_ascii=False))
+
+
+def read_json(path: PathLike, default: Any = None) -> Any:
+    """
+    Read a JSON state file under a shared lock.
+
+    Args:
+        path: JSON file to read
+        default: Value returned when the file does not exist
+
+    Returns:
+        Parsed JSON data or ``default``
+    """
+    target = Path(path)
+    if not target.exists():
+        return default
+
+    with file_lock(target, shared=True):
+        if not target.exists():
+            return default
+        with open(target, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+
+def write_json(path: PathLike, data: Any, indent: int = 2):
+    """Atomically write a JSON state file under an exclusive lock."""
+    with file_lock(path):
+        atomic_write_json(path, data, indent=indent)
+
+
+@contextmanager
+def locked_json(path: PathLike, default_factory: Callable[[], Any] = dict) -> Iterator[Any]:
+    """
+    Read-modify-write a JSON state file as one locked transaction.
+
+    The file is re-read under an exclusive lock, the caller mutates the yielded
+    object in place, and the result is written back atomically when the block
+    exits without an exception.
+
+    Example:
+        with locked_json(tracking_path) as tracking:
+            tracking["timeline"].append(event)
+
+    Args:
+        path: JSON file to update
+        default_factory: Builds the initial value when the file does not exist
+    """
+    target = Path(path)
+    with file_lock(target):
+        if target.exists():
+            with open(target, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        else:
+            data = default_factory()
+
+        yield data
+
+        atomic_write_json(target, data)
+
+
+def update_json(path: PathLike, mutator: Callable[[Any], Optional[Any]],
+                default_factory: Callable[[], Any] = dict) -> Any:
+    """
+    Apply ``mutator`` to a JSON state file inside a locked transaction.
+
+    Args:
+        path: JSON file to update
+        mutator: Receives the current data; may mutate it in place or return a replacement
+        default_factory: Builds the initial value when the file does not exist
+
+    Returns:
+        The data that was written
+    """
+    target = Path(path)
+    with file_lock(target):
+        if target.exists():
+            with open(target, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        else:
+            data = default_factory()
+
+        result = mutator(data)
+        if result is not None:
+            data = result
+
+        atomic_write_json(target, data)
+        return data
+
+
+def append_jsonl(path: PathLike, record: Any):
+    """
+    Append one JSON record as a line to a JSONL log under an exclusive lock.
+
+    The line is written with a single write() and fsync'd, so concurrent writers
+    never interleave and a crash can at worst leave a truncated final line
+    (which read_jsonl skips).
+    """
+    target = Path(path)
+    target.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+
+    with file_lock(target):
+        with open(target, 'a', encoding='utf-8') as f:
+            f.write(line)
+            f.flush()
+            os.fsync(f.fileno())
+
+
+def read_jsonl(path: PathLike) -> list:
+    """
+    Read every record of a JSONL log under a shared lock.
+
+    Returns:
+        Parsed records (empty when the file does not exist); malformed lines are skipped
+    """
+    target = Path(path)
+    if not target.exists():
+        return []
+
+    records = []
+    with file_lock(target, shared=True):
+        with open(target, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+    return records
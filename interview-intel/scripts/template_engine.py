@@ -0,0 +1,318 @@
+#!/usr/bin/env python3
+"""
+Template Engine
+
+Renders the generated documents (pipeline teammate briefs, interview strategy,
+icebreakers, resume optimization report, analytics dashboard) from the files
+in assets/templates/, so their wording and layout can be edited without
+touching the code.
+
+Each template is compiled once into a Python render function that appends to
+a list buffer and joins it at the end; compiled templates are cached by file
+mtime/size and recompiled when the file changes. Rendering a template that is
+already compiled costs one os.stat() plus the appends.
+
+Syntax:
+    {{ name.key.0 }}               value lookup (dict key, attribute or index)
+    {{ rate:.1% }}                 format spec, as in f-strings
+    {{ items | list }}             filters (built-in or passed to render())
+    {{ script.bad | default("N/A") }}
+    {% for item in items %} ... {{ loop.index }} ... {% endfor %}
+    {% for key, value in mapping | items %} ... {% endfor %}
+    {% if name %} ... {% elif not other %} ... {% else %} ... {% endif %}
+
+A line holding nothing but a {% ... %} tag is removed entirely, so block tags
+can sit on their own lines without leaving blank lines behind. Looking up a
+missing key yields an undefined value: it is falsy in {% if %}, replaced by
+the default filter, and an error when written out.
+
+Usage:
+    from template_engine import render
+    content = render("teammate_a_company_intel.md", {"company": company, "role": role})
+"""
+
+import os
+import re
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+TEMPLATE_DIR = Path(__file__).parent.parent / "assets" / "templates"
+
+_TOKEN = re.compile(r"({{.*?}}|{%.*?%})", re.S)
+_STANDALONE_TAG = re.compile(r"^[ \t]*({%(?:(?!%})[^\n])*%})[ \t]*(?:\n|\Z)", re.M)
+_FILTER = re.compile(r"^([A-Za-z_][A-Za-z0-9_]*)\s*(?:\((.*)\))?$", re.S)
+
+
+class TemplateError(Exception):
+    """Template syntax error, or an undefined value written out."""
+
+
+class Undefined:
+    """Result of looking up a missing key or attribute."""
+
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __bool__(self) -> bool:
+        return False
+
+    def __iter__(self):
+        raise TemplateError(f"undefined value in loop: {self.name}")
+
+    def __str__(self) -> str:
+        raise TemplateError(f"undefined value: {self.name}")
+
+    def __format__(self, spec: str) -> str:
+        return str(self)
+
+
+def _get(obj: Any, key: str) -> Any:
+    if isinstance(obj, Undefined):
+        return Undefined(f"{obj.name}.{key}")
+    if isinstance(obj, dict):
+        return obj[key] if key in obj else Undefined(key)
+    if key.isdigit() and isinstance(obj, (list, tuple, str)):
+        index = int(key)
+        return obj[index] if index < len(obj) else Undefined(key)
+    return getattr(obj, key, Undefined(key))
+
+
+def _default(value: Any, fallback: Any = "") -> Any:
+    return fallback if isinstance(value, Undefined) else value
+
+
+def _json(value: Any) -> str:
+    import json
+
+    return json.dumps(value)
+
+
+def _markdown_list(items: Any) -> str:
+    if isinstance(items, str):
+        return f"- {items}"
+    if isinstance(items, (list, tuple)):
+        return "\n".join([f"- {item}" for item in items])
+    return str(items)
+
+
+FILTERS: Dict[str, Callable] = {
+    "default": _default,
+    "list": _markdown_list,
+    "join": lambda items, separator=", ": separator.join(str(item) for item in items),
+    "json": _json,
+    "items": lambda mapping: list(mapping.items()),
+}
+
+
+class _Compiler:
+    """Turns template source into the source of a render function."""
+
+    def __init__(self, source: str, name: str):
+        self.name = name
+        self.source = _STANDALONE_TAG.sub(r"\1", source)
+        self.lines: List[str] = []
+        self.depth = 1
+        self.scopes: List[Dict[str, str]] = []
+        self.blocks: List[str] = []
+        self.counter = 0
+        self.line_number = 1
+
+    def error(self, message: str) -> TemplateError:
+        return TemplateError(f"{self.name}:{self.line_number}: {message}")
+
+    def emit(self, line: str):
+        self.lines.append("    " * self.depth + line)
+
+    def open(self):
+        # Start a block body ("pass" keeps empty bodies valid)
+        self.depth += 1
+        self.emit("pass")
+
+    def lookup(self, path: str) -> str:
+        parts = path.split(".")
+        if not all(part.isidentifier() or part.isdigit() for part in parts):
+            raise self.error(f"invalid name: {path!r}")
+        for scope in reversed(self.scopes):
+            if parts[0] in scope:
+                code = scope[parts[0]]
+                if parts[0] == "loop" and len(parts) > 1:
+                    attributes = {"index": code, "first": f"({code} == 1)"}
+                    if parts[1] not in attributes:
+                        raise self.error(f"unknown loop attribute: {parts[1]}")
+                    code, parts = attributes[parts[1]], parts[1:]
+                break
+        else:
+            code = f"_get(context, {parts[0]!r})"
+        for part in parts[1:]:
+            code = f"_get({code}, {part!r})"
+        return code
+
+    def expression(self, text: str) -> Tuple[str, Optional[str]]:
+        """Compile `path[:spec] [| filter ...]` to (code, format spec)."""
+        head, *filters = [piece.strip() for piece in text.split("|")]
+        path, _, spec = head.partition(":")
+        code = self.lookup(path.strip())
+        for item in filters:
+            match = _FILTER.match(item)
+            if not match:
+                raise self.error(f"invalid filter: {item!r}")
+            args = ""
+            if match.group(2):
+                import ast
+
+                try:
+                    args = ", " + ", ".join(repr(value) for value in
+                                            ast.literal_eval(f"({match.group(2)},)"))
+                except (ValueError, SyntaxError):
+                    raise self.error(f"filter arguments must be literals: {item!r}")
+            code = f"_filter({match.group(1)!r})({code}{args})"
+        return code, (spec or None)
+
+    def condition(self, text: str) -> str:
+        negate = text.startswith("not ")
+        code, _ = self.expression(text[4:] if negate else text)
+        return f"not {code}" if negate else code
+
+    def tag(self, body: str):
+        keyword, _, rest = body.partition(" ")
+        rest = rest.strip()
+        if keyword == "for":
+            targets, separator, iterable = rest.partition(" in ")
+            names = [name.strip() for name in targets.split(",")]
+            if not separator or not all(name.isidentifier() for name in names):
+                raise self.error(f"invalid for: {body!r}")
+            code, _ = self.expression(iterable.strip())
+            self.counter += 1
+            index = f"_loop{self.counter}"
+            variables = {name: f"_v{self.counter}_{name}" for name in names}
+            target = ", ".join(variables.values())
+            if len(names) > 1:
+                target = f"({target})"
+            self.emit(f"for {index}, {target} in enumerate({code}, 1):")
+            self.scopes.append({**variables, "loop": index})
+            self.blocks.append("for")
+            self.open()
+        elif keyword == "if":
+            self.emit(f"if {self.condition(rest)}:")
+            self.blocks.append("if")
+            self.open()
+        elif keyword in ("elif", "else"):
+            if not self.blocks or self.blocks[-1] != "if":
+                raise self.error(f"{keyword} outside if")
+            self.depth -= 1
+            self.emit(f"elif {self.condition(rest)}:" if keyword == "elif" else "else:")
+            self.open()
+        elif keyword in ("endfor", "endif"):
+            if not self.blocks or self.blocks[-1] != keyword[3:]:
+                raise self.error(f"unexpected {keyword}")
+            self.blocks.pop()
+            if keyword == "endfor":
+                self.scopes.pop()
+            self.depth -= 1
+        else:
+            raise self.error(f"unknown tag: {keyword!r}")
+
+    def compile(self) -> str:
+        self.lines.append("def render(context, _filter):")
+        self.emit("_buffer = []")
+        self.emit("_write = _buffer.append")
+        for token in _TOKEN.split(self.source):
+            if token.startswith("{{") and token.endswith("}}"):
+                code, spec = self.expression(token[2:-2].strip())
+                self.emit(f"_write(format({code}, {spec!r}))" if spec else f"_write(_text({code}))")
+            elif token.startswith("{%") and token.endswith("%}"):
+                self.tag(token[2:-2].strip())
+            elif token:
+                self.emit(f"_write({token!r})")
+            self.line_number += token.count("\n")
+        if self.blocks:
+            raise self.error(f"unclosed {self.blocks[-1]}")
+        self.emit("return ''.join(_buffer)")
+        return "\n".join(self.lines)
+
+
+def _text(value: Any) -> str:
+    return value if type(value) is str else str(value)
+
+
+class Template:
+    """A compiled template."""
+
+    def __init__(self, source: str, name: str = "<template>"):
+        import hashlib
+
+        namespace = {"_get": _get, "_text": _text}
+        code = _Compiler(source, name).compile()
+        exec(compile(code, f"<template {name}>", "exec"), namespace)
+        self.name = name
+        # Content version: lets caches of rendered or generated output expire when the template is edited
+        self.digest = hashlib.sha256(source.encode("utf-8")).hexdigest()[:16]
+        self._render = namespace["render"]
+
+    def render(self, context: Dict[str, Any], filters: Optional[Dict[str, Callable]] = None) -> str:
+        """
+        Render with the given values.
+
+        Args:
+            context: Top-level names available to the template
+            filters: Extra filters (override the built-in ones of the same name)
+        """
+        table = {**FILTERS, **filters} if filters else FILTERS
+
+        def lookup_filter(name: str) -> Callable:
+            try:
+                return table[name]
+            except KeyError:
+                raise TemplateError(f"{self.name}: unknown filter {name!r}") from None
+
+        return self._render(context, lookup_filter)
+
+
+class TemplateEngine:
+    """Loads templates from a directory; compiled templates are cached by mtime."""
+
+    def __init__(self, directory: Path = TEMPLATE_DIR):
+        self.directory = Path(directory)
+        self._cache: Dict[str, Tuple[Tuple[int, int], Template]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Template:
+        """The compiled template, recompiled if the file changed since last use."""
+        path = self.directory / name
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        cached = self._cache.get(name)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        with self._lock:
+            cached = self._cache.get(name)
+            if cached is None or cached[0] != version:
+                with open(path, 'r', encoding='utf-8') as f:
+                    cached = (version, Template(f.read(), name))
+                self._cache[name] = cached
+        return cached[1]
+
+    def render(self, name: str, context: Dict[str, Any],
+               filters: Optional[Dict[str, Callable]] = None) -> str:
+        """Render the named template (see Template.render)."""
+        return self.get(name).render(context, filters)
+
+
+_default_engine: Optional[TemplateEngine] = None
+
+
+def default_engine() -> TemplateEngine:
+    """The process-wide engine for assets/templates/."""
+    global _default_engine
+    if _default_engine is None:
+        _default_engine = TemplateEngine()
+    return _default_engine
+
+
+def render(name: str, context: Dict[str, Any], filters: Optional[Dict[str, Callable]] = None) -> str:
+    """Render assets/templates/<name> with the process-wide engine."""
+    return default_engine().render(name, context, filters)
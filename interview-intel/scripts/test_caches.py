@@ -0,0 +1,175 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+缓存 - 测试脚本
+
+覆盖 jd_analysis_cache.py 的键归一化与磁盘命中、response_cache.py 的提示词
+归一化与 LRU 淘汰、company_intel_cache.py 的新鲜期与 get_or_create
+"""
+
+import os
+import sys
+import time
+import tempfile
+from pathlib import Path
+
+# 添加路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.company_intel_cache import HIT, MISS, STALE, CompanyIntelCache
+from scripts.extract_jd_keywords import analyze_jd
+from scripts.jd_analysis_cache import KEY_VERSION, JDAnalysisCache, normalize_jd
+from scripts.response_cache import ResponseCache, normalize_prompt
+
+JD = """任职要求:
+- 3+ years of Python experience
+- Must have experience with React and SQL
+加分项:
+- Kubernetes experience is a plus
+"""
+
+
+def test_jd_analysis_key_normalization():
+    """空白和 Unicode 组合形式不同的同一 JD 共用一个键，分析的是原文"""
+    cache = JDAnalysisCache()
+    variant = "  " + JD.replace("\n", "\r\n").replace("- ", "-   ")
+    composed, decomposed = "Caf\u00e9 PM: Python", "Cafe\u0301 PM:  Python"
+
+    assert normalize_jd(JD) == normalize_jd(variant)
+    assert cache.key(normalize_jd(composed)) == cache.key(normalize_jd(decomposed))
+    assert cache.key(normalize_jd(JD)) != cache.key(normalize_jd(JD.replace("React", "Vue")))
+
+    analysis = cache.analyze(JD)
+    # 归一化只用于键: 分析的是原文 (要求句保留原文的换行)
+    assert analysis == analyze_jd(JD)
+    assert analysis != analyze_jd(normalize_jd(JD))
+    assert cache.analyze(variant) is analysis
+    assert cache.stats == {"memory_hits": 1, "disk_hits": 0, "misses": 1}
+
+
+def test_jd_analysis_key_version():
+    """键包含 KEY_VERSION: 格式变化后旧条目不再命中"""
+    from scripts import jd_analysis_cache
+
+    key = JDAnalysisCache.key(normalize_jd(JD))
+    jd_analysis_cache.KEY_VERSION = KEY_VERSION + 1
+    try:
+        assert JDAnalysisCache.key(normalize_jd(JD)) != key
+    finally:
+        jd_analysis_cache.KEY_VERSION = KEY_VERSION
+
+
+def test_jd_analysis_disk_hit():
+    """另一个进程 (新的缓存实例) 从磁盘命中，结果与 analyze_jd 相同"""
+    with tempfile.TemporaryDirectory() as base_path:
+        first = JDAnalysisCache(base_path)
+        analysis = first.analyze(JD)
+
+        second = JDAnalysisCache(base_path)
+        assert second.analyze(JD) == analysis
+        assert second.stats == {"memory_hits": 0, "disk_hits": 1, "misses": 0}
+        assert second.report()["entries"] == 1
+
+        second.clear()
+        assert JDAnalysisCache(base_path).report()["entries"] == 0
+
+
+def test_normalize_prompt_only_timestamp_lines():
+    """只有生成时间行中的时间戳被替换，其他文本中的日期保留"""
+    prompt = "| 生成时间 | 2026-03-01 10:20 |\n面试日期: 2026-03-05\n"
+    later = "| 生成时间 | 2026-03-02 08:00 |\n面试日期:   2026-03-05\n"
+
+    assert normalize_prompt(prompt) == normalize_prompt(later)
+    assert "2026-03-05" in normalize_prompt(prompt)
+    assert normalize_prompt(prompt) != normalize_prompt(prompt.replace("2026-03-05", "2026-03-06"))
+
+
+def test_response_cache_hit_and_miss():
+    """命中 / 未命中计数；模板、后端或 max_tokens 不同为不同的键"""
+    with tempfile.TemporaryDirectory() as base_path:
+        cache = ResponseCache(base_path)
+        key = cache.key("提示词", "teammate_c/hr.md", "http", 512)
+
+        assert cache.get(key) is None
+        cache.put(key, "生成结果")
+        assert cache.get(key) == "生成结果"
+        for other in (cache.key("提示词", "teammate_c/business.md", "http", 512),
+                      cache.key("提示词", "teammate_c/hr.md", "placeholder", 512),
+                      cache.key("提示词", "teammate_c/hr.md", "http", 256)):
+            assert other != key
+
+        cache.save_stats()
+        report = ResponseCache(base_path).report()
+        assert (report["hits"], report["misses"], report["stores"], report["entries"]) == (1, 1, 1, 1)
+
+
+def test_response_cache_evicts_least_recently_used():
+    """超过大小上限时淘汰最久未用的条目"""
+    with tempfile.TemporaryDirectory() as base_path:
+        cache = ResponseCache(base_path)
+        keys = [cache.key(f"提示词 {i}") for i in range(4)]
+        for i, key in enumerate(keys):
+            cache.put(key, "x" * 3000)
+            # mtime 精度: 错开各条目的最近使用时间
+            os.utime(cache._path(key), (time.time() - 100 + i, time.time() - 100 + i))
+        cache.get(keys[0])
+
+        # 上限约 3.5 个条目: 写入第 5 个后淘汰到 LOW_WATERMARK 以下，只剩 3 个
+        cache.max_bytes = int(cache._path(keys[0]).stat().st_size * 3.5)
+        cache.put(cache.key("提示词 4"), "x" * 3000)
+
+        assert [cache.get(key) is not None for key in keys] == [True, False, False, True]
+        assert cache.report()["entries"] == 3
+        assert cache.stats["evictions"] == 2
+
+
+def test_company_intel_store_and_lookup():
+    """按 公司 / 职位 / JD 存取，JD 的空白差异不影响键"""
+    with tempfile.TemporaryDirectory() as base_path:
+        cache = CompanyIntelCache(base_path)
+        cache.store("测试公司", "产品经理", JD, "简报")
+
+        assert cache.lookup("测试公司", "产品经理", JD.replace("\n", "\n\n"))["content"] == "简报"
+        assert cache.lookup("测试公司", "运营", JD) is None
+        # 键只含公司时与职位 / JD 无关
+        assert CompanyIntelCache(base_path, key=("company",)).lookup("测试公司", "运营", "") is None
+        CompanyIntelCache(base_path, key=("company",)).store("测试公司", "运营", "", "公司简报")
+        assert CompanyIntelCache(base_path, key=("company",)).lookup("测试公司", "任意", "其他")["content"] == "公司简报"
+
+        assert cache.invalidate("测试公司", "产品经理") == 1
+        assert cache.lookup("测试公司", "产品经理", JD) is None
+
+
+def test_company_intel_get_or_create():
+    """未命中时生成，新鲜命中直接返回，过期时返回旧内容并后台刷新"""
+    with tempfile.TemporaryDirectory() as base_path:
+        cache = CompanyIntelCache(base_path, ttl_hours=1)
+        calls = []
+
+        def compose():
+            calls.append(1)
+            return f"简报 v{len(calls)}"
+
+        assert cache.get_or_create("测试公司", "产品经理", JD, compose) == ("简报 v1", MISS)
+        assert cache.get_or_create("测试公司", "产品经理", JD, compose) == ("简报 v1", HIT)
+
+        cache.ttl = 0
+        assert cache.get_or_create("测试公司", "产品经理", JD, compose) == ("简报 v1", STALE)
+        cache.wait()
+        assert cache.lookup("测试公司", "产品经理", JD)["content"] == "简报 v2"
+
+        cache.ttl = None
+        assert cache.get_or_create("测试公司", "产品经理", JD, compose, refresh=True) == ("简报 v3", MISS)
+        assert len(calls) == 3
+
+
+def main():
+    """主入口"""
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+JD 修订差异 - 测试脚本
+
+验证 jd_diff.py 的要求对齐、按上游章节 (而不是整篇上游文档) 计算的修订
+计划，以及 PipelineTeam.revise 只重新生成计划中的章节
+"""
+
+import io
+import sys
+import tempfile
+from contextlib import redirect_stdout
+from pathlib import Path
+
+# 添加路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.jd_diff import diff_requirements, plan_revision, split_blocks
+from scripts.pipeline_team import PipelineTeam, load_pipeline_config
+
+JD = """岗位职责:
+1. 负责产品规划与需求分析
+任职要求:
+1. 3年以上产品经理经验
+2. 熟悉数据分析
+加分项:
+1. 有 SaaS 行业经验者优先
+"""
+
+# 只改一句加分项
+JD_PREFERRED = JD.replace("有 SaaS 行业经验者优先", "有 AI 产品经验者优先")
+
+# 一句加分项变化的计划: 各文档只有依赖加分项的章节
+PREFERRED_PLAN = {
+    "teammate_a": ["职位深度分析"],
+    "teammate_b": ["加分项匹配"],
+    "teammate_c": ["business"],
+    "teammate_d": ["reverse_questions"],
+    "teammate_e": None,
+}
+
+# 修订后内容变化的二级标题 (C / D 的节 id 对应的标题)
+PREFERRED_BLOCKS = {
+    "01_company_intel_brief.md": {"职位深度分析"},
+    "02_resume_jd_matching.md": {"加分项匹配"},
+    "03_interview_prep_report.md": {"业务面试"},
+    "04_icebreaker_messages.md": {"反向提问"},
+}
+
+
+def test_diff_requirements():
+    """修改的要求按相似度配对，未变的要求计数"""
+    diff = diff_requirements(JD, JD_PREFERRED)
+
+    assert not diff["added"] and not diff["removed"]
+    assert [(c["old"]["category"], c["new"]["text"]) for c in diff["modified"]] == [
+        ("preferred", "有 AI 产品经验者优先")]
+    assert diff["unchanged"] == 3
+    assert plan_revision(diff_requirements(JD, JD), load_pipeline_config()) == {}
+
+
+def test_preferred_change_plans_mapped_sections():
+    """一句加分项变化只影响依赖上游对应章节的节，不因上游文档变化而整篇展开"""
+    plan = plan_revision(diff_requirements(JD, JD_PREFERRED), load_pipeline_config())
+
+    assert plan == PREFERRED_PLAN
+
+
+def test_whole_document_dependency():
+    """依赖整篇上游 (前缀) 的节受该文档任何章节变化影响"""
+    config = load_pipeline_config()
+    coach = next(t for t in config["teammates"].values() if t["id"] == "teammate_c")
+    for section in coach["sections"]:
+        if section["id"] == "hr":
+            section["dependencies"] = ["01"]
+
+    plan = plan_revision(diff_requirements(JD, JD_PREFERRED), config)
+
+    assert plan["teammate_c"] == ["hr", "business"]
+
+
+def test_revise_regenerates_only_planned_sections():
+    """PipelineTeam.revise (桩服务): 计划外的章节原样保留，计划内的章节重新生成"""
+    from scripts.benchmark_pipeline import write_synthetic_pdf
+    from scripts.generation_stub import running
+
+    with tempfile.TemporaryDirectory() as base_path, running() as server:
+        resume = Path(base_path) / "resume.pdf"
+        write_synthetic_pdf(resume, ["Product manager, 5 years of SaaS analytics"])
+        team = PipelineTeam(base_path, trace=False, history=False, generation_url=server.url)
+        team.generator.cache = None
+        with redirect_stdout(io.StringIO()):
+            output_dir = team.launch("测试公司", "产品经理", "测试候选人", JD, str(resume))
+            before = {name: (output_dir / name).read_text(encoding="utf-8") for name in PREFERRED_BLOCKS}
+            result = team.revise(output_dir, JD_PREFERRED)
+
+        assert result["plan"] == PREFERRED_PLAN
+        assert result["jd_updated"]
+        for name, expected in PREFERRED_BLOCKS.items():
+            old_blocks = split_blocks(before[name])
+            new_blocks = split_blocks((output_dir / name).read_text(encoding="utf-8"))
+            assert [title for title, _ in old_blocks] == [title for title, _ in new_blocks], name
+            changed = {title for (title, old), (_, new) in zip(old_blocks, new_blocks) if old != new}
+            assert changed == expected, f"{name}: 变化的章节 {changed}"
+
+
+def main():
+    """主入口"""
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+近似重复 JD 索引 - 测试脚本
+
+验证 jd_index.py 的相似度阈值、排除本次运行自己的 JD，以及索引的增量刷新
+"""
+
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 添加路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.jd_index import BINS, DEFAULT_THRESHOLD, INDEX_FILE, JDIndex, find_similar
+
+JD = """岗位职责:
+1. 负责 B 端 SaaS 产品的规划、需求分析与迭代，推动产品从 0 到 1 落地
+2. 深入理解客户业务流程，输出高质量的 PRD 与原型，协调研发、设计、测试按期交付
+3. 搭建产品数据指标体系，基于数据分析持续优化产品体验与转化
+4. 跟踪行业动态与竞品，提出有竞争力的产品策略
+任职要求:
+1. 本科及以上学历，3 年以上 B 端产品经理经验
+2. 熟练使用 Axure、Figma 等原型工具，具备 SQL 数据分析能力
+3. 逻辑清晰，沟通协调能力强，有跨团队推动项目的经验
+加分项:
+1. 有 CRM / ERP 行业经验者优先
+"""
+
+# 重新发布: 改了一个词、加了一行福利
+REPOSTED = JD.replace("3 年以上", "5 年以上") + "福利: 六险一金，弹性工作\n"
+
+OTHER = """Responsibilities:
+- Build and operate Kubernetes clusters across regions
+- Own the on-call rotation and incident postmortems
+Requirements:
+- 5+ years of Go or Rust in production
+"""
+
+
+def _save(base_path: str, packet: str, text: str) -> Path:
+    path = Path(base_path) / "companies" / packet / "raw_data" / "jd_original.txt"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_near_duplicate_threshold():
+    """改动很小的 JD 超过默认阈值，无关 JD 不返回；相似度低于阈值的不返回"""
+    with tempfile.TemporaryDirectory() as base_path:
+        _save(base_path, "测试公司-产品经理-张三", JD)
+        _save(base_path, "其他公司-SRE-李四", OTHER)
+
+        matches = find_similar(REPOSTED, base_path)
+        assert [Path(match["packet"]).name for match in matches] == ["测试公司-产品经理-张三"]
+        score = matches[0]["similarity"]
+        assert DEFAULT_THRESHOLD <= score < 1.0
+        assert matches[0]["kind"] == "workflow", "没有 packet.json 的目录按一键工作流处理"
+
+        # 返回的相似度保留 3 位小数，阈值按签名相等的桶数 (1 / BINS 的倍数) 比较
+        equal = round(score * BINS)
+        assert find_similar(REPOSTED, base_path, threshold=equal / BINS)
+        assert not find_similar(REPOSTED, base_path, threshold=(equal + 1) / BINS)
+        assert find_similar(JD, base_path, threshold=1.0)
+
+
+def test_exclude_own_jd():
+    """本次运行自己保存的 JD 不算重复"""
+    with tempfile.TemporaryDirectory() as base_path:
+        own = _save(base_path, "测试公司-产品经理-张三", JD)
+        _save(base_path, "测试公司-产品经理-王五", REPOSTED)
+
+        matches = find_similar(JD, base_path, exclude=[own])
+        assert [Path(match["packet"]).name for match in matches] == ["测试公司-产品经理-王五"]
+
+
+def test_refresh_is_incremental():
+    """refresh 只为新增 / 改动的文件重新计算签名，删除的文件移出索引"""
+    with tempfile.TemporaryDirectory() as base_path:
+        first = _save(base_path, "测试公司-产品经理-张三", JD)
+        second = _save(base_path, "其他公司-SRE-李四", OTHER)
+
+        index = JDIndex(base_path).load()
+        assert index.refresh() == {"added": 2, "updated": 0, "removed": 0, "entries": 2}
+        assert (Path(base_path) / INDEX_FILE).is_file()
+
+        reloaded = JDIndex(base_path).load()
+        assert reloaded.refresh() == {"added": 0, "updated": 0, "removed": 0, "entries": 2}
+
+        first.write_text(OTHER, encoding="utf-8")
+        os.utime(first, ns=(first.stat().st_atime_ns, first.stat().st_mtime_ns + 10 ** 9))
+        second.unlink()
+        assert reloaded.refresh() == {"added": 0, "updated": 1, "removed": 1, "entries": 1}
+        assert not reloaded.query(REPOSTED)
+        assert reloaded.query(OTHER, threshold=1.0)
+
+
+def main():
+    """主入口"""
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+包质量检查 - 测试脚本
+
+验证 packet_validator.py 的章节匹配 (忽略空白、允许更长的标题、代码块中的
+# 不算标题)、大小与占位检查、过期副本回退解析，以及失败队友的下游
+"""
+
+import sys
+import copy
+import tempfile
+from pathlib import Path
+
+# 添加路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts import artifact_sidecar
+from scripts.packet_validator import (MISSING_FILE, MISSING_SECTION, PLACEHOLDER, TOO_SMALL, find_packets,
+                                      load_rules, validate_file, validate_packet)
+from scripts.pipeline_team import load_pipeline_config
+
+# 各产物满足 quality.required_sections 的标题 (标题中的空白、前后缀不影响匹配)
+HEADINGS = {
+    "01": ["公司背景", "业务模式", "竞争格局"],
+    "02": ["匹配度总览", "逐项匹配分析", "核心竞争力总结"],
+    "03": ["HR 面试", "业务面试", "高管面试"],
+    "04": ["自我介绍", "针对不同面试官的开场白", "反向提问"],
+    "05": ["综合评估", "核心竞争力定位", "行动计划"],
+}
+
+
+def _config() -> dict:
+    """pipeline_config.json，去掉大小下限 (单独测试)"""
+    config = copy.deepcopy(load_pipeline_config())
+    config["quality"]["min_file_sizes"] = {}
+    return config
+
+
+def _write_packet(output_dir: Path, config: dict) -> dict:
+    """写出全部通过检查的 01-05，返回 {前缀: 路径}"""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    paths = {}
+    for prefix, rule in load_rules(config).items():
+        body = "".join(f"## {title}\n\n内容\n\n" for title in HEADINGS[prefix])
+        paths[prefix] = output_dir / rule["file"]
+        paths[prefix].write_text(f"# 文档 {prefix}\n\n{body}", encoding="utf-8")
+    return paths
+
+
+def test_complete_packet_passes():
+    """章节齐全、没有占位的包通过；「HR面试」匹配「## HR 面试」，「开场白」匹配更长的标题"""
+    config = _config()
+    with tempfile.TemporaryDirectory() as root:
+        output_dir = Path(root) / "测试公司-产品经理-张三"
+        _write_packet(output_dir, config)
+
+        report = validate_packet(output_dir, config)
+        assert report["ok"], report
+        assert report["failed"] == [] and report["regenerate"] == []
+        assert find_packets([root]) == [output_dir]
+
+
+def test_file_issues():
+    """代码块中的标题不算章节；过小的文件和剩余占位 (含所在章节) 都报出"""
+    config = _config()
+    with tempfile.TemporaryDirectory() as root:
+        path = Path(root) / "03_interview_prep_report.md"
+        path.write_text("# 面试准备报告\n\n## HR 面试\n\n**[待 AI 生成 - 基于简历]**\n\n"
+                        "## 业务面试\n\n```\n## 高管面试\n```\n", encoding="utf-8")
+        rule = {**load_rules(config)["03"], "min_bytes": 8 * 1024}
+
+        result = validate_file(path, rule)
+        assert not result["ok"]
+        assert [issue["type"] for issue in result["issues"]] == [TOO_SMALL, MISSING_SECTION, PLACEHOLDER]
+        assert result["issues"][1]["section"] == "高管面试"
+        assert [(p["section"], p["hint"]) for p in result["placeholders"]] == [
+            ("面试准备报告 > HR 面试", "生成 - 基于简历")]
+
+        assert validate_file(Path(root) / "missing.md", rule)["issues"] == [{"type": MISSING_FILE}]
+
+
+def test_stale_sidecar_is_reparsed():
+    """产物在写出副本后被改写时不使用过期副本"""
+    config = _config()
+    with tempfile.TemporaryDirectory() as root:
+        output_dir = Path(root) / "测试公司-产品经理-张三"
+        paths = _write_packet(output_dir, config)
+        artifact_sidecar.ensure(paths["02"], "teammate_b")
+        assert validate_packet(output_dir, config)["ok"]
+
+        paths["02"].write_text("# 简历分析和匹配\n\n## 匹配度总览\n\n内容\n", encoding="utf-8")
+
+        report = validate_packet(output_dir, config)
+        assert [issue["section"] for issue in report["files"]["02"]["issues"]] == ["逐项匹配分析", "核心竞争力"]
+
+
+def test_failed_teammate_regenerates_downstream():
+    """未通过的队友连同下游列入 regenerate"""
+    config = _config()
+    with tempfile.TemporaryDirectory() as root:
+        output_dir = Path(root) / "测试公司-产品经理-张三"
+        paths = _write_packet(output_dir, config)
+        paths["01"].unlink()
+
+        report = validate_packet(output_dir, config)
+        assert report["failed"] == ["teammate_a"]
+        assert report["regenerate"] == ["teammate_a", "teammate_c", "teammate_d", "teammate_e"]
+
+
+def main():
+    """主入口"""
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
+
+
+if __name__ == "__main__":
+    main()
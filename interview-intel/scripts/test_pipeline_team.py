@@ -130,6 +130,137 @@ def test_pipeline_team():
         sys.exit(1)
 
 
+def test_section_placeholders_get_own_responses():
+    """分节文档 (C / D) 各节并发生成时，每个占位取到自己的生成结果 (桩服务)"""
+    import re
+    import tempfile
+
+    from scripts.generation_stub import running
+
+    with tempfile.TemporaryDirectory() as base_path, running() as server:
+        team = PipelineTeam(base_path, trace=False, history=False, generation_url=server.url)
+        team.generator.cache = None
+        output_dir = Path(base_path) / "companies" / "测试公司-产品经理-测试候选人"
+        output_dir.mkdir(parents=True)
+        metadata = {"company": "测试公司", "role": "产品经理", "candidate": "测试候选人"}
+
+        for teammate_id in ("teammate_c", "teammate_d"):
+            content = team._compose_sections(teammate_id, {}, output_dir, metadata)
+
+            # 桩服务的内容以 【段落所在小节标题】 开头，带提示词哈希
+            heading = ""
+            responses = []
+            for line in content.splitlines():
+                match = re.match(r"#{1,6}\s+(.+?)\s*$", line)
+                if match:
+                    heading = match.group(1)
+                for section, digest in re.findall(r"【([^】]*)】 桩服务生成内容 \((\w+)\)", line):
+                    assert section == heading, f"{teammate_id}: 「{heading}」下的占位取到了「{section}」的内容"
+                    responses.append(digest)
+
+            assert responses, f"{teammate_id}: 没有生成任何段落"
+            assert len(set(responses)) == len(responses), f"{teammate_id}: 不同占位取到了相同的内容"
+            assert "[待 AI" not in content
+
+
+def _changed_blocks(before: str, after: str) -> set:
+    """两版文档中内容不同的一级 / 二级标题 (两版的标题结构须相同)"""
+    from scripts.jd_diff import split_blocks
+
+    old_blocks, new_blocks = split_blocks(before), split_blocks(after)
+    assert [title for title, _ in old_blocks] == [title for title, _ in new_blocks]
+    return {title for (title, old), (_, new) in zip(old_blocks, new_blocks) if old != new}
+
+
+def _launch_quietly(team: PipelineTeam, *args, **kwargs) -> Path:
+    import io
+    from contextlib import redirect_stdout
+
+    with redirect_stdout(io.StringIO()):
+        return team.launch(*args, **kwargs)
+
+
+def _similar_quietly(args, jd_content: str):
+    import io
+    from contextlib import redirect_stdout
+
+    from scripts.pipeline_team import _similar_packet
+
+    with redirect_stdout(io.StringIO()):
+        return _similar_packet(args, jd_content)
+
+
+def test_reuse_revises_planned_sections():
+    """沿用 JD 近似重复的包 (桩服务): 只有一句加分项不同时复制 A-D，只重新生成计划中的章节，E 整篇"""
+    import tempfile
+
+    from scripts.benchmark_pipeline import write_synthetic_pdf
+    from scripts.generation_stub import running
+    from scripts.run_manifest import MANIFEST_FILE
+    from scripts.state_io import read_json
+    from scripts.test_jd_diff import JD, JD_PREFERRED, PREFERRED_BLOCKS
+
+    with tempfile.TemporaryDirectory() as root, running() as server:
+        resume = Path(root) / "resume.pdf"
+        write_synthetic_pdf(resume, ["Product manager, 5 years of SaaS analytics"])
+        teams = []
+        for name in ("first", "second"):
+            team = PipelineTeam(str(Path(root) / name), trace=False, history=False, generation_url=server.url)
+            team.generator.cache = None
+            teams.append(team)
+
+        source = _launch_quietly(teams[0], "测试公司", "产品经理", "测试候选人", JD, str(resume))
+        output_dir = _launch_quietly(teams[1], "测试公司", "产品经理", "测试候选人", JD_PREFERRED, str(resume),
+                                     reuse_from=source)
+
+        # 沿用的队友不再运行，E 依赖整篇上游，重新生成
+        assert list(teams[1].teammate_results) == ["teammate_e"]
+        for name, expected in PREFERRED_BLOCKS.items():
+            changed = _changed_blocks((source / name).read_text(encoding="utf-8"),
+                                      (output_dir / name).read_text(encoding="utf-8"))
+            assert changed == expected, f"{name}: 变化的章节 {changed}"
+        assert (output_dir / "05_final_analysis_report.md").is_file()
+
+        completed = read_json(output_dir / MANIFEST_FILE)["nodes"]
+        assert {"teammate_a", "teammate_b", "teammate_c", "teammate_d", "teammate_e"} <= set(completed)
+
+
+def test_reuse_similar_for_another_candidate():
+    """--reuse-similar: 另一位候选人的近似重复 JD 只沿用公司研究 (A)，按 JD 差异修订其章节"""
+    import argparse
+    import tempfile
+
+    from scripts.benchmark_pipeline import write_synthetic_pdf
+    from scripts.generation_stub import running
+    from scripts.test_jd_diff import JD, JD_PREFERRED
+
+    with tempfile.TemporaryDirectory() as base_path, running() as server:
+        resume = Path(base_path) / "resume.pdf"
+        write_synthetic_pdf(resume, ["Product manager, 5 years of SaaS analytics"])
+        team = PipelineTeam(base_path, trace=False, history=False, generation_url=server.url)
+        team.generator.cache = None
+        source = _launch_quietly(team, "测试公司", "产品经理", "张三", JD, str(resume))
+
+        # 样例 JD 很短，改一句后的相似度约 0.67，低于默认阈值
+        args = argparse.Namespace(base_path=base_path, company="测试公司", role="产品经理", candidate="李四",
+                                  similarity=None, reuse_similar=True)
+        assert _similar_quietly(args, JD_PREFERRED) is None
+        args.similarity, args.reuse_similar = 0.6, False
+        assert _similar_quietly(args, JD_PREFERRED) is None, "不加 --reuse-similar 时只提示"
+        args.reuse_similar = True
+        reuse_from = _similar_quietly(args, JD_PREFERRED)
+        assert reuse_from == source
+
+        output_dir = _launch_quietly(team, "测试公司", "产品经理", "李四", JD_PREFERRED, str(resume),
+                                     reuse_from=reuse_from)
+
+        # 候选人不同按简历变更处理: B 及下游重新生成
+        assert list(team.teammate_results) == ["teammate_b", "teammate_c", "teammate_d", "teammate_e"]
+        name = "01_company_intel_brief.md"
+        assert _changed_blocks((source / name).read_text(encoding="utf-8"),
+                               (output_dir / name).read_text(encoding="utf-8")) == {"职位深度分析"}
+
+
 def main():
     """主入口"""
     import argparse
@@ -137,10 +268,17 @@ def main():
     parser = argparse.ArgumentParser(description="专业化流水线团队测试")
     parser.add_argument("--quick", action="store_true", help="快速测试（使用模拟数据）")
     parser.add_argument("--real", action="store_true", help="真实测试（使用真实简历）")
+    parser.add_argument("--bench", action="store_true",
+                        help="基准测试（合成数据，其余参数传给 benchmark_pipeline.py）")
+
+    args, bench_args = parser.parse_known_args()
 
-    args = parser.parse_args()
+    if args.bench:
+        from scripts import benchmark_pipeline
 
-    if args.real:
+        sys.argv = [sys.argv[0]] + bench_args
+        benchmark_pipeline.main()
+    elif args.real:
         print("🧪 真实测试模式")
         print("请确保提供了真实的JD和简历路径")
         print()
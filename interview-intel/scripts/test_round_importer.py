@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+面试轮次批量导入 - 测试脚本
+
+用 CSV / ICS 样例文件验证 round_importer.py 的解析、按公司分组、UTC 时间
+转本地时间，以及重复导入不产生重复轮次
+"""
+
+import os
+import sys
+import time
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+# 添加路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.round_importer import bulk_import, parse_csv, parse_ics, resolve_company_path
+from scripts.state_io import read_json
+
+CSV_FIXTURE = """﻿公司,轮次,面试名称,日期,时间,时长,平台,面试官,重点
+字节跳动,1,HR 面,2026-03-02,10:00,30,飞书,王女士,动机；稳定性
+字节跳动,2,业务面,2026-03-05,14:00,60,飞书,李先生,"产品设计,数据分析"
+阿里云,,技术面,2026-03-03,15:30,45,钉钉,,
+"""
+
+# 第一场为 UTC 时间 (Z)，第二场为浮动时间；SUMMARY 跨行折叠
+ICS_FIXTURE = """BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VEVENT
+SUMMARY:字节跳动 | 终面
+DTSTART:20260310T020000Z
+DTEND:20260310T030000Z
+LOCATION:Zoom https://zoom.us/j/1
+ATTENDEE;CN=Boss:mailto:boss@example.com
+END:VEVENT
+BEGIN:VEVENT
+CATEGORIES:阿里云
+SUMMARY:阿里云 - 交叉
+ 面
+DTSTART:20260311T093000
+DURATION:PT1H30M
+LOCATION:杭州园区
+END:VEVENT
+BEGIN:VEVENT
+SUMMARY:没有公司的日程
+DTSTART:20260312T090000
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+@contextmanager
+def local_timezone(tz: str):
+    """临时切换进程的本地时区 (POSIX TZ 串，不依赖 tzdata)"""
+    previous = os.environ.get("TZ")
+    os.environ["TZ"] = tz
+    time.tzset()
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop("TZ", None)
+        else:
+            os.environ["TZ"] = previous
+        time.tzset()
+
+
+def _write(root: str, name: str, content: str) -> str:
+    path = Path(root) / name
+    path.write_text(content, encoding="utf-8")
+    return str(path)
+
+
+def _init_companies(root: str, companies):
+    from scripts.interview_tracker import InterviewTracker
+
+    for company in companies:
+        path = resolve_company_path(root, {"company": company})
+        InterviewTracker(str(path)).init_tracking(company, "产品经理", "v1")
+
+
+def _rounds(root: str, company: str):
+    tracking = read_json(resolve_company_path(root, {"company": company}) / "interviews" / "tracking.json")
+    return tracking["interviews"]
+
+
+def test_parse_csv():
+    """CSV: 中文表头别名、重点拆分、可选列缺省"""
+    with tempfile.TemporaryDirectory() as root:
+        records = parse_csv(_write(root, "rounds.csv", CSV_FIXTURE))
+
+    assert [(r["company"], r["round_num"], r["round_name"]) for r in records] == [
+        ("字节跳动", 1, "HR 面"), ("字节跳动", 2, "业务面"), ("阿里云", None, "技术面")]
+    assert records[0]["focus_areas"] == ["动机", "稳定性"]
+    assert records[1]["focus_areas"] == ["产品设计", "数据分析"]
+    assert records[1]["duration_minutes"] == 60 and records[1]["interviewer_name"] == "李先生"
+    assert records[2]["interviewer_name"] == "" and records[2]["format"] == "video"
+
+
+def test_parse_csv_missing_columns():
+    """CSV 缺少必填列时报出行号"""
+    with tempfile.TemporaryDirectory() as root:
+        path = _write(root, "bad.csv", "company,name,date\n字节跳动,,2026-03-02\n")
+        try:
+            parse_csv(path)
+        except ValueError as e:
+            assert ":2: missing name" in str(e)
+        else:
+            raise AssertionError("缺少 name 应该报错")
+
+
+def test_parse_ics_converts_utc_to_local():
+    """ICS: Z 结尾的 UTC 时间转为本地时间，浮动时间原样保留"""
+    with tempfile.TemporaryDirectory() as root, local_timezone("CST-8"):
+        records = parse_ics(_write(root, "calendar.ics", ICS_FIXTURE))
+
+    assert len(records) == 2, "没有公司的日程应被忽略"
+    final, cross = records
+    assert (final["company"], final["round_name"]) == ("字节跳动", "终面")
+    assert (final["date"], final["time"], final["duration_minutes"]) == ("2026-03-10", "10:00", 60)
+    assert final["platform"] == "Zoom" and final["interviewer_name"] == "boss@example.com"
+
+    assert (cross["company"], cross["round_name"]) == ("阿里云", "交叉面")
+    assert (cross["date"], cross["time"], cross["duration_minutes"]) == ("2026-03-11", "09:30", 90)
+    assert cross["format"] == "in-person"
+
+
+def test_bulk_import_groups_by_company():
+    """批量导入按公司目录分组，各公司的轮次按日期编号写入各自的 tracking.json"""
+    with tempfile.TemporaryDirectory() as root, local_timezone("CST-8"):
+        _init_companies(root, ["字节跳动", "阿里云"])
+        from_csv = bulk_import(root, _write(root, "rounds.csv", CSV_FIXTURE))
+        from_ics = bulk_import(root, _write(root, "calendar.ics", ICS_FIXTURE))
+
+        assert sorted(result["added"] for result in from_csv.values()) == [1, 2]
+        assert sorted(result["added"] for result in from_ics.values()) == [1, 1]
+        assert [(r["round"], r["round_name"], r["time"]) for r in _rounds(root, "字节跳动")] == [
+            (1, "HR 面", "10:00"), (2, "业务面", "14:00"), (3, "终面", "10:00")]
+        assert [(r["round"], r["round_name"]) for r in _rounds(root, "阿里云")] == [(1, "技术面"), (2, "交叉面")]
+
+
+def test_bulk_import_is_idempotent():
+    """重复导入同一 CSV / ICS 不新增轮次"""
+    with tempfile.TemporaryDirectory() as root, local_timezone("CST-8"):
+        _init_companies(root, ["字节跳动", "阿里云"])
+        sources = [_write(root, "rounds.csv", CSV_FIXTURE), _write(root, "calendar.ics", ICS_FIXTURE)]
+        for source in sources:
+            bulk_import(root, source)
+        before = {company: len(_rounds(root, company)) for company in ("字节跳动", "阿里云")}
+
+        for source in sources:
+            summary = bulk_import(root, source)
+            assert all(result["added"] == 0 and result["skipped"] > 0 for result in summary.values())
+
+        assert {company: len(_rounds(root, company)) for company in ("字节跳动", "阿里云")} == before
+
+
+def test_bulk_import_requires_initialized_tracking():
+    """公司目录未初始化时报告错误而不是创建 tracking.json"""
+    with tempfile.TemporaryDirectory() as root:
+        summary = bulk_import(root, _write(root, "rounds.csv", CSV_FIXTURE))
+
+        assert all("error" in result for result in summary.values())
+        assert not list(Path(root).glob("companies/*/interviews/tracking.json"))
+
+
+def main():
+    """主入口"""
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+状态文件读写 - 测试脚本
+
+覆盖 state_io.py 的原子替换、跨进程 update_json 和嵌套锁规则，以及
+interview_tracker.py 在锁内重新加载 tracking.json 的事务
+"""
+
+import os
+import sys
+import json
+import tempfile
+import subprocess
+from pathlib import Path
+
+# 添加路径
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from scripts.state_io import atomic_write_bytes, file_lock, locked_json, read_json, update_json, write_json
+
+SCRIPTS_DIR = Path(__file__).parent
+
+# 子进程: 在 update_json 中把计数器加一，重复 N 次
+INCREMENT = """
+import sys
+sys.path.insert(0, sys.argv[1])
+from state_io import update_json
+
+def bump(data):
+    data["count"] = data.get("count", 0) + 1
+
+for _ in range(int(sys.argv[3])):
+    update_json(sys.argv[2], bump)
+"""
+
+
+def test_atomic_write_keeps_old_content_on_failure():
+    """写入中途失败时目标文件保持原内容，不留下临时文件"""
+    with tempfile.TemporaryDirectory() as root:
+        target = Path(root) / "state.json"
+        write_json(target, {"version": 1})
+
+        try:
+            atomic_write_bytes(target, "不是 bytes")
+        except TypeError:
+            pass
+        else:
+            raise AssertionError("写入 str 应该失败")
+
+        assert read_json(target) == {"version": 1}
+        assert [path.name for path in Path(root).iterdir()] == ["state.json"]
+
+
+def test_failed_transaction_does_not_write():
+    """update_json / locked_json 的修改抛出异常时不写回"""
+    with tempfile.TemporaryDirectory() as root:
+        target = Path(root) / "state.json"
+        write_json(target, {"items": [1]})
+
+        def fail(data):
+            data["items"].append(2)
+            raise ValueError("中途失败")
+
+        try:
+            update_json(target, fail)
+        except ValueError:
+            pass
+        try:
+            with locked_json(target) as data:
+                data["items"].append(3)
+                raise ValueError("中途失败")
+        except ValueError:
+            pass
+
+        assert read_json(target) == {"items": [1]}
+
+
+def test_concurrent_update_json_from_two_processes():
+    """两个进程同时 update_json 同一文件，不丢失任何一次更新"""
+    rounds = 200
+    with tempfile.TemporaryDirectory() as root:
+        target = Path(root) / "counter.json"
+        env = {**os.environ, "XDG_CACHE_HOME": str(Path(root) / "cache")}
+        workers = [subprocess.Popen([sys.executable, "-c", INCREMENT, str(SCRIPTS_DIR), str(target), str(rounds)],
+                                    env=env) for _ in range(2)]
+        for worker in workers:
+            assert worker.wait(timeout=60) == 0
+
+        assert json.loads(target.read_text(encoding="utf-8")) == {"count": 2 * rounds}
+
+
+def test_nested_locks():
+    """同一路径的嵌套锁: 独占锁内可再取共享锁，共享锁内取独占锁报错"""
+    with tempfile.TemporaryDirectory() as root:
+        target = Path(root) / "state.json"
+        write_json(target, {"n": 1})
+
+        with locked_json(target) as data:
+            # 独占锁内读取 (共享锁) 直接复用已持有的锁，不会死锁
+            assert read_json(target) == {"n": 1}
+            data["n"] = 2
+        assert read_json(target) == {"n": 2}
+
+        with file_lock(target, shared=True):
+            try:
+                with file_lock(target):
+                    pass
+            except RuntimeError:
+                pass
+            else:
+                raise AssertionError("共享锁内取独占锁应该报错")
+            # 报错后原来的共享锁仍然有效
+            assert read_json(target) == {"n": 2}
+
+        # 锁已全部释放，可以重新取独占锁
+        update_json(target, lambda data: {"n": data["n"] + 1})
+        assert read_json(target) == {"n": 3}
+
+
+def test_tracker_transaction_reloads_under_lock():
+    """两个 InterviewTracker 实例交替更新同一公司，后写的不覆盖先写的"""
+    from scripts.interview_tracker import InterviewTracker
+
+    with tempfile.TemporaryDirectory() as root:
+        first = InterviewTracker(root)
+        first.init_tracking("测试公司", "产品经理", "v1")
+        second = InterviewTracker(root)
+
+        first.add_timeline_event("2026-01-02", "一面", "scheduled")
+        # second 内存中的副本已过期，事务开始时在锁内重新加载
+        second.add_timeline_event("2026-01-03", "二面", "scheduled")
+
+        events = [event["event"] for event in read_json(Path(root) / "interviews" / "tracking.json")["timeline"]]
+        assert events[-2:] == ["一面", "二面"]
+
+
+def main():
+    """主入口"""
+    for name, test in list(globals().items()):
+        if name.startswith("test_") and callable(test):
+            test()
+            print(f"✅ {name}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Tracing
+
+Lightweight span recorder for the pipeline and the all-in-one workflow.
+Each span records start/end, thread, an optional inputs hash and the bytes
+written inside it; bytes roll up into the enclosing span on the same thread.
+Traces export as Chrome trace-event JSON (open in chrome://tracing or
+https://ui.perfetto.dev) to see the critical path and whether parallel stages
+overlap.
+
+Usage:
+    tracer = Tracer()
+    with activate(tracer):
+        with span("teammate_a", "teammate", inputs=(company, jd)):
+            write_text(path, content)
+    tracer.export(output_dir / "trace.json")
+
+The active tracer and the span stack live in context variables, so they are
+per-thread and per-asyncio-task: concurrent coroutines on one event loop keep
+separate stacks. Plain worker threads start with an empty context, so code
+that fans out to a ThreadPoolExecutor activates its tracer in each worker (see
+PipelineTeam._run_teammate). When no tracer is active, span() and the I/O
+helpers cost one context-variable lookup.
+"""
+
+import os
+import time
+import threading
+from contextvars import ContextVar
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+from state_io import atomic_write_json
+
+TRACE_FILE = "trace.json"
+
+_active_tracer: ContextVar[Optional["Tracer"]] = ContextVar("active_tracer", default=None)
+_span_stack: ContextVar[tuple] = ContextVar("span_stack", default=())
+
+
+def inputs_hash(*values: Any) -> str:
+    """Short SHA-256 over the given values (str/bytes/Path, others via repr)."""
+    import hashlib  # deferred: ~3 ms at import, and most commands never hash
+
+    digest = hashlib.sha256()
+    for value in values:
+        if isinstance(value, bytes):
+            digest.update(value)
+        elif isinstance(value, (str, Path)):
+            digest.update(str(value).encode("utf-8"))
+        else:
+            digest.update(repr(value).encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()[:16]
+
+
+class Span:
+    """One timed region; created by Tracer.span()."""
+
+    __slots__ = ("name", "category", "args", "start_us", "bytes_written")
+
+    def __init__(self, name: str, category: str, args: Dict[str, Any]):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start_us = 0.0
+        self.bytes_written = 0
+
+    def add_bytes(self, count: int):
+        self.bytes_written += count
+
+    def set(self, key: str, value: Any):
+        self.args[key] = value
+
+
+class _NullSpan:
+    """Stand-in yielded when tracing is off."""
+
+    def add_bytes(self, count: int):
+        pass
+
+    def set(self, key: str, value: Any):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Tracer:
+    """Thread-safe collector of completed spans."""
+
+    def __init__(self):
+        self._events: List[Dict[str, Any]] = []
+        self._threads: Dict[int, str] = {}
+        self._lock = threading.Lock()
+        self._origin = time.perf_counter()
+        self.pid = os.getpid()
+
+    def _now_us(self) -> float:
+        return (time.perf_counter() - self._origin) * 1_000_000
+
+    @contextmanager
+    def span(self, name: str, category: str = "", inputs: Optional[tuple] = None,
+             **args: Any) -> Iterator[Span]:
+        """
+        Time a region of code.
+
+        Args:
+            name: Span name shown in the timeline
+            category: Grouping (teammate, stage, step, io, subprocess, pdf)
+            inputs: Values hashed into the span's "inputs_hash" arg
+            **args: Extra key/values recorded on the span
+        """
+        if inputs is not None:
+            args["inputs_hash"] = inputs_hash(*inputs)
+
+        current = Span(name, category, args)
+        parents = _span_stack.get()
+        token = _span_stack.set(parents + (current,))
+        current.start_us = self._now_us()
+        try:
+            yield current
+        except BaseException as e:
+            current.args["error"] = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            end_us = self._now_us()
+            _span_stack.reset(token)
+            if parents:
+                parents[-1].bytes_written += current.bytes_written
+            self._record(current, end_us)
+
+    def _record(self, current: Span, end_us: float):
+        thread = threading.current_thread()
+        args = dict(current.args)
+        if current.bytes_written:
+            args["bytes_written"] = current.bytes_written
+
+        with self._lock:
+            self._threads.setdefault(thread.ident, thread.name)
+            self._events.append({
+                "name": current.name,
+                "cat": current.category,
+                "ph": "X",
+                "ts": round(current.start_us, 3),
+                "dur": round(end_us - current.start_us, 3),
+                "pid": self.pid,
+                "tid": thread.ident,
+                "args": args
+            })
+
+    @property
+    def events(self) -> List[Dict[str, Any]]:
+        """Completed spans in completion order."""
+        with self._lock:
+            return list(self._events)
+
+    def to_chrome_trace(self, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Build a Chrome trace-event document."""
+        with self._lock:
+            events = sorted(self._events, key=lambda e: e["ts"])
+            thread_names = [
+                {"name": "thread_name", "ph": "M", "pid": self.pid, "tid": tid, "args": {"name": name}}
+                for tid, name in self._threads.items()
+            ]
+        return {
+            "traceEvents": thread_names + events,
+            "displayTimeUnit": "ms",
+            "otherData": metadata or {}
+        }
+
+    def export(self, path: Path, metadata: Optional[Dict[str, Any]] = None) -> Path:
+        """Write the trace as Chrome trace-event JSON."""
+        atomic_write_json(path, self.to_chrome_trace(metadata))
+        return Path(path)
+
+
+@contextmanager
+def activate(tracer: Optional[Tracer]) -> Iterator[Optional[Tracer]]:
+    """Make tracer the active tracer for the current thread / asyncio task."""
+    token = _active_tracer.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _active_tracer.reset(token)
+
+
+def active_tracer() -> Optional[Tracer]:
+    """The active tracer of the current context, if any."""
+    return _active_tracer.get()
+
+
+@contextmanager
+def span(name: str, category: str = "", inputs: Optional[tuple] = None, **args: Any):
+    """Span on the active tracer; a no-op when tracing is off."""
+    tracer = active_tracer()
+    if tracer is None:
+        yield _NULL_SPAN
+        return
+    with tracer.span(name, category, inputs, **args) as current:
+        yield current
+
+
+def read_text(path: Path, encoding: str = "utf-8") -> str:
+    """Read a text file inside a "read" span."""
+    with span(f"read {Path(path).name}", "io", path=str(path)) as current:
+        with open(path, 'r', encoding=encoding) as f:
+            content = f.read()
+        if current is not _NULL_SPAN:
+            current.set("bytes_read", os.path.getsize(path))
+        return content
+
+
+def write_text(path: Path, content: str, encoding: str = "utf-8", atomic: bool = False) -> int:
+    """
+    Write a text file inside a "write" span; returns bytes written.
+
+    With ``atomic`` the file is replaced via a fsync'd temp file (state_io),
+    so readers never see a partial document.
+    """
+    data = content.encode(encoding)
+    with span(f"write {Path(path).name}", "io", path=str(path)) as current:
+        if atomic:
+            from state_io import atomic_write_bytes
+            atomic_write_bytes(path, data)
+        else:
+            with open(path, 'wb') as f:
+                f.write(data)
+        current.add_bytes(len(data))
+    return len(data)
+
+
+def run(cmd: List[str], **kwargs: Any) -> "subprocess.CompletedProcess":
+    """subprocess.run inside a "subprocess" span."""
+    import subprocess
+
+    name = Path(cmd[1]).name if len(cmd) > 1 else Path(cmd[0]).name
+    with span(f"subprocess {name}", "subprocess", inputs=tuple(cmd), argv=" ".join(cmd)) as current:
+        result = subprocess.run(cmd, **kwargs)
+        current.set("returncode", result.returncode)
+        return result